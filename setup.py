@@ -27,6 +27,7 @@ setup(
     ],
     extras_require={
         "tui": ["textual>=0.40.0"],
+        "zstd": ["zstandard>=0.21.0"],
     },
     entry_points={
         'console_scripts': [
@@ -131,12 +131,25 @@ Examples:
     csv_group.add_argument('--csv-delimiter', default=',', help='CSV field delimiter (default: comma)')
     csv_group.add_argument('--csv-quotechar', default='"',
                           help='Character used for quoting fields in CSV (default: double quote)')
+    csv_group.add_argument('--csv-key-columns',
+                          help='Comma-separated key column names for order-insensitive CSV row matching')
 
     # JSON comparison options
-    json_group = compare_parser.add_argument_group('JSON comparison options')
+    json_group = compare_parser.add_argument_group('JSON and JSON Lines comparison options')
     json_group.add_argument('--json-compare-mode', choices=['exact', 'key-based'], default='exact',
                            help='JSON comparison mode: exact (default) or key-based')
     json_group.add_argument('--json-key-field', help='Key field(s) to use for key-based JSON comparison')
+    json_group.add_argument('--json-rtol', type=float,
+                           help='Relative tolerance for numbers in JSON files (default: exact)')
+    json_group.add_argument('--json-atol', type=float,
+                           help='Absolute tolerance for numbers in JSON files (default: exact)')
+    json_group.add_argument('--json-ignore-paths',
+                           help='Comma-separated JSONPath-like patterns of values to ignore, e.g. $.meta.timestamp')
+
+    # XML comparison options
+    xml_group = compare_parser.add_argument_group('XML comparison options')
+    xml_group.add_argument('--xml-ignore-order', action='store_true',
+                          help='Match XML child elements regardless of their order')
 
     # H5 comparison options
     h5_group = compare_parser.add_argument_group('HDF5 comparison options')
@@ -155,6 +168,27 @@ Examples:
                          help='Data filter to apply before comparison')
     h5_group.add_argument('--h5-no-expand-path', dest='h5_expand_path', action='store_false',
                          help='Do not expand HDF5 group paths to compare all sub-items')
+    h5_group.add_argument('--h5-tolerance-profile',
+                         help='JSON/YAML file mapping dataset path regexes to {rtol, atol, max_ulp, ignore}')
+
+    # NumPy comparison options
+    npy_group = compare_parser.add_argument_group('NumPy .npy/.npz comparison options')
+    npy_group.add_argument('--npy-rtol', type=float, default=1e-5,
+                          help='Relative tolerance for numerical comparison in NumPy files')
+    npy_group.add_argument('--npy-atol', type=float, default=1e-8,
+                          help='Absolute tolerance for numerical comparison in NumPy files')
+    npy_group.add_argument('--npy-show-content-diff', action='store_true',
+                          help='Report mismatch statistics and sample elements of differing arrays')
+    npy_group.add_argument('--npy-tolerance-profile',
+                          help='JSON/YAML file mapping .npz member name regexes to {rtol, atol, max_ulp, ignore}')
+
+    # Directory comparison options
+    dir_group = compare_parser.add_argument_group('Directory comparison options')
+    dir_group.add_argument('--dir-include',
+                          help="Comma-separated globs of the files to compare within directories "
+                               "(patterns without '/' match file names)")
+    dir_group.add_argument('--dir-exclude',
+                          help='Comma-separated globs of the files and subdirectories to leave out')
 
     return parser
 
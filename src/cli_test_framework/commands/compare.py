@@ -13,6 +13,7 @@ import os
 import argparse
 import logging
 from pathlib import Path
+from ..file_comparator.compression import DECOMPRESSED_TYPES, strip_compression_suffix
 from ..file_comparator.factory import ComparatorFactory
 from ..file_comparator.result import ComparisonResult
 
@@ -49,13 +50,26 @@ def parse_arguments():
                          help="CSV field delimiter (default: comma)")
     csv_group.add_argument("--csv-quotechar", default='"',
                          help="Character used for quoting fields in CSV (default: double quote)")
+    csv_group.add_argument("--csv-key-columns",
+                         help="Comma-separated key column names for order-insensitive CSV row matching")
 
     # JSON comparison options
-    json_group = parser.add_argument_group('JSON comparison options')
+    json_group = parser.add_argument_group('JSON and JSON Lines comparison options')
     json_group.add_argument("--json-compare-mode", choices=["exact", "key-based"], default="exact",
                       help="JSON comparison mode: exact (default) or key-based")
     json_group.add_argument("--json-key-field", help="Key field(s) to use for key-based JSON comparison")
+    json_group.add_argument("--json-rtol", type=float,
+                      help="Relative tolerance for numbers in JSON files (default: exact)")
+    json_group.add_argument("--json-atol", type=float,
+                      help="Absolute tolerance for numbers in JSON files (default: exact)")
+    json_group.add_argument("--json-ignore-paths",
+                      help="Comma-separated JSONPath-like patterns of values to ignore, e.g. $.meta.timestamp")
     
+    # XML comparison options
+    xml_group = parser.add_argument_group('XML comparison options')
+    xml_group.add_argument("--xml-ignore-order", action="store_true",
+                      help="Match XML child elements regardless of their order")
+
     # H5 comparison options
     h5_group = parser.add_argument_group('HDF5 comparison options')
     h5_group.add_argument("--h5-table", help="Comma-separated list of table names to compare in HDF5 files")
@@ -74,18 +88,51 @@ def parse_arguments():
                               "Filters out data that does not meet the criteria from BOTH files before comparison.")
     h5_group.add_argument("--h5-no-expand-path", dest="h5_expand_path", action="store_false",
                          help="Do not expand HDF5 group paths to compare all sub-items.")
+    h5_group.add_argument("--h5-tolerance-profile",
+                         help="JSON/YAML file mapping dataset path regexes to {rtol, atol, max_ulp, ignore}. "
+                              "Datasets matching no entry use --h5-rtol/--h5-atol.")
+
+    # NumPy comparison options
+    npy_group = parser.add_argument_group('NumPy .npy/.npz comparison options')
+    npy_group.add_argument("--npy-rtol", type=float, default=1e-5,
+                          help="Relative tolerance for numerical comparison in NumPy files")
+    npy_group.add_argument("--npy-atol", type=float, default=1e-8,
+                          help="Absolute tolerance for numerical comparison in NumPy files")
+    npy_group.add_argument("--npy-show-content-diff", action="store_true",
+                          help="Report mismatch statistics and sample elements of differing arrays")
+    npy_group.add_argument("--npy-tolerance-profile",
+                          help="JSON/YAML file mapping .npz member name regexes to {rtol, atol, max_ulp, ignore}. "
+                               "Members matching no entry use --npy-rtol/--npy-atol.")
+
+    dir_group = parser.add_argument_group('Directory comparison options')
+    dir_group.add_argument("--dir-include",
+                          help="Comma-separated globs of the files to compare within directories "
+                               "(patterns without '/' match file names)")
+    dir_group.add_argument("--dir-exclude",
+                          help="Comma-separated globs of the files and subdirectories to leave out")
     
     return parser.parse_args()
 
 def detect_file_type(file_path):
-    """Detect the type of file based on its extension"""
+    """Detect the type of file based on its extension, ignoring compression suffixes
+    of the types read with on-the-fly decompression"""
+    if Path(file_path).is_dir():
+        return 'dir'
+    stripped = strip_compression_suffix(file_path)
+    if stripped != str(file_path):
+        file_type = detect_file_type(stripped)
+        return file_type if file_type in DECOMPRESSED_TYPES else 'binary'
     ext = Path(file_path).suffix.lower()
     if ext == '.json':
         return 'json'
+    elif ext in ['.jsonl', '.ndjson']:
+        return 'jsonl'
     elif ext == '.xml':
         return 'xml'
     elif ext in ['.h5', '.hdf5']:
         return 'h5'
+    elif ext in ['.npy', '.npz']:
+        return 'npy'
     elif ext == '.csv':
         return 'csv'
     elif ext in ['.txt', '.py', '.md', '.html', '.css', '.js']:
@@ -148,17 +195,29 @@ def run_comparison(args, logger=None):
     }
     
     # Add file type specific arguments
-    if file_type == "json":
-        comparator_kwargs["compare_mode"] = args.json_compare_mode
+    if file_type in ("json", "jsonl"):
+        if file_type == "json":
+            comparator_kwargs["compare_mode"] = args.json_compare_mode
         if args.json_key_field:
             key_fields = [field.strip() for field in args.json_key_field.split(',')]
             comparator_kwargs["key_field"] = key_fields[0] if len(key_fields) == 1 else key_fields
+        comparator_kwargs["rtol"] = getattr(args, "json_rtol", None)
+        comparator_kwargs["atol"] = getattr(args, "json_atol", None)
+        ignore_paths = getattr(args, "json_ignore_paths", None)
+        if ignore_paths:
+            comparator_kwargs["ignore_paths"] = [pattern.strip() for pattern in ignore_paths.split(',')]
     
     if file_type == "csv":
         comparator_kwargs["rtol"] = args.csv_rtol
         comparator_kwargs["atol"] = args.csv_atol
         comparator_kwargs["delimiter"] = args.csv_delimiter
         comparator_kwargs["quotechar"] = args.csv_quotechar
+        key_columns = getattr(args, "csv_key_columns", None)
+        if key_columns:
+            comparator_kwargs["key_columns"] = [column.strip() for column in key_columns.split(',')]
+
+    if file_type == "xml":
+        comparator_kwargs["ignore_order"] = getattr(args, "xml_ignore_order", False)
 
     if file_type == "h5":
         if args.h5_table:
@@ -173,7 +232,24 @@ def run_comparison(args, logger=None):
         if args.h5_data_filter:
             comparator_kwargs["data_filter"] = args.h5_data_filter
         comparator_kwargs["expand_path"] = args.h5_expand_path
+        tolerance_profile = getattr(args, "h5_tolerance_profile", None)
+        if tolerance_profile:
+            comparator_kwargs["tolerance_profile"] = tolerance_profile
     
+    if file_type == "npy":
+        comparator_kwargs["rtol"] = getattr(args, "npy_rtol", 1e-5)
+        comparator_kwargs["atol"] = getattr(args, "npy_atol", 1e-8)
+        comparator_kwargs["show_content_diff"] = getattr(args, "npy_show_content_diff", False)
+        tolerance_profile = getattr(args, "npy_tolerance_profile", None)
+        if tolerance_profile:
+            comparator_kwargs["tolerance_profile"] = tolerance_profile
+
+    if file_type == "dir":
+        for option in ("include", "exclude"):
+            patterns = getattr(args, f"dir_{option}", None)
+            if patterns:
+                comparator_kwargs[option] = [pattern.strip() for pattern in patterns.split(',')]
+
     if file_type == "binary":
         comparator_kwargs["similarity"] = args.similarity
 
@@ -2,20 +2,35 @@ import os
 import re
 from typing import Any, Dict, Optional, Pattern
 
+from ..file_comparator.compression import DECOMPRESSED_TYPES, strip_compression_suffix
 from ..file_comparator.factory import ComparatorFactory
+from .compare_cache import active_cache
+
+# Comparator kwargs holding file paths; resolved relative to the workspace like
+# the compared files themselves.
+_PATH_KWARGS = ("tolerance_profile",)
 
 
 def _detect_file_type(file_path: str) -> str:
-    """Auto-detect comparator type from file extension."""
-    ext = os.path.splitext(file_path)[1].lower()
+    """Auto-detect comparator type from file extension.
+
+    Compression suffixes are ignored for types read with on-the-fly decompression:
+    ``out.json.gz`` is compared as JSON, ``out.npy.gz`` as binary.
+    """
+    if os.path.isdir(file_path):
+        return 'dir'
+    stripped = strip_compression_suffix(file_path)
+    ext = os.path.splitext(stripped)[1].lower()
     _type_map = {
         '.h5': 'h5', '.hdf5': 'h5', '.hdf': 'h5',
+        '.npy': 'npy', '.npz': 'npy',
         '.json': 'json',
+        '.jsonl': 'jsonl', '.ndjson': 'jsonl',
         '.csv': 'csv', '.tsv': 'csv',
         '.xml': 'xml', '.html': 'xml', '.htm': 'xml',
         '.txt': 'text', '.log': 'text', '.out': 'text', '.py': 'text',
     }
-    if ext in _type_map:
+    if ext in _type_map and (stripped == file_path or _type_map[ext] in DECOMPRESSED_TYPES):
         return _type_map[ext]
     # For unknown extensions, use binary comparator
     return 'binary'
@@ -62,15 +77,20 @@ class Assertions:
         """
         Compare two files using the appropriate file comparator.
 
+        Within a run (see ``compare_cache.comparison_cache``) comparators, parsed
+        baselines and results of unchanged files are reused.
+
         :param actual_path:   Path to the file generated by the test command.
         :param baseline_path: Path to the golden / reference file.
-        :param file_type:     Comparator type ('h5','json','csv','xml','text','binary').
-                              Auto-detected from file extension if omitted.
+        :param file_type:     Comparator type ('h5','json','csv','xml','text','binary','dir').
+                              Auto-detected from file extension if omitted
+                              ('dir' for directories).
         :param workspace:     Working directory; both paths are resolved relative to
                               this directory when they are not absolute.
         :param comparator_kwargs: Extra keyword arguments forwarded to the comparator
                                   (e.g. ``rtol=1e-5``, ``atol=1e-8``, ``encoding='utf-8'``).
         :return: True when files are identical.
+
         :raises AssertionError: when files differ or an error occurs during comparison.
         """
         # Resolve paths relative to workspace
@@ -78,18 +98,24 @@ class Assertions:
             actual_path = os.path.join(workspace, actual_path)
         if workspace and not os.path.isabs(baseline_path):
             baseline_path = os.path.join(workspace, baseline_path)
+        for key in _PATH_KWARGS:
+            value = comparator_kwargs.get(key)
+            if workspace and isinstance(value, str) and not os.path.isabs(value):
+                comparator_kwargs[key] = os.path.join(workspace, value)
 
         # Auto-detect file type from extension
         if not file_type:
             file_type = _detect_file_type(actual_path)
 
         try:
-            comparator = ComparatorFactory.create_comparator(
-                file_type,
-                verbose=True,  # always include diff details in the assertion message
-                **comparator_kwargs,
-            )
-            result = comparator.compare_files(actual_path, baseline_path)
+            # Always include diff details in the assertion message
+            comparator_kwargs["verbose"] = True
+            cache = active_cache()
+            if cache is not None:
+                result = cache.compare(file_type, actual_path, baseline_path, **comparator_kwargs)
+            else:
+                comparator = ComparatorFactory.create_comparator(file_type, **comparator_kwargs)
+                result = comparator.compare_files(actual_path, baseline_path)
 
             if result.error:
                 raise AssertionError(
@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Optional
 from .test_case import TestCase
 from .assertions import Assertions
 from .setup import SetupManager, EnvironmentSetup
+from .compare_cache import comparison_cache
 from .execution import execute_single_test_case
 from .history_store import load_history, update_case, check_regression, save_history
 
@@ -101,19 +102,21 @@ class BaseRunner(ABC):
             logger.info("Starting test execution... Total tests: %d", self.results["total"])
             logger.info("=" * 50)
             
-            for i, case in enumerate(self.test_cases, 1):
-                logger.info("Running test %d/%d: %s", i, self.results["total"], case.name)
-                result = self.run_single_test(case)
-                self.results["details"].append(result)
-                duration = result.get("duration", 0)
-                if result["status"] == "passed":
-                    self.results["passed"] += 1
-                    logger.info("✓ Test passed: %s (%.2fs)", case.name, duration)
-                else:
-                    self.results["failed"] += 1
-                    logger.error("✗ Test failed: %s (%.2fs)", case.name, duration)
-                    if result["message"]:
-                        logger.error("  Error: %s", result["message"])
+            # Comparators, parsed baselines and results are reused within the run
+            with comparison_cache():
+                for i, case in enumerate(self.test_cases, 1):
+                    logger.info("Running test %d/%d: %s", i, self.results["total"], case.name)
+                    result = self.run_single_test(case)
+                    self.results["details"].append(result)
+                    duration = result.get("duration", 0)
+                    if result["status"] == "passed":
+                        self.results["passed"] += 1
+                        logger.info("✓ Test passed: %s (%.2fs)", case.name, duration)
+                    else:
+                        self.results["failed"] += 1
+                        logger.error("✗ Test failed: %s (%.2fs)", case.name, duration)
+                        if result["message"]:
+                            logger.error("  Error: %s", result["message"])
                     
             total_duration = time.time() - total_start_time
             logger.info("=" * 50)
@@ -0,0 +1,147 @@
+"""
+Run-scoped reuse of comparators, parsed baselines and comparison results.
+
+A test run usually compares many outputs against a few baselines with a handful
+of comparator configurations. While a :class:`ComparisonCache` is active (the
+runners activate one for the duration of ``run_tests``), ``Assertions.compare_files``
+reuses one comparator per (type, options), shares the parsed content of stable
+JSON and XML files loaded whole between those comparisons, and answers a repeated
+comparison of unchanged files from the memoized result.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ..file_comparator.base_comparator import BaseComparator
+from ..file_comparator.digest_cache import STABLE_AGE
+from ..file_comparator.factory import ComparatorFactory
+from ..file_comparator.lru_cache import LruCache
+from ..file_comparator.result import ComparisonResult
+
+logger = logging.getLogger("cli_test_framework.core.compare_cache")
+
+# Environment variable disabling the cache ("off")
+CACHE_ENV_VAR = "CLI_TEST_COMPARE_CACHE"
+
+_active: Optional["ComparisonCache"] = None
+
+
+def _file_version(path: str) -> Optional[Tuple[str, int, int, int]]:
+    """Identity of the current version of a stable file: (realpath, size, mtime_ns, inode).
+
+    Returns None for directories, whose stat does not reflect their content, and for
+    files modified within STABLE_AGE seconds, which a rewrite in the same mtime tick
+    could change without changing their identity.
+    """
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    if os.path.isdir(path) or time.time_ns() - stat.st_mtime_ns <= STABLE_AGE * 1e9:
+        return None
+    return path, stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class ComparisonCache:
+    """Comparators, parsed content and results shared by the comparisons of one run.
+
+    :param max_results:       Maximum number of memoized comparison results.
+    :param max_contents:      Maximum number of cached parsed files.
+    :param max_content_bytes: Maximum total size of the files whose parsed content
+                              is cached (parsed content is usually a few times larger).
+    """
+
+    def __init__(self, max_results: int = 4096, max_contents: int = 32,
+                 max_content_bytes: int = 256 << 20):
+        self.contents = LruCache(max_contents, max_content_bytes)
+        self.results = LruCache(max_results)
+        self._comparators: Dict[str, BaseComparator] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def options_key(file_type: str, options: Dict[str, Any]) -> str:
+        """Canonical key of a comparator type and its keyword arguments."""
+        return json.dumps([file_type.lower(), options], sort_keys=True, default=repr)
+
+    def comparator(self, file_type: str, **options: Any) -> BaseComparator:
+        """Get the shared comparator of a type and options, creating it on first use."""
+        key = self.options_key(file_type, options)
+        comparator = self._comparators.get(key)
+        if comparator is None:
+            created = ComparatorFactory.create_comparator(file_type, **options)
+            created.content_cache = self.contents
+            with self._lock:
+                comparator = self._comparators.setdefault(key, created)
+        return comparator
+
+    def compare(self, file_type: str, actual_path: str, baseline_path: str,
+                **options: Any) -> ComparisonResult:
+        """Compare two files with the shared comparator, reusing a memoized result.
+
+        A result is memoized when both files are stable (see ``_file_version``) and
+        unchanged by the comparison, and the comparison did not fail with an error.
+        """
+        comparator = self.comparator(file_type, **options)
+        try:
+            key = (self.options_key(file_type, options),
+                   _file_version(actual_path), _file_version(baseline_path))
+        except OSError:
+            key = None  # Missing files are reported by the comparator
+        if key is not None and None in key[1:]:
+            key = None
+        if key is not None:
+            result = self.results.get(key)
+            if result is not None:
+                logger.debug("Reusing comparison result of %s vs %s", actual_path, baseline_path)
+                return result
+        result = comparator.compare_files(actual_path, baseline_path)
+        if key is not None and not result.error:
+            try:
+                unchanged = key[1:] == (_file_version(actual_path), _file_version(baseline_path))
+            except OSError:
+                unchanged = False
+            if unchanged:
+                self.results.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Drop all comparators, cached content and results."""
+        with self._lock:
+            self._comparators.clear()
+        self.contents.clear()
+        self.results.clear()
+
+
+def active_cache() -> Optional[ComparisonCache]:
+    """The cache of the current run, or None outside a run."""
+    return _active
+
+
+@contextmanager
+def comparison_cache(cache: Optional[ComparisonCache] = None) -> Iterator[Optional[ComparisonCache]]:
+    """Activate a comparison cache for the duration of a run.
+
+    :param cache: Cache to activate, kept by the caller after the run; by default a
+                  new cache is created and cleared when the run ends.
+
+    An already active cache is kept, so nested runs (e.g. the sequential fallback
+    of the parallel runner) share it. Setting ``CLI_TEST_COMPARE_CACHE=off``
+    disables caching.
+    """
+    global _active
+    if _active is not None:
+        yield _active
+        return
+    if os.environ.get(CACHE_ENV_VAR, "").lower() == "off":
+        yield None
+        return
+    _active = cache if cache is not None else ComparisonCache()
+    try:
+        yield _active
+    finally:
+        if cache is None:
+            _active.clear()
+        _active = None
@@ -3,6 +3,8 @@ import signal
 import time
 import os
 import shlex
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from typing import Any, List, Optional, Dict
 
 from .assertions import Assertions
@@ -27,6 +29,46 @@ def _normalize_cmd_list(command: str, args: List[str]) -> List[str]:
     return [command, *args]
 
 
+# Environment variable setting the number of comparison threads per process
+# (1 compares the files of a test case one after another)
+COMPARE_WORKERS_ENV_VAR = "CLI_TEST_COMPARE_WORKERS"
+
+_compare_pool: Optional[ThreadPoolExecutor] = None
+_compare_pool_pid: Optional[int] = None
+_compare_pool_lock = threading.Lock()
+
+
+def _compare_workers() -> int:
+    """Size of the comparison pool: CLI_TEST_COMPARE_WORKERS, or min(8, CPU count + 4).
+
+    Like ThreadPoolExecutor's default, the pool is larger than the CPU count since
+    comparisons often wait for reads or run in C code that releases the GIL.
+    """
+    value = os.environ.get(COMPARE_WORKERS_ENV_VAR)
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return min(8, (os.cpu_count() or 1) + 4)
+
+
+def _comparison_pool() -> ThreadPoolExecutor:
+    """Get the process-wide pool comparing files, creating it on first use.
+
+    The pool is separate from the runners' command pools, so comparisons never
+    occupy a command slot, and bounded, so parallel test cases share its threads.
+    A pool inherited through fork has no threads and is replaced.
+    """
+    global _compare_pool, _compare_pool_pid
+    with _compare_pool_lock:
+        if _compare_pool is None or _compare_pool_pid != os.getpid():
+            _compare_pool = ThreadPoolExecutor(max_workers=_compare_workers(),
+                                               thread_name_prefix="compare")
+            _compare_pool_pid = os.getpid()
+        return _compare_pool
+
+
 def validate_result(
     expected: ExpectedResult,
     actual: TestResultData,
@@ -53,8 +95,61 @@ def validate_result(
         assertions.matches(actual["output"], expected["output_matches"])
 
     if "compare_files" in expected:
-        for spec in expected["compare_files"]:
-            _dispatch_file_compare(spec, workspace, assertions)
+        _compare_all_files(expected["compare_files"], workspace, assertions,
+                           fail_fast=expected.get("compare_fail_fast", False))
+
+
+def _compare_all_files(
+    specs: List[Dict[str, Any]],
+    workspace: Optional[str],
+    assertions: Assertions,
+    fail_fast: bool = False,
+) -> None:
+    """
+    Evaluate compare_files specs concurrently in the comparison pool.
+
+    :param specs:      compare_files spec dicts.
+    :param workspace:  Working directory for relative paths.
+    :param assertions: Assertions instance performing the comparisons.
+    :param fail_fast:  Raise as soon as a comparison fails and cancel the ones not
+                       yet started, instead of reporting every failure.
+    :raises AssertionError: with the failure message when one spec fails, or all
+                            failure messages in spec order when several fail.
+    """
+    if len(specs) <= 1 or _compare_workers() == 1:
+        failures = []
+        for spec in specs:
+            try:
+                _dispatch_file_compare(spec, workspace, assertions)
+            except AssertionError as exc:
+                if fail_fast:
+                    raise
+                failures.append(exc)
+    else:
+        pool = _comparison_pool()
+        futures = [pool.submit(_dispatch_file_compare, spec, workspace, assertions) for spec in specs]
+        if fail_fast:
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+            # Comparisons already running finish in the background; their results are ignored
+            failed = [future for future in futures if future in done and future.exception()]
+            if failed:
+                raise failed[0].exception()
+        failures = []
+        for future in futures:
+            exc = future.exception()
+            if isinstance(exc, AssertionError):
+                failures.append(exc)
+            elif exc is not None:
+                raise exc
+    if len(failures) == 1:
+        raise failures[0]
+    if failures:
+        raise AssertionError(
+            f"{len(failures)} of {len(specs)} file comparisons failed:\n"
+            + "\n".join(str(exc) for exc in failures)
+        )
 
 
 def _dispatch_file_compare(
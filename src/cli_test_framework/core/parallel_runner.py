@@ -6,6 +6,7 @@ import threading
 import logging
 from .base_runner import BaseRunner
 from .test_case import TestCase
+from .compare_cache import comparison_cache
 from .process_worker import run_test_in_process
 
 logger = logging.getLogger("cli_test_framework.core.parallel_runner")
@@ -123,7 +124,9 @@ class ParallelRunner(BaseRunner):
             else:
                 executor_class = ThreadPoolExecutor
                 
-            with executor_class(max_workers=self.max_workers) as executor:
+            # Comparators, parsed baselines and results are reused within the run
+            # (process workers keep a cache of their own)
+            with comparison_cache(), executor_class(max_workers=self.max_workers) as executor:
                 # 提交所有测试任务
                 if self.execution_mode == "process":
                     # 进程模式：使用独立的工作器函数
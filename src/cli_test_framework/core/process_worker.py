@@ -5,12 +5,24 @@
 
 import logging
 from typing import Dict, Any, List
+from .compare_cache import ComparisonCache, comparison_cache
 from .config_loader import execute_sequence
 from .execution import execute_single_test_case
 from .types import TestCaseData
 
 logger = logging.getLogger("cli_test_framework.core.process_worker")
 
+# Comparison cache shared by the test cases run in this worker process
+_cache = None
+
+
+def _worker_cache() -> ComparisonCache:
+    """Get the comparison cache of this worker process, creating it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = ComparisonCache()
+    return _cache
+
 def _run_sequence_in_process(test_index: int, case_data: Dict[str, Any], workspace: str = None) -> Dict[str, Any]:
     """Run a sequence test case with multiple steps (fail-fast) in a process worker."""
     return execute_sequence(
@@ -33,6 +45,13 @@ def run_test_in_process(test_index: int, case_data: Dict[str, Any], workspace: s
     Returns:
         测试结果字典
     """
+    # The pool's workers live as long as the run, and so does their cache
+    with comparison_cache(_worker_cache()):
+        return _run_test(test_index, case_data, workspace)
+
+
+def _run_test(test_index: int, case_data: Dict[str, Any], workspace: str = None) -> Dict[str, Any]:
+    """Run a single test case in this worker process (see run_test_in_process)."""
     # Sequence mode
     if case_data.get("steps"):
         return _run_sequence_in_process(test_index, case_data, workspace)
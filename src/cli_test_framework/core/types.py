@@ -16,6 +16,9 @@ class ExpectedResult(TypedDict, total=False):
                                   auto-detected from extension if omitted
         Additional kwargs are forwarded to the comparator (e.g. rtol, atol, encoding, ...)
     """
+    compare_fail_fast: bool
+    """Stop at the first failing compare_files spec (default: evaluate all specs
+    concurrently and report every failure)."""
 
 
 class ResourceRequirements(TypedDict, total=False):
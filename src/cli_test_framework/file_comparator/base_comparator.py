@@ -10,7 +10,11 @@
 
 from abc import ABC, abstractmethod
 import logging
+import os
+import time
 from pathlib import Path
+from .compression import detect_compression, open_decompressed
+from .digest_cache import STABLE_AGE
 from .result import ComparisonResult, Difference
 
 class BaseComparator(ABC):
@@ -18,21 +22,57 @@ class BaseComparator(ABC):
     @brief Base abstract class for all file comparators
     @details This class defines the interface and common functionality for all file comparators.
              It provides basic file comparison operations and logging capabilities.
+             Subclasses whose compare_content never modifies its arguments set
+             ``cache_content``, so that parsed content of stable files (typically
+             baselines) can be shared between comparisons through ``content_cache``.
     """
+
+    # True if read_content results may be cached and passed to several comparisons
+    cache_content = False
     
-    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, **kwargs):
+    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, decompress=True, **kwargs):
         """
         @brief Initialize the base comparator
         @param encoding str: File encoding to use (default: "utf-8")
         @param chunk_size int: Size of chunks for reading large files (default: 8192)
         @param verbose bool: Enable verbose logging (default: False)
+        @param decompress bool: Read gzip, bzip2, xz and zstd files through open_file
+                                as their decompressed content (default: True)
         """
         self.encoding = encoding
         self.chunk_size = chunk_size
+        self.decompress = decompress
+        # LruCache of parsed content, set by the owner of a shared comparator
+        self.content_cache = None
         self.logger = logging.getLogger(f"file_comparator.{self.__class__.__name__}")
         if verbose:
             self.logger.setLevel(logging.DEBUG)
     
+    def compression(self, file_path):
+        """
+        @brief Get the compression format open_file decompresses a file from
+        @param file_path Path: Path to the file
+        @return str: "gzip", "bz2", "xz" or "zstd", or None if the file is read as is
+        @throws OSError: If the file cannot be read
+        """
+        return detect_compression(file_path) if self.decompress else None
+
+    def open_file(self, file_path, mode='r'):
+        """
+        @brief Open a file for reading, decompressing it on the fly if compressed
+        @param file_path Path: Path to the file
+        @param mode str: 'r' for text in the comparator's encoding, 'rb' for bytes
+        @return file: Readable stream of the (decompressed) content
+        @details Compression is detected from the leading bytes, not the file name.
+                 Decompressed streams are read sequentially; forward seeks decompress
+                 and discard the data before the target.
+        """
+        compression = self.compression(file_path)
+        if compression is None:
+            return open(file_path, mode, encoding=None if 'b' in mode else self.encoding)
+        self.logger.debug(f"Decompressing {compression} file: {file_path}")
+        return open_decompressed(file_path, compression, mode, self.encoding)
+
     @abstractmethod
     def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
         """
@@ -56,6 +96,37 @@ class BaseComparator(ABC):
         """
         pass
 
+    def _read_cached(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Read file content through the content cache
+        @param file_path Path: Path to the file to read
+        @param start_line int: Starting line number (0-based)
+        @param end_line int: Ending line number (0-based, None for end of file)
+        @param start_column int: Starting column number (0-based)
+        @param end_column int: Ending column number (0-based, None for end of line)
+        @return object: File content as returned by read_content
+        @details Content is cached per comparator, file version (path, size, mtime_ns,
+                 inode) and range, weighted by the file size. Only files older than
+                 STABLE_AGE and unchanged while being read are cached, since a rewrite
+                 within the same mtime tick would otherwise go unnoticed.
+        """
+        cache = self.content_cache
+        if cache is None or not self.cache_content:
+            return self.read_content(file_path, start_line, end_line, start_column, end_column)
+        path = os.path.realpath(file_path)
+        stat = os.stat(path)
+        key = (self, path, stat.st_size, stat.st_mtime_ns, stat.st_ino,
+               start_line, end_line, start_column, end_column)
+        content = cache.get(key)
+        if content is not None:
+            self.logger.debug(f"Using cached content of {file_path}")
+            return content
+        content = self.read_content(file_path, start_line, end_line, start_column, end_column)
+        if (time.time_ns() - stat.st_mtime_ns > STABLE_AGE * 1e9
+                and os.stat(path).st_mtime_ns == stat.st_mtime_ns):
+            cache.put(key, content, stat.st_size)
+        return content
+
     def compare_files(self, file1, file2, start_line=0, end_line=None, start_column=0, end_column=None):
         """
         @brief Compare two files with the specified parameters
@@ -87,8 +158,8 @@ class BaseComparator(ABC):
             
             # Read content with specified ranges
             self.logger.debug(f"Reading content from files")
-            content1 = self.read_content(file1, start_line, end_line, start_column, end_column)
-            content2 = self.read_content(file2, start_line, end_line, start_column, end_column)
+            content1 = self._read_cached(file1, start_line, end_line, start_column, end_column)
+            content2 = self._read_cached(file2, start_line, end_line, start_column, end_column)
             
             # Compare content
             self.logger.debug(f"Comparing content")
@@ -10,20 +10,71 @@
 
 import difflib
 import hashlib
+import mmap
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+import numpy as np
 from .base_comparator import BaseComparator
+from .compression import READ_ERRORS
+from .digest_cache import resolve_digest_cache
 from .result import Difference
 
+# Content-defined chunking: bytes per rolling-hash window, chunk size bounds and
+# the number of hash bits that must be zero at a boundary (average 8 KiB chunks)
+CDC_WINDOW = 48
+CDC_MIN_CHUNK = 2048
+CDC_MAX_CHUNK = 65536
+CDC_AVERAGE_BITS = 13
+# Bytes read per step when chunking a stream
+CDC_BLOCK_SIZE = 1 << 20
+# Odd multiplier of the polynomial rolling hash (invertible modulo 2**64)
+_CDC_BASE = 0x9E3779B97F4A7C15
+_cdc_tables = None
+
+
+def _cdc_power_tables():
+    """
+    @brief Get the power tables of the rolling hash, building them on first use
+    @return tuple: (powers, inverse_powers) of _CDC_BASE modulo 2**64 as uint64 arrays
+                   covering one block plus one window
+    """
+    global _cdc_tables
+    if _cdc_tables is None:
+        size = CDC_BLOCK_SIZE + CDC_WINDOW
+        powers = np.empty(size, dtype=np.uint64)
+        inverse = np.empty(size, dtype=np.uint64)
+        powers[0] = inverse[0] = 1
+        powers[1:] = _CDC_BASE
+        inverse[1:] = pow(_CDC_BASE, -1, 1 << 64)
+        # Integer cumprod wraps modulo 2**64
+        np.cumprod(powers, out=powers)
+        np.cumprod(inverse, out=inverse)
+        _cdc_tables = (powers, inverse)
+    return _cdc_tables
+
+
 class BinaryComparator(BaseComparator):
     """
     @brief Comparator for binary files with efficient byte-level comparison
     @details This class implements binary file comparison with support for:
              - Byte-level difference detection
              - Similarity index calculation using LCS
-             - Parallel processing for large files
-             - File hash calculation
+             - Parallel range comparison for large files (num_threads)
+             - File hash calculation, with cached block digests for baselines
     """
     
-    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, similarity=False, num_threads=4, **kwargs):
+    # Bytes compared per vectorized step; chunk_size is used when it is larger
+    WINDOW_SIZE = 1 << 22
+    # Bytes of context shown on each side of a difference
+    CONTEXT_SIZE = 8
+    # Inputs at least this large are compared in parallel byte ranges
+    PARALLEL_THRESHOLD = 1 << 26
+
+    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, similarity=False, num_threads=4,
+                 max_differences=10, digest_cache=True, **kwargs):
         """
         @brief Initialize the binary comparator
         @param encoding str: File encoding (not used for binary files)
@@ -31,11 +82,16 @@ class BinaryComparator(BaseComparator):
         @param verbose bool: Enable verbose logging
         @param similarity bool: Enable similarity index calculation
         @param num_threads int: Number of threads for parallel processing
+        @param max_differences int: Maximum number of differing byte runs to report
+        @param digest_cache bool or str: Use the persistent block digest cache (True for the
+                                         default location, a path for a specific database)
         @param **kwargs: Additional parameters (ignored)
         """
         super().__init__(encoding=encoding, chunk_size=chunk_size, verbose=verbose, **kwargs)
         self.similarity = similarity
         self.num_threads = num_threads
+        self.max_differences = max_differences
+        self.digest_cache = resolve_digest_cache(digest_cache)
 
     def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
         """
@@ -57,7 +113,7 @@ class BinaryComparator(BaseComparator):
             start_offset = start_line
             end_offset = end_line
             
-            with open(file_path, 'rb') as f:
+            with self.open_file(file_path, 'rb') as f:
                 if start_offset > 0:
                     f.seek(start_offset)
                 
@@ -73,7 +129,7 @@ class BinaryComparator(BaseComparator):
                 
         except FileNotFoundError:
             raise ValueError(f"File not found: {file_path}")
-        except IOError as e:
+        except READ_ERRORS as e:
             raise ValueError(f"Error reading file {file_path}: {str(e)}")
     
     def compare_content(self, content1, content2):
@@ -101,47 +157,9 @@ class BinaryComparator(BaseComparator):
             identical = True
         else:
             identical = False
-            differences = []
-            offset = 0
-            max_differences = 10  # Limit number of differences reported
-        
-            for i in range(0, len(content1), self.chunk_size):
-                chunk1 = content1[i:i+self.chunk_size]
-                chunk2 = content2[i:i+self.chunk_size]
-                
-                if chunk1 != chunk2:
-                    # Find the exact byte position where the difference starts
-                    for j in range(len(chunk1)):
-                        if j >= len(chunk2) or chunk1[j] != chunk2[j]:
-                            diff_pos = i + j
-                            # Show a few bytes before and after the difference for context
-                            context_size = 8
-                            start_ctx = max(0, diff_pos - context_size)
-                            end_ctx = min(len(content1), diff_pos + context_size)
-                            
-                            # Create hex representations of the differing sections
-                            expected_bytes = content1[start_ctx:end_ctx]
-                            actual_bytes = content2[start_ctx:min(len(content2), end_ctx)]
-                            
-                            expected_hex = ' '.join(f"{b:02x}" for b in expected_bytes)
-                            actual_hex = ' '.join(f"{b:02x}" for b in actual_bytes)
-                            
-                            differences.append(Difference(
-                                position=f"byte {diff_pos}",
-                                expected=expected_hex,
-                                actual=actual_hex,
-                                diff_type="content"
-                            ))
-                            break
-                            
-                    if len(differences) >= max_differences:
-                        differences.append(Difference(
-                            position=None,
-                            expected=None,
-                            actual=None,
-                            diff_type=f"more differences not shown"
-                        ))
-                        break
+            differences = self._collect_differences(
+                np.frombuffer(content1, dtype=np.uint8), np.frombuffer(content2, dtype=np.uint8)
+            )
         
         return identical, differences
 
@@ -152,7 +170,7 @@ class BinaryComparator(BaseComparator):
         @param b bytes: Second binary sequence
         @return float: Similarity ratio in [0.0, 1.0]
         @details Uses difflib.SequenceMatcher for accurate comparison on small/medium
-                 files, and hash-based chunk comparison for large files to avoid
+                 files, and content-defined chunk comparison for large files to avoid
                  O(n*m) complexity that would be infeasible on large binaries.
         """
         if not a and not b:
@@ -172,34 +190,147 @@ class BinaryComparator(BaseComparator):
 
     def _hash_chunk_similarity(self, a: bytes, b: bytes) -> float:
         """
-        @brief Approximate similarity via chunk-level hash matching for large files.
+        @brief Approximate similarity via content-defined chunk matching for large inputs.
         @param a bytes: First binary sequence
         @param b bytes: Second binary sequence
         @return float: Approximate similarity ratio in [0.0, 1.0]
-        @details Splits both inputs into fixed-size chunks (4 KB), hashes each chunk,
-                 and computes Jaccard similarity on the chunk hash sets. This avoids
-                 O(n*m) DP while giving a reasonable estimate of binary similarity.
+        @details In-memory variant of _stream_chunk_similarity, see _chunk_fingerprints.
         """
-        chunk_size = 4096
+        return self._fingerprint_similarity(
+            self._chunk_fingerprints(self._iter_blocks(a)),
+            self._chunk_fingerprints(self._iter_blocks(b))
+        )
 
-        hashes_a = set()
-        for i in range(0, len(a), chunk_size):
-            hashes_a.add(hash(a[i:i + chunk_size]))
+    def _stream_chunk_similarity(self, file1_path, file2_path, start_offset=0, end_offset=None):
+        """
+        @brief Approximate similarity of two files via content-defined chunk matching
+        @param file1_path Path: Path to the first binary file
+        @param file2_path Path: Path to the second binary file
+        @param start_offset int: Starting byte offset
+        @param end_offset int: Ending byte offset (None for end of file)
+        @return float: Approximate similarity ratio in [0.0, 1.0]
+        @details Files are read block by block (decompressed if compressed), so memory
+                 is bounded by one block plus the chunk fingerprint table (about 8 KiB
+                 of input per entry).
+        """
+        fingerprints = []
+        length = sys.maxsize if end_offset is None else max(0, end_offset - start_offset)
+        for path in (file1_path, file2_path):
+            with self.open_file(path, 'rb') as f:
+                f.seek(start_offset)
+                fingerprints.append(self._chunk_fingerprints(self._iter_file_blocks(f, length)))
+        return self._fingerprint_similarity(*fingerprints)
 
-        hashes_b = set()
-        for i in range(0, len(b), chunk_size):
-            hashes_b.add(hash(b[i:i + chunk_size]))
+    @staticmethod
+    def _iter_blocks(data):
+        """
+        @brief Split in-memory content into chunking blocks
+        @param data bytes: Binary content
+        @return generator: memoryview slices of at most CDC_BLOCK_SIZE bytes
+        """
+        view = memoryview(data)
+        for start in range(0, len(view), CDC_BLOCK_SIZE):
+            yield view[start:start + CDC_BLOCK_SIZE]
 
-        if not hashes_a and not hashes_b:
-            return 1.0
+    @staticmethod
+    def _iter_file_blocks(f, length):
+        """
+        @brief Read a byte range of an open file in chunking blocks
+        @param f file: File opened in binary mode, positioned at the range start
+        @param length int: Number of bytes to read at most
+        @return generator: bytes blocks of at most CDC_BLOCK_SIZE bytes
+        """
+        while length > 0:
+            block = f.read(min(CDC_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
 
-        intersection = len(hashes_a & hashes_b)
-        union = len(hashes_a | hashes_b)
+    @staticmethod
+    def _cut_candidates(data):
+        """
+        @brief Find the positions whose rolling-hash window selects a chunk boundary
+        @param data np.ndarray: uint8 array of at most CDC_BLOCK_SIZE + CDC_WINDOW - 1 bytes
+        @return np.ndarray: Indices of the last byte of every selecting window
+        @details The window hash is sum(b[i-k] * BASE**k) modulo 2**64 over the last
+                 CDC_WINDOW bytes, computed for all positions at once from a prefix sum
+                 of b[j] * BASE**-j. It depends on the window content only, so
+                 boundaries move together with inserted or removed bytes.
+        """
+        n = len(data)
+        if n < CDC_WINDOW:
+            return np.empty(0, dtype=np.intp)
+        powers, inverse = _cdc_power_tables()
+        prefix = data.astype(np.uint64)
+        prefix += 1  # Keep runs of zero bytes from hashing to zero
+        prefix *= inverse[:n]
+        np.cumsum(prefix, out=prefix)
+        window_hash = prefix[CDC_WINDOW - 1:].copy()
+        window_hash[1:] -= prefix[:n - CDC_WINDOW]
+        window_hash *= powers[CDC_WINDOW - 1:n]
+        # The high bits are the best mixed ones
+        selected = (window_hash >> np.uint64(64 - CDC_AVERAGE_BITS)) == 0
+        return np.flatnonzero(selected) + (CDC_WINDOW - 1)
 
-        if union == 0:
-            return 1.0
+    def _chunk_fingerprints(self, blocks):
+        """
+        @brief Split a byte stream into content-defined chunks and fingerprint them
+        @param blocks iterable: Consecutive blocks (bytes-like) of the stream
+        @return Counter: Bytes covered per chunk digest
+        @details Boundaries come from _cut_candidates, constrained to chunks of
+                 CDC_MIN_CHUNK to CDC_MAX_CHUNK bytes. Because boundaries depend on
+                 content rather than offsets, an insertion only changes the chunks
+                 around it instead of every following fixed-size block.
+        """
+        fingerprints = Counter()
+        tail = b''
+        base = 0       # Stream offset of the current block
+        last_cut = 0   # Stream offset of the current chunk start
+        hasher = hashlib.blake2b(digest_size=16)
+        for block in blocks:
+            block = memoryview(block)
+            block_end = base + len(block)
+            window_data = np.frombuffer(bytes(tail) + bytes(block), dtype=np.uint8)
+            # Windows ending inside the tail were evaluated with the previous block
+            cuts = self._cut_candidates(window_data)
+            cuts = cuts[cuts >= len(tail)] + (base - len(tail) + 1)
 
-        return intersection / union
+            fed = max(last_cut, base)
+            while True:
+                limit = last_cut + CDC_MAX_CHUNK
+                i = np.searchsorted(cuts, last_cut + CDC_MIN_CHUNK)
+                if i < len(cuts) and cuts[i] <= limit:
+                    cut = int(cuts[i])
+                elif limit <= block_end:
+                    cut = limit
+                else:
+                    break
+                hasher.update(block[fed - base:cut - base])
+                fingerprints[hasher.digest()] += cut - last_cut
+                hasher = hashlib.blake2b(digest_size=16)
+                fed = last_cut = cut
+            hasher.update(block[fed - base:])
+
+            tail = window_data[-(CDC_WINDOW - 1):].tobytes()
+            base = block_end
+        if base > last_cut:
+            fingerprints[hasher.digest()] += base - last_cut
+        return fingerprints
+
+    @staticmethod
+    def _fingerprint_similarity(fingerprints1, fingerprints2):
+        """
+        @brief Compute the byte-weighted overlap of two chunk fingerprint tables
+        @param fingerprints1 Counter: Bytes per chunk digest of the first input
+        @param fingerprints2 Counter: Bytes per chunk digest of the second input
+        @return float: 2 * shared bytes / total bytes, like SequenceMatcher.ratio()
+        """
+        total = sum(fingerprints1.values()) + sum(fingerprints2.values())
+        if total == 0:
+            return 1.0
+        shared = sum((fingerprints1 & fingerprints2).values())
+        return 2.0 * shared / total
 
     def compare_files(self, file1, file2, start_line=0, end_line=None, start_column=0, end_column=None):
         """
@@ -230,18 +361,31 @@ class BinaryComparator(BaseComparator):
             file2_path = Path(file2)
             result.file1_size = file1_path.stat().st_size
             result.file2_size = file2_path.stat().st_size
+
+            if self.compression(file1_path) or self.compression(file2_path):
+                # Sizes on disk say nothing about the content: compare the decompressed streams
+                self.logger.debug("Using decompressing streaming comparison")
+                result.identical, result.differences = self._compare_decompressed(
+                    file1_path, file2_path, start_line, end_line
+                )
+                if self.similarity:
+                    result.similarity = 1.0 if result.identical else self._stream_chunk_similarity(
+                        file1_path, file2_path, start_line, end_line
+                    )
+                return result
             
-            # Quick size check: if file sizes differ and similarity is not requested, 
-            # we can return early without streaming
-            if result.file1_size != result.file2_size and not self.similarity:
+            # Quick size check: if file sizes differ we can skip byte comparison
+            size_differs = False
+            if result.file1_size != result.file2_size:
                 # Adjust sizes based on offset if specified
                 adjusted_size1 = result.file1_size - start_line
                 adjusted_size2 = result.file2_size - start_line
                 if end_line is not None:
                     adjusted_size1 = min(adjusted_size1, end_line - start_line)
                     adjusted_size2 = min(adjusted_size2, end_line - start_line)
+                size_differs = adjusted_size1 != adjusted_size2
                 
-                if adjusted_size1 != adjusted_size2:
+                if size_differs and not self.similarity:
                     result.identical = False
                     result.differences.append(Difference(
                         position="file size",
@@ -251,22 +395,35 @@ class BinaryComparator(BaseComparator):
                     ))
                     return result
             
-            # If similarity calculation is needed, we still need to read full content
-            # but for regular comparison, use chunk-based streaming
-            if self.similarity:
-                # Similarity calculation requires full content for SequenceMatcher
-                # or chunk-hash comparison
+            if self.similarity and result.file1_size + result.file2_size <= 1024 * 1024:
+                # Small files: exact similarity with SequenceMatcher on the full content
                 self.logger.debug("Reading full content for similarity calculation")
                 content1 = self.read_content(file1, start_line, end_line, start_column, end_column)
                 content2 = self.read_content(file2, start_line, end_line, start_column, end_column)
                 identical, differences = self.compare_content(content1, content2)
                 result.similarity = self._compute_similarity(content1, content2)
+            elif size_differs:
+                # Large files of different sizes: report the size, stream only the similarity
+                identical = False
+                differences = [Difference(
+                    position="file size",
+                    expected=f"{result.file1_size} bytes",
+                    actual=f"{result.file2_size} bytes",
+                    diff_type="size"
+                )]
+                result.similarity = self._stream_chunk_similarity(
+                    file1_path, file2_path, start_line, end_line
+                )
             else:
                 # Chunk-based streaming comparison for O(1) memory usage
                 self.logger.debug("Using chunk-based streaming comparison")
                 identical, differences = self._compare_files_streaming(
                     file1_path, file2_path, start_line, end_line
                 )
+                if self.similarity:
+                    result.similarity = self._stream_chunk_similarity(
+                        file1_path, file2_path, start_line, end_line
+                    )
             
             result.identical = identical
             result.differences = differences
@@ -279,117 +436,352 @@ class BinaryComparator(BaseComparator):
     
     def _compare_files_streaming(self, file1_path, file2_path, start_offset=0, end_offset=None):
         """
-        @brief Compare two binary files using chunk-based streaming
+        @brief Compare two binary files through memory maps
         @param file1_path Path: Path to the first binary file
         @param file2_path Path: Path to the second binary file
         @param start_offset int: Starting byte offset
         @param end_offset int: Ending byte offset (None for end of file)
         @return tuple: (bool, list) - (identical, differences)
-        @details This method compares files chunk by chunk without loading entire files
-                 into memory, achieving O(1) memory complexity.
+        @details Both files are memory-mapped and compared in large windows with NumPy,
+                 so the page cache is read directly without per-chunk copies. Only the
+                 pages actually touched are resident, keeping memory usage bounded.
         """
-        differences = []
-        max_differences = 10  # Limit number of differences reported
-        
+        if end_offset is not None and end_offset <= start_offset:
+            raise ValueError("End offset must be greater than start offset")
+
         try:
             with open(file1_path, 'rb') as f1, open(file2_path, 'rb') as f2:
-                # Seek to start offset if specified
-                if start_offset > 0:
+                length1 = self._range_length(f1, start_offset, end_offset)
+                length2 = self._range_length(f2, start_offset, end_offset)
+                common = min(length1, length2)
+
+                differences = []
+                spans = None
+                if common > 0 and length1 == length2 and start_offset == 0 and end_offset is None:
+                    spans = self._digest_spans(file1_path, file2_path)
+                if common > 0 and spans != []:
+                    with self._mapped(f1) as m1, self._mapped(f2) as m2:
+                        differences = self._collect_differences(
+                            np.frombuffer(m1, dtype=np.uint8, count=common, offset=start_offset),
+                            np.frombuffer(m2, dtype=np.uint8, count=common, offset=start_offset),
+                            base_offset=start_offset,
+                            spans=spans
+                        )
+
+                # If one file ends before the other, that's a difference
+                if length1 != length2 and len(differences) <= self.max_differences:
+                    differences.append(Difference(
+                        position=f"byte {start_offset + common}",
+                        expected=f"{length1} bytes",
+                        actual=f"{length2} bytes",
+                        diff_type="size"
+                    ))
+
+                identical = len(differences) == 0
+                return identical, differences
+
+        except FileNotFoundError as e:
+            raise ValueError(f"File not found: {e}")
+        except IOError as e:
+            raise ValueError(f"Error reading file: {str(e)}")
+
+    def _compare_decompressed(self, file1_path, file2_path, start_offset=0, end_offset=None):
+        """
+        @brief Compare the decompressed content of two files while reading them
+        @param file1_path Path: Path to the first file (compressed or not)
+        @param file2_path Path: Path to the second file (compressed or not)
+        @param start_offset int: Starting byte offset in the decompressed content
+        @param end_offset int: Ending byte offset (None for end of content)
+        @return tuple: (bool, list) - (identical, differences)
+        @details Compressed files cannot be memory-mapped, so both streams are read
+                 window by window and each pair of windows is scanned like mapped
+                 content. The last bytes of the previous windows are kept and the
+                 first bytes of the next windows are read ahead, so runs near a
+                 window boundary are reported once with the same context as in
+                 mapped content. Reading stops once more than max_differences runs are found.
+                 Byte-identical files are recognized from their cached digests
+                 without decompressing them.
+        """
+        if end_offset is not None and end_offset <= start_offset:
+            raise ValueError("End offset must be greater than start offset")
+        cache = self.digest_cache
+        if (start_offset == 0 and end_offset is None and cache is not None
+                and (cache.is_cheap(file1_path) or cache.is_cheap(file2_path))
+                and cache.same_content(file1_path, file2_path)):
+            self.logger.debug("Files identical according to digests")
+            return True, []
+
+        window = max(self.chunk_size, self.WINDOW_SIZE)
+        limit = None if end_offset is None else end_offset - start_offset
+        try:
+            with self.open_file(file1_path, 'rb') as f1, self.open_file(file2_path, 'rb') as f2:
+                if start_offset:
                     f1.seek(start_offset)
                     f2.seek(start_offset)
-                
-                # Calculate bytes to read if end_offset is specified
-                bytes_to_read = None
-                if end_offset is not None:
-                    if end_offset <= start_offset:
-                        raise ValueError("End offset must be greater than start offset")
-                    bytes_to_read = end_offset - start_offset
-                
-                chunk_size = self.chunk_size
-                current_offset = start_offset
-                bytes_read_total = 0
-                
+                differences = []
+                offset = start_offset
+                tail1 = tail2 = ahead1 = ahead2 = b''
                 while True:
-                    # Determine how many bytes to read in this chunk
-                    if bytes_to_read is not None:
-                        remaining = bytes_to_read - bytes_read_total
-                        if remaining <= 0:
-                            break
-                        read_size = min(chunk_size, remaining)
-                    else:
-                        read_size = chunk_size
-                    
-                    # Read chunks from both files
-                    chunk1 = f1.read(read_size)
-                    chunk2 = f2.read(read_size)
-                    
-                    # If both files are exhausted, we're done
-                    if not chunk1 and not chunk2:
-                        break
-                    
-                    # If one file ends before the other, that's a difference
-                    if len(chunk1) != len(chunk2):
-                        differences.append(Difference(
-                            position=f"byte {current_offset}",
-                            expected=f"{len(chunk1)} bytes in chunk",
-                            actual=f"{len(chunk2)} bytes in chunk",
-                            diff_type="content"
-                        ))
-                        break
-                    
-                    # Compare chunks byte by byte
-                    if chunk1 != chunk2:
-                        # Find the exact byte position where the difference starts
-                        for i in range(len(chunk1)):
-                            if chunk1[i] != chunk2[i]:
-                                abs_pos = current_offset + i
-                                
-                                # Show a few bytes before and after the difference for context
-                                context_size = 8
-                                context_start = max(0, i - context_size)
-                                context_end = min(len(chunk1), i + context_size)
-                                
-                                # Get context bytes (may need to read previous chunk)
-                                context1 = chunk1[context_start:context_end]
-                                context2 = chunk2[context_start:context_end]
-                                
-                                expected_hex = ' '.join(f"{b:02x}" for b in context1)
-                                actual_hex = ' '.join(f"{b:02x}" for b in context2)
-                                
+                    size = window if limit is None else min(window, start_offset + limit - offset)
+                    block1 = ahead1 + f1.read(size - len(ahead1)) if size > 0 else b''
+                    block2 = ahead2 + f2.read(size - len(ahead2)) if size > 0 else b''
+                    ahead1 = ahead2 = b''
+                    if len(block1) == len(block2) == size:
+                        extra = self.CONTEXT_SIZE if limit is None else min(
+                            self.CONTEXT_SIZE, start_offset + limit - offset - size)
+                        if extra > 0:
+                            ahead1 = f1.read(extra)
+                            ahead2 = f2.read(extra)
+                    common = min(len(block1), len(block2))
+                    if block1[:common] != block2[:common]:
+                        count = min(len(ahead1), len(ahead2))
+                        data1 = np.frombuffer(tail1 + block1[:common] + ahead1[:count], dtype=np.uint8)
+                        data2 = np.frombuffer(tail2 + block2[:common] + ahead2[:count], dtype=np.uint8)
+                        for pos in self._iter_difference_runs(data1, data2, len(tail1), len(tail1) + common):
+                            if len(differences) == self.max_differences:
                                 differences.append(Difference(
-                                    position=f"byte {abs_pos}",
-                                    expected=expected_hex,
-                                    actual=actual_hex,
-                                    diff_type="content"
+                                    position=None,
+                                    expected=None,
+                                    actual=None,
+                                    diff_type="more differences not shown"
                                 ))
-                                
-                                # Stop after finding first difference in chunk
-                                # or if we've reached max differences
-                                if len(differences) >= max_differences:
-                                    differences.append(Difference(
-                                        position=None,
-                                        expected=None,
-                                        actual=None,
-                                        diff_type="more differences not shown"
-                                    ))
-                                    return False, differences
-                                break
-                    
-                    current_offset += len(chunk1)
-                    bytes_read_total += len(chunk1)
-                    
-                    # If we didn't read a full chunk, we've reached EOF
-                    if len(chunk1) < read_size:
+                                return False, differences
+                            differences.append(self._byte_difference(data1, data2, pos, offset - len(tail1)))
+                    offset += common
+                    if len(block1) != len(block2) or not block1:
                         break
-                
-                identical = len(differences) == 0
-                return identical, differences
-                
+                    tail1 = block1[-self.CONTEXT_SIZE:]
+                    tail2 = block2[-self.CONTEXT_SIZE:]
+
+                if len(block1) != len(block2):
+                    rest = None if limit is None else start_offset + limit - offset
+                    length1 = offset - start_offset + self._count_bytes(f1, block1[common:], rest)
+                    length2 = offset - start_offset + self._count_bytes(f2, block2[common:], rest)
+                    differences.append(Difference(
+                        position=f"byte {offset}",
+                        expected=f"{length1} bytes",
+                        actual=f"{length2} bytes",
+                        diff_type="size"
+                    ))
+                return not differences, differences
+
         except FileNotFoundError as e:
             raise ValueError(f"File not found: {e}")
-        except IOError as e:
+        except READ_ERRORS as e:
             raise ValueError(f"Error reading file: {str(e)}")
 
+    def _count_bytes(self, f, pending, limit):
+        """
+        @brief Count the bytes left in a stream
+        @param f file: Stream opened in binary mode
+        @param pending bytes: Bytes already read from the stream but not counted
+        @param limit int: Maximum number of bytes to count (None for no limit)
+        @return int: Number of bytes up to the end of the stream or the limit
+        """
+        count = len(pending)
+        window = max(self.chunk_size, self.WINDOW_SIZE)
+        while limit is None or count < limit:
+            block = f.read(window if limit is None else min(window, limit - count))
+            if not block:
+                break
+            count += len(block)
+        return count if limit is None else min(count, limit)
+
+    def _digest_spans(self, file1_path, file2_path):
+        """
+        @brief Use cached block digests to find the byte spans that can differ
+        @param file1_path Path: Path to the first binary file
+        @param file2_path Path: Path to the second binary file (same size)
+        @return list: (start, stop) spans of differing blocks ([] if the files are
+                      identical), or None when digests are not worth computing
+        @details Digests are only used when at least one file is cached or stable
+                 (a baseline); hashing two fresh files would cost more than
+                 comparing them directly. The other file is then read once to
+                 hash it, and only blocks whose digests differ are compared.
+        """
+        cache = self.digest_cache
+        if cache is None or not (cache.is_cheap(file1_path) or cache.is_cheap(file2_path)):
+            return None
+        digest1 = cache.get(file1_path)
+        digest2 = cache.get(file2_path)
+        if digest1.size != digest2.size:
+            return None  # Changed while hashing; compare the mapped content instead
+        if digest1.digest == digest2.digest:
+            self.logger.debug("Files identical according to block digests")
+            return []
+        return digest1.differing_blocks(digest2)
+
+    @staticmethod
+    def _range_length(f, start_offset, end_offset):
+        """
+        @brief Get the number of bytes of an open file within a byte range
+        @param f file: File opened in binary mode
+        @param start_offset int: Starting byte offset
+        @param end_offset int: Ending byte offset (None for end of file)
+        @return int: Number of bytes available in the range
+        """
+        size = os.fstat(f.fileno()).st_size
+        if end_offset is not None:
+            size = min(size, end_offset)
+        return max(0, size - start_offset)
+
+    @staticmethod
+    @contextmanager
+    def _mapped(f):
+        """
+        @brief Memory-map an open file read-only
+        @param f file: Non-empty file opened in binary mode
+        @return mmap.mmap: Read-only mapping of the whole file
+        """
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapping
+        finally:
+            try:
+                mapping.close()
+            except BufferError:
+                # Views are still referenced by an exception traceback; the
+                # mapping is released together with them
+                pass
+
+    def _iter_difference_runs(self, data1, data2, start=0, stop=None, cancelled=None):
+        """
+        @brief Find the start offsets of runs of differing bytes
+        @param data1 np.ndarray: First byte array (uint8)
+        @param data2 np.ndarray: Second byte array of the same length
+        @param start int: First offset to scan
+        @param stop int: Offset to stop scanning at (None for the end of the arrays)
+        @param cancelled callable: Polled once per window; scanning stops when it returns True
+        @return generator: Offsets (relative to the arrays) where a run of differing bytes starts
+        @details Arrays are compared window by window into a reused mask buffer. Equal
+                 windows cost a single vectorized comparison; runs spanning a window
+                 boundary (or starting before ``start``) are not reported again.
+        """
+        stop = len(data1) if stop is None else stop
+        window = max(self.chunk_size, self.WINDOW_SIZE)
+        mask = np.empty(max(0, min(window, stop - start)), dtype=bool)
+        in_run = start > 0 and data1[start - 1] != data2[start - 1]
+        for offset in range(start, stop, window):
+            if cancelled is not None and cancelled():
+                return
+            end = min(offset + window, stop)
+            neq = mask[:end - offset]
+            np.not_equal(data1[offset:end], data2[offset:end], out=neq)
+            if not neq.any():
+                in_run = False
+                continue
+            if neq[0] and not in_run:
+                yield offset
+            for run_start in np.flatnonzero(neq[1:] & ~neq[:-1]):
+                yield offset + int(run_start) + 1
+            in_run = bool(neq[-1])
+
+    def _find_runs(self, data1, data2, limit, spans=None):
+        """
+        @brief Get the first run offsets of two byte arrays in offset order
+        @param data1 np.ndarray: First byte array (uint8)
+        @param data2 np.ndarray: Second byte array of the same length
+        @param limit int: Maximum number of offsets to return
+        @param spans list: Ascending (start, stop) spans to scan (None for everything)
+        @return list: Up to ``limit`` run start offsets, ascending
+        @details Large inputs are split into byte ranges compared by num_threads
+                 workers; NumPy releases the GIL, so ranges of memory-mapped files
+                 are read and compared concurrently. Once the completed leading
+                 ranges hold ``limit`` runs, later ranges are cancelled or stop at
+                 their next window, and results are merged in range order so the
+                 output matches a sequential scan.
+        """
+        length = len(data1)
+        if spans is None:
+            spans = [(0, length)]
+        total = sum(stop - start for start, stop in spans)
+        if self.num_threads <= 1 or total < self.PARALLEL_THRESHOLD:
+            runs = []
+            for start, stop in spans:
+                for pos in self._iter_difference_runs(data1, data2, start, stop):
+                    runs.append(pos)
+                    if len(runs) >= limit:
+                        return runs
+            return runs
+
+        # Several ranges per thread keep the workers balanced and allow early stopping
+        window = max(self.chunk_size, self.WINDOW_SIZE)
+        range_size = -(-total // (self.num_threads * 4))
+        range_size = max(window, -(-range_size // window) * window)
+        bounds = [(s, min(s + range_size, stop)) for start, stop in spans for s in range(start, stop, range_size)]
+        cutoff = [length]  # Ranges starting at or after this offset are no longer needed
+
+        def scan(start, stop):
+            runs = []
+            for pos in self._iter_difference_runs(data1, data2, start, stop, lambda: start >= cutoff[0]):
+                runs.append(pos)
+                if len(runs) >= limit:
+                    break
+            return runs
+
+        results = [None] * len(bounds)
+        with ThreadPoolExecutor(max_workers=self.num_threads) as pool:
+            futures = {pool.submit(scan, s, e): i for i, (s, e) in enumerate(bounds)}
+            done, found = 0, 0
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                while done < len(bounds) and results[done] is not None:
+                    found += len(results[done])
+                    done += 1
+                    if found >= limit:
+                        break
+                if found >= limit or done == len(bounds):
+                    cutoff[0] = bounds[done - 1][1]
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        return [pos for runs in results[:done] for pos in runs][:limit]
+
+    def _collect_differences(self, data1, data2, base_offset=0, spans=None):
+        """
+        @brief Report differing byte runs with hex context
+        @param data1 np.ndarray: First byte array (uint8)
+        @param data2 np.ndarray: Second byte array of the same length
+        @param base_offset int: File offset of the first array element
+        @param spans list: Ascending (start, stop) spans that can differ (None for everything)
+        @return list: Up to max_differences content differences, followed by a
+                      "more differences not shown" marker when more runs exist
+        @details Context bytes are taken from the full arrays, so runs near a window
+                 or range boundary still show the bytes on both sides.
+        """
+        differences = []
+        runs = self._find_runs(data1, data2, self.max_differences + 1, spans)
+        for pos in runs[:self.max_differences]:
+            differences.append(self._byte_difference(data1, data2, pos, base_offset))
+        if len(runs) > self.max_differences:
+            differences.append(Difference(
+                position=None,
+                expected=None,
+                actual=None,
+                diff_type="more differences not shown"
+            ))
+        return differences
+
+    def _byte_difference(self, data1, data2, pos, base_offset=0):
+        """
+        @brief Describe one run of differing bytes
+        @param data1 np.ndarray: First byte array (uint8)
+        @param data2 np.ndarray: Second byte array of the same length
+        @param pos int: Array offset where the run starts
+        @param base_offset int: File offset of the first array element
+        @return Difference: Content difference with the bytes around the run in hex
+        """
+        # Show a few bytes before and after the difference for context
+        start_ctx = max(0, pos - self.CONTEXT_SIZE)
+        end_ctx = min(len(data1), pos + self.CONTEXT_SIZE)
+        return Difference(
+            position=f"byte {base_offset + pos}",
+            expected=' '.join(f"{b:02x}" for b in data1[start_ctx:end_ctx].tobytes()),
+            actual=' '.join(f"{b:02x}" for b in data2[start_ctx:end_ctx].tobytes()),
+            diff_type="content"
+        )
+
     def get_file_hash(self, file_path, chunk_size=8192):
         """
         @brief Calculate SHA-256 hash of a file efficiently
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file compression.py
+@brief Detection and on-the-fly decompression of gzip, bzip2, xz and zstd files
+@author Xiaotong Wang
+@date 2025
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+
+# Leading bytes of each supported format
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+_MAGIC_LENGTH = max(len(magic) for magic, _ in _MAGIC)
+# File name suffixes of compressed files, stripped to detect the content type
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+# File types whose comparators read through open_file; other types (h5, npy) need
+# random access, so their compressed files are compared as binary
+DECOMPRESSED_TYPES = frozenset(("text", "csv", "json", "jsonl", "xml"))
+# Errors raised by the standard library decompressors for corrupt or truncated data
+READ_ERRORS = (OSError, EOFError, lzma.LZMAError)
+
+
+class _ForwardSeekReader(io.BufferedReader):
+    """
+    @brief Buffered reader over a stream that can only move forward
+    @details zstandard's stream reader reports seekable() False, so BufferedReader
+             refuses every seek. Forward seeks are emulated here by reading and
+             discarding data, as gzip, bz2 and lzma do.
+    """
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """
+        @brief Move forward in the decompressed data
+        @param offset int: Target position (SEEK_SET) or distance (SEEK_CUR)
+        @param whence int: io.SEEK_SET or io.SEEK_CUR
+        @return int: The new position
+        @throws io.UnsupportedOperation: For backward seeks or seeks from the end
+        """
+        position = self.tell()
+        if whence == io.SEEK_CUR:
+            offset += position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Seeking from the end of a zstd stream is not supported")
+        if offset < position:
+            raise io.UnsupportedOperation("Backward seeks in a zstd stream are not supported")
+        remaining = offset - position
+        while remaining:
+            chunk = self.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        return self.tell()
+
+
+def detect_compression(file_path):
+    """
+    @brief Detect the compression format of a file from its leading bytes
+    @param file_path str or Path: File to inspect
+    @return str: "gzip", "bz2", "xz" or "zstd", or None for an uncompressed file
+    @throws OSError: If the file cannot be read
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(_MAGIC_LENGTH)
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def strip_compression_suffix(file_path):
+    """
+    @brief Remove a compression suffix from a file name
+    @param file_path str: File name or path
+    @return str: The name without ".gz", ".bz2", ".xz" or ".zst" ("out.json.gz" -> "out.json")
+    """
+    lowered = str(file_path).lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if lowered.endswith(suffix):
+            return str(file_path)[:-len(suffix)]
+    return str(file_path)
+
+
+def open_decompressed(file_path, compression, mode='rb', encoding=None):
+    """
+    @brief Open a compressed file for reading its decompressed content
+    @param file_path str or Path: Compressed file
+    @param compression str: Format returned by detect_compression
+    @param mode str: 'rb' for bytes, 'r' for text
+    @param encoding str: Text encoding (text mode only)
+    @return file: Readable stream decompressing on the fly; forward seeks are
+                  supported by reading and discarding data
+    @throws ValueError: If zstd support is needed but the zstandard package is missing
+    """
+    if compression == "gzip":
+        stream = gzip.open(file_path, 'rb')
+    elif compression == "bz2":
+        stream = bz2.open(file_path, 'rb')
+    elif compression == "xz":
+        stream = lzma.open(file_path, 'rb')
+    elif compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(f"Reading zstd-compressed file {file_path} requires the zstandard package "
+                             "(pip install cli-test-framework[zstd])")
+        raw = open(file_path, 'rb')
+        stream = _ForwardSeekReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    else:
+        raise ValueError(f"Unsupported compression format: {compression}")
+    if 'b' in mode:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding)
@@ -9,9 +9,15 @@
 """
 
 import csv
-import io
-import math
+import heapq
+import os
+import pickle
+import tempfile
+from itertools import chain, islice
+from operator import itemgetter
+import numpy as np
 from .text_comparator import TextComparator
+from .numeric_kernel import ToleranceKernel
 from .result import Difference
 
 class CsvComparator(TextComparator):
@@ -21,11 +27,17 @@ class CsvComparator(TextComparator):
              capabilities, including:
              - Row count comparison
              - Column count comparison
-             - Cell value comparison
+             - Cell value comparison, vectorized per column for numeric columns
              - Configurable delimiter and quote character
+             compare_files parses both files lazily and compares them block by
+             block in lockstep, so memory use does not grow with the file size.
+             With ``key_columns``, rows are matched by key instead of position.
     """
+    # Number of rows compared column by column at a time
+    ROW_BLOCK = 8192
     
-    def __init__(self, encoding="utf-8", delimiter=",", quotechar='"', chunk_size=8192, verbose=False, rtol=1e-5, atol=1e-8, **kwargs):
+    def __init__(self, encoding="utf-8", delimiter=",", quotechar='"', chunk_size=8192, verbose=False, rtol=1e-5, atol=1e-8,
+                 key_columns=None, max_rows_in_memory=1000000, **kwargs):
         """
         @brief Initialize CSV comparator with configuration
         @param encoding str: File encoding (default: utf-8)
@@ -35,6 +47,11 @@ class CsvComparator(TextComparator):
         @param verbose bool: Enable verbose output
         @param rtol float: Relative tolerance for numerical comparison (default: 1e-5)
         @param atol float: Absolute tolerance for numerical comparison (default: 1e-8)
+        @param key_columns str or list: Column name(s) from the header row, or 0-based
+                                        column indices, identifying rows; rows are then
+                                        matched by key regardless of their order
+        @param max_rows_in_memory int: Rows indexed in memory for key matching; larger
+                                       files are sort-merged through temporary files
         @param **kwargs: Additional parameters (ignored)
         """
         super().__init__(encoding=encoding, chunk_size=chunk_size, verbose=verbose, **kwargs)
@@ -42,6 +59,12 @@ class CsvComparator(TextComparator):
         self.quotechar = quotechar
         self.rtol = rtol
         self.atol = atol
+        if isinstance(key_columns, str):
+            key_columns = [column.strip() for column in key_columns.split(',')]
+        self.key_columns = list(key_columns) if key_columns else None
+        self.max_rows_in_memory = max(1, int(max_rows_in_memory))
+        # math.isclose semantics, as used for single cells before vectorization
+        self.kernel = ToleranceKernel(rtol=rtol, atol=atol, equal_nan=False, symmetric=True)
     
     def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
         """
@@ -55,30 +78,103 @@ class CsvComparator(TextComparator):
         @details Reads CSV content and parses it into a structured format,
                  supporting line and column range selection
         """
-        # First read the file as text
-        text_content = super().read_content(file_path, start_line, end_line, start_column, end_column)
-        
-        # Join the lines to create a CSV string
-        csv_text = ''.join(text_content)
-        
-        # Parse the CSV
-        csv_data = []
-        csv_reader = csv.reader(
-            io.StringIO(csv_text), 
-            delimiter=self.delimiter,
-            quotechar=self.quotechar
-        )
-        
-        for row in csv_reader:
-            # Apply column range if specified
+        return list(self._iter_rows(file_path, start_line, end_line, start_column, end_column))
+
+    def _iter_rows(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Lazily parse CSV rows within the specified range
+        @param file_path Path: Path to the CSV file
+        @param start_line int: Starting line number
+        @param end_line int: Ending line number
+        @param start_column int: Starting column (field) number
+        @param end_column int: Ending column (field) number
+        @return generator: Rows as lists of cell values
+        @details csv.reader is fed directly from the lazily read lines of the file,
+                 so no copy of the file content is built. The column range selects
+                 fields of each row.
+        """
+        lines = self._iter_lines(file_path, start_line, end_line)
+        try:
+            csv_reader = csv.reader(lines, delimiter=self.delimiter, quotechar=self.quotechar)
             if start_column > 0 or end_column is not None:
-                col_start = start_column
-                col_end = end_column if end_column is not None else len(row)
-                row = row[col_start:col_end+1]
-            csv_data.append(row)
-            
-        return csv_data
-    
+                col_end = None if end_column is None else end_column + 1
+                for row in csv_reader:
+                    yield row[start_column:col_end]
+            else:
+                yield from csv_reader
+        finally:
+            lines.close()
+
+    def _streams(self, file1, file2):
+        """
+        @brief Check whether compare_files may use the streaming path
+        @param file1 Path: Path to the first file
+        @param file2 Path: Path to the second file
+        @return bool: True unless a subclass replaced read_content or compare_content
+        """
+        return (type(self).read_content is CsvComparator.read_content
+                and type(self).compare_content is CsvComparator.compare_content)
+
+    def _iter_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Lazily read the rows compared by the streaming path
+        @param file_path Path: Path to the CSV file
+        @param start_line int: Starting line number
+        @param end_line int: Ending line number
+        @param start_column int: Starting column number
+        @param end_column int: Ending column number
+        @return generator: The file's rows (see _iter_rows)
+        """
+        return self._iter_rows(file_path, start_line, end_line, start_column, end_column)
+
+    def _compare_iterables(self, items1, items2):
+        """
+        @brief Compare the rows of two CSV files in lockstep while they are read
+        @param items1 iterator: Rows of the first file
+        @param items2 iterator: Rows of the second file
+        @return tuple: (bool, list) - (identical, differences)
+        """
+        if self.key_columns:
+            return self._compare_rows_by_key(items1, items2)
+        return self._compare_rows(items1, items2)
+
+    def _parse_pair(self, cell1, cell2):
+        """
+        @brief Parse two cells as numbers for tolerance comparison
+        @param cell1 str: Expected cell value
+        @param cell2 str: Actual cell value
+        @return tuple: (float, float), or (None, None) if either cell is not numeric
+        """
+        try:
+            return float(cell1), float(cell2)
+        except (ValueError, TypeError):
+            return None, None
+
+    def _flush_pending(self, pending, differences, max_diffs):
+        """
+        @brief Resolve a batch of candidate differences and record the real ones
+        @param pending list: (Difference, num1, num2) tuples in report order; num1/num2 are
+                             None for differences that are not numeric cells
+        @param differences list: List receiving the confirmed differences
+        @param max_diffs int: Maximum number of differences to report
+        @details Numeric candidates are checked together with the tolerance kernel;
+                 those within tolerance are dropped.
+        """
+        numeric = [k for k, (_, num1, _) in enumerate(pending) if num1 is not None]
+        within = set()
+        if numeric:
+            expected = np.fromiter((pending[k][1] for k in numeric), dtype=np.float64, count=len(numeric))
+            actual = np.fromiter((pending[k][2] for k in numeric), dtype=np.float64, count=len(numeric))
+            ok = self.kernel.within(expected, actual)
+            within = {numeric[k] for k in np.flatnonzero(ok)}
+
+        for k, (diff, _, _) in enumerate(pending):
+            if k in within:
+                continue  # Within tolerance, treat as equal
+            differences.append(diff)
+            if len(differences) >= max_diffs:
+                return
+
     def compare_content(self, content1, content2):
         """
         @brief Compare CSV content structurally
@@ -93,55 +189,52 @@ class CsvComparator(TextComparator):
         """
         if content1 == content2:
             return True, []
-            
+        if self.key_columns:
+            return self._compare_rows_by_key(content1, content2)
+        return self._compare_rows(content1, content2)
+
+    def _compare_rows(self, rows1, rows2):
+        """
+        @brief Compare two row sequences block by block
+        @param rows1 iterable: Expected rows (lists of cell values)
+        @param rows2 iterable: Actual rows
+        @return tuple: (bool, list) - (identical, differences)
+        @details Rows are taken ROW_BLOCK at a time from both inputs and compared
+                 column by column (see _compare_block). Once max_differences are
+                 found, the remaining rows are only counted for the row count check.
+        """
+        max_diffs = self.max_differences
         differences = []
-        
+        kinds = {}
+        rows1 = iter(rows1)
+        rows2 = iter(rows2)
+        count1 = count2 = 0
+
+        while len(differences) < max_diffs:
+            block1 = list(islice(rows1, self.ROW_BLOCK))
+            block2 = list(islice(rows2, self.ROW_BLOCK))
+            count1 += len(block1)
+            count2 += len(block2)
+            if not block1 or not block2:
+                break
+            first_row = count1 - len(block1)
+            self._compare_block(block1, block2, lambda offset: f"row {first_row + offset + 1}",
+                                kinds, differences, max_diffs)
+            if len(block1) != len(block2):
+                break
+        count1 += sum(1 for _ in rows1)
+        count2 += sum(1 for _ in rows2)
+
         # Check row count
-        if len(content1) != len(content2):
-            differences.append(Difference(
+        if count1 != count2:
+            differences.insert(0, Difference(
                 position="row count",
-                expected=f"{len(content1)} rows",
-                actual=f"{len(content2)} rows",
+                expected=f"{count1} rows",
+                actual=f"{count2} rows",
                 diff_type="row_count_mismatch"
             ))
-        
-        # Compare rows
-        max_diffs = 10
-        for i, (row1, row2) in enumerate(zip(content1, content2)):
-            # Check column count in this row
-            if len(row1) != len(row2):
-                differences.append(Difference(
-                    position=f"row {i+1}",
-                    expected=f"{len(row1)} columns",
-                    actual=f"{len(row2)} columns",
-                    diff_type="column_count_mismatch"
-                ))
-                if len(differences) >= max_diffs:
-                    break
-            
-            # Compare column values
-            for j, (cell1, cell2) in enumerate(zip(row1, row2)):
-                if cell1 != cell2:
-                    # Try numeric tolerance comparison
-                    try:
-                        num1 = float(cell1)
-                        num2 = float(cell2)
-                        if math.isclose(num1, num2, rel_tol=self.rtol, abs_tol=self.atol):
-                            continue  # Within tolerance, treat as equal
-                    except (ValueError, TypeError):
-                        pass  # Non-numeric, fall through to string mismatch
-                    differences.append(Difference(
-                        position=f"row {i+1}, column {j+1}",
-                        expected=cell1,
-                        actual=cell2,
-                        diff_type="cell_mismatch"
-                    ))
-                    if len(differences) >= max_diffs:
-                        break
-            
-            if len(differences) >= max_diffs:
-                break
-        
+            del differences[max_diffs:]
+
         # Add a summary if there are more differences
         if len(differences) >= max_diffs:
             differences.append(Difference(
@@ -150,7 +243,385 @@ class CsvComparator(TextComparator):
                 actual=None,
                 diff_type=f"more differences not shown"
             ))
-        
+
         if not differences:
             return True, []
-        return False, differences
\ No newline at end of file
+        return False, differences
+
+    def _compare_rows_by_key(self, rows1, rows2):
+        """
+        @brief Compare two row sequences, matching rows by their key columns
+        @param rows1 iterable: Expected rows (lists of cell values)
+        @param rows2 iterable: Actual rows
+        @return tuple: (bool, list) - (identical, differences)
+        @details When key columns are given by name, the first row of each input is
+                 its header: the headers are compared as row 1 and each input's key
+                 indices are looked up in its own header. The expected rows are then
+                 indexed by key in a dict and the actual rows streamed against it. If
+                 the expected rows exceed max_rows_in_memory, both inputs are sorted
+                 by key through temporary files and merge-joined instead. Missing,
+                 extra and duplicate keys are reported; matched rows are compared
+                 cell by cell like positional rows.
+        """
+        max_diffs = self.max_differences
+        differences = []
+        kinds = {}
+        rows1 = enumerate(rows1, 1)
+        rows2 = enumerate(rows2, 1)
+
+        if all(isinstance(column, int) for column in self.key_columns):
+            indices1 = indices2 = self.key_columns
+        else:
+            (_, header1), (_, header2) = next(rows1, (0, [])), next(rows2, (0, []))
+            indices1 = self._key_indices(header1)
+            indices2 = self._key_indices(header2)
+            if header1 != header2:
+                self._compare_block([header1], [header2], lambda offset: "row 1", {}, differences, max_diffs)
+        keyed1 = self._keyed(rows1, indices1)
+        keyed2 = self._keyed(rows2, indices2)
+
+        index = {}
+        duplicates = []
+        for key, number, row in keyed1:
+            if key in index:
+                duplicates.append((key, number, row))
+            else:
+                index[key] = (number, row)
+            if len(index) + len(duplicates) > self.max_rows_in_memory:
+                # Too many rows to index: sort both inputs by key on disk instead
+                head = [(key, number, row) for key, (number, row) in index.items()] + duplicates
+                index = duplicates = None
+                with tempfile.TemporaryDirectory(prefix="csv_compare_") as directory:
+                    self._merge_join(self._external_sort(chain(head, keyed1), directory),
+                                     self._external_sort(keyed2, directory),
+                                     kinds, differences, max_diffs)
+                break
+        else:
+            self._hash_join(index, duplicates, keyed2, kinds, differences, max_diffs)
+
+        if len(differences) >= max_diffs:
+            del differences[max_diffs:]
+            differences.append(Difference(
+                position=None,
+                expected=None,
+                actual=None,
+                diff_type=f"more differences not shown"
+            ))
+
+        if not differences:
+            return True, []
+        return False, differences
+
+    def _key_indices(self, header):
+        """
+        @brief Resolve the key columns against a header row
+        @param header list: Header row of one input
+        @return list: 0-based column indices of the key columns
+        @throws ValueError: If a named key column is not in the header
+        """
+        indices = []
+        for column in self.key_columns:
+            if isinstance(column, int):
+                indices.append(column)
+            elif column in header:
+                indices.append(header.index(column))
+            else:
+                raise ValueError(f"Key column '{column}' not found in CSV header {header}")
+        return indices
+
+    @staticmethod
+    def _keyed(rows, indices):
+        """
+        @brief Attach keys to numbered rows
+        @param rows iterator: (row number, row) pairs
+        @param indices list: Column indices of the key
+        @return generator: (key, number, row) records; the key is the cell value for a
+                           single key column, else a tuple, with "" for missing cells
+        """
+        getter = itemgetter(*indices)
+        for number, row in rows:
+            try:
+                key = getter(row)
+            except IndexError:
+                key = tuple(row[i] if i < len(row) else "" for i in indices)
+                if len(indices) == 1:
+                    key = key[0]
+            yield key, number, row
+
+    def _key_label(self, key, number):
+        """
+        @brief Format the position of a keyed row
+        @param key str or tuple: Key value(s) of the row
+        @param number int: 1-based row number within its input
+        @return str: Position label, e.g. "row 5 (key: id=3)"
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        key_str = ".".join(f"{k}={v}" for k, v in zip(self.key_columns, key))
+        return f"row {number} (key: {key_str})"
+
+    def _hash_join(self, index, duplicates, keyed2, kinds, differences, max_diffs):
+        """
+        @brief Match streamed actual rows against an in-memory index of expected rows
+        @param index dict: Key -> (row number, row) of the expected rows (see _keyed)
+        @param duplicates list: (key, number, row) of expected rows repeating a key
+        @param keyed2 iterator: (key, number, row) of the actual rows
+        @param kinds dict: Column kinds shared with _compare_block
+        @param differences list: List receiving the differences
+        @param max_diffs int: Maximum number of differences to report
+        @details Matched index entries are replaced by None, so keys seen again in the
+                 actual rows are reported as duplicates without extra memory.
+        """
+        matches = []
+        for key, number, row in duplicates:
+            self._report_keyed(matches, kinds, differences, max_diffs, Difference(
+                position=self._key_label(key, number),
+                expected=self.delimiter.join(row),
+                actual=None,
+                diff_type="duplicate_key"
+            ))
+        for key, number, row in keyed2:
+            if len(differences) >= max_diffs:
+                return
+            if key not in index:
+                self._report_keyed(matches, kinds, differences, max_diffs, Difference(
+                    position=self._key_label(key, number),
+                    expected=None,
+                    actual=self.delimiter.join(row),
+                    diff_type="extra_row"
+                ))
+                continue
+            entry = index[key]
+            if entry is None:
+                self._report_keyed(matches, kinds, differences, max_diffs, Difference(
+                    position=self._key_label(key, number),
+                    expected=None,
+                    actual=self.delimiter.join(row),
+                    diff_type="duplicate_key"
+                ))
+                continue
+            index[key] = None
+            if entry[1] != row:
+                matches.append((self._key_label(key, number), entry[1], row))
+                if len(matches) >= self.ROW_BLOCK:
+                    self._flush_matches(matches, kinds, differences, max_diffs)
+        self._flush_matches(matches, kinds, differences, max_diffs)
+
+        for key, entry in index.items():
+            if len(differences) >= max_diffs:
+                return
+            if entry is not None:
+                differences.append(Difference(
+                    position=self._key_label(key, entry[0]),
+                    expected=self.delimiter.join(entry[1]),
+                    actual=None,
+                    diff_type="missing_row"
+                ))
+
+    def _merge_join(self, sorted1, sorted2, kinds, differences, max_diffs):
+        """
+        @brief Match two key-sorted row streams
+        @param sorted1 iterator: (key, number, row) of the expected rows, sorted by key
+        @param sorted2 iterator: (key, number, row) of the actual rows, sorted by key
+        @param kinds dict: Column kinds shared with _compare_block
+        @param differences list: List receiving the differences, in key order
+        @param max_diffs int: Maximum number of differences to report
+        """
+        matches = []
+        last1 = last2 = None
+        a = next(sorted1, None)
+        b = next(sorted2, None)
+        while (a is not None or b is not None) and len(differences) < max_diffs:
+            if a is not None and a[0] == last1:
+                diff = Difference(self._key_label(a[0], a[1]), self.delimiter.join(a[2]), None, "duplicate_key")
+                a = next(sorted1, None)
+            elif b is not None and b[0] == last2:
+                diff = Difference(self._key_label(b[0], b[1]), None, self.delimiter.join(b[2]), "duplicate_key")
+                b = next(sorted2, None)
+            elif b is None or (a is not None and a[0] < b[0]):
+                diff = Difference(self._key_label(a[0], a[1]), self.delimiter.join(a[2]), None, "missing_row")
+                last1 = a[0]
+                a = next(sorted1, None)
+            elif a is None or b[0] < a[0]:
+                diff = Difference(self._key_label(b[0], b[1]), None, self.delimiter.join(b[2]), "extra_row")
+                last2 = b[0]
+                b = next(sorted2, None)
+            else:
+                if a[2] != b[2]:
+                    matches.append((self._key_label(b[0], b[1]), a[2], b[2]))
+                    if len(matches) >= self.ROW_BLOCK:
+                        self._flush_matches(matches, kinds, differences, max_diffs)
+                last1 = a[0]
+                last2 = b[0]
+                a = next(sorted1, None)
+                b = next(sorted2, None)
+                continue
+            self._report_keyed(matches, kinds, differences, max_diffs, diff)
+        self._flush_matches(matches, kinds, differences, max_diffs)
+
+    def _report_keyed(self, matches, kinds, differences, max_diffs, diff):
+        """
+        @brief Record a key-level difference after the pending matched rows
+        @param matches list: Pending (label, row1, row2) matches, flushed first to keep order
+        @param kinds dict: Column kinds shared with _compare_block
+        @param differences list: List receiving the differences
+        @param max_diffs int: Maximum number of differences to report
+        @param diff Difference: The missing, extra or duplicate row
+        """
+        self._flush_matches(matches, kinds, differences, max_diffs)
+        if len(differences) < max_diffs:
+            differences.append(diff)
+
+    def _flush_matches(self, matches, kinds, differences, max_diffs):
+        """
+        @brief Compare pending pairs of rows matched by key
+        @param matches list: (label, row1, row2) tuples; emptied
+        @param kinds dict: Column kinds shared with _compare_block
+        @param differences list: List receiving the differences
+        @param max_diffs int: Maximum number of differences to report
+        """
+        if not matches or len(differences) >= max_diffs:
+            matches.clear()
+            return
+        labels, block1, block2 = zip(*matches)
+        self._compare_block(list(block1), list(block2), labels.__getitem__, kinds, differences, max_diffs)
+        matches.clear()
+
+    def _external_sort(self, keyed_rows, directory):
+        """
+        @brief Sort (key, number, row) records by key with bounded memory
+        @param keyed_rows iterable: Records to sort
+        @param directory str: Directory for the temporary sorted runs
+        @return iterator: Records in (key, number) order
+        @details Runs of max_rows_in_memory records are sorted and pickled to
+                 temporary files, then merged lazily with heapq.merge.
+        """
+        runs = []
+        chunk = []
+        for record in keyed_rows:
+            chunk.append(record)
+            if len(chunk) >= self.max_rows_in_memory:
+                runs.append(self._write_run(chunk, directory))
+                chunk = []
+        if not runs:
+            chunk.sort(key=itemgetter(0, 1))
+            return iter(chunk)
+        if chunk:
+            runs.append(self._write_run(chunk, directory))
+        return heapq.merge(*(self._read_run(path) for path in runs), key=itemgetter(0, 1))
+
+    @staticmethod
+    def _write_run(records, directory):
+        """
+        @brief Sort records and write them to a temporary run file
+        @param records list: (key, number, row) records; sorted in place
+        @param directory str: Directory for the run file
+        @return str: Path of the run file
+        """
+        records.sort(key=itemgetter(0, 1))
+        fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            for start in range(0, len(records), 1024):
+                pickle.dump(records[start:start + 1024], f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @staticmethod
+    def _read_run(path):
+        """
+        @brief Read the records of a run file lazily
+        @param path str: Path of the run file
+        @return generator: Records in stored order
+        """
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    batch = pickle.load(f)
+                except EOFError:
+                    return
+                yield from batch
+
+    def _compare_block(self, block1, block2, label, kinds, differences, max_diffs):
+        """
+        @brief Compare one block of rows column by column
+        @param block1 list: Expected rows of the block
+        @param block2 list: Actual rows of the block (paired with block1 by position)
+        @param label callable: Maps a row's offset in the block to its position label
+        @param kinds dict: Column index -> "numeric", "text" or "unknown" (one block
+                           failed to parse), inferred on first use and kept across blocks
+        @param differences list: List receiving the differences, in row/column order
+        @param max_diffs int: Maximum number of differences to report
+        @details Rows whose width matches the block's first row are transposed into
+                 columns. Equal columns are skipped with one tuple comparison. Numeric
+                 columns are parsed into float arrays and checked with the vectorized
+                 tolerance kernel; a column that fails to parse in two blocks is
+                 compared as text from then on, where cells that differ as strings are still checked
+                 for numeric tolerance in one batch. Rows of other widths are compared
+                 cell by cell.
+        """
+        width = len(block1[0])
+        regular = []
+        # (sort key, Difference, num1, num2) of every candidate difference
+        pending = []
+        for offset, (row1, row2) in enumerate(zip(block1, block2)):
+            if len(row1) == width and len(row2) == width:
+                regular.append(offset)
+                continue
+            if len(row1) != len(row2):
+                pending.append(((offset, -1), Difference(
+                    position=label(offset),
+                    expected=f"{len(row1)} columns",
+                    actual=f"{len(row2)} columns",
+                    diff_type="column_count_mismatch"
+                ), None, None))
+            for j, (cell1, cell2) in enumerate(zip(row1, row2)):
+                if cell1 != cell2:
+                    pending.append(((offset, j), Difference(
+                        position=f"{label(offset)}, column {j+1}",
+                        expected=cell1,
+                        actual=cell2,
+                        diff_type="cell_mismatch"
+                    ), *self._parse_pair(cell1, cell2)))
+
+        if regular:
+            if len(regular) == len(block1):
+                columns1 = list(zip(*block1))
+                columns2 = list(zip(*block2[:len(block1)]))
+            else:
+                columns1 = list(zip(*(block1[k] for k in regular)))
+                columns2 = list(zip(*(block2[k] for k in regular)))
+            for j, (column1, column2) in enumerate(zip(columns1, columns2)):
+                if column1 == column2:
+                    continue
+                if kinds.get(j) != "text":
+                    try:
+                        values1 = np.fromiter(map(float, column1), dtype=np.float64, count=len(column1))
+                        values2 = np.fromiter(map(float, column2), dtype=np.float64, count=len(column2))
+                    except ValueError:
+                        # One failing block may just hold a header row; a second means text
+                        kinds[j] = "text" if j in kinds else "unknown"
+                    else:
+                        kinds[j] = "numeric"
+                        for k in np.flatnonzero(np.logical_not(self.kernel.within(values1, values2))):
+                            cell1, cell2 = column1[k], column2[k]
+                            if cell1 != cell2:
+                                offset = regular[k]
+                                pending.append(((offset, j), Difference(
+                                    position=f"{label(offset)}, column {j+1}",
+                                    expected=cell1,
+                                    actual=cell2,
+                                    diff_type="cell_mismatch"
+                                ), None, None))
+                        continue
+                for k, (cell1, cell2) in enumerate(zip(column1, column2)):
+                    if cell1 != cell2:
+                        offset = regular[k]
+                        pending.append(((offset, j), Difference(
+                            position=f"{label(offset)}, column {j+1}",
+                            expected=cell1,
+                            actual=cell2,
+                            diff_type="cell_mismatch"
+                        ), *self._parse_pair(cell1, cell2)))
+
+        if pending:
+            pending.sort(key=lambda candidate: candidate[0])
+            self._flush_pending([candidate[1:] for candidate in pending], differences, max_diffs)
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file digest_cache.py
+@brief Persistent cache of whole-file and per-block digests and line indexes for baseline files
+@author Xiaotong Wang
+@date 2025
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from .line_index import LINE_INDEX_INTERVAL, LineIndex
+from .lru_cache import LruCache
+
+# Environment variable overriding the cache database path ("off" disables persistence)
+CACHE_ENV_VAR = "CLI_TEST_DIGEST_CACHE"
+# Bytes covered by each block digest
+DIGEST_BLOCK_SIZE = 1 << 20
+# Files modified more recently than this (seconds) may still be changing and are
+# hashed without being cached, since a rewrite within the same mtime tick would
+# otherwise go unnoticed
+STABLE_AGE = 2.0
+
+logger = logging.getLogger("file_comparator.DigestCache")
+
+
+class FileDigest:
+    """
+    @brief Digests of one file version
+    @details ``blocks`` holds a 16-byte BLAKE2b digest per DIGEST_BLOCK_SIZE bytes;
+             ``digest`` is the BLAKE2b digest of the concatenated block digests,
+             so equal digests mean equal content.
+    """
+
+    def __init__(self, size, block_size, blocks):
+        """
+        @brief Initialize the digests of a file
+        @param size int: File size in bytes
+        @param block_size int: Bytes covered by each block digest
+        @param blocks list: Block digests (bytes), in file order
+        """
+        self.size = size
+        self.block_size = block_size
+        self.blocks = blocks
+        self.digest = hashlib.blake2b(b''.join(blocks), digest_size=16).hexdigest()
+
+    def differing_blocks(self, other):
+        """
+        @brief Get the byte spans whose block digests differ from another file's
+        @param other FileDigest: Digests of a file of the same size and block size
+        @return list: (start, stop) byte offsets of consecutive differing blocks
+        """
+        spans = []
+        for index, (block1, block2) in enumerate(zip(self.blocks, other.blocks)):
+            if block1 == block2:
+                continue
+            start = index * self.block_size
+            stop = min(start + self.block_size, self.size)
+            if spans and spans[-1][1] == start:
+                spans[-1] = (spans[-1][0], stop)
+            else:
+                spans.append((start, stop))
+        return spans
+
+
+class DigestCache:
+    """
+    @brief Digest and line index store keyed by file identity (path, size, mtime_ns, inode)
+    @details Digests and sparse line indexes are kept in memory for the process and
+             persisted in a SQLite database, so baselines shared by many test cases
+             and runs are hashed or scanned once. Any database error disables persistence for the instance; the
+             in-memory layer keeps working.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path=None, block_size=DIGEST_BLOCK_SIZE, max_entries=10000):
+        """
+        @brief Initialize a digest cache
+        @param db_path str or Path: SQLite database path (None keeps digests in memory only)
+        @param block_size int: Bytes covered by each block digest
+        @param max_entries int: Number of files kept in memory and in the database; the
+                                least recently used (in memory) and oldest (persisted)
+                                entries are evicted
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self.block_size = block_size
+        self.max_entries = max_entries
+        self._memory = LruCache(max_entries)
+        self._line_indexes = LruCache(max_entries)
+        if self.db_path is not None:
+            self._init_db()
+
+    @classmethod
+    def shared(cls, db_path=None):
+        """
+        @brief Get the process-wide cache for a database path
+        @param db_path str or Path: Database path; None uses $CLI_TEST_DIGEST_CACHE or
+                                    the user cache directory
+        @return DigestCache: The shared instance
+        """
+        if db_path is None:
+            db_path = default_cache_path()
+        key = str(db_path) if db_path else None
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(db_path)
+            return cls._instances[key]
+
+    def get(self, file_path):
+        """
+        @brief Get the digests of a file, hashing it only if no cached entry matches
+        @param file_path str or Path: File to hash
+        @return FileDigest: Digests of the current file content
+        """
+        path, stat, key = self._identify(file_path)
+        digest = self._memory.get(key)
+        if digest is None:
+            digest = self._load(key)
+        if digest is not None:
+            return digest
+
+        digest = self.compute(path, self.block_size)
+        if self._is_stable(path, stat):
+            self._memory.put(key, digest)
+            self._store(key, digest)
+        return digest
+
+    def is_cheap(self, file_path):
+        """
+        @brief Check whether a file's digests are cached or worth caching
+        @param file_path str or Path: File to check
+        @return bool: True if the digests are already known or the file is old enough
+                      to be cached (typically a baseline rather than fresh output)
+        """
+        path, stat, key = self._identify(file_path)
+        if key in self._memory:
+            return True
+        return time.time_ns() - stat.st_mtime_ns > STABLE_AGE * 1e9 or self._load(key) is not None
+
+    def same_content(self, file1, file2):
+        """
+        @brief Check whether two files have identical content
+        @param file1 str or Path: First file
+        @param file2 str or Path: Second file
+        @return bool: True if sizes and digests match
+        """
+        if os.path.getsize(file1) != os.path.getsize(file2):
+            return False
+        return self.get(file1).digest == self.get(file2).digest
+
+    def line_index(self, file_path, line, interval=LINE_INDEX_INTERVAL):
+        """
+        @brief Get a line index of a file covering a line, scanning only what is missing
+        @param file_path str or Path: File to index
+        @param line int: Line number (0-based) the index must reach
+        @param interval int: Lines between two recorded offsets
+        @return LineIndex: The index, or None if the file cannot be indexed
+        @details Indexes of stable files are kept and persisted, and extended when a
+                 later comparison needs a line further into the file.
+        """
+        path, stat, key = self._identify(file_path)
+        index = self._line_indexes.get(key)
+        if index is None:
+            index = self._load_line_index(key, interval)
+        if index is None or index.interval != interval:
+            index = LineIndex(interval)
+        if index.covers(line):
+            return index if index.usable else None
+
+        usable = index.extend(path, line)
+        if self._is_stable(path, stat):
+            self._line_indexes.put(key, index)
+            if usable:
+                self._store_line_index(key, index)
+        return index if usable else None
+
+    @staticmethod
+    def _identify(file_path):
+        """
+        @brief Get the identity of the current version of a file
+        @param file_path str or Path: File to identify
+        @return tuple: (path, stat, key) - resolved path, os.stat result and cache key
+        """
+        path = os.path.realpath(file_path)
+        stat = os.stat(path)
+        return path, stat, (path, stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+    @staticmethod
+    def _is_stable(path, stat):
+        """
+        @brief Check whether a file is old enough and unchanged since it was examined
+        @param path str: Resolved file path
+        @param stat os.stat_result: Status taken before the file was read
+        @return bool: True if results computed from the file may be cached
+        """
+        return time.time_ns() - stat.st_mtime_ns > STABLE_AGE * 1e9 and os.stat(path).st_mtime_ns == stat.st_mtime_ns
+
+    @staticmethod
+    def compute(file_path, block_size=DIGEST_BLOCK_SIZE):
+        """
+        @brief Hash a file block by block
+        @param file_path str or Path: File to hash
+        @param block_size int: Bytes covered by each block digest
+        @return FileDigest: Digests of the file
+        """
+        blocks = []
+        size = 0
+        buffer = bytearray(block_size)
+        view = memoryview(buffer)
+        with open(file_path, 'rb') as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                size += n
+                blocks.append(hashlib.blake2b(view[:n], digest_size=16).digest())
+        return FileDigest(size, block_size, blocks)
+
+    @contextmanager
+    def _connect(self):
+        """
+        @brief Open a connection to the cache database for one transaction
+        @return sqlite3.Connection: New connection (one per operation, safe across
+                                    threads and processes), committed and closed on exit
+        """
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """
+        @brief Create the cache database and table if needed
+        """
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS digests ("
+                    "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, "
+                    "block_size INTEGER, blocks BLOB, stored_at REAL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS line_indexes ("
+                    "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, "
+                    "interval INTEGER, lines INTEGER, offsets BLOB, stored_at REAL)"
+                )
+        except (sqlite3.Error, OSError) as e:
+            self._disable(e)
+
+    def _load(self, key):
+        """
+        @brief Look up a file version in the database
+        @param key tuple: (path, size, mtime_ns, inode)
+        @return FileDigest: Stored digests, or None if missing or stale
+        """
+        if self.db_path is None:
+            return None
+        path, size, mtime_ns, inode = key
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT blocks FROM digests WHERE path = ? AND size = ? AND mtime_ns = ? "
+                    "AND inode = ? AND block_size = ?",
+                    (path, size, mtime_ns, inode, self.block_size)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+        if row is None:
+            return None
+        blob = row[0]
+        digest = FileDigest(size, self.block_size, [blob[i:i + 16] for i in range(0, len(blob), 16)])
+        self._memory.put(key, digest)
+        return digest
+
+    def _store(self, key, digest):
+        """
+        @brief Persist the digests of a file version, evicting the oldest entries
+        @param key tuple: (path, size, mtime_ns, inode)
+        @param digest FileDigest: Digests to store
+        """
+        if self.db_path is None:
+            return
+        path, size, mtime_ns, inode = key
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (path, size, mtime_ns, inode, self.block_size, b''.join(digest.blocks), time.time())
+                )
+                conn.execute(
+                    "DELETE FROM digests WHERE path NOT IN "
+                    "(SELECT path FROM digests ORDER BY stored_at DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def _load_line_index(self, key, interval):
+        """
+        @brief Look up the line index of a file version in the database
+        @param key tuple: (path, size, mtime_ns, inode)
+        @param interval int: Lines between two recorded offsets
+        @return LineIndex: Stored index, or None if missing or stale
+        """
+        if self.db_path is None:
+            return None
+        path, size, mtime_ns, inode = key
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT lines, offsets FROM line_indexes WHERE path = ? AND size = ? "
+                    "AND mtime_ns = ? AND inode = ? AND interval = ?",
+                    (path, size, mtime_ns, inode, interval)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+        if row is None:
+            return None
+        offsets = array('q')
+        offsets.frombytes(row[1])
+        index = LineIndex(interval, offsets.tolist(), row[0])
+        self._line_indexes.put(key, index)
+        return index
+
+    def _store_line_index(self, key, index):
+        """
+        @brief Persist the line index of a file version, evicting the oldest entries
+        @param key tuple: (path, size, mtime_ns, inode)
+        @param index LineIndex: Index to store
+        """
+        if self.db_path is None:
+            return
+        path, size, mtime_ns, inode = key
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO line_indexes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, size, mtime_ns, inode, index.interval, index.lines,
+                     array('q', index.offsets).tobytes(), time.time())
+                )
+                conn.execute(
+                    "DELETE FROM line_indexes WHERE path NOT IN "
+                    "(SELECT path FROM line_indexes ORDER BY stored_at DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def _disable(self, error):
+        """
+        @brief Stop using the database after an error
+        @param error Exception: The database or file system error
+        """
+        logger.debug(f"Digest cache {self.db_path} disabled: {error}")
+        self.db_path = None
+
+
+def default_cache_path():
+    """
+    @brief Get the default digest cache database path
+    @return Path: $CLI_TEST_DIGEST_CACHE, or digests.sqlite3 in the user cache
+                  directory; None when the variable is set to "off" or ""
+    """
+    configured = os.environ.get(CACHE_ENV_VAR)
+    if configured is not None:
+        if configured.strip().lower() in ("", "0", "off", "false", "no"):
+            return None
+        return Path(configured).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "cli_test_framework" / "digests.sqlite3"
+
+
+def resolve_digest_cache(option):
+    """
+    @brief Turn a comparator ``digest_cache`` option into a cache instance
+    @param option bool, str or Path: True for the shared default cache, False or None
+                  to disable, or a database path
+    @return DigestCache: The cache to use, or None
+    """
+    if option is True:
+        return DigestCache.shared()
+    if not option:
+        return None
+    return DigestCache.shared(Path(option))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file dir_comparator.py
+@brief Directory tree comparator dispatching differing files to per-type comparators
+@author Xiaotong Wang
+@date 2025
+"""
+
+import fnmatch
+import os
+from concurrent.futures import ThreadPoolExecutor
+from .base_comparator import BaseComparator
+from .digest_cache import DigestCache, resolve_digest_cache
+from .factory import ComparatorFactory
+from .result import Difference
+
+
+def _matches(rel_path, patterns):
+    """
+    @brief Check whether a relative path matches one of a list of globs
+    @param rel_path str: Path relative to the compared directory, with "/" separators
+    @param patterns list: Glob patterns; patterns without "/" are matched against the
+                          last path component, others against the whole path
+    @return bool: True if a pattern matches
+    """
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        if fnmatch.fnmatch(rel_path if "/" in pattern else name, pattern):
+            return True
+    return False
+
+
+class DirComparator(BaseComparator):
+    """
+    @brief Comparator for directory trees
+    @details Both trees are walked with os.scandir. Files found in only one tree are
+             reported as structure differences. Files of equal size are hashed in a
+             thread pool and skipped when their digests match; the remaining pairs are
+             compared in the same pool, each by the comparator chosen from its file
+             extension (or from ``file_options``). Differences are reported in path
+             order, prefixed with the file's relative path. Symbolic links to
+             directories are not followed.
+    """
+
+    def __init__(self, include=None, exclude=None, file_options=None, num_threads=None,
+                 digest_cache=True, **kwargs):
+        """
+        @brief Initialize the directory comparator
+        @param include list: Globs of the files to compare (None for all files)
+        @param exclude list: Globs of the files and directories to leave out
+        @param file_options dict: Glob -> keyword arguments of the comparators of
+                                  matching files; every matching glob applies, later
+                                  ones overriding earlier ones. The ``file_type`` key
+                                  selects the comparator instead of the extension
+        @param num_threads int: Threads hashing and comparing files (None for the
+                                ThreadPoolExecutor default)
+        @param digest_cache bool or str: Use the persistent digest cache when hashing
+                                         (see BinaryComparator)
+        @param **kwargs: Parameters passed to BaseComparator and to every file comparator
+        """
+        super().__init__(**kwargs)
+        self.include = [include] if isinstance(include, str) else list(include or ())
+        self.exclude = [exclude] if isinstance(exclude, str) else list(exclude or ())
+        items = file_options.items() if isinstance(file_options, dict) else (file_options or ())
+        self.file_options = [(pattern, dict(options)) for pattern, options in items]
+        self.num_threads = num_threads
+        self.digest_cache = resolve_digest_cache(digest_cache)
+        self.options = dict(kwargs, digest_cache=digest_cache)
+
+    def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief List the selected files of a directory tree
+        @param file_path Path: Root of the tree
+        @param start_line int: Ignored (directories have no lines)
+        @param end_line int: Ignored
+        @param start_column int: Ignored
+        @param end_column int: Ignored
+        @return dict: Relative path ("/" separators) -> (path, size)
+        @throws ValueError: If file_path is not a directory
+        """
+        if not os.path.isdir(file_path):
+            raise ValueError(f"Not a directory: {file_path}")
+        self.logger.debug(f"Listing directory: {file_path}")
+        files = {}
+        pending = [""]
+        while pending:
+            prefix = pending.pop()
+            with os.scandir(os.path.join(file_path, prefix)) as entries:
+                for entry in entries:
+                    rel_path = prefix + entry.name
+                    if _matches(rel_path, self.exclude):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(rel_path + "/")
+                    elif entry.is_file() and (not self.include or _matches(rel_path, self.include)):
+                        files[rel_path] = (entry.path, entry.stat().st_size)
+        return files
+
+    def compare_content(self, content1, content2):
+        """
+        @brief Compare the files of two directory trees
+        @param content1 dict: Files of the first tree (see read_content)
+        @param content2 dict: Files of the second tree
+        @return tuple: (bool, list) - (identical, differences)
+        """
+        paths = sorted(content1.keys() | content2.keys())
+        common = [path for path in paths if path in content1 and path in content2]
+        with ThreadPoolExecutor(max_workers=self.num_threads) as pool:
+            same = pool.map(lambda path: self._same_content(content1[path], content2[path]), common)
+            changed = [path for path, equal in zip(common, same) if not equal]
+            self.logger.debug(f"{len(common) - len(changed)} of {len(common)} common files have equal digests")
+            compared = dict(zip(changed, pool.map(
+                lambda path: self._compare_file(path, content1[path][0], content2[path][0]), changed)))
+
+        differences = []
+        for path in paths:
+            if path not in content2:
+                differences.append(Difference(
+                    position=path,
+                    expected="File exists",
+                    actual="File missing",
+                    diff_type="structure"
+                ))
+            elif path not in content1:
+                differences.append(Difference(
+                    position=path,
+                    expected="File missing",
+                    actual="File exists",
+                    diff_type="structure"
+                ))
+            else:
+                differences.extend(compared.get(path, ()))
+        return not differences, differences
+
+    def _same_content(self, entry1, entry2):
+        """
+        @brief Check whether two files have identical content
+        @param entry1 tuple: (path, size) of the first file
+        @param entry2 tuple: (path, size) of the second file
+        @return bool: True if sizes and digests match; False if a file cannot be read,
+                      so its comparator reports the error
+        """
+        if entry1[1] != entry2[1]:
+            return False
+        try:
+            if self.digest_cache is not None:
+                return self.digest_cache.get(entry1[0]).digest == self.digest_cache.get(entry2[0]).digest
+            return DigestCache.compute(entry1[0]).digest == DigestCache.compute(entry2[0]).digest
+        except OSError as e:
+            self.logger.debug(f"Digest check skipped: {e}")
+            return False
+
+    def _comparator_for(self, rel_path):
+        """
+        @brief Create the comparator of a file
+        @param rel_path str: Path relative to the compared directories
+        @return BaseComparator: Comparator for the file type given by file_options or
+                                detected from the extension
+        """
+        # Imported here: the assertions module loads the comparator factory itself
+        from ..core.assertions import _detect_file_type
+
+        options = dict(self.options)
+        file_type = None
+        for pattern, extra in self.file_options:
+            if _matches(rel_path, [pattern]):
+                extra = dict(extra)
+                file_type = extra.pop("file_type", file_type)
+                options.update(extra)
+        return ComparatorFactory.create_comparator(file_type or _detect_file_type(rel_path), **options)
+
+    def _compare_file(self, rel_path, file1, file2):
+        """
+        @brief Compare one pair of files whose digests differ
+        @param rel_path str: Path relative to the compared directories
+        @param file1 str: Path of the file in the first tree
+        @param file2 str: Path of the file in the second tree
+        @return list: Differences prefixed with rel_path, empty if the files match
+        """
+        try:
+            result = self._comparator_for(rel_path).compare_files(file1, file2)
+        except Exception as e:
+            result = None
+            error = str(e)
+        else:
+            error = result.error
+        if error:
+            return [Difference(
+                position=rel_path,
+                expected="Comparable files",
+                actual=f"Error: {error}",
+                diff_type="error"
+            )]
+        if result.identical:
+            return []
+        if not result.differences:
+            return [Difference(
+                position=rel_path,
+                expected="Same content",
+                actual="Content differs",
+                diff_type="content"
+            )]
+        return [Difference(
+            position=f"{rel_path}: {diff.position}",
+            expected=diff.expected,
+            actual=diff.actual,
+            diff_type=diff.diff_type
+        ) for diff in result.differences]
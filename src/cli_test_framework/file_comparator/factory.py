@@ -9,28 +9,68 @@
 """
 
 import importlib
-import pkgutil
 import logging
-from pathlib import Path
+import threading
 
 logger = logging.getLogger("cli_test_framework.file_comparator.factory")
 
+# Entry point group through which installed packages provide comparators
+ENTRY_POINT_GROUP = "cli_test_framework.comparators"
+
+# Built-in comparators: file type -> "module:Class", modules relative to this package
+_BUILTIN_COMPARATORS = {
+    "binary": "binary_comparator:BinaryComparator",
+    "csv": "csv_comparator:CsvComparator",
+    "dir": "dir_comparator:DirComparator",
+    "h5": "h5_comparator:H5Comparator",
+    "json": "json_comparator:JsonComparator",
+    "jsonl": "jsonl_comparator:JsonlComparator",
+    "npy": "npy_comparator:NpyComparator",
+    "text": "text_comparator:TextComparator",
+    "xml": "xml_comparator:XmlComparator",
+}
+
+
+def _entry_points(group):
+    """
+    @brief List the entry points of a group without loading them
+    @param group str: Entry point group name
+    @return list: importlib.metadata entry points
+    """
+    # Imported here: importlib.metadata is slow to import and only needed for
+    # file types that are not built in
+    from importlib import metadata
+
+    points = metadata.entry_points()
+    if hasattr(points, "select"):
+        return list(points.select(group=group))
+    return list(points.get(group, ()))  # Python 3.9
+
+
 class ComparatorFactory:
     """
     @brief Factory class for creating file comparators
     @details This class manages the creation and registration of different types of file comparators.
-             It provides a centralized way to create appropriate comparators based on file type
-             and automatically discovers and registers comparator classes via plugin scanning.
+             Comparators are registered lazily: the built-in table and comparators
+             registered as "module:Class" strings name the class without importing
+             it, and installed packages may add types through the
+             ``cli_test_framework.comparators`` entry point group. A module is
+             imported when its type is first requested, so comparing text never
+             loads h5py or NumPy.
     """
     _comparators = {}
-    _initialized = False
+    _entry_points = None
+    _lock = threading.Lock()
 
     @staticmethod
     def register_comparator(file_type, comparator_class):
         """
         @brief Register a new comparator class for a specific file type
         @param file_type str: Type of file the comparator handles
-        @param comparator_class class: Comparator class to register
+        @param comparator_class class or str: Comparator class to register, or its
+                                              "package.module:Class" path to import
+                                              on first use
+        @details Registered types take precedence over built-in and entry point types.
         """
         ComparatorFactory._comparators[file_type.lower()] = comparator_class
 
@@ -42,13 +82,11 @@ class ComparatorFactory:
         @param **kwargs: Additional arguments to pass to the comparator
         @return BaseComparator: An instance of the appropriate comparator class
         @details Creates and returns a comparator instance based on the file type.
-                 If no specific comparator is found, falls back to TextComparator
-                 for text files or BinaryComparator for other types.
+                 If no specific comparator is found, or its module cannot be
+                 imported, falls back to TextComparator for text files or
+                 BinaryComparator for other types.
         """
-        if not ComparatorFactory._initialized:
-            ComparatorFactory._load_comparators()
-
-        comparator_class = ComparatorFactory._comparators.get(file_type.lower())
+        comparator_class = ComparatorFactory.get_comparator_class(file_type)
         if not comparator_class:
             if file_type.lower() in ['auto', 'text']:
                 from .text_comparator import TextComparator
@@ -60,38 +98,83 @@ class ComparatorFactory:
         return comparator_class(**kwargs)
 
     @staticmethod
-    def _load_comparators():
+    def get_comparator_class(file_type):
         """
-        @brief Load and register all available comparators
-        @details Automatically discovers and registers comparator classes from the package.
-                 This includes both built-in comparators and any additional comparators
-                 that follow the naming convention '*_comparator.py'.
+        @brief Get the comparator class of a file type, importing it on first use
+        @param file_type str: Type of file to compare
+        @return class: The comparator class, or None if the type is unknown or its
+                       module failed to import (a warning is logged once)
+        @details Lookup order: registered types, built-in types, then entry points.
         """
-        package_dir = Path(__file__).parent
-        for module_info in pkgutil.iter_modules([str(package_dir)]):
-            if module_info.name.endswith('_comparator') and module_info.name != 'base_comparator':
-                try:
-                    module = importlib.import_module(f".{module_info.name}", package=__package__)
-
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (isinstance(attr, type) and
-                            attr.__module__ == module.__name__ and
-                            attr_name.endswith('Comparator')):
-                            type_name = attr_name.lower().replace('comparator', '')
-                            ComparatorFactory.register_comparator(type_name, attr)
-                except ImportError as e:
-                    logger.warning("Failed to import comparator module %s: %s", module_info.name, e)
-
-        ComparatorFactory._initialized = True
+        file_type = file_type.lower()
+        comparators = ComparatorFactory._comparators
+        comparator_class = comparators.get(file_type)
+        if comparator_class is None:
+            if file_type in _BUILTIN_COMPARATORS:
+                comparator_class = f"{__package__}.{_BUILTIN_COMPARATORS[file_type]}"
+            else:
+                comparator_class = ComparatorFactory._plugins().get(file_type)
+            if comparator_class is None:
+                return None
+        if isinstance(comparator_class, type):
+            return comparator_class
+
+        with ComparatorFactory._lock:
+            # Another thread may have loaded (or failed to load) it meanwhile
+            current = comparators.get(file_type, comparator_class)
+            if isinstance(current, type) or current is False:
+                return current or None
+            try:
+                loaded = ComparatorFactory._load(current)
+            except Exception as e:
+                logger.warning("Failed to load comparator for file type %s: %s", file_type, e)
+                loaded = False
+            comparators[file_type] = loaded
+            return loaded or None
+
+    @staticmethod
+    def _load(target):
+        """
+        @brief Import a lazily registered comparator class
+        @param target str or EntryPoint: "package.module:Class" path or entry point
+        @return class: The comparator class
+        @throws ImportError: If the module cannot be imported
+        @throws AttributeError: If the module has no such class
+        """
+        if not isinstance(target, str):
+            return target.load()
+        module_name, _, class_name = target.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+    @staticmethod
+    def _plugins():
+        """
+        @brief Get the comparator entry points of installed packages
+        @return dict: File type -> entry point, read from package metadata once
+        @details Entry points cannot replace built-in types; use register_comparator
+                 for that.
+        """
+        if ComparatorFactory._entry_points is None:
+            plugins = {}
+            try:
+                for point in _entry_points(ENTRY_POINT_GROUP):
+                    name = point.name.lower()
+                    if name in _BUILTIN_COMPARATORS:
+                        logger.warning("Ignoring comparator entry point %s: built-in file type", point.name)
+                    else:
+                        plugins.setdefault(name, point)
+            except Exception as e:
+                logger.warning("Failed to read comparator entry points: %s", e)
+            ComparatorFactory._entry_points = plugins
+        return ComparatorFactory._entry_points
 
     @staticmethod
     def get_available_comparators():
         """
         @brief Get a list of all registered comparator types
-        @return list: List of available comparator type names
+        @return list: List of available comparator type names (built-in, registered
+                      and entry point types, without importing them)
         """
-        if not ComparatorFactory._initialized:
-            ComparatorFactory._load_comparators()
-        return sorted(ComparatorFactory._comparators.keys())
-
+        comparators = ComparatorFactory._comparators
+        names = set(_BUILTIN_COMPARATORS) | set(ComparatorFactory._plugins()) | set(comparators)
+        return sorted(name for name in names if comparators.get(name) is not False)
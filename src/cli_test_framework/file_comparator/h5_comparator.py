@@ -1,11 +1,119 @@
 from .base_comparator import BaseComparator
+from .digest_cache import STABLE_AGE
+from .numeric_kernel import ToleranceKernel, KernelStats, stats_differences
+from .tolerance_profile import ToleranceProfile
 import h5py
 import numpy as np
 import logging
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
+
+# Object indexes of recently read files, keyed by file identity and selection
+_INDEX_CACHE = OrderedDict()
+_INDEX_CACHE_SIZE = 32
+_INDEX_LOCK = threading.Lock()
+
+# Characters that make a table_regex entry a regular expression rather than a path
+_REGEX_METACHARACTERS = set('[]{}()*+?^$|\\')
+
+
+class _PathSelector:
+    """
+    Compiled tables/table_regex selection
+    @details All regex patterns are combined into one alternation so each path is
+             matched once. The literal prefix of every pattern (and every table
+             path) tells whether a group can contain a selected descendant, which
+             lets the traversal skip whole subtrees.
+    """
+
+    def __init__(self, tables=None, table_regex=None, expand_path=True):
+        """
+        Initialize the selector
+        @param tables list: List of exact object paths
+        @param table_regex str: Comma-separated regular expressions (full match)
+        @param expand_path bool: Whether descendants of selected groups are selected
+        """
+        self.tables = [t.strip('/') for t in tables] if tables else []
+        self._table_set = set(self.tables)
+        patterns = []
+        if table_regex:
+            for regex_str in (p.strip() for p in table_regex.split(',')):
+                # A pattern without regex metacharacters (other than . and /) is a literal path
+                if not any(char in regex_str for char in _REGEX_METACHARACTERS):
+                    regex_str = re.escape(regex_str)
+                patterns.append(regex_str)
+        self.patterns = patterns
+        self.select_all = not self.tables and not patterns
+        self.key = (tuple(self.tables), tuple(patterns), expand_path)
+
+        self._combined = None
+        self._compiled = []
+        if patterns:
+            try:
+                self._combined = re.compile('|'.join(f'(?:{p})' for p in patterns))
+            except re.error:
+                # e.g. numbered backreferences that do not survive the combination
+                self._compiled = [re.compile(p) for p in patterns]
+        self._prefixes = self.tables + [self._literal_prefix(p) for p in patterns]
+
+    @staticmethod
+    def _literal_prefix(pattern):
+        """
+        Get the literal text every match of a pattern must start with
+        @param pattern str: Regular expression
+        @return str: The literal prefix (empty if nothing can be assumed)
+        """
+        if '|' in pattern.replace('\\|', ''):
+            return ''
+        prefix = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+                prefix.append(pattern[i + 1])
+                i += 2
+                continue
+            if char in _REGEX_METACHARACTERS or char == '.':
+                break
+            prefix.append(char)
+            i += 1
+        # A quantifier makes the preceding character optional or repeatable
+        if i < len(pattern) and pattern[i] in '*?{' and prefix:
+            prefix.pop()
+        return ''.join(prefix)
+
+    def matches(self, path):
+        """
+        Check whether a path is selected
+        @param path str: Object path without leading slash
+        @return bool: True if the path is a table or fully matches a pattern
+        """
+        if self.select_all or path in self._table_set:
+            return True
+        if self._combined is not None:
+            return self._combined.fullmatch(path) is not None
+        return any(p.fullmatch(path) for p in self._compiled)
+
+    def may_contain(self, group_path):
+        """
+        Check whether a group can have selected descendants
+        @param group_path str: Group path without leading slash
+        @return bool: False only if no selected path can start with group_path + '/'
+        """
+        if self.select_all:
+            return True
+        group_prefix = group_path + '/'
+        return any(p.startswith(group_prefix) or group_prefix.startswith(p) for p in self._prefixes)
+
 
 class H5Comparator(BaseComparator):
-    def __init__(self, tables=None, table_regex=None, structure_only=False, show_content_diff=False, debug=False, rtol=1e-5, atol=1e-8, expand_path=True, data_filter=None, **kwargs):
+    # Number of elements read per slice when comparing large datasets
+    CHUNK_ELEMENTS = 1 << 20
+
+    def __init__(self, tables=None, table_regex=None, structure_only=False, show_content_diff=False, debug=False, rtol=1e-5, atol=1e-8, expand_path=True, data_filter=None, tolerance_profile=None, **kwargs):
         """
         Initialize H5 comparator
         :param tables: List of table names to compare. If None, compare all tables
@@ -17,6 +125,9 @@ class H5Comparator(BaseComparator):
         :param atol: Absolute tolerance for numerical comparison
         :param expand_path: If True, expand group paths to compare all sub-items. Defaults to True.
         :param data_filter: String filter expression for data comparison (e.g., '>1e-6', 'abs>1e-9')
+        :param tolerance_profile: Per-dataset tolerances: a mapping from path regex to
+                                  {rtol, atol, max_ulp, ignore}, a list of such entries with a
+                                  'pattern' key, or a path to a JSON/YAML file containing either
         """
         super().__init__(**kwargs)
         self.tables = tables
@@ -28,6 +139,9 @@ class H5Comparator(BaseComparator):
         self.expand_path = expand_path
         self.data_filter = data_filter
         self.filter_func = self._parse_filter()
+        self.selector = _PathSelector(tables, table_regex, expand_path)
+        self.profile = ToleranceProfile.load(tolerance_profile, rtol=rtol, atol=atol)
+        self.kernel = self.profile.default_kernel
         
         # Set debug level if verbose is enabled
         if kwargs.get('verbose', False) or debug:
@@ -40,7 +154,6 @@ class H5Comparator(BaseComparator):
     def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
         """Read H5 file content"""
         content = {}
-        processed_paths = set()
         
         # Store file path for later chunked reading if needed
         content['_file_path'] = str(file_path)
@@ -53,184 +166,159 @@ class H5Comparator(BaseComparator):
         self.logger.debug(f"Reading file {file_path} in structure-only mode: {self.structure_only}")
         self.logger.debug(f"Tables parameter: {self.tables}")
         self.logger.debug(f"Table regex parameter: {self.table_regex}")
-        
+
+        index = self._object_index(file_path)
+        for table_path in self.selector.tables:
+            if table_path not in index:
+                self.logger.warning(f"Table {table_path} not found in {file_path}")
+
+        selected = [name for name in index if not self.profile.is_ignored(name)]
+        for name in selected:
+            content[name] = dict(index[name])
+
+        datasets = [name for name in selected if content[name]['type'] == 'dataset']
+        if self.structure_only or not datasets:
+            self.logger.debug(f"Read {len(content)} items from {file_path}")
+            return content
+
         with h5py.File(file_path, 'r') as f:
-            # Function to collect structure information
-            def collect_structure(name, obj):
-                if name in processed_paths:
-                    self.logger.debug(f"Path {name} already processed, skipping.")
-                    return
-
-                if isinstance(obj, h5py.Dataset):
-                    content[name] = {
-                        'type': 'dataset',
-                        'shape': obj.shape,
-                        'dtype': str(obj.dtype),
-                        'attrs': dict(obj.attrs)
-                    }
-                    self.logger.debug(f"Collected structure for dataset: {name}")
-                    processed_paths.add(name)
-                elif isinstance(obj, h5py.Group) and name:  # Skip root group
-                    content[name] = {
-                        'type': 'group',
-                        'keys': list(obj.keys()),
-                        'attrs': dict(obj.attrs)
-                    }
-                    self.logger.debug(f"Collected structure for group: {name}")
-                    processed_paths.add(name)
-            
-            # Function to collect structure and data
-            def collect_structure_and_data(name, obj):
-                if name in processed_paths:
-                    self.logger.debug(f"Path {name} already processed, skipping.")
-                    return
-
-                if isinstance(obj, h5py.Dataset):
-                    dataset_info = {
-                        'type': 'dataset',
-                        'shape': obj.shape,
-                        'dtype': str(obj.dtype),
-                        'attrs': dict(obj.attrs)
-                    }
-                    
-                    # Read data with range constraints and chunk-based reading for large datasets
-                    try:
-                        # Threshold for chunk-based reading (1 million elements = ~8MB for float64)
-                        # For datasets smaller than this, read entire dataset for efficiency
-                        if obj.size < 1000000:
-                            # Small dataset: read entire dataset into memory
-                            data = obj[:]
-                            if isinstance(data, np.ndarray):
-                                if end_line is None:
-                                    end_line_actual = data.shape[0]
+            for name in datasets:
+                dataset_info = content[name]
+                # Read data with range constraints and chunk-based reading for large datasets
+                try:
+                    # Threshold for chunk-based reading (1 million elements = ~8MB for float64)
+                    # For datasets smaller than this, read entire dataset for efficiency
+                    if dataset_info['size'] < 1000000:
+                        # Small dataset: read entire dataset into memory
+                        data = f[name][:]
+                        if isinstance(data, np.ndarray):
+                            if end_line is None:
+                                end_line_actual = data.shape[0]
+                            else:
+                                end_line_actual = min(end_line, data.shape[0])
+                                
+                            if len(data.shape) == 1:
+                                data = data[start_line:end_line_actual]
+                            elif len(data.shape) > 1:
+                                if end_column is None:
+                                    end_column_actual = data.shape[1]
                                 else:
-                                    end_line_actual = min(end_line, data.shape[0])
-                                    
-                                if len(data.shape) == 1:
-                                    data = data[start_line:end_line_actual]
-                                elif len(data.shape) > 1:
-                                    if end_column is None:
-                                        end_column_actual = data.shape[1]
-                                    else:
-                                        end_column_actual = min(end_column, data.shape[1])
-                                    data = data[start_line:end_line_actual, start_column:end_column_actual]
-                            
-                            dataset_info['data'] = data
-                            self.logger.debug(f"Collected full data for small dataset: {name} (size: {obj.size})")
-                        else:
-                            # Large dataset: mark for chunked reading during comparison
-                            # Don't load entire dataset into memory
-                            dataset_info['data'] = None  # Will be read chunk-by-chunk during comparison
-                            dataset_info['dataset_path'] = name  # Store dataset path for later chunked reading
-                            dataset_info['needs_chunked_reading'] = True
-                            self.logger.debug(f"Marked large dataset for chunked reading: {name} (size: {obj.size})")
+                                    end_column_actual = min(end_column, data.shape[1])
+                                data = data[start_line:end_line_actual, start_column:end_column_actual]
                         
-                    except Exception as e:
-                        self.logger.error(f"Error reading data from {name}: {str(e)}")
-                    
-                    content[name] = dataset_info
-                    processed_paths.add(name)
+                        dataset_info['data'] = data
+                        self.logger.debug(f"Collected full data for small dataset: {name} (size: {dataset_info['size']})")
+                    else:
+                        # Large dataset: mark for chunked reading during comparison
+                        # Don't load entire dataset into memory
+                        dataset_info['data'] = None  # Will be read chunk-by-chunk during comparison
+                        dataset_info['dataset_path'] = name  # Store dataset path for later chunked reading
+                        dataset_info['needs_chunked_reading'] = True
+                        self.logger.debug(f"Marked large dataset for chunked reading: {name} (size: {dataset_info['size']})")
                     
-                elif isinstance(obj, h5py.Group) and name:  # Skip root group
-                    content[name] = {
-                        'type': 'group',
-                        'keys': list(obj.keys()),
-                        'attrs': dict(obj.attrs)
-                    }
-                    self.logger.debug(f"Collected structure for group: {name}")
-                    processed_paths.add(name)
-            
-            if self.tables or self.table_regex:
-                # If specific tables or regex pattern is specified
-                regex_patterns = []
-                if self.table_regex:
-                    # Split by comma to support multiple regex patterns
-                    regex_strings = [pattern.strip() for pattern in self.table_regex.split(',')]
-                    self.logger.debug(f"Parsed regex patterns: {regex_strings}")
-                    
-                    for regex_str in regex_strings:
-                        # If the regex looks like a simple path (no regex metacharacters except . and /),
-                        # escape it to treat it as a literal string
-                        self.logger.debug(f"Processing regex pattern: {regex_str}")
-                        # Check if it contains regex metacharacters other than . and /
-                        import string
-                        regex_metacharacters = set('[]{}()*+?^$|\\')
-                        if not any(char in regex_str for char in regex_metacharacters):
-                            # Escape dots and other special characters for literal matching
-                            escaped_regex_str = re.escape(regex_str)
-                            self.logger.debug(f"Treating pattern as literal path, escaped: {escaped_regex_str}")
-                            regex_patterns.append(re.compile(escaped_regex_str))
-                        else:
-                            self.logger.debug(f"Using pattern as regular expression: {regex_str}")
-                            regex_patterns.append(re.compile(regex_str))
-                
-                def should_process(name):
-                    if self.tables and name in self.tables:
-                        self.logger.debug(f"Matched by tables list: {name}")
-                        return True
-                    for pattern in regex_patterns:
-                        if pattern.fullmatch(name):
-                            self.logger.debug(f"Matched by regex pattern {pattern.pattern}: {name}")
-                            return True
-                    return False
-                
-                def process_item(name, item):
-                    try:
-                        # Process the current item first
-                        if self.structure_only:
-                            collect_structure(name, item)
-                        else:
-                            collect_structure_and_data(name, item)
-
-                        # If it's a group and expand_path is enabled, visit all its members
-                        if self.expand_path and isinstance(item, h5py.Group):
-                            self.logger.debug(f"Expanding group path: {name}")
-                            
-                            def visitor(sub_name, sub_obj):
-                                full_path = f"{name}/{sub_name}"
-                                self.logger.debug(f"Processing sub-item from expansion: {full_path}")
-                                if self.structure_only:
-                                    collect_structure(full_path, sub_obj)
-                                else:
-                                    collect_structure_and_data(full_path, sub_obj)
-                            
-                            item.visititems(visitor)
-
-                    except Exception as e:
-                        self.logger.error(f"Error processing {name}: {str(e)}")
-                
-                # First try direct path access for table names
-                if self.tables:
-                    for table_path in self.tables:
-                        try:
-                            if table_path in f:
-                                process_item(table_path, f[table_path])
-                            else:
-                                self.logger.warning(f"Table {table_path} not found in {file_path}")
-                        except Exception as e:
-                            self.logger.error(f"Error processing {table_path}: {str(e)}")
-                
-                # Then process regex pattern if specified
-                if regex_patterns:
-                    def visit_with_regex(name, obj):
-                        self.logger.debug(f"Checking path: {name}")
-                        if should_process(name):
-                            self.logger.debug(f"Processing matched path: {name}")
-                            process_item(name, obj)
-                        else:
-                            self.logger.debug(f"Skipping path: {name}")
-                    f.visititems(visit_with_regex)
-            else:
-                # If no tables specified, read all datasets
-                if self.structure_only:
-                    f.visititems(collect_structure)
-                else:
-                    f.visititems(collect_structure_and_data)
+                except Exception as e:
+                    self.logger.error(f"Error reading data from {name}: {str(e)}")
         
         self.logger.debug(f"Read {len(content)} items from {file_path}")
         self.logger.debug(f"Items read: {list(content.keys())}")
         return content
 
+    def _object_index(self, file_path):
+        """
+        Get the selected objects of a file, walking the file only on a cache miss
+        @param file_path str: Path to the HDF5 file
+        @return dict: Mapping of object path to its metadata (type, shape, dtype, size,
+                      keys and attrs), in traversal order
+        @details The index is cached per (file identity, selection) so the baseline
+                 of repeated comparisons is walked once. File identity includes
+                 size, mtime and inode, so a rewritten file is walked again. Only
+                 files older than STABLE_AGE seconds and unchanged by the walk are
+                 cached, since a rewrite within the same mtime tick keeps their identity.
+        """
+        stat = os.stat(file_path)
+        key = (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns, stat.st_ino, self.selector.key)
+        with _INDEX_LOCK:
+            index = _INDEX_CACHE.get(key)
+            if index is not None:
+                _INDEX_CACHE.move_to_end(key)
+                self.logger.debug(f"Using cached object index for {file_path}")
+                return index
+
+        with h5py.File(file_path, 'r') as f:
+            index = self._walk(f)
+
+        if time.time_ns() - stat.st_mtime_ns <= STABLE_AGE * 1e9:
+            return index
+        try:
+            after = os.stat(file_path)
+        except OSError:
+            return index
+        if (after.st_size, after.st_mtime_ns, after.st_ino) != (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+            return index
+        with _INDEX_LOCK:
+            _INDEX_CACHE[key] = index
+            while len(_INDEX_CACHE) > _INDEX_CACHE_SIZE:
+                _INDEX_CACHE.popitem(last=False)
+        return index
+
+    def _walk(self, f):
+        """
+        Collect the selected objects of an open file in a single traversal
+        @param f h5py.File: Open HDF5 file
+        @return dict: Mapping of object path to metadata
+        @details Groups that cannot contain a selected path (according to the literal
+                 prefixes of the selection) are not descended into. Below a selected
+                 group every object is included when expand_path is set. Like
+                 visititems, soft and external links are not followed and an object
+                 reachable through several hard links is visited once, under the
+                 first path found.
+        """
+        index = {}
+        selector = self.selector
+        visited = set()
+
+        def visit(group, prefix, inside_selected):
+            for child_name in group:
+                if not isinstance(group.get(child_name, getlink=True), h5py.HardLink):
+                    continue  # Soft or external link
+                path = prefix + child_name
+                obj = group.get(child_name)
+                if obj is None or obj.id in visited:
+                    continue
+                visited.add(obj.id)
+                is_group = isinstance(obj, h5py.Group)
+                selected = inside_selected or selector.matches(path)
+                if selected:
+                    index[path] = self._describe(obj)
+                if is_group:
+                    expand = selected and self.expand_path
+                    if expand or selector.may_contain(path):
+                        visit(obj, path + '/', expand)
+
+        visit(f, '', selector.select_all)
+        return index
+
+    @staticmethod
+    def _describe(obj):
+        """
+        Collect the metadata of an HDF5 object
+        @param obj h5py.Dataset or h5py.Group: Object to describe
+        @return dict: Structure information used by compare_content
+        """
+        if isinstance(obj, h5py.Dataset):
+            return {
+                'type': 'dataset',
+                'shape': obj.shape,
+                'dtype': str(obj.dtype),
+                'size': obj.size,
+                'attrs': dict(obj.attrs)
+            }
+        return {
+            'type': 'group',
+            'keys': list(obj.keys()),
+            'attrs': dict(obj.attrs)
+        }
+
     def compare_content(self, content1, content2):
         """Compare two H5 file contents"""
         identical = True
@@ -247,6 +335,8 @@ class H5Comparator(BaseComparator):
         self.logger.debug(f"Number of tables to compare: {len(all_tables)}")
         
         for table_name in all_tables:
+            if self.profile.is_ignored(table_name):
+                continue
             # Debug log
             self.logger.debug(f"Comparing table: {table_name}")
             if table_name in content1 and table_name in content2:
@@ -373,63 +463,10 @@ class H5Comparator(BaseComparator):
                     elif isinstance(data1, np.ndarray) and isinstance(data2, np.ndarray):
                         # Small dataset: already in memory, compare directly
                         try:
-                            # 应用过滤器
-                            mask1 = self.filter_func(data1) if self.filter_func else np.ones_like(data1, dtype=bool)
-                            mask2 = self.filter_func(data2) if self.filter_func else np.ones_like(data2, dtype=bool)
-                            
-                            # 我们只关心两个文件中都满足条件的位置
-                            combined_mask = mask1 & mask2
-                            
-                            # 过滤后的数据
-                            filtered_data1 = data1[combined_mask]
-                            filtered_data2 = data2[combined_mask]
-                            
-                            if self.filter_func:
-                                self.logger.debug(f"Applied filter to {table_name}: {np.sum(combined_mask)}/{data1.size} elements meet criteria")
-                            
-                            # 对于数值类型数据使用 isclose
-                            if np.issubdtype(data1.dtype, np.number) and np.issubdtype(data2.dtype, np.number):
-                                if not np.all(np.isclose(filtered_data1, filtered_data2, equal_nan=True, rtol=self.rtol, atol=self.atol)):
-                                    if self.show_content_diff:
-                                        # 如果过滤后数据不相等，需要找到原始数据的索引来报告差异
-                                        # 简化处理：直接报告内容不同
-                                        differences.append(self._create_difference(
-                                            position=table_name,
-                                            expected="Same content (after filtering)",
-                                            actual="Content differs (after filtering)",
-                                            diff_type="content"
-                                        ))
-                                    else:
-                                        # Just report that content differs
-                                        differences.append(self._create_difference(
-                                            position=table_name,
-                                            expected="Same content (after filtering)",
-                                            actual="Content differs (after filtering)",
-                                            diff_type="content"
-                                        ))
-                                    identical = False
-                            # 对于字符串或其他类型直接比较
-                            else:
-                                if not np.array_equal(filtered_data1, filtered_data2):
-                                    if self.show_content_diff:
-                                        # For non-numeric arrays, find the first difference
-                                        diff_indices = np.where(filtered_data1 != filtered_data2)
-                                        for idx in list(zip(*diff_indices))[:10]:
-                                            position = f"{table_name}[{','.join(map(str, idx))}]"
-                                            differences.append(self._create_difference(
-                                                position=position,
-                                                expected=str(filtered_data1[idx]),
-                                                actual=str(filtered_data2[idx]),
-                                                diff_type="content"
-                                            ))
-                                    else:
-                                        differences.append(self._create_difference(
-                                            position=table_name,
-                                            expected="Same content (after filtering)",
-                                            actual="Content differs (after filtering)",
-                                            diff_type="content"
-                                        ))
-                                    identical = False
+                            data_diff = self._compare_arrays(data1, data2, table_name)
+                            if data_diff:
+                                differences.extend(data_diff)
+                                identical = False
                         except Exception as e:
                             self.logger.error(f"Error comparing data in table {table_name}: {str(e)}")
                             differences.append(self._create_difference(
@@ -552,6 +589,65 @@ class H5Comparator(BaseComparator):
             self.logger.error(f"Failed to parse data filter '{self.data_filter}': {e}. Ignoring filter.")
             return None
     
+    def _compare_arrays(self, data1, data2, table_name):
+        """
+        Compare two in-memory arrays
+        @param data1 np.ndarray: Data from the first file
+        @param data2 np.ndarray: Data from the second file
+        @param table_name str: Name/path of the dataset
+        @return list: List of Difference objects, empty if the arrays match
+        """
+        if ToleranceKernel.is_numeric(data1) and ToleranceKernel.is_numeric(data2):
+            kernel = self.profile.kernel_for(table_name)
+            stats = kernel.compare(data1, data2, filter_func=self.filter_func,
+                                   detailed=self.show_content_diff)
+            if self.filter_func:
+                self.logger.debug(f"Applied filter to {table_name}: {stats.checked}/{data1.size} elements meet criteria")
+            if stats.identical:
+                return []
+            return self._numeric_differences(table_name, stats, data1.shape, kernel)
+
+        # Strings and other non-numeric types: the data filter does not apply
+        if np.array_equal(data1, data2):
+            return []
+        if not self.show_content_diff:
+            return [self._create_difference(
+                position=table_name,
+                expected="Same content (after filtering)",
+                actual="Content differs (after filtering)",
+                diff_type="content"
+            )]
+        differences = []
+        diff_indices = np.where(data1 != data2)
+        for idx in list(zip(*diff_indices))[:10]:
+            position = f"{table_name}[{','.join(map(str, idx))}]"
+            differences.append(self._create_difference(
+                position=position,
+                expected=str(data1[idx]),
+                actual=str(data2[idx]),
+                diff_type="content"
+            ))
+        return differences
+
+    def _numeric_differences(self, table_name, stats, shape, kernel):
+        """
+        Build differences from tolerance kernel statistics
+        @param table_name str: Name/path of the dataset
+        @param stats KernelStats: Statistics of the comparison
+        @param shape tuple: Shape of the compared data, used to locate samples
+        @param kernel ToleranceKernel: Kernel used for the comparison
+        @return list: List of Difference objects
+        """
+        if not self.show_content_diff:
+            return [self._create_difference(
+                position=table_name,
+                expected="Same content (after filtering)",
+                actual="Content differs (after filtering)",
+                diff_type="content"
+            )]
+
+        return stats_differences(table_name, stats, shape, kernel)
+
     def _compare_dataset_chunked(self, table1, table2, table_name, file1_path, file2_path):
         """
         Compare large datasets using chunked reading to avoid loading entire dataset into memory
@@ -561,6 +657,9 @@ class H5Comparator(BaseComparator):
         @param file1_path str: Path to first HDF5 file
         @param file2_path str: Path to second HDF5 file
         @return list: List of Difference objects, empty if datasets are identical
+        @details Slices along the first dimension are read into two preallocated buffers
+                 and checked with the shared tolerance kernel. Unless show_content_diff
+                 is set, the comparison stops at the first differing slice.
         """
         differences = []
         dataset_path = table1.get('dataset_path') or table2.get('dataset_path') or table_name
@@ -579,133 +678,62 @@ class H5Comparator(BaseComparator):
                         diff_type="structure"
                     ))
                     return differences
-                
-                # Determine chunk size (1000 rows at a time, adjustable based on memory constraints)
-                chunk_size = 1000
-                total_rows = ds1.shape[0]
-                
-                # Handle different dimensionalities
-                if len(ds1.shape) == 1:
-                    # 1D array: simple chunking
-                    for start_idx in range(0, total_rows, chunk_size):
-                        end_idx = min(start_idx + chunk_size, total_rows)
-                        
-                        # Read only this slice
-                        slice1 = ds1[start_idx:end_idx]
-                        slice2 = ds2[start_idx:end_idx]
-                        
-                        # Apply filter if specified
-                        if self.filter_func:
-                            mask1 = self.filter_func(slice1)
-                            mask2 = self.filter_func(slice2)
-                            combined_mask = mask1 & mask2
-                            slice1 = slice1[combined_mask]
-                            slice2 = slice2[combined_mask]
-                        
-                        # Compare slices
-                        if np.issubdtype(ds1.dtype, np.number) and np.issubdtype(ds2.dtype, np.number):
-                            if not np.all(np.isclose(slice1, slice2, equal_nan=True, rtol=self.rtol, atol=self.atol)):
-                                differences.append(self._create_difference(
-                                    position=f"{table_name}[{start_idx}:{end_idx}]",
-                                    expected="Content matches",
-                                    actual="Content differs",
-                                    diff_type="content"
-                                ))
-                                # Early return on first difference to save time
-                                return differences
-                        else:
-                            if not np.array_equal(slice1, slice2):
-                                differences.append(self._create_difference(
-                                    position=f"{table_name}[{start_idx}:{end_idx}]",
-                                    expected="Content matches",
-                                    actual="Content differs",
-                                    diff_type="content"
-                                ))
-                                return differences
-                
-                elif len(ds1.shape) == 2:
-                    # 2D array: chunk along first dimension
-                    for start_idx in range(0, total_rows, chunk_size):
-                        end_idx = min(start_idx + chunk_size, total_rows)
-                        
-                        # Read slice along first dimension
-                        slice1 = ds1[start_idx:end_idx, :]
-                        slice2 = ds2[start_idx:end_idx, :]
-                        
-                        # Apply filter if specified
-                        if self.filter_func:
-                            mask1 = self.filter_func(slice1)
-                            mask2 = self.filter_func(slice2)
-                            combined_mask = mask1 & mask2
-                            # Flatten for filtering, then reshape
-                            flat1 = slice1.flatten()
-                            flat2 = slice2.flatten()
-                            slice1 = flat1[combined_mask.flatten()]
-                            slice2 = flat2[combined_mask.flatten()]
-                        
-                        # Compare slices
-                        if np.issubdtype(ds1.dtype, np.number) and np.issubdtype(ds2.dtype, np.number):
-                            if not np.all(np.isclose(slice1, slice2, equal_nan=True, rtol=self.rtol, atol=self.atol)):
-                                differences.append(self._create_difference(
-                                    position=f"{table_name}[{start_idx}:{end_idx},:]",
-                                    expected="Content matches",
-                                    actual="Content differs",
-                                    diff_type="content"
-                                ))
-                                return differences
-                        else:
-                            if not np.array_equal(slice1, slice2):
-                                differences.append(self._create_difference(
-                                    position=f"{table_name}[{start_idx}:{end_idx},:]",
-                                    expected="Content matches",
-                                    actual="Content differs",
-                                    diff_type="content"
-                                ))
-                                return differences
-                
+
+                shape = ds1.shape
+                total_rows = shape[0]
+                row_size = int(np.prod(shape[1:], dtype=np.int64)) if len(shape) > 1 else 1
+                # Read about one million elements per slice
+                chunk_rows = max(1, self.CHUNK_ELEMENTS // max(row_size, 1))
+                if len(shape) == 1:
+                    suffix = ""
+                elif len(shape) == 2:
+                    suffix = ",:"
                 else:
-                    # Higher dimensional arrays: chunk along first dimension
-                    # This is a simplified approach; for very high-dimensional arrays,
-                    # you might want more sophisticated chunking
-                    for start_idx in range(0, total_rows, chunk_size):
-                        end_idx = min(start_idx + chunk_size, total_rows)
-                        
-                        # Create slice tuple
-                        slice_tuple1 = (slice(start_idx, end_idx),) + (slice(None),) * (len(ds1.shape) - 1)
-                        slice_tuple2 = (slice(start_idx, end_idx),) + (slice(None),) * (len(ds2.shape) - 1)
-                        
-                        slice1 = ds1[slice_tuple1]
-                        slice2 = ds2[slice_tuple2]
-                        
-                        # Apply filter if specified (flatten for filtering)
-                        if self.filter_func:
-                            flat1 = slice1.flatten()
-                            flat2 = slice2.flatten()
-                            mask1 = self.filter_func(flat1)
-                            mask2 = self.filter_func(flat2)
-                            combined_mask = mask1 & mask2
-                            slice1 = flat1[combined_mask]
-                            slice2 = flat2[combined_mask]
-                        
-                        # Compare slices
-                        if np.issubdtype(ds1.dtype, np.number) and np.issubdtype(ds2.dtype, np.number):
-                            if not np.all(np.isclose(slice1, slice2, equal_nan=True, rtol=self.rtol, atol=self.atol)):
-                                differences.append(self._create_difference(
-                                    position=f"{table_name}[{start_idx}:{end_idx},...]",
-                                    expected="Content matches",
-                                    actual="Content differs",
-                                    diff_type="content"
-                                ))
-                                return differences
-                        else:
-                            if not np.array_equal(slice1, slice2):
-                                differences.append(self._create_difference(
-                                    position=f"{table_name}[{start_idx}:{end_idx},...]",
-                                    expected="Content matches",
-                                    actual="Content differs",
-                                    diff_type="content"
-                                ))
-                                return differences
+                    suffix = ",..."
+
+                numeric = np.issubdtype(ds1.dtype, np.number) and np.issubdtype(ds2.dtype, np.number)
+                kernel = self.profile.kernel_for(table_name)
+                stats = KernelStats()
+                first_bad_slice = None
+
+                if numeric:
+                    buffer_rows = min(chunk_rows, total_rows)
+                    buf1 = np.empty((buffer_rows,) + shape[1:], dtype=ds1.dtype)
+                    buf2 = np.empty((buffer_rows,) + shape[1:], dtype=ds2.dtype)
+
+                for start_idx in range(0, total_rows, chunk_rows):
+                    end_idx = min(start_idx + chunk_rows, total_rows)
+
+                    if numeric:
+                        n = end_idx - start_idx
+                        slice1 = buf1[:n]
+                        slice2 = buf2[:n]
+                        ds1.read_direct(slice1, source_sel=np.s_[start_idx:end_idx])
+                        ds2.read_direct(slice2, source_sel=np.s_[start_idx:end_idx])
+                        before = stats.mismatches
+                        kernel.compare(slice1, slice2, filter_func=self.filter_func,
+                                            detailed=self.show_content_diff, stats=stats,
+                                            offset=start_idx * row_size)
+                        if stats.mismatches > before and first_bad_slice is None:
+                            first_bad_slice = (start_idx, end_idx)
+                        if not stats.complete:
+                            break
+                    elif not np.array_equal(ds1[start_idx:end_idx], ds2[start_idx:end_idx]):
+                        first_bad_slice = (start_idx, end_idx)
+                        break
+
+                if first_bad_slice is None:
+                    return differences
+                if numeric and self.show_content_diff:
+                    return self._numeric_differences(table_name, stats, shape, kernel)
+
+                start_idx, end_idx = first_bad_slice
+                differences.append(self._create_difference(
+                    position=f"{table_name}[{start_idx}:{end_idx}{suffix}]",
+                    expected="Content matches",
+                    actual="Content differs",
+                    diff_type="content"
+                ))
                 
         except Exception as e:
             self.logger.error(f"Error in chunked comparison of {table_name}: {str(e)}")
@@ -716,4 +744,4 @@ class H5Comparator(BaseComparator):
                 diff_type="error"
             ))
         
-        return differences
\ No newline at end of file
+        return differences
@@ -9,9 +9,24 @@
 """
 
 import json
+from pathlib import Path
+from .json_path import JsonPathTrie
+from .json_stream import JsonTokenReader
 from .text_comparator import TextComparator
 from .result import Difference
 
+# Files from this size on are compared while streaming when streaming is not forced
+STREAM_THRESHOLD = 64 << 20
+
+def _is_number(value):
+    """
+    @brief Check whether a JSON value is a number
+    @param value: Parsed JSON value
+    @return bool: True for int and float values (booleans excluded)
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
 class JsonComparator(TextComparator):
     """
     @brief Comparator for JSON files with support for exact and key-based comparison
@@ -20,21 +35,222 @@ class JsonComparator(TextComparator):
              - Exact comparison of JSON structures
              - Key-based comparison for lists of objects
              - Detailed difference reporting with path information
+             - Streaming comparison of large documents in exact mode
+             - Numeric tolerances and ignored paths
     """
+
+    # Loaded documents are only read by compare_content; streamed comparisons never load them
+    cache_content = True
     
-    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, key_field=None, compare_mode="exact", **kwargs):
+    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, key_field=None, compare_mode="exact",
+                 streaming=None, rtol=None, atol=None, ignore_paths=None, **kwargs):
         """
         @brief Initialize the JSON comparator
         @param encoding str: File encoding
         @param chunk_size int: Chunk size for reading files
         @param verbose bool: Enable verbose logging
-        @param key_field str or list: Field name(s) to use as key for comparing JSON objects in lists
+        @param key_field str or list: Field name(s) to use as key for comparing JSON objects in lists;
+                                      a dotted name selects a nested member (``meta.id``)
         @param compare_mode str: Comparison mode: 'exact' (default) or 'key-based'
-        @param **kwargs: Additional parameters (ignored)
+        @param streaming bool: Walk both documents while parsing them instead of loading
+                               them (None to stream files of STREAM_THRESHOLD bytes or more)
+        @param rtol float: Relative tolerance for numbers (None with atol None for exact values)
+        @param atol float: Absolute tolerance for numbers
+        @param ignore_paths list: JSONPath-like patterns of values left out of the comparison,
+                                  e.g. ``$.meta.timestamp`` or ``$.results[*].elapsed``
+                                  (see JsonPathTrie)
+        @param **kwargs: Additional parameters passed to TextComparator, e.g. max_differences
+                         (maximum number of differences to report, default 10)
+        @throws ValueError: If an ignore path is malformed
         """
         super().__init__(encoding=encoding, chunk_size=chunk_size, verbose=verbose, **kwargs)
         self.key_field = key_field
         self.compare_mode = compare_mode
+        key_fields = key_field if isinstance(key_field, list) else [key_field] if key_field else []
+        self._key_paths = [(field, tuple(field.split("."))) for field in key_fields]
+        self.streaming = streaming
+        self.tolerance = None
+        if rtol is not None or atol is not None:
+            self.tolerance = (float(rtol or 0.0), float(atol or 0.0))
+        self.ignore_paths = JsonPathTrie(ignore_paths) if ignore_paths else None
+
+    def _streams(self, file1, file2):
+        """
+        @brief Check whether compare_files may use the streaming path
+        @param file1 Path: Path to the first file
+        @param file2 Path: Path to the second file
+        @return bool: True for exact comparisons when streaming is enabled, or left
+                      automatic and either file is at least STREAM_THRESHOLD bytes or
+                      compressed (its decompressed size is not known up front)
+        @details Key-based matching needs whole lists and always loads the documents.
+        """
+        if (type(self).read_content is not JsonComparator.read_content
+                or type(self).compare_content is not JsonComparator.compare_content):
+            return False
+        if self.compare_mode == "key-based" and self.key_field:
+            return False
+        if self.streaming is not None:
+            return bool(self.streaming)
+        try:
+            if self.compression(file1) or self.compression(file2):
+                return True
+            return max(Path(file1).stat().st_size, Path(file2).stat().st_size) >= STREAM_THRESHOLD
+        except OSError:
+            return False
+
+    def _iter_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Open a token reader over a JSON document for the streaming path
+        @param file_path Path: Path to the JSON file
+        @param start_line int: Starting line number
+        @param end_line int: Ending line number
+        @param start_column int: Starting column number
+        @param end_column int: Ending column number
+        @return JsonTokenReader: Reader over the selected text
+        """
+        return JsonTokenReader(self._iter_text(file_path, start_line, end_line, start_column, end_column),
+                               name=str(file_path))
+
+    def _compare_iterables(self, reader1, reader2):
+        """
+        @brief Compare two JSON documents while they are parsed
+        @param reader1 JsonTokenReader: Reader over the first document
+        @param reader2 JsonTokenReader: Reader over the second document
+        @return tuple: (bool, list) - (identical, differences)
+        @throws ValueError: If either document is not valid JSON
+        """
+        self.logger.debug(f"Comparing JSON content while streaming")
+        differences = []
+        if self.ignore_paths is not None and self.ignore_paths.matches_root():
+            return True, differences
+        self._compare_streamed(reader1, reader2, "", differences, self.max_differences,
+                               paths=self._root_paths())
+        if len(differences) < self.max_differences:
+            # Both documents were read to their end; nothing may follow them
+            for reader in (reader1, reader2):
+                if reader.token()[0] != "eof":
+                    raise reader.error("Extra data after the document")
+        return not differences, differences
+
+    def _compare_streamed(self, reader1, reader2, path, differences, max_diffs=10, paths=()):
+        """
+        @brief Compare the next JSON value of two readers while reading it
+        @param reader1 JsonTokenReader: Reader over the first document
+        @param reader2 JsonTokenReader: Reader over the second document
+        @param path str: Current path in the JSON structure
+        @param differences list: List to store found differences
+        @param max_diffs int: Maximum number of differences to report
+        @param paths tuple: Ignore-path states of path (see _child_paths)
+        @details Values small enough to be parsed whole (see JsonTokenReader.read_value)
+                 are compared by _compare_json_exact, so differences match the loaded
+                 comparison. Larger objects are walked member by member while both
+                 list the same keys in the same order; from the first diverging key
+                 on, the remaining members are loaded and compared as in exact mode.
+                 Larger arrays are walked item by item. Reading stops once max_diffs
+                 differences are found; a length mismatch of an array that was not
+                 read to its end is then not reported.
+        """
+        loaded1, value1 = reader1.read_value()
+        loaded2, value2 = reader2.read_value()
+        if loaded1 and loaded2:
+            # Equal values pass, like the equality check of compare_content
+            if value1 != value2:
+                self._compare_json_exact(value1, value2, path, differences, max_diffs, paths)
+            return
+        # Walk a parsed value on one side against the large one on the other
+        if loaded1:
+            reader1 = JsonTokenReader([json.dumps(value1)], name=reader1.name)
+            value1 = reader1.token()
+        if loaded2:
+            reader2 = JsonTokenReader([json.dumps(value2)], name=reader2.name)
+            value2 = reader2.token()
+        kind1, kind2 = value1[0], value2[0]
+
+        if kind1 == "{" and kind2 == "{":
+            key1 = reader1.object_key(True)
+            key2 = reader2.object_key(True)
+            while key1 is not None and key1 == key2:
+                child = self._child_paths(paths, key1)
+                if child is None:
+                    reader1.skip_value()
+                    reader2.skip_value()
+                else:
+                    new_path = f"{path}.{key1}" if path else key1
+                    self._compare_streamed(reader1, reader2, new_path, differences, max_diffs, child)
+                if len(differences) >= max_diffs:
+                    return
+                key1 = reader1.object_key(False)
+                key2 = reader2.object_key(False)
+            if key1 is not None or key2 is not None:
+                self._compare_json_exact(reader1.rest_of_object(key1), reader2.rest_of_object(key2),
+                                         path, differences, max_diffs, paths)
+            return
+
+        if kind1 == "[" and kind2 == "[":
+            mark = len(differences)
+            length1 = length2 = 0
+            more1 = reader1.array_item(True)
+            more2 = reader2.array_item(True)
+            while more1 and more2:
+                child = self._child_paths(paths, length1)
+                if child is None:
+                    reader1.skip_value()
+                    reader2.skip_value()
+                else:
+                    self._compare_streamed(reader1, reader2, f"{path}[{length1}]", differences, max_diffs, child)
+                if len(differences) >= max_diffs:
+                    return
+                length1 += 1
+                length2 += 1
+                more1 = reader1.array_item(False)
+                more2 = reader2.array_item(False)
+            # Count the items of the longer array without loading them
+            while more1:
+                reader1.skip_value()
+                length1 += 1
+                more1 = reader1.array_item(False)
+            while more2:
+                reader2.skip_value()
+                length2 += 1
+                more2 = reader2.array_item(False)
+            if length1 != length2:
+                # Reported ahead of the item differences, as in exact mode
+                differences.insert(mark, Difference(
+                    position=path or "root",
+                    expected=f"list with {length1} items",
+                    actual=f"list with {length2} items",
+                    diff_type="length_mismatch"
+                ))
+                del differences[max_diffs:]
+            return
+
+        self._compare_json_exact(reader1.value(value1), reader2.value(value2), path, differences, max_diffs, paths)
+
+    def _root_paths(self):
+        """
+        @brief Get the ignore-path states of the document root
+        @return tuple: Trie states, empty when no paths are ignored
+        """
+        return self.ignore_paths.root if self.ignore_paths is not None else ()
+
+    def _child_paths(self, paths, step):
+        """
+        @brief Advance ignore-path states to a member or item
+        @param paths tuple: States of the parent path
+        @param step str or int: Member name or item index
+        @return tuple: States of the child path, or None if the child is ignored
+        """
+        return self.ignore_paths.step(paths, step) if paths else ()
+
+    def _numbers_differ(self, obj1, obj2):
+        """
+        @brief Check two numbers against the configured tolerance
+        @param obj1 int or float: Expected number
+        @param obj2 int or float: Actual number
+        @return bool: True if |obj1 - obj2| > atol + rtol * |obj2|
+        """
+        rtol, atol = self.tolerance
+        return obj1 != obj2 and not abs(obj1 - obj2) <= atol + rtol * abs(obj2)
 
     def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
         """
@@ -68,18 +284,22 @@ class JsonComparator(TextComparator):
         # Quick check for exact equality
         if content1 == content2:
             return True, []
+        if self.ignore_paths is not None and self.ignore_paths.matches_root():
+            return True, []
         
         # Different comparison modes
         differences = []
         if self.compare_mode == "key-based" and self.key_field:
-            self._compare_json_key_based(content1, content2, "", differences)
+            self._compare_json_key_based(content1, content2, "", differences, self.max_differences,
+                                         paths=self._root_paths())
         else:
-            self._compare_json_exact(content1, content2, "", differences)
+            self._compare_json_exact(content1, content2, "", differences, self.max_differences,
+                                     paths=self._root_paths())
         
         identical = len(differences) == 0
         return identical, differences
 
-    def _compare_json_exact(self, obj1, obj2, path, differences, max_diffs=10):
+    def _compare_json_exact(self, obj1, obj2, path, differences, max_diffs=10, paths=()):
         """
         @brief Perform exact JSON comparison
         @param obj1: First JSON object to compare
@@ -87,6 +307,7 @@ class JsonComparator(TextComparator):
         @param path str: Current path in the JSON structure
         @param differences list: List to store found differences
         @param max_diffs int: Maximum number of differences to report
+        @param paths tuple: Ignore-path states of path (see _child_paths)
         @details Compares JSON objects recursively, checking for:
                  - Type mismatches
                  - Missing or extra keys in dictionaries
@@ -96,6 +317,17 @@ class JsonComparator(TextComparator):
         if len(differences) >= max_diffs:
             return
 
+        # Numbers within tolerance match, whether stored as int or float
+        if self.tolerance is not None and _is_number(obj1) and _is_number(obj2):
+            if self._numbers_differ(obj1, obj2):
+                differences.append(Difference(
+                    position=path or "root",
+                    expected=obj1,
+                    actual=obj2,
+                    diff_type="value_mismatch"
+                ))
+            return
+
         # Type check
         if type(obj1) != type(obj2):
             differences.append(Difference(
@@ -113,6 +345,8 @@ class JsonComparator(TextComparator):
 
             # Check for missing keys
             for key in keys1 - keys2:
+                if self._child_paths(paths, key) is None:
+                    continue
                 differences.append(Difference(
                     position=f"{path}.{key}" if path else key,
                     expected=obj1[key],
@@ -124,6 +358,8 @@ class JsonComparator(TextComparator):
 
             # Check for extra keys
             for key in keys2 - keys1:
+                if self._child_paths(paths, key) is None:
+                    continue
                 differences.append(Difference(
                     position=f"{path}.{key}" if path else key,
                     expected=None,
@@ -135,8 +371,11 @@ class JsonComparator(TextComparator):
 
             # Compare common keys recursively
             for key in keys1 & keys2:
+                child = self._child_paths(paths, key)
+                if child is None:
+                    continue
                 new_path = f"{path}.{key}" if path else key
-                self._compare_json_exact(obj1[key], obj2[key], new_path, differences, max_diffs)
+                self._compare_json_exact(obj1[key], obj2[key], new_path, differences, max_diffs, child)
 
         # List comparison
         elif isinstance(obj1, list):
@@ -150,8 +389,11 @@ class JsonComparator(TextComparator):
 
             # Compare items by position
             for i in range(min(len(obj1), len(obj2))):
+                child = self._child_paths(paths, i)
+                if child is None:
+                    continue
                 new_path = f"{path}[{i}]"
-                self._compare_json_exact(obj1[i], obj2[i], new_path, differences, max_diffs)
+                self._compare_json_exact(obj1[i], obj2[i], new_path, differences, max_diffs, child)
 
         # Value comparison
         elif obj1 != obj2:
@@ -162,7 +404,7 @@ class JsonComparator(TextComparator):
                 diff_type="value_mismatch"
             ))
 
-    def _compare_json_key_based(self, obj1, obj2, path, differences, max_diffs=10):
+    def _compare_json_key_based(self, obj1, obj2, path, differences, max_diffs=10, paths=()):
         """
         @brief Perform key-based JSON comparison for lists of objects
         @param obj1: First JSON object to compare
@@ -170,12 +412,24 @@ class JsonComparator(TextComparator):
         @param path str: Current path in the JSON structure
         @param differences list: List to store found differences
         @param max_diffs int: Maximum number of differences to report
+        @param paths tuple: Ignore-path states of path (see _child_paths)
         @details Similar to exact comparison but with special handling for lists
                  of objects, using key fields to match items instead of position
         """
         if len(differences) >= max_diffs:
             return
 
+        # Numbers within tolerance match, whether stored as int or float
+        if self.tolerance is not None and _is_number(obj1) and _is_number(obj2):
+            if self._numbers_differ(obj1, obj2):
+                differences.append(Difference(
+                    position=path or "root",
+                    expected=obj1,
+                    actual=obj2,
+                    diff_type="value_mismatch"
+                ))
+            return
+
         # Type check
         if type(obj1) != type(obj2):
             differences.append(Difference(
@@ -193,6 +447,8 @@ class JsonComparator(TextComparator):
 
             # Check for missing keys
             for key in keys1 - keys2:
+                if self._child_paths(paths, key) is None:
+                    continue
                 differences.append(Difference(
                     position=f"{path}.{key}" if path else key,
                     expected=obj1[key],
@@ -204,6 +460,8 @@ class JsonComparator(TextComparator):
 
             # Check for extra keys
             for key in keys2 - keys1:
+                if self._child_paths(paths, key) is None:
+                    continue
                 differences.append(Difference(
                     position=f"{path}.{key}" if path else key,
                     expected=None,
@@ -215,14 +473,18 @@ class JsonComparator(TextComparator):
 
             # Compare common keys recursively
             for key in keys1 & keys2:
+                child = self._child_paths(paths, key)
+                if child is None:
+                    continue
                 new_path = f"{path}.{key}" if path else key
-                self._compare_json_key_based(obj1[key], obj2[key], new_path, differences, max_diffs)
+                self._compare_json_key_based(obj1[key], obj2[key], new_path, differences, max_diffs, child)
 
         # List comparison - the key difference for key-based comparison
         elif isinstance(obj1, list) and isinstance(obj2, list):
             # Check if we can do key-based comparison
-            if self.key_field and all(isinstance(item, dict) for item in obj1 + obj2):
-                self._compare_lists_by_key(obj1, obj2, path, differences, max_diffs)
+            if (self._key_paths and all(isinstance(item, dict) for item in obj1)
+                    and all(isinstance(item, dict) for item in obj2)):
+                self._compare_lists_by_key(obj1, obj2, path, differences, max_diffs, paths)
             else:
                 # Fall back to position-based comparison if key-based is not possible
                 if len(obj1) != len(obj2):
@@ -235,8 +497,11 @@ class JsonComparator(TextComparator):
 
                 # Compare items by position
                 for i in range(min(len(obj1), len(obj2))):
+                    child = self._child_paths(paths, i)
+                    if child is None:
+                        continue
                     new_path = f"{path}[{i}]"
-                    self._compare_json_key_based(obj1[i], obj2[i], new_path, differences, max_diffs)
+                    self._compare_json_key_based(obj1[i], obj2[i], new_path, differences, max_diffs, child)
 
         # Value comparison
         elif obj1 != obj2:
@@ -247,7 +512,7 @@ class JsonComparator(TextComparator):
                 diff_type="value_mismatch"
             ))
 
-    def _compare_lists_by_key(self, list1, list2, path, differences, max_diffs=10):
+    def _compare_lists_by_key(self, list1, list2, path, differences, max_diffs=10, paths=()):
         """
         @brief Compare two lists of dictionaries using key field(s) to match items
         @param list1 list: First list of dictionaries
@@ -255,69 +520,146 @@ class JsonComparator(TextComparator):
         @param path str: Current path in the JSON structure
         @param differences list: List to store found differences
         @param max_diffs int: Maximum number of differences to report
+        @param paths tuple: Ignore-path states of path (see _child_paths)
         @details Matches items in lists using specified key fields instead of position,
-                 allowing for reordered lists with the same content
+                 allowing for reordered lists with the same content. Both lists are
+                 indexed once by their typed key tuples (see _item_key), so matching
+                 is linear in the number of items. Repeated keys are reported as
+                 duplicate_key and the first item with a key is the one matched. Items
+                 lacking a key field are compared by position among themselves.
         """
-        # Convert key_field to list if it's a string
-        key_fields = self.key_field if isinstance(self.key_field, list) else [self.key_field]
-        
-        # Create dictionaries indexed by the key fields
-        dict1 = {}
-        dict2 = {}
-        
-        # Function to create compound key from an item
-        def get_key(item):
-            if not all(k in item for k in key_fields):
-                return None  # Skip items without all key fields
-            return tuple(str(item.get(k)) for k in key_fields)
-        
-        # Build dictionaries from lists
-        for i, item in enumerate(list1):
-            key = get_key(item)
-            if key:
-                dict1[key] = (i, item)
-        
-        for i, item in enumerate(list2):
-            key = get_key(item)
-            if key:
-                dict2[key] = (i, item)
-        
+        index1, unkeyed1 = self._index_by_key(list1, path, differences, max_diffs, paths, expected=True)
+        index2, unkeyed2 = self._index_by_key(list2, path, differences, max_diffs, paths, expected=False)
+
         # Find keys in the first list that are missing from the second
-        for key in set(dict1.keys()) - set(dict2.keys()):
-            idx, item = dict1[key]
-            key_str = ".".join(f"{k}={v}" for k, v in zip(key_fields, key))
+        for key, (idx, item) in index1.items():
+            if len(differences) >= max_diffs:
+                return
+            if key in index2 or self._child_paths(paths, idx) is None:
+                continue
             differences.append(Difference(
-                position=f"{path}[{idx}] (key: {key_str})",
+                position=f"{path}[{idx}] (key: {self._key_label(key)})",
                 expected=item,
                 actual=None,
                 diff_type="missing_item"
             ))
+
+        # Find keys in the second list that are missing from the first
+        for key, (idx, item) in index2.items():
             if len(differences) >= max_diffs:
                 return
-        
-        # Find keys in the second list that are missing from the first
-        for key in set(dict2.keys()) - set(dict1.keys()):
-            idx, item = dict2[key]
-            key_str = ".".join(f"{k}={v}" for k, v in zip(key_fields, key))
+            if key in index1 or self._child_paths(paths, idx) is None:
+                continue
             differences.append(Difference(
-                position=f"{path}[{idx}] (key: {key_str})",
+                position=f"{path}[{idx}] (key: {self._key_label(key)})",
                 expected=None,
                 actual=item,
                 diff_type="extra_item"
             ))
+
+        # Compare matching items
+        for key, (idx1, item1) in index1.items():
             if len(differences) >= max_diffs:
                 return
-        
-        # Compare matching items
-        for key in set(dict1.keys()) & set(dict2.keys()):
-            idx1, item1 = dict1[key]
-            idx2, item2 = dict2[key]
-            key_str = ".".join(f"{k}={v}" for k, v in zip(key_fields, key))
-            new_path = f"{path}[key:{key_str}]"
-            
+            entry = index2.get(key)
             # Skip identical items
-            if item1 == item2:
+            if entry is None or entry[1] == item1:
                 continue
-                
+            child = self._child_paths(paths, idx1)
+            if child is None:
+                continue
+            new_path = f"{path}[key:{self._key_label(key)}]"
             # Recursive comparison of matched items
-            self._compare_json_key_based(item1, item2, new_path, differences, max_diffs)
\ No newline at end of file
+            self._compare_json_key_based(item1, entry[1], new_path, differences, max_diffs, child)
+
+        # Items without all key fields are compared by position
+        for (idx1, item1), (idx2, item2) in zip(unkeyed1, unkeyed2):
+            if len(differences) >= max_diffs:
+                return
+            child = self._child_paths(paths, idx1)
+            if child is not None and item1 != item2:
+                self._compare_json_key_based(item1, item2, f"{path}[{idx1}]", differences, max_diffs, child)
+        for idx, item in unkeyed1[len(unkeyed2):]:
+            if len(differences) >= max_diffs:
+                return
+            if self._child_paths(paths, idx) is not None:
+                differences.append(Difference(
+                    position=f"{path}[{idx}]",
+                    expected=item,
+                    actual=None,
+                    diff_type="missing_item"
+                ))
+        for idx, item in unkeyed2[len(unkeyed1):]:
+            if len(differences) >= max_diffs:
+                return
+            if self._child_paths(paths, idx) is not None:
+                differences.append(Difference(
+                    position=f"{path}[{idx}]",
+                    expected=None,
+                    actual=item,
+                    diff_type="extra_item"
+                ))
+
+    def _index_by_key(self, items, path, differences, max_diffs, paths, expected):
+        """
+        @brief Index a list of dictionaries by their key tuples
+        @param items list: List of dictionaries
+        @param path str: Path of the list in the JSON structure
+        @param differences list: List to store duplicate_key differences
+        @param max_diffs int: Maximum number of differences to report
+        @param paths tuple: Ignore-path states of path (see _child_paths)
+        @param expected bool: True for the first (expected) list
+        @return tuple: (dict, list) - key tuple -> (index, item) for the first item
+                       with each key, and (index, item) pairs of items without a key
+        """
+        index = {}
+        unkeyed = []
+        item_key = self._item_key
+        for i, item in enumerate(items):
+            key = item_key(item)
+            if key is None:
+                unkeyed.append((i, item))
+            elif key not in index:
+                index[key] = (i, item)
+            elif len(differences) < max_diffs and self._child_paths(paths, i) is not None:
+                differences.append(Difference(
+                    position=f"{path}[{i}] (key: {self._key_label(key)})",
+                    expected=item if expected else None,
+                    actual=None if expected else item,
+                    diff_type="duplicate_key"
+                ))
+        return index, unkeyed
+
+    def _item_key(self, item):
+        """
+        @brief Build the key tuple of a list item
+        @param item dict: List item
+        @return tuple: One (type, value) pair per key field, or None if a field is missing
+        @details Key fields name a member, or a dotted path to a nested member
+                 (``meta.id``) when no member has the literal name. Values are
+                 paired with their type so that ``1``, ``1.0``, ``True`` and ``"1"``
+                 are different keys; lists and objects are keyed by their
+                 canonical JSON text.
+        """
+        key = []
+        for field, steps in self._key_paths:
+            if field in item:
+                value = item[field]
+            else:
+                value = item
+                for step in steps:
+                    if not isinstance(value, dict) or step not in value:
+                        return None
+                    value = value[step]
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, sort_keys=True)
+            key.append((type(value), value))
+        return tuple(key)
+
+    def _key_label(self, key):
+        """
+        @brief Format a key tuple for difference positions
+        @param key tuple: Key tuple from _item_key
+        @return str: ``field=value`` pairs joined by dots
+        """
+        return ".".join(f"{field}={value}" for (field, _), (_, value) in zip(self._key_paths, key))
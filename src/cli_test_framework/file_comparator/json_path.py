@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file json_path.py
+@brief Path-matching trie for JSONPath-like ignore patterns
+@author Xiaotong Wang
+@date 2025
+"""
+
+import fnmatch
+import re
+
+# One step of a pattern: "..", ".name", "[index]", "[*]", "['name']" or a bare
+# name (only valid right after "..")
+_STEP = re.compile(r'''(\.\.)|\.([^.\[\]]+)|\[(\*|\d+|'[^']*'|"[^"]*")\]|([^.\[\]]+)''')
+
+
+class _PathNode:
+    """
+    @brief State of the path trie
+    @details ``recursive`` nodes stand for a ".." step: they stay active at any depth
+             below the node that introduced them.
+    """
+
+    __slots__ = ("keys", "globs", "indexes", "wildcard", "descendant", "recursive", "terminal")
+
+    def __init__(self, recursive=False):
+        self.keys = {}
+        self.globs = {}
+        self.indexes = {}
+        self.wildcard = None
+        self.descendant = None
+        self.recursive = recursive
+        self.terminal = False
+
+
+class JsonPathTrie:
+    """
+    @brief Set of JSONPath-like patterns compiled into one trie
+    @details Patterns start with ``$`` (the document root) followed by steps:
+             - ``.name`` or ``['name']``: member of an object; ``*`` and ``?`` in a
+               name are glob wildcards,
+             - ``[N]``: item N of an array,
+             - ``.*`` or ``[*]``: any member or item,
+             - ``..name``: ``name`` at any depth below.
+             Patterns share their common prefixes. Callers walking a document keep
+             the set of active trie states for the current path and advance it with
+             step(), which tells when the path matches a pattern.
+    """
+
+    def __init__(self, patterns):
+        """
+        @brief Compile patterns into a trie
+        @param patterns list: Pattern strings (a single string is accepted too)
+        @throws ValueError: If a pattern is malformed
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        self._root = _PathNode()
+        for pattern in patterns:
+            self._add(pattern)
+        self.root = self._closure([self._root])
+
+    def _add(self, pattern):
+        """
+        @brief Add one pattern to the trie
+        @param pattern str: Pattern string
+        @throws ValueError: If the pattern is malformed
+        """
+        if not isinstance(pattern, str) or not pattern.startswith("$"):
+            raise ValueError(f"Invalid JSON path {pattern!r}: must start with '$'")
+        node = self._root
+        pos = 1
+        recursive = False
+        while pos < len(pattern):
+            match = _STEP.match(pattern, pos)
+            if match is None or (match.group(4) is not None and not recursive):
+                raise ValueError(f"Invalid JSON path {pattern!r} at position {pos}")
+            pos = match.end()
+            if match.group(1):
+                if recursive:
+                    raise ValueError(f"Invalid JSON path {pattern!r}: repeated '..'")
+                if node.descendant is None:
+                    node.descendant = _PathNode(recursive=True)
+                node = node.descendant
+                recursive = True
+                continue
+            recursive = False
+
+            name = match.group(2) or match.group(4)
+            bracket = match.group(3)
+            if name is None and bracket[0] in "'\"":
+                node = node.keys.setdefault(bracket[1:-1], _PathNode())
+            elif name == "*" or bracket == "*":
+                if node.wildcard is None:
+                    node.wildcard = _PathNode()
+                node = node.wildcard
+            elif name is None:
+                node = node.indexes.setdefault(int(bracket), _PathNode())
+            elif "*" in name or "?" in name:
+                if name not in node.globs:
+                    node.globs[name] = (re.compile(fnmatch.translate(name)), _PathNode())
+                node = node.globs[name][1]
+            else:
+                node = node.keys.setdefault(name, _PathNode())
+        if recursive:
+            raise ValueError(f"Invalid JSON path {pattern!r}: '..' must be followed by a step")
+        node.terminal = True
+
+    @staticmethod
+    def _closure(nodes):
+        """
+        @brief Add the ".." states introduced by a set of states
+        @param nodes list: Active states
+        @return tuple: The states and their descendant states, without duplicates
+        """
+        states = {}
+        for node in nodes:
+            states[node] = None
+            if node.descendant is not None:
+                states[node.descendant] = None
+        return tuple(states)
+
+    def matches_root(self):
+        """
+        @brief Check whether a pattern selects the whole document ("$")
+        @return bool: True if the root is matched
+        """
+        return self._root.terminal
+
+    def step(self, states, step):
+        """
+        @brief Advance the active states by one path step
+        @param states tuple: Active states of the parent path
+        @param step str or int: Object member name or array index
+        @return tuple: Active states of the child path (empty when no pattern can
+                       match below it), or None if the child path matches a pattern
+        """
+        nodes = []
+        for node in states:
+            if node.recursive:
+                nodes.append(node)
+            if node.wildcard is not None:
+                nodes.append(node.wildcard)
+            if isinstance(step, str):
+                child = node.keys.get(step)
+                if child is not None:
+                    nodes.append(child)
+                for regex, child in node.globs.values():
+                    if regex.match(step):
+                        nodes.append(child)
+            else:
+                child = node.indexes.get(step)
+                if child is not None:
+                    nodes.append(child)
+        for node in nodes:
+            if node.terminal:
+                return None
+        return self._closure(nodes) if nodes else ()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file json_stream.py
+@brief Incremental pull tokenizer for JSON documents read in chunks
+@author Xiaotong Wang
+@date 2025
+"""
+
+import json
+import re
+from json.decoder import JSONDecodeError, scanstring
+from json.scanner import make_scanner
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Whitespace, then punctuation (or a string's opening quote), number or literal
+_TOKEN = re.compile(
+    r'[ \t\n\r]*(?:'
+    r'([{}\[\],:"])'
+    r'|(-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?)'
+    r'|(true|false|null|NaN|Infinity|-Infinity))'
+)
+_LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+# Longest literal, so a shorter unmatched tail may still be an incomplete token
+_MAX_LITERAL = 9
+# Longest tail an incomplete number leaves unmatched ("e+" of "1e+5")
+_NUMBER_TAIL = 2
+# Longest escape sequence (a surrogate pair of \uXXXX escapes)
+_ESCAPE_TAIL = 12
+# Characters buffered at most to parse one value whole
+SCAN_LIMIT = 1 << 20
+
+# json's own (C) value scanner, so values parse exactly as with json.loads
+_scan_once = make_scanner(json.JSONDecoder())
+
+
+class JsonTokenReader:
+    """
+    @brief Reads JSON tokens from an iterable of text chunks
+    @details Tokens are ``(kind, value)`` pairs where kind is one of ``{ } [ ] : ,``
+             for punctuation, ``"value"`` for strings, numbers and literals (parsed
+             like the json module does), or ``"eof"``. Only the unread part of the
+             current chunk is buffered. read_value() parses values that fit within
+             SCAN_LIMIT characters whole with the json module's scanner; larger ones
+             are walked token by token. Container helpers (object_key, array_item,
+             value, skip) build on token() so callers can walk a document, load a
+             subtree or skip it without holding the rest of the document.
+    """
+
+    def __init__(self, chunks, name="<json>", scan_limit=None):
+        """
+        @brief Initialize the reader
+        @param chunks iterable: Text chunks of the document, in order
+        @param name str: Document name used in error messages
+        @param scan_limit int: Characters buffered at most to parse one value whole
+                               (None for SCAN_LIMIT)
+        """
+        self._chunks = iter(chunks)
+        self.name = name
+        self.scan_limit = SCAN_LIMIT if scan_limit is None else scan_limit
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def close(self):
+        """
+        @brief Close the underlying chunk source if it supports it
+        """
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+
+    def _fill(self):
+        """
+        @brief Append the next chunk to the unread buffer
+        @return bool: False once the input is exhausted
+        """
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _fill_past(self, char):
+        """
+        @brief Append chunks until one contains a character
+        @param char str: Character to look for
+        @return bool: False if the input ended without any new chunk
+        @details Chunks are collected and joined once, so a long string spanning
+                 many chunks is not copied for each of them.
+        """
+        parts = [self._buf[self._pos:]]
+        while True:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            parts.append(chunk)
+            if char in chunk:
+                break
+        if len(parts) == 1:
+            return False
+        self._buf = "".join(parts)
+        self._pos = 0
+        return True
+
+    def error(self, message):
+        """
+        @brief Build the error raised for malformed input
+        @param message str: What was wrong
+        @return ValueError: Error naming the document
+        """
+        return ValueError(f"Invalid JSON in {self.name}: {message}")
+
+    def token(self):
+        """
+        @brief Read the next token
+        @return tuple: (kind, value)
+        @throws ValueError: If the input is not valid JSON
+        """
+        while True:
+            buf = self._buf
+            match = _TOKEN.match(buf, self._pos)
+            if match is None:
+                pos = _WHITESPACE.match(buf, self._pos).end()
+                # Whitespace or the start of a literal may continue in the next chunk
+                if len(buf) - pos < _MAX_LITERAL and self._fill():
+                    continue
+                self._pos = pos
+                if pos == len(buf):
+                    return "eof", None
+                raise self.error(f"Unexpected input at {buf[pos:pos + 40]!r}")
+            if match.end() + _NUMBER_TAIL >= len(buf) and not self._eof:
+                # A number or literal close to the end of the buffer may continue
+                self._fill()
+                continue
+
+            group = match.lastindex
+            if group == 1:
+                kind = match.group(1)
+                if kind != '"':
+                    self._pos = match.end()
+                    return kind, None
+                try:
+                    value, end = scanstring(buf, match.end(), True)
+                except JSONDecodeError as e:
+                    # The closing quote or the rest of an escape may be in a later chunk
+                    cut = e.msg.startswith("Unterminated") or e.pos >= len(buf) - _ESCAPE_TAIL
+                    if cut and self._fill_past('"'):
+                        continue
+                    raise self.error(f"{e.msg}: {buf[match.end() - 1:match.end() + 39]!r}")
+                self._pos = end
+                return "value", value
+
+            self._pos = match.end()
+            if group == 2:
+                text = match.group(2)
+                if match.group(3) or match.group(4):
+                    return "value", float(text)
+                return "value", int(text)
+            return "value", _LITERALS[match.group(5)]
+
+    def read_value(self):
+        """
+        @brief Read the next value whole if it fits within scan_limit characters
+        @return tuple: (True, value) if the value was parsed, else (False, token)
+                       with the value's first token read
+        @details Malformed input is left to token(), which reports it.
+        """
+        while True:
+            buf = self._buf
+            pos = _WHITESPACE.match(buf, self._pos).end()
+            try:
+                value, end = _scan_once(buf, pos)
+            except (StopIteration, ValueError):
+                end = None
+            # A number at the end of the buffer may continue in the next chunk
+            if end is not None and (self._eof or end + _NUMBER_TAIL < len(buf)):
+                self._pos = end
+                return True, value
+            if self._eof or (end is None and len(buf) - self._pos >= self.scan_limit):
+                return False, self.token()
+            self._fill()
+
+    def expect(self, kind):
+        """
+        @brief Read a token of a given kind
+        @param kind str: Expected token kind
+        @throws ValueError: If another token follows
+        """
+        token = self.token()
+        if token[0] != kind:
+            raise self.error(f"Expecting '{kind}', got {token[0]!r}")
+
+    def object_key(self, first):
+        """
+        @brief Read the next member key of an object whose '{' was consumed
+        @param first bool: True for the first member
+        @return str: The key (its ':' consumed), or None at the closing '}'
+        """
+        kind, value = self.token()
+        if kind == "}":
+            return None
+        if not first:
+            if kind != ",":
+                raise self.error(f"Expecting ',' or '}}' in object, got {kind!r}")
+            kind, value = self.token()
+        if kind != "value" or not isinstance(value, str):
+            raise self.error(f"Expecting property name, got {kind!r}")
+        self.expect(":")
+        return value
+
+    def array_item(self, first):
+        """
+        @brief Move to the next item of an array whose '[' was consumed
+        @param first bool: True for the first item
+        @return bool: True if an item follows (left unread), False at the closing ']'
+        """
+        char = self._peek()
+        if char == "]":
+            self._pos += 1
+            return False
+        if not first:
+            if char != ",":
+                raise self.error(f"Expecting ',' or ']' in array, got {char or 'end of document'!r}")
+            self._pos += 1
+        return True
+
+    def _peek(self):
+        """
+        @brief Skip whitespace and look at the next character
+        @return str: The character, or "" at the end of the input
+        """
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def value(self, token):
+        """
+        @brief Load the value starting with a token
+        @param token tuple: First token of the value
+        @return object: The parsed value
+        """
+        kind, value = token
+        if kind == "value":
+            return value
+        if kind == "{":
+            return self.rest_of_object(self.object_key(True))
+        if kind == "[":
+            items = []
+            while self.array_item(not items):
+                items.append(self.value(self.token()))
+            return items
+        raise self.error(f"Expecting value, got {kind!r}")
+
+    def rest_of_object(self, key):
+        """
+        @brief Load the remaining members of an object
+        @param key str: Key whose ':' was just consumed, or None if the '}' was read
+        @return dict: The member for key and all following members
+        """
+        obj = {}
+        while key is not None:
+            obj[key] = self.value(self.token())
+            key = self.object_key(False)
+        return obj
+
+    def skip_value(self):
+        """
+        @brief Consume the next value without comparing it
+        """
+        loaded, token = self.read_value()
+        if not loaded:
+            self.skip(token)
+
+    def skip(self, token):
+        """
+        @brief Consume the value starting with a token without building it
+        @param token tuple: First token of the value
+        """
+        if token[0] not in ("value", "{", "["):
+            raise self.error(f"Expecting value, got {token[0]!r}")
+        if token[0] == "value":
+            return
+        depth = 1
+        while depth:
+            kind = self.token()[0]
+            if kind in ("{", "["):
+                depth += 1
+            elif kind in ("}", "]"):
+                depth -= 1
+            elif kind == "eof":
+                raise self.error("Unexpected end of document")
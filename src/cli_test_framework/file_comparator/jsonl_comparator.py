@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file jsonl_comparator.py
+@brief JSON Lines (NDJSON) comparator with batched, parallel record comparison
+@author Xiaotong Wang
+@date 2025
+"""
+
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from .json_comparator import JsonComparator
+from .result import Difference
+
+# Comparators built by pool workers, keyed by their options
+_worker_comparators = {}
+
+
+def _parse_record(name, number, text):
+    """
+    @brief Parse one JSON Lines record
+    @param name str: File name used in error messages
+    @param number int: Line number of the record
+    @param text str: Text of the line
+    @return object: The parsed record
+    @throws ValueError: If the line is not valid JSON
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in {name} at line {number}: {str(e)}")
+
+
+def _parse_batch(name, batch):
+    """
+    @brief Parse a batch of records (pool task)
+    @param name str: File name used in error messages
+    @param batch list: (line number, text) pairs
+    @return list: (line number, record) pairs
+    """
+    return [(number, _parse_record(name, number, text)) for number, text in batch]
+
+
+def _compare_batch(options, name1, name2, batch1, batch2):
+    """
+    @brief Compare a batch of records by position (pool task)
+    @param options dict: Keyword arguments of the comparator (see JsonlComparator._options)
+    @param name1 str: Name of the first file
+    @param name2 str: Name of the second file
+    @param batch1 list: (line number, text) pairs of the first file
+    @param batch2 list: (line number, text) pairs of the second file
+    @return list: Differences found in the batch
+    """
+    key = json.dumps(options, sort_keys=True)
+    comparator = _worker_comparators.get(key)
+    if comparator is None:
+        comparator = _worker_comparators[key] = JsonlComparator(digest_cache=False, **options)
+    return comparator._compare_batch(name1, name2, batch1, batch2)
+
+
+class _RecordLines:
+    """
+    @brief Non-blank lines of a JSON Lines file, with their line numbers
+    """
+
+    def __init__(self, lines, name, first_line, size):
+        """
+        @brief Initialize the line source
+        @param lines generator: Lines of the compared range
+        @param name str: File name used in error messages
+        @param first_line int: Line number of the first line
+        @param size int: File size in bytes
+        """
+        self._lines = lines
+        self.name = name
+        self.first_line = first_line
+        self.size = size
+
+    def __iter__(self):
+        for number, line in enumerate(self._lines, self.first_line):
+            if line.strip():
+                yield number, line
+
+    def close(self):
+        """
+        @brief Close the underlying line generator
+        """
+        self._lines.close()
+
+
+class JsonlComparator(JsonComparator):
+    """
+    @brief Comparator for JSON Lines / NDJSON files (one JSON record per line)
+    @details Records are compared by position, or matched by ``key_field`` when it
+             is set. Differences use the JSON comparator's rules, including
+             ``rtol``/``atol`` and ``ignore_paths`` (``$`` is each record), with
+             positions prefixed by the record's line number. Blank lines are
+             skipped.
+
+             In positional mode both files are read in batches of ``batch_size``
+             records. Batches are parsed and compared by a pool of ``num_threads``
+             workers (processes by default, since parsing holds the GIL) that
+             return only their differences; a bounded number of batches is in
+             flight, so memory does not grow with the file size, and reading stops
+             once max_differences differences are found. Lines with identical text
+             are not parsed. Key matching needs all records and keeps them in
+             memory; their parsing is still spread over the pool.
+    """
+
+    # Combined size of both files from which batches are handed to a worker pool
+    PARALLEL_THRESHOLD = 8 << 20
+
+    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, key_field=None, rtol=None, atol=None,
+                 ignore_paths=None, max_differences=10, num_threads=4, execution_mode="process",
+                 batch_size=2000, **kwargs):
+        """
+        @brief Initialize the JSON Lines comparator
+        @param encoding str: File encoding
+        @param chunk_size int: Chunk size for reading files
+        @param verbose bool: Enable verbose logging
+        @param key_field str or list: Record field(s) used to match records instead of
+                                      their position; dotted names select nested fields
+        @param rtol float: Relative tolerance for numbers (None with atol None for exact values)
+        @param atol float: Absolute tolerance for numbers
+        @param ignore_paths list: JSONPath-like patterns of record values left out of the comparison
+        @param max_differences int: Maximum number of differences to report
+        @param num_threads int: Number of pool workers (1 to compare in the calling thread)
+        @param execution_mode str: 'process' (default) or 'thread' pool workers
+        @param batch_size int: Records per batch handed to a worker
+        @param **kwargs: Additional parameters passed to JsonComparator
+        @throws ValueError: If an ignore path is malformed
+        """
+        super().__init__(encoding=encoding, chunk_size=chunk_size, verbose=verbose, key_field=key_field,
+                         rtol=rtol, atol=atol, ignore_paths=ignore_paths, max_differences=max_differences,
+                         **kwargs)
+        self.num_threads = num_threads
+        self.execution_mode = execution_mode
+        self.batch_size = max(1, int(batch_size))
+        # Options rebuilding an equivalent comparator in pool workers
+        self._options = {
+            "encoding": encoding,
+            "key_field": key_field,
+            "rtol": rtol,
+            "atol": atol,
+            "ignore_paths": ignore_paths,
+            "max_differences": max_differences,
+        }
+
+    def _streams(self, file1, file2):
+        """
+        @brief Check whether compare_files may use the streaming path
+        @param file1 Path: Path to the first file
+        @param file2 Path: Path to the second file
+        @return bool: True unless a subclass replaced read_content or compare_content
+        """
+        return (type(self).read_content is JsonlComparator.read_content
+                and type(self).compare_content is JsonlComparator.compare_content)
+
+    def _iter_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Lazily read the record lines compared by the streaming path
+        @param file_path Path: Path to the JSON Lines file
+        @param start_line int: Starting line number
+        @param end_line int: Ending line number
+        @param start_column int: Starting column number
+        @param end_column int: Ending column number
+        @return _RecordLines: Non-blank lines with their 1-based line numbers
+        """
+        try:
+            size = Path(file_path).stat().st_size
+        except OSError:
+            size = 0
+        lines = self._iter_lines(file_path, start_line, end_line, start_column, end_column)
+        return _RecordLines(lines, str(file_path), start_line + 1, size)
+
+    def _compare_iterables(self, lines1, lines2):
+        """
+        @brief Compare the records of two files while they are read
+        @param lines1 _RecordLines: Record lines of the first file
+        @param lines2 _RecordLines: Record lines of the second file
+        @return tuple: (bool, list) - (identical, differences)
+        @throws ValueError: If a record is not valid JSON
+        """
+        parallel = self.num_threads > 1 and lines1.size + lines2.size >= self.PARALLEL_THRESHOLD
+        if self._key_paths:
+            records1 = self._parse_all(lines1, parallel)
+            records2 = self._parse_all(lines2, parallel)
+            return self._finish(self._compare_keyed(records1, records2))
+
+        differences = []
+        if parallel:
+            compare = partial(_compare_batch, self._options, lines1.name, lines2.name)
+        else:
+            compare = partial(self._compare_batch, lines1.name, lines2.name)
+        for found in self._map_batches(compare, self._paired_batches(iter(lines1), iter(lines2)), parallel):
+            differences.extend(found)
+            if len(differences) >= self.max_differences:
+                break
+        return self._finish(differences)
+
+    def _paired_batches(self, lines1, lines2):
+        """
+        @brief Split the record lines of both files into aligned batches
+        @param lines1 iterator: (line number, text) pairs of the first file
+        @param lines2 iterator: (line number, text) pairs of the second file
+        @return generator: (batch1, batch2) lists of up to batch_size records each;
+                           near the end the batch of the shorter file is shorter
+        """
+        while True:
+            batch1 = list(islice(lines1, self.batch_size))
+            batch2 = list(islice(lines2, self.batch_size))
+            if not batch1 and not batch2:
+                return
+            yield batch1, batch2
+
+    def _parse_all(self, lines, parallel):
+        """
+        @brief Parse all records of a file
+        @param lines _RecordLines: Record lines of the file
+        @param parallel bool: Parse batches in the worker pool
+        @return list: (line number, record) pairs
+        """
+        iter_lines = iter(lines)
+        batches = ((batch,) for batch in iter(lambda: list(islice(iter_lines, self.batch_size)), []))
+        records = []
+        for parsed in self._map_batches(partial(_parse_batch, lines.name), batches, parallel):
+            records.extend(parsed)
+        return records
+
+    def _map_batches(self, function, batches, parallel):
+        """
+        @brief Apply a function to batches, returning the results in batch order
+        @param function callable: Task applied to each batch's arguments
+        @param batches iterable: Argument tuples, one per batch
+        @param parallel bool: Run the tasks in a worker pool
+        @return generator: Task results in batch order
+        @details At most two batches per worker are submitted ahead of the result
+                 being consumed, which bounds the memory held by pending batches.
+                 Closing the generator cancels the batches not yet started.
+        """
+        if not parallel:
+            for args in batches:
+                yield function(*args)
+            return
+        executor_class = ProcessPoolExecutor if self.execution_mode == "process" else ThreadPoolExecutor
+        with executor_class(max_workers=self.num_threads) as pool:
+            pending = deque()
+            try:
+                for args in batches:
+                    pending.append(pool.submit(function, *args))
+                    if len(pending) >= 2 * self.num_threads:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _compare_batch(self, name1, name2, batch1, batch2):
+        """
+        @brief Compare a batch of records by position
+        @param name1 str: Name of the first file
+        @param name2 str: Name of the second file
+        @param batch1 list: (line number, text) pairs of the first file
+        @param batch2 list: (line number, text) pairs of the second file
+        @return list: Up to max_differences differences
+        """
+        differences = []
+        for (number1, text1), (number2, text2) in zip(batch1, batch2):
+            # Identical lines hold equal records
+            if text1 != text2:
+                self._compare_record(number1, _parse_record(name1, number1, text1),
+                                     _parse_record(name2, number2, text2), differences)
+                if len(differences) >= self.max_differences:
+                    return differences
+        for number, text in batch1[len(batch2):]:
+            differences.append(Difference(
+                position=f"line {number}",
+                expected=_parse_record(name1, number, text),
+                actual=None,
+                diff_type="missing_item"
+            ))
+            if len(differences) >= self.max_differences:
+                return differences
+        for number, text in batch2[len(batch1):]:
+            differences.append(Difference(
+                position=f"line {number}",
+                expected=None,
+                actual=_parse_record(name2, number, text),
+                diff_type="extra_item"
+            ))
+            if len(differences) >= self.max_differences:
+                return differences
+        return differences
+
+    def _compare_record(self, number, record1, record2, differences, path=None):
+        """
+        @brief Compare two records with the JSON comparison rules
+        @param number int: Line number of the record in the first file
+        @param record1: Expected record
+        @param record2: Actual record
+        @param differences list: List to store found differences
+        @param path str: Position prefix (None for "line <number>")
+        """
+        if record1 == record2 or len(differences) >= self.max_differences:
+            return
+        if self.ignore_paths is None or not self.ignore_paths.matches_root():
+            self._compare_json_exact(record1, record2, path or f"line {number}", differences,
+                                     self.max_differences, self._root_paths())
+
+    def _compare_keyed(self, records1, records2):
+        """
+        @brief Match records by key_field and compare them
+        @param records1 list: (line number, record) pairs of the first file
+        @param records2 list: (line number, record) pairs of the second file
+        @return list: Differences found
+        @details Records are indexed by their typed key tuples (see _item_key).
+                 Repeated keys are reported as duplicate_key; records that are not
+                 objects or lack a key field are compared by position among
+                 themselves.
+        """
+        differences = []
+        max_diffs = self.max_differences
+        index1, unkeyed1 = self._index_records(records1, differences, expected=True)
+        index2, unkeyed2 = self._index_records(records2, differences, expected=False)
+
+        for key, (number, record) in index1.items():
+            if len(differences) >= max_diffs:
+                return differences
+            if key not in index2:
+                differences.append(Difference(
+                    position=f"line {number} (key: {self._key_label(key)})",
+                    expected=record,
+                    actual=None,
+                    diff_type="missing_item"
+                ))
+        for key, (number, record) in index2.items():
+            if len(differences) >= max_diffs:
+                return differences
+            if key not in index1:
+                differences.append(Difference(
+                    position=f"line {number} (key: {self._key_label(key)})",
+                    expected=None,
+                    actual=record,
+                    diff_type="extra_item"
+                ))
+        for key, (number, record) in index1.items():
+            entry = index2.get(key)
+            if entry is not None:
+                self._compare_record(number, record, entry[1], differences, f"[key:{self._key_label(key)}]")
+            if len(differences) >= max_diffs:
+                return differences
+
+        self._compare_positional(unkeyed1, unkeyed2, differences)
+        return differences[:max_diffs]
+
+    def _compare_positional(self, records1, records2, differences):
+        """
+        @brief Compare records by position, stopping at max_differences
+        @param records1 list: (line number, record) pairs of the first file
+        @param records2 list: (line number, record) pairs of the second file
+        @param differences list: List to store found differences
+        """
+        max_diffs = self.max_differences
+        for (number, record1), (_, record2) in zip(records1, records2):
+            if len(differences) >= max_diffs:
+                return
+            self._compare_record(number, record1, record2, differences)
+        for number, record in records1[len(records2):]:
+            if len(differences) >= max_diffs:
+                return
+            differences.append(Difference(
+                position=f"line {number}",
+                expected=record,
+                actual=None,
+                diff_type="missing_item"
+            ))
+        for number, record in records2[len(records1):]:
+            if len(differences) >= max_diffs:
+                return
+            differences.append(Difference(
+                position=f"line {number}",
+                expected=None,
+                actual=record,
+                diff_type="extra_item"
+            ))
+
+    def _index_records(self, records, differences, expected):
+        """
+        @brief Index records by their key tuples
+        @param records list: (line number, record) pairs
+        @param differences list: List to store duplicate_key differences
+        @param expected bool: True for the first (expected) file
+        @return tuple: (dict, list) - key tuple -> (line number, record) for the first
+                       record with each key, and records without a key
+        """
+        index = {}
+        unkeyed = []
+        for number, record in records:
+            key = self._item_key(record) if isinstance(record, dict) else None
+            if key is None:
+                unkeyed.append((number, record))
+            elif key not in index:
+                index[key] = (number, record)
+            elif len(differences) < self.max_differences:
+                differences.append(Difference(
+                    position=f"line {number} (key: {self._key_label(key)})",
+                    expected=record if expected else None,
+                    actual=None if expected else record,
+                    diff_type="duplicate_key"
+                ))
+        return index, unkeyed
+
+    def _finish(self, differences):
+        """
+        @brief Cap the differences and mark when the cap was reached
+        @param differences list: Differences found
+        @return tuple: (bool, list) - (identical, differences)
+        """
+        if len(differences) >= self.max_differences:
+            del differences[self.max_differences:]
+            differences.append(Difference(
+                position=None,
+                expected=None,
+                actual=None,
+                diff_type="more differences not shown"
+            ))
+        return not differences, differences
+
+    def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Read and parse all records of a JSON Lines file
+        @param file_path Path: Path to the JSON Lines file
+        @param start_line int: Starting line number
+        @param end_line int: Ending line number
+        @param start_column int: Starting column number
+        @param end_column int: Ending column number
+        @return list: (line number, record) pairs, blank lines skipped
+        @throws ValueError: If a record is not valid JSON
+        """
+        lines = self._iter_content(file_path, start_line, end_line, start_column, end_column)
+        try:
+            return [(number, _parse_record(lines.name, number, text)) for number, text in lines]
+        finally:
+            lines.close()
+
+    def compare_content(self, content1, content2):
+        """
+        @brief Compare parsed records by position or key
+        @param content1 list: (line number, record) pairs of the first file
+        @param content2 list: (line number, record) pairs of the second file
+        @return tuple: (bool, list) - (identical, differences)
+        """
+        if self._key_paths:
+            return self._finish(self._compare_keyed(content1, content2))
+        differences = []
+        self._compare_positional(content1, content2, differences)
+        return self._finish(differences)
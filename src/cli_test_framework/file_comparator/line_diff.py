@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file line_diff.py
+@brief Streaming line-level diff engine with a bounded difference count
+@author Xiaotong Wang
+@date 2025
+"""
+
+from itertools import islice
+from .result import Difference
+
+
+class _LineBuffer:
+    """
+    @brief Look-ahead buffer over a line iterator
+    @details Keeps only the lines between the consumed position and the current
+             look-ahead, so memory is bounded by the diff window.
+    """
+
+    def __init__(self, lines):
+        """
+        @brief Initialize the buffer
+        @param lines iterable: Lines to read lazily
+        """
+        self._iterator = iter(lines)
+        self._lines = []
+        self._pos = 0
+        self.consumed = 0
+        self.eof = False
+
+    def window(self, size):
+        """
+        @brief Get up to ``size`` unconsumed lines, reading more if needed
+        @param size int: Maximum number of lines
+        @return list: The next lines (fewer only at end of input)
+        """
+        missing = self._pos + size - len(self._lines)
+        if missing > 0 and not self.eof:
+            self._lines.extend(islice(self._iterator, missing))
+            if len(self._lines) < self._pos + size:
+                self.eof = True
+        return self._lines[self._pos:self._pos + size]
+
+    def advance(self, count):
+        """
+        @brief Consume lines
+        @param count int: Number of lines to consume
+        """
+        self._pos += count
+        self.consumed += count
+        if self._pos >= len(self._lines) or self._pos > 65536:
+            del self._lines[:self._pos]
+            self._pos = 0
+
+
+class LineDiffer:
+    """
+    @brief Line diff that streams through equal regions and stops at a difference cap
+    @details Equal stretches are skipped by comparing whole windows of lines at C
+             speed. At each mismatch, the lines of both windows are mapped to
+             integer ids and a greedy Myers search, bounded by the number of edits
+             that can still be reported, finds the first hunk. The hunk is reported,
+             both inputs advance past it and the scan continues, so only one window
+             per input is held in memory and the work ends once the cap is reached.
+    """
+
+    # Lines per input considered when resolving one hunk
+    WINDOW = 4096
+
+    def __init__(self, max_differences=10):
+        """
+        @brief Initialize the differ
+        @param max_differences int: Number of differences reported before stopping
+        """
+        self.max_differences = max_differences
+
+    def diff(self, lines1, lines2):
+        """
+        @brief Compare two line sequences
+        @param lines1 iterable: Expected lines
+        @param lines2 iterable: Actual lines
+        @return tuple: (bool, list) - (identical, differences); a "more differences
+                       not shown" marker follows the first max_differences entries
+                       when the inputs differ further
+        @details Line numbers in differences are 1-based positions within each input,
+                 or the ``number`` attribute of lines that carry one (NormalizedLine).
+                 Content differences and missing lines use the expected line number,
+                 extra lines use the actual line number.
+        """
+        buffer1 = _LineBuffer(lines1)
+        buffer2 = _LineBuffer(lines2)
+        differences = []
+        limit = self.max_differences + 1
+
+        while len(differences) < limit:
+            if not self._skip_equal(buffer1, buffer2):
+                break
+            window1 = buffer1.window(self.WINDOW)
+            window2 = buffer2.window(self.WINDOW)
+            # Every hunk yields at least one difference per two edits
+            removed, added = self._first_hunk(window1, window2, 2 * (limit - len(differences)))
+            self._report(buffer1, buffer2, window1[:removed], window2[:added], differences)
+            buffer1.advance(removed)
+            buffer2.advance(added)
+
+        if len(differences) > self.max_differences:
+            del differences[self.max_differences:]
+            differences.append(Difference(
+                position=None,
+                expected=None,
+                actual=None,
+                diff_type="more differences not shown"
+            ))
+        return not differences, differences
+
+    def _skip_equal(self, buffer1, buffer2):
+        """
+        @brief Advance both inputs past their common lines
+        @param buffer1 _LineBuffer: Expected lines
+        @param buffer2 _LineBuffer: Actual lines
+        @return bool: True if a difference follows, False if both inputs ended
+        """
+        size = 64
+        while True:
+            window1 = buffer1.window(size)
+            window2 = buffer2.window(size)
+            if window1 == window2:
+                if not window1:
+                    return False
+                buffer1.advance(len(window1))
+                buffer2.advance(len(window2))
+                size = min(size * 2, self.WINDOW)
+                continue
+            common = next((i for i, (x, y) in enumerate(zip(window1, window2)) if x != y),
+                          min(len(window1), len(window2)))
+            buffer1.advance(common)
+            buffer2.advance(common)
+            return True
+
+    @staticmethod
+    def _first_hunk(lines1, lines2, max_edits):
+        """
+        @brief Find the extent of the hunk starting at the first lines of two windows
+        @param lines1 list: Expected lines, the first of which differs from lines2[0]
+        @param lines2 list: Actual lines
+        @param max_edits int: Maximum number of edits to search
+        @return tuple: (removed, added) - lines of each window belonging to the hunk
+        @details Runs the greedy forward Myers search on integer line ids. The search
+                 ends at the window corner or after max_edits edits, keeping the
+                 furthest reaching path. Its leading edits, up to the first common
+                 line, form the hunk.
+        """
+        ids = {}
+        a = [ids.setdefault(line, len(ids)) for line in lines1]
+        b = [ids.setdefault(line, len(ids)) for line in lines2]
+        n, m = len(a), len(b)
+        if n == 0 or m == 0:
+            return n, m
+
+        # steps[d][k] = (previous diagonal, x after the edit, x after the snake)
+        x = 0
+        while x < n and x < m and a[x] == b[x]:
+            x += 1
+        steps = [{0: (None, 0, x)}]
+        frontier = {0: x}
+        end = (0, 0)
+        best = 2 * x
+        for d in range(1, max_edits + 1):
+            current = {}
+            step = {}
+            for k in range(-d, d + 1, 2):
+                down = frontier.get(k + 1)    # Insert a line of b: x stays
+                right = frontier.get(k - 1)   # Remove a line of a: x + 1
+                if down is not None and down - k > m:
+                    down = None
+                if right is not None and right + 1 > n:
+                    right = None
+                if down is None and right is None:
+                    continue
+                if right is None or (down is not None and right < down):
+                    k_prev, x = k + 1, down
+                else:
+                    k_prev, x = k - 1, right + 1
+                x_start = x
+                y = x - k
+                while x < n and y < m and a[x] == b[y]:
+                    x += 1
+                    y += 1
+                current[k] = x
+                step[k] = (k_prev, x_start, x)
+                # Prefer the most balanced path on ties, pairing removed and added lines
+                if x + y > best or (x + y == best and abs(k) < abs(end[1])):
+                    best, end = x + y, (d, k)
+                if x == n and y == m:
+                    break
+            steps.append(step)
+            frontier = current
+            if end[0] == d and best == n + m:
+                break
+
+        # Trace the path back, then take its edits up to the first snake
+        d, k = end
+        path = []
+        while d > 0:
+            k_prev, x_start, x_end = steps[d][k]
+            path.append((x_start, x_start - k, x_end))
+            d, k = d - 1, k_prev
+        for x_start, y_start, x_end in reversed(path):
+            if x_end > x_start:
+                return x_start, y_start
+        # No common line before the search ended: the hunk runs to the path's end
+        x_start, y_start, x_end = path[0]
+        return x_end, x_end - (x_start - y_start)
+
+    def _report(self, buffer1, buffer2, removed, added, differences):
+        """
+        @brief Turn one hunk into differences
+        @param buffer1 _LineBuffer: Expected lines, positioned at the hunk
+        @param buffer2 _LineBuffer: Actual lines, positioned at the hunk
+        @param removed list: Lines of the hunk in the expected input
+        @param added list: Lines of the hunk in the actual input
+        @param differences list: List to append Difference objects to
+        @details Removed and added lines are paired in order as content differences;
+                 the remainder are missing or extra lines.
+        """
+        limit = self.max_differences + 1
+        paired = min(len(removed), len(added))
+        for i in range(paired):
+            differences.append(Difference(
+                position=f"line {self._number(removed[i], buffer1.consumed + i + 1)}",
+                expected=removed[i],
+                actual=added[i],
+                diff_type="content"
+            ))
+        for i in range(paired, len(removed)):
+            differences.append(Difference(
+                position=f"line {self._number(removed[i], buffer1.consumed + i + 1)}",
+                expected=removed[i],
+                actual=None,
+                diff_type="missing"
+            ))
+        for i in range(paired, len(added)):
+            differences.append(Difference(
+                position=f"line {self._number(added[i], buffer2.consumed + i + 1)}",
+                expected=None,
+                actual=added[i],
+                diff_type="extra"
+            ))
+        del differences[limit:]
+
+    @staticmethod
+    def _number(line, position):
+        """
+        @brief Get the line number to report for a line
+        @param line str: The line
+        @param position int: 1-based position of the line within its input
+        @return int: The line's own number if it carries one, else its position
+        """
+        return getattr(line, "number", position)
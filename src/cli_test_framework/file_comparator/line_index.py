@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file line_index.py
+@brief Sparse line-offset index for seeking to a line in large text files
+@author Xiaotong Wang
+@date 2025
+"""
+
+import threading
+
+# Lines between two recorded offsets
+LINE_INDEX_INTERVAL = 1 << 13
+# Bytes scanned per read while building the index
+SCAN_BLOCK_SIZE = 1 << 20
+
+
+class LineIndex:
+    """
+    @brief Byte offsets of every LINE_INDEX_INTERVAL-th line of a file
+    @details ``offsets[j]`` is the byte offset of line ``j * interval`` (0-based). The
+             index is built lazily: extend() scans only as far as the requested line,
+             counting b"\\n" in the raw bytes, and later calls continue from the last
+             recorded offset. Files with lone carriage returns split lines differently
+             in text mode, so they are marked unusable.
+    """
+
+    def __init__(self, interval=LINE_INDEX_INTERVAL, offsets=None, lines=None):
+        """
+        @brief Initialize a line index
+        @param interval int: Lines between two recorded offsets
+        @param offsets list: Known offsets, starting with line 0
+        @param lines int: Total number of lines, once the whole file has been scanned
+        """
+        self.interval = interval
+        self.offsets = list(offsets) if offsets else [0]
+        self.lines = lines
+        self.usable = True
+        self._lock = threading.Lock()
+
+    def covers(self, line):
+        """
+        @brief Check whether the closest preceding offset of a line is known
+        @param line int: Line number (0-based)
+        @return bool: True if extend() would not need to read the file
+        """
+        return not self.usable or self.lines is not None or len(self.offsets) - 1 >= line // self.interval
+
+    def seek_point(self, line):
+        """
+        @brief Get the closest indexed position at or before a line
+        @param line int: Line number (0-based)
+        @return tuple: (line, offset) - indexed line number and its byte offset
+        """
+        j = min(line // self.interval, len(self.offsets) - 1)
+        return j * self.interval, self.offsets[j]
+
+    def extend(self, file_path, line):
+        """
+        @brief Scan the file until the closest preceding offset of a line is known
+        @param file_path str or Path: The indexed file
+        @param line int: Line number (0-based) to cover
+        @return bool: True if the index is usable
+        """
+        # Imported here so text comparisons that never seek do not load NumPy
+        import numpy as np
+
+        with self._lock:
+            if self.covers(line):
+                return self.usable
+            count = (len(self.offsets) - 1) * self.interval
+            pos = self.offsets[-1]
+            pending_cr = False
+            last = b''
+            with open(file_path, 'rb') as f:
+                f.seek(pos)
+                while True:
+                    block = f.read(SCAN_BLOCK_SIZE)
+                    if not block:
+                        if pending_cr:
+                            self.usable = False
+                        else:
+                            # A last line without a trailing newline still counts
+                            self.lines = count + (last not in (b'', b'\n'))
+                        break
+                    # "\r" not followed by "\n" ends a line in text mode only
+                    if pending_cr and block[:1] != b'\n':
+                        self.usable = False
+                        break
+                    pending_cr = block.endswith(b'\r')
+                    if b'\r' in block and block.count(b'\r') - block.count(b'\r\n') - pending_cr > 0:
+                        self.usable = False
+                        break
+
+                    positions = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+                    newlines = len(positions)
+                    mark = len(self.offsets) * self.interval
+                    for g in range(mark, count + newlines + 1, self.interval):
+                        # Line g starts after the g-th newline
+                        self.offsets.append(pos + int(positions[g - count - 1]) + 1)
+                    count += newlines
+                    pos += len(block)
+                    last = block[-1:]
+                    if len(self.offsets) - 1 >= line // self.interval:
+                        break
+            return self.usable
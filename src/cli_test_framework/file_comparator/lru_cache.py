@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file lru_cache.py
+@brief Thread-safe LRU cache bounded by entry count and total weight
+@author Xiaotong Wang
+@date 2025
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LruCache:
+    """
+    @brief Least-recently-used cache with an entry limit and an optional weight limit
+    @details Each entry carries a weight (e.g. the size of the file it was read from);
+             the least recently used entries are evicted until both the entry count
+             and the total weight are within bounds. An entry heavier than the weight
+             limit is not stored.
+    """
+
+    def __init__(self, max_entries, max_weight=None):
+        """
+        @brief Initialize the cache
+        @param max_entries int: Maximum number of entries
+        @param max_weight int: Maximum total weight (None for no weight limit)
+        """
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.weight = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        @brief Look up an entry and mark it as recently used
+        @param key hashable: Entry key
+        @param default object: Value returned if the key is not cached
+        @return object: The cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, weight=1):
+        """
+        @brief Store an entry, evicting the least recently used ones if needed
+        @param key hashable: Entry key
+        @param value object: Value to store
+        @param weight int: Weight of the entry
+        @return bool: True if the entry was stored
+        """
+        if self.max_entries <= 0 or (self.max_weight is not None and weight > self.max_weight):
+            return False
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.weight -= previous[1]
+            self._entries[key] = (value, weight)
+            self.weight += weight
+            while len(self._entries) > self.max_entries or (
+                    self.max_weight is not None and self.weight > self.max_weight):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.weight -= evicted
+        return True
+
+    def clear(self):
+        """
+        @brief Remove all entries
+        """
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file npy_comparator.py
+@brief NumPy .npy/.npz file comparator with tolerance-based array comparison
+@author Xiaotong Wang
+@date 2025
+"""
+
+import numpy as np
+from .base_comparator import BaseComparator
+from .numeric_kernel import ToleranceKernel, stats_differences
+from .result import Difference
+from .tolerance_profile import ToleranceProfile
+
+# Member name under which the array of a .npy file is compared
+NPY_MEMBER = "array"
+
+
+class NpyComparator(BaseComparator):
+    """
+    @brief Comparator for NumPy .npy and .npz files
+    @details A .npy file holds one array, compared as the member ``array``; a .npz
+             archive holds named members. Members are matched by name and compared
+             with the blockwise tolerance kernel shared with the HDF5 comparator,
+             so numeric noise within rtol/atol passes and headers are never
+             compared byte by byte. .npy data is memory-mapped and .npz members
+             are loaded one at a time, so at most one pair of members is in
+             memory. Pickled (object) arrays are refused.
+    """
+
+    def __init__(self, rtol=1e-5, atol=1e-8, show_content_diff=False, tolerance_profile=None, **kwargs):
+        """
+        @brief Initialize the NumPy comparator
+        @param rtol float: Relative tolerance for numerical comparison
+        @param atol float: Absolute tolerance for numerical comparison
+        @param show_content_diff bool: Scan whole arrays and report mismatch statistics
+                                       and sample elements; otherwise stop at the first
+                                       differing block with a summary difference
+        @param tolerance_profile dict, list or str: Per-member tolerances, matched
+                                                    against member names (see
+                                                    ToleranceProfile)
+        @param **kwargs: Additional parameters passed to BaseComparator
+        @throws ValueError: If the tolerance profile is malformed
+        """
+        super().__init__(**kwargs)
+        self.rtol = rtol
+        self.atol = atol
+        self.show_content_diff = show_content_diff
+        self.profile = ToleranceProfile.load(tolerance_profile, rtol=rtol, atol=atol)
+
+    def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Open a .npy or .npz file without reading its data
+        @param file_path Path: Path to the NumPy file
+        @param start_line int: Ignored (arrays have no lines)
+        @param end_line int: Ignored
+        @param start_column int: Ignored
+        @param end_column int: Ignored
+        @return Mapping: Member name -> array; members of .npz archives are loaded
+                         when accessed
+        @throws ValueError: If the file is missing or not a NumPy file
+        """
+        try:
+            self.logger.debug(f"Opening NumPy file: {file_path}")
+            data = np.load(file_path, mmap_mode='r', allow_pickle=False)
+        except FileNotFoundError:
+            raise ValueError(f"File not found: {file_path}")
+        except (OSError, ValueError, EOFError) as e:
+            raise ValueError(f"Invalid NumPy file {file_path}: {str(e)}")
+        if isinstance(data, np.ndarray):
+            return {NPY_MEMBER: data}
+        return data
+
+    def compare_content(self, content1, content2):
+        """
+        @brief Compare the members of two NumPy files
+        @param content1 Mapping: Members of the first file
+        @param content2 Mapping: Members of the second file
+        @return tuple: (bool, list) - (identical, differences)
+        @details Members are compared in the order of the first file, then members
+                 only found in the second file are reported. Archives are closed
+                 once compared.
+        """
+        differences = []
+        try:
+            names1 = list(content1.keys())
+            names2 = list(content2.keys())
+            in1 = set(names1)
+            in2 = set(names2)
+            for name in names1 + [name for name in names2 if name not in in1]:
+                if self.profile.is_ignored(name):
+                    continue
+                if name not in in2:
+                    differences.append(Difference(
+                        position=name,
+                        expected="Array exists",
+                        actual="Array missing",
+                        diff_type="structure"
+                    ))
+                elif name not in in1:
+                    differences.append(Difference(
+                        position=name,
+                        expected="Array missing",
+                        actual="Array exists",
+                        diff_type="structure"
+                    ))
+                else:
+                    self.logger.debug(f"Comparing array: {name}")
+                    differences.extend(self._compare_arrays(content1[name], content2[name], name))
+        finally:
+            for content in (content1, content2):
+                close = getattr(content, "close", None)
+                if close is not None:
+                    close()
+        return not differences, differences
+
+    def _compare_arrays(self, data1, data2, name):
+        """
+        @brief Compare two arrays
+        @param data1 np.ndarray: Array from the first file
+        @param data2 np.ndarray: Array from the second file
+        @param name str: Member name
+        @return list: List of Difference objects, empty if the arrays match
+        @details Like HDF5 datasets, a dtype mismatch is reported and the values are
+                 still compared; a shape mismatch ends the comparison of the member.
+        """
+        if data1.shape != data2.shape:
+            return [Difference(
+                position=f"{name}/shape",
+                expected=str(data1.shape),
+                actual=str(data2.shape),
+                diff_type="structure"
+            )]
+        differences = []
+        if data1.dtype != data2.dtype:
+            differences.append(Difference(
+                position=f"{name}/dtype",
+                expected=str(data1.dtype),
+                actual=str(data2.dtype),
+                diff_type="structure"
+            ))
+
+        if ToleranceKernel.is_numeric(data1) and ToleranceKernel.is_numeric(data2):
+            kernel = self.profile.kernel_for(name)
+            stats = kernel.compare(data1, data2, detailed=self.show_content_diff)
+            if stats.identical:
+                return differences
+            if self.show_content_diff:
+                return differences + stats_differences(name, stats, data1.shape, kernel)
+            return differences + [Difference(
+                position=name,
+                expected="Same content",
+                actual="Content differs",
+                diff_type="content"
+            )]
+
+        try:
+            equal = np.array_equal(data1, data2)
+        except (TypeError, ValueError) as e:
+            return differences + [Difference(
+                position=name,
+                expected="Comparable arrays",
+                actual=f"Error: {str(e)}",
+                diff_type="error"
+            )]
+        if equal:
+            return differences
+        if not self.show_content_diff:
+            return differences + [Difference(
+                position=name,
+                expected="Same content",
+                actual="Content differs",
+                diff_type="content"
+            )]
+        for idx in np.argwhere(data1 != data2)[:10]:
+            idx = tuple(idx)
+            differences.append(Difference(
+                position=f"{name}[{','.join(map(str, idx))}]",
+                expected=str(data1[idx]),
+                actual=str(data2[idx]),
+                diff_type="content"
+            ))
+        return differences
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file numeric_kernel.py
+@brief Blockwise tolerance kernel shared by the numeric array comparators
+@author Xiaotong Wang
+@date 2025
+"""
+
+import threading
+import numpy as np
+from .result import Difference
+
+# Number of elements processed per block. Scratch buffers are sized to this,
+# so memory use of the kernel is constant regardless of the array size.
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+# Signed integer type with the same width as each float type, for ULP distances
+_ULP_INT_TYPES = {2: np.int16, 4: np.int32, 8: np.int64}
+
+
+class KernelStats:
+    """
+    @brief Accumulated outcome of one or more kernel comparisons
+    @details A single instance can be passed to several ToleranceKernel.compare
+             calls (e.g. one per chunk of a large dataset) to accumulate the
+             statistics of the whole array.
+    """
+
+    def __init__(self, max_samples=10):
+        """
+        @brief Initialize empty statistics
+        @param max_samples int: Maximum number of mismatching elements to keep as samples
+        """
+        self.checked = 0          # Elements that took part in the comparison
+        self.mismatches = 0       # Elements outside the tolerance
+        self.max_abs_diff = 0.0   # Largest finite |a - b| among mismatches
+        self.max_rel_diff = 0.0   # Largest finite |a - b| / |b| among mismatches
+        self.samples = []         # (flat_index, expected, actual) of the first mismatches
+        self.max_samples = max_samples
+        self.complete = True      # False when the kernel stopped at the first failing block
+
+    @property
+    def identical(self):
+        """
+        @brief Whether no mismatching element was found
+        @return bool: True if all compared elements are within tolerance
+        """
+        return self.mismatches == 0
+
+
+class ToleranceKernel:
+    """
+    @brief Allocation-free elementwise tolerance check for numeric arrays
+    @details Compares two arrays block by block using preallocated scratch buffers
+             and ``out=`` ufunc arguments, so no temporary array proportional to
+             the input size is created. The default test follows ``np.isclose``:
+             ``|a - b| <= atol + rtol * |b|``; with ``symmetric=True`` it follows
+             ``math.isclose``: ``|a - b| <= max(rtol * max(|a|, |b|), atol)``.
+             Equal infinities always match and NaN pairs match when ``equal_nan``
+             is set. When ``max_ulp`` is given, finite values that are at most
+             that many units in the last place apart also match; for integer
+             data one ULP is one unit. Scratch buffers are thread-local, so one
+             kernel can be shared by concurrent comparisons.
+    """
+
+    def __init__(self, rtol=1e-5, atol=1e-8, equal_nan=True, symmetric=False, max_ulp=None,
+                 block_size=DEFAULT_BLOCK_SIZE):
+        """
+        @brief Initialize the tolerance kernel
+        @param rtol float: Relative tolerance
+        @param atol float: Absolute tolerance
+        @param equal_nan bool: Treat NaN values at the same position as equal
+        @param symmetric bool: Use math.isclose semantics instead of np.isclose semantics
+        @param max_ulp int: Maximum distance in units in the last place (None to disable)
+        @param block_size int: Number of elements compared per block
+        """
+        self.rtol = float(rtol)
+        self.atol = float(atol)
+        self.equal_nan = equal_nan
+        self.symmetric = symmetric
+        self.max_ulp = None if max_ulp is None else int(max_ulp)
+        self.block_size = max(1, int(block_size))
+        self._local = threading.local()
+
+    @staticmethod
+    def is_numeric(array):
+        """
+        @brief Check whether an array can be compared with tolerances
+        @param array np.ndarray: Array to check
+        @return bool: True for integer, floating point and complex arrays
+        """
+        return isinstance(array, np.ndarray) and np.issubdtype(array.dtype, np.number)
+
+    def compare(self, a, b, filter_func=None, detailed=False, stats=None, offset=0):
+        """
+        @brief Compare two numeric arrays of the same shape
+        @param a np.ndarray: Expected values
+        @param b np.ndarray: Actual values
+        @param filter_func callable: Optional mask function; only positions where the
+                                     mask is True for both arrays are compared
+        @param detailed bool: Scan all blocks and collect full statistics. When False
+                              the scan stops at the first failing block
+        @param stats KernelStats: Statistics to accumulate into (created if None)
+        @param offset int: Flat index of a[0] within the full array, used for samples
+        @return KernelStats: The accumulated statistics
+        @throws ValueError: If the array shapes differ
+        """
+        if stats is None:
+            stats = KernelStats()
+        if a.shape != b.shape:
+            raise ValueError(f"Shape mismatch: {a.shape} vs {b.shape}")
+
+        with np.errstate(invalid='ignore', over='ignore', divide='ignore'):
+            for start, block_a, block_b in self._iter_blocks(a, b, offset):
+                ok, diff = self._block_ok(block_a, block_b)
+
+                if filter_func is not None:
+                    keep = filter_func(block_a) & filter_func(block_b)
+                    stats.checked += int(np.count_nonzero(keep))
+                    np.logical_or(ok, np.logical_not(keep), out=ok)
+                else:
+                    stats.checked += block_a.size
+
+                if ok.all():
+                    continue
+
+                bad = np.flatnonzero(np.logical_not(ok))
+                stats.mismatches += bad.size
+                self._record(stats, bad, start, block_a, block_b, diff)
+
+                if not detailed:
+                    stats.complete = False
+                    return stats
+
+        return stats
+
+    def within(self, a, b, out=None):
+        """
+        @brief Elementwise tolerance mask of two arrays
+        @param a np.ndarray: Expected values
+        @param b np.ndarray: Actual values (same shape)
+        @param out np.ndarray: Optional boolean array receiving the result
+        @return np.ndarray: Boolean array, True where the values are within tolerance
+        """
+        if out is None:
+            out = np.empty(a.shape, dtype=bool)
+        flat_out = out.reshape(-1)
+        with np.errstate(invalid='ignore', over='ignore', divide='ignore'):
+            for start, block_a, block_b in self._iter_blocks(np.ascontiguousarray(a), np.ascontiguousarray(b), 0):
+                ok, _ = self._block_ok(block_a, block_b)
+                flat_out[start:start + block_a.size] = ok.reshape(-1)
+        return out
+
+    def _scratch(self):
+        """
+        @brief Get the thread-local scratch buffers, allocating them on first use
+        @return tuple: (diff, tol, aux, ok, tmp) flat buffers of block_size elements
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            size = self.block_size
+            buffers = (
+                np.empty(size, dtype=np.float64),
+                np.empty(size, dtype=np.float64),
+                np.empty(size, dtype=np.float64),
+                np.empty(size, dtype=bool),
+                np.empty(size, dtype=bool),
+            )
+            self._local.buffers = buffers
+        return buffers
+
+    def _int_scratch(self):
+        """
+        @brief Get the thread-local scratch buffers used for ULP distances
+        @return tuple: (key_a, key_b, finite) flat buffers of block_size elements
+        """
+        buffers = getattr(self._local, 'int_buffers', None)
+        if buffers is None:
+            size = self.block_size
+            buffers = (
+                np.empty(size, dtype=np.int64),
+                np.empty(size, dtype=np.int64),
+                np.empty(size, dtype=bool),
+            )
+            self._local.int_buffers = buffers
+        return buffers
+
+    def _iter_blocks(self, a, b, offset):
+        """
+        @brief Split two arrays into matching blocks of at most block_size elements
+        @param a np.ndarray: First array
+        @param b np.ndarray: Second array (same shape)
+        @param offset int: Flat index of the first element
+        @return generator: Yields (flat_start, block_a, block_b) views
+        @details Contiguous arrays are walked as flat views; other arrays are split
+                 along the first axis so blocks stay views of the original data.
+        """
+        size = self.block_size
+        if a.ndim <= 1 or (a.flags.c_contiguous and b.flags.c_contiguous):
+            flat_a = a.reshape(-1)
+            flat_b = b.reshape(-1)
+            for start in range(0, flat_a.size, size):
+                yield offset + start, flat_a[start:start + size], flat_b[start:start + size]
+            return
+
+        row_size = a[0].size if a.shape[0] else 0
+        if row_size == 0:
+            return
+        if row_size > size:
+            for row in range(a.shape[0]):
+                yield from self._iter_blocks(a[row], b[row], offset + row * row_size)
+            return
+
+        rows = size // row_size
+        for row in range(0, a.shape[0], rows):
+            yield offset + row * row_size, a[row:row + rows], b[row:row + rows]
+
+    def _block_ok(self, x, y):
+        """
+        @brief Evaluate the tolerance test on one block
+        @param x np.ndarray: Block of expected values
+        @param y np.ndarray: Block of actual values
+        @return tuple: (ok, diff) scratch views shaped like the block; diff holds |x - y|
+        """
+        diff_buf, tol_buf, aux_buf, ok_buf, tmp_buf = self._scratch()
+        n = x.size
+        shape = x.shape
+        ok = ok_buf[:n].reshape(shape)
+
+        diff = diff_buf[:n].reshape(shape)
+        if np.iscomplexobj(x) or np.iscomplexobj(y):
+            # Complex differences cannot be computed in the float scratch buffers; this path is rare
+            ok[...] = np.isclose(x, y, rtol=self.rtol, atol=self.atol, equal_nan=self.equal_nan)
+            np.absolute(np.subtract(x, y), out=diff)
+            return ok, diff
+
+        tol = tol_buf[:n].reshape(shape)
+        tmp = tmp_buf[:n].reshape(shape)
+
+        np.subtract(x, y, out=diff, dtype=np.float64)
+        np.absolute(diff, out=diff)
+        if self.symmetric:
+            aux = aux_buf[:n].reshape(shape)
+            np.absolute(x, out=tol, dtype=np.float64)
+            np.absolute(y, out=aux, dtype=np.float64)
+            np.maximum(tol, aux, out=tol)
+            np.multiply(tol, self.rtol, out=tol)
+            np.maximum(tol, self.atol, out=tol)
+        else:
+            np.absolute(y, out=tol, dtype=np.float64)
+            np.multiply(tol, self.rtol, out=tol)
+            np.add(tol, self.atol, out=tol)
+        np.less_equal(diff, tol, out=ok)
+
+        # An infinite tolerance must not accept an infinite difference
+        np.isfinite(diff, out=tmp)
+        np.logical_and(ok, tmp, out=ok)
+
+        if self.max_ulp is not None and not ok.all():
+            self._apply_ulp(x, y, diff, ok, tmp)
+
+        if not ok.all():
+            # Equal infinities produce a NaN difference but are equal
+            np.equal(x, y, out=tmp)
+            np.logical_or(ok, tmp, out=ok)
+            if self.equal_nan and np.issubdtype(x.dtype, np.floating) and np.issubdtype(y.dtype, np.floating):
+                aux_bool = np.isnan(x, out=tmp)
+                np.logical_and(aux_bool, np.isnan(y), out=aux_bool)
+                np.logical_or(ok, aux_bool, out=ok)
+        return ok, diff
+
+    def _apply_ulp(self, x, y, diff, ok, tmp):
+        """
+        @brief Accept values that are within max_ulp units in the last place
+        @param x np.ndarray: Block of expected values
+        @param y np.ndarray: Block of actual values
+        @param diff np.ndarray: |x - y| for the block
+        @param ok np.ndarray: Tolerance result, updated in place
+        @param tmp np.ndarray: Boolean scratch view shaped like the block
+        @details Floats are mapped to integers that are ordered like the float
+                 values (sign-magnitude to two's complement), so the ULP distance
+                 is the difference of the keys. Only same-dtype float16/32/64
+                 data uses ULPs; integers use the plain difference.
+        """
+        if not (np.issubdtype(x.dtype, np.floating) or np.issubdtype(y.dtype, np.floating)):
+            np.less_equal(diff, self.max_ulp, out=tmp)
+            np.logical_or(ok, tmp, out=ok)
+            return
+        if x.dtype != y.dtype or x.dtype.itemsize not in _ULP_INT_TYPES:
+            return
+
+        int_type = _ULP_INT_TYPES[x.dtype.itemsize]
+        lowest = np.int64(np.iinfo(int_type).min)
+        key_a_buf, key_b_buf, finite_buf = self._int_scratch()
+        n = x.size
+        key_a = key_a_buf[:n].reshape(x.shape)
+        key_b = key_b_buf[:n].reshape(x.shape)
+        finite = finite_buf[:n].reshape(x.shape)
+        for key, values in ((key_a, x), (key_b, y)):
+            np.copyto(key, values.view(int_type))
+            np.less(key, 0, out=tmp)
+            np.subtract(lowest, key, out=key, where=tmp)
+
+        np.subtract(key_a, key_b, out=key_a)
+        np.absolute(key_a, out=key_a)
+        # Compare as unsigned so a wrapped INT64_MIN is never "close"
+        np.less_equal(key_a.view(np.uint64), np.uint64(self.max_ulp), out=tmp)
+        np.isfinite(diff, out=finite)
+        np.logical_and(tmp, finite, out=tmp)
+        np.logical_or(ok, tmp, out=ok)
+
+    def _record(self, stats, bad, start, block_a, block_b, diff):
+        """
+        @brief Update statistics with the mismatching positions of a block
+        @param stats KernelStats: Statistics to update
+        @param bad np.ndarray: Flat indices of mismatches within the block
+        @param start int: Flat index of the block start
+        @param block_a np.ndarray: Block of expected values
+        @param block_b np.ndarray: Block of actual values
+        @param diff np.ndarray: |a - b| scratch view for the block
+        """
+        flat_a = block_a.reshape(-1) if block_a.flags.c_contiguous else None
+        flat_b = block_b.reshape(-1) if block_b.flags.c_contiguous else None
+
+        remaining = stats.max_samples - len(stats.samples)
+        for idx in bad[:max(0, remaining)]:
+            idx = int(idx)
+            if flat_a is not None and flat_b is not None:
+                expected, actual = flat_a[idx], flat_b[idx]
+            else:
+                pos = np.unravel_index(idx, block_a.shape)
+                expected, actual = block_a[pos], block_b[pos]
+            stats.samples.append((start + idx, expected.item(), actual.item()))
+
+        abs_diff = diff.reshape(-1)[bad]
+        finite = abs_diff[np.isfinite(abs_diff)]
+        if finite.size:
+            stats.max_abs_diff = max(stats.max_abs_diff, float(finite.max()))
+            ref = np.abs(block_b.reshape(-1)[bad] if flat_b is not None else block_b[np.unravel_index(bad, block_b.shape)])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rel = abs_diff / ref
+            rel = rel[np.isfinite(rel)]
+            if rel.size:
+                stats.max_rel_diff = max(stats.max_rel_diff, float(rel.max()))
+
+
+def stats_differences(position, stats, shape, kernel):
+    """
+    @brief Describe a failed kernel comparison as differences
+    @param position str: Name/path of the compared array
+    @param stats KernelStats: Statistics of the comparison
+    @param shape tuple: Shape of the compared data, used to locate samples
+    @param kernel ToleranceKernel: Kernel used for the comparison
+    @return list: A summary Difference with the mismatch statistics, followed by
+                  one Difference per sampled mismatching element
+    """
+    tolerance = f"rtol={kernel.rtol}, atol={kernel.atol}"
+    if kernel.max_ulp is not None:
+        tolerance += f", max_ulp={kernel.max_ulp}"
+    differences = [Difference(
+        position=position,
+        expected=f"All values within {tolerance}",
+        actual=(f"{stats.mismatches}/{stats.checked} values differ "
+                f"(max abs diff {stats.max_abs_diff:.6g}, max rel diff {stats.max_rel_diff:.6g})"),
+        diff_type="content"
+    )]
+    for flat_index, expected, actual in stats.samples:
+        idx = np.unravel_index(flat_index, shape) if shape else ()
+        differences.append(Difference(
+            position=f"{position}[{','.join(map(str, idx))}]",
+            expected=str(expected),
+            actual=str(actual),
+            diff_type="content"
+        ))
+    return differences
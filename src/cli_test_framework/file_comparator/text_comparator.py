@@ -8,180 +8,313 @@
 @date 2025
 """
 
-import difflib
-import re
+from itertools import islice
+from pathlib import Path
 from .base_comparator import BaseComparator
-from .result import Difference
+from .compression import READ_ERRORS
+from .digest_cache import resolve_digest_cache
+from .line_diff import LineDiffer
+from .line_index import LINE_INDEX_INTERVAL, LineIndex
+from .result import ComparisonResult
+from .text_normalizer import TextNormalizer
+
+# Characters read per chunk when streaming a whole file to a parser
+STREAM_CHUNK = 1 << 16
 
 class TextComparator(BaseComparator):
     """
     @brief Comparator for text files with line-by-line comparison
-    @details This class implements text file comparison using Python's difflib
-             for detailed difference detection. It supports line and column-based
-             range selection for comparison.
+    @details This class implements text file comparison with a streaming line diff
+             (see LineDiffer) for detailed difference detection. It supports line
+             and column-based range selection for comparison.
     """
     
-    def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, digest_cache=True,
+                 max_differences=10, line_index=True, normalize=None, **kwargs):
         """
-        @brief Read text content with specified range
+        @brief Initialize the text comparator
+        @param encoding str: File encoding to use
+        @param chunk_size int: Size of chunks for reading large files
+        @param verbose bool: Enable verbose logging
+        @param digest_cache bool or str: Use the persistent digest cache to detect identical
+                                         files without reading their lines (True for the
+                                         default location, a path for a specific database)
+        @param max_differences int: Maximum number of line differences to report
+        @param line_index bool: Seek to distant start lines through a sparse line-offset
+                                index (kept in the digest cache for stable baselines)
+        @param normalize dict: Normalization applied to every line while reading
+                               (see TextNormalizer), None to compare lines as read
+        @param **kwargs: Additional parameters passed to BaseComparator
+        """
+        super().__init__(encoding=encoding, chunk_size=chunk_size, verbose=verbose, **kwargs)
+        self.digest_cache = resolve_digest_cache(digest_cache)
+        self.max_differences = max_differences
+        self.line_index = line_index
+        self.normalizer = TextNormalizer.load(normalize) if normalize else None
+
+    def compare_files(self, file1, file2, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Compare two text files, short-circuiting byte-identical files
+        @param file1 Path: Path to the first file
+        @param file2 Path: Path to the second file
+        @param start_line int: Starting line number (0-based)
+        @param end_line int: Ending line number (0-based, None for end of file)
+        @param start_column int: Starting column number (0-based)
+        @param end_column int: Ending column number (0-based, None for end of line)
+        @return ComparisonResult: Result object containing comparison details
+        @details When whole files are compared and one of them is a cached or stable
+                 baseline, equal digests prove the files identical, so only the other
+                 file is hashed and no lines are decoded or diffed. Otherwise plain text
+                 files are diffed while streaming; subclasses that parse the content
+                 use the read/compare flow of BaseComparator.
+        """
+        whole_file = start_line == 0 and end_line is None and start_column == 0 and end_column is None
+        cache = self.digest_cache
+        try:
+            if (whole_file and cache is not None
+                    and (cache.is_cheap(file1) or cache.is_cheap(file2))
+                    and cache.same_content(file1, file2)):
+                self.logger.debug("Files identical according to digests")
+                result = ComparisonResult(file1=str(file1), file2=str(file2))
+                result.identical = True
+                result.file1_size = Path(file1).stat().st_size
+                result.file2_size = Path(file2).stat().st_size
+                return result
+        except OSError as e:
+            # Missing or unreadable files are reported by the regular comparison
+            self.logger.debug(f"Digest check skipped: {e}")
+        if self._streams(file1, file2):
+            return self._compare_files_streaming(file1, file2, start_line, end_line, start_column, end_column)
+        return super().compare_files(file1, file2, start_line, end_line, start_column, end_column)
+
+    def _streams(self, file1, file2):
+        """
+        @brief Check whether compare_files may use the streaming path
+        @param file1 Path: Path to the first file
+        @param file2 Path: Path to the second file
+        @return bool: True unless a subclass replaced read_content or compare_content,
+                      whose list-based forms the streaming path stands in for
+        """
+        return (type(self).read_content is TextComparator.read_content
+                and type(self).compare_content is TextComparator.compare_content)
+
+    def _iter_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Lazily read the items compared by the streaming path
+        @param file_path Path: Path to the file to read
+        @param start_line int: Starting line number (0-based)
+        @param end_line int: Ending line number (0-based, None for end of file)
+        @param start_column int: Starting column number (0-based)
+        @param end_column int: Ending column number (0-based, None for end of line)
+        @return generator: The file's lines (see _iter_lines)
+        """
+        return self._iter_lines(file_path, start_line, end_line, start_column, end_column)
+
+    def _iter_text(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Lazily read the text of a document for a streaming parser
+        @param file_path Path: Path to the file to read
+        @param start_line int: Starting line number
+        @param end_line int: Ending line number
+        @param start_column int: Starting column number
+        @param end_column int: Ending column number
+        @return generator: Text chunks; fixed-size chunks for whole files, so documents
+                           without line breaks are not read as one line
+        @throws ValueError: Same conditions and messages as read_content
+        """
+        if start_line or end_line is not None or start_column or end_column is not None or self.normalizer:
+            yield from self._iter_lines(file_path, start_line, end_line, start_column, end_column)
+            return
+        try:
+            self.logger.debug(f"Reading file: {file_path}")
+            with self.open_file(file_path) as f:
+                for chunk in iter(lambda: f.read(STREAM_CHUNK), ""):
+                    yield chunk
+        except UnicodeDecodeError as e:
+            raise ValueError(f"File encoding error for {file_path}. Try specifying a different encoding. Error: {str(e)}")
+        except FileNotFoundError:
+            raise ValueError(f"File not found: {file_path}")
+        except READ_ERRORS as e:
+            raise ValueError(f"Error reading file {file_path}: {str(e)}")
+
+    def _compare_iterables(self, items1, items2):
+        """
+        @brief Compare the items of two files while they are read
+        @param items1 iterator: Items of the first file
+        @param items2 iterator: Items of the second file
+        @return tuple: (bool, list) - (identical, differences)
+        """
+        return LineDiffer(self.max_differences).diff(items1, items2)
+
+    def _compare_files_streaming(self, file1, file2, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Compare two files without loading them into memory
+        @param file1 Path: Path to the first file
+        @param file2 Path: Path to the second file
+        @param start_line int: Starting line number (0-based)
+        @param end_line int: Ending line number (0-based, None for end of file)
+        @param start_column int: Starting column number (0-based)
+        @param end_column int: Ending column number (0-based, None for end of line)
+        @return ComparisonResult: Result object containing comparison details
+        @details Items are read lazily from both files (_iter_content) and compared
+                 as they arrive (_compare_iterables). For text, LineDiffer skips equal
+                 stretches and stops reading once the difference cap is reached, so
+                 memory stays bounded by its look-ahead window.
+        """
+        result = ComparisonResult(
+            file1=str(file1),
+            file2=str(file2),
+            start_line=start_line,
+            end_line=end_line,
+            start_column=start_column,
+            end_column=end_column
+        )
+        items1 = self._iter_content(file1, start_line, end_line, start_column, end_column)
+        items2 = self._iter_content(file2, start_line, end_line, start_column, end_column)
+        try:
+            self.logger.info(f"Comparing files: {file1} and {file2}")
+            result.file1_size = Path(file1).stat().st_size
+            result.file2_size = Path(file2).stat().st_size
+            identical, differences = self._compare_iterables(items1, items2)
+            result.identical = identical
+            result.differences = differences
+        except Exception as e:
+            self.logger.error(f"Error during comparison: {str(e)}")
+            result.error = str(e)
+            result.identical = False
+        finally:
+            items1.close()
+            items2.close()
+        return result
+
+    def _iter_lines(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Lazily read text lines within the specified range
         @param file_path Path: Path to the text file to read
         @param start_line int: Starting line number (0-based)
         @param end_line int: Ending line number (0-based, None for end of file)
         @param start_column int: Starting column number (0-based)
         @param end_column int: Ending column number (0-based, None for end of line)
-        @return list: List of text lines within the specified range
-        @throws ValueError: If line or column ranges are invalid
-        @throws UnicodeDecodeError: If file encoding is incorrect
-        @throws FileNotFoundError: If file doesn't exist
-        @throws IOError: If there are other file reading errors
+        @return generator: Selected lines, with the column range and normalization applied
+        @throws ValueError: Same conditions and messages as read_content
+        @details Lines before start_line are skipped without being kept, or jumped over
+                 via the line index, and reading stops after end_line. Lines dropped
+                 by the normalizer still count towards the range.
         """
+        if start_line < 0:
+            raise ValueError("Start line cannot be negative")
+        if end_line is not None and end_line < start_line:
+            raise ValueError("End line cannot be before start line")
+        if start_column < 0:
+            raise ValueError("Start column cannot be negative")
+        if end_column is not None and end_column < start_column:
+            raise ValueError("End column cannot be before start column")
+
         try:
             self.logger.debug(f"Reading text file: {file_path}")
-            with open(file_path, 'r', encoding=self.encoding) as f:
-                lines = f.readlines()
-                
-            if start_line < 0:
-                raise ValueError("Start line cannot be negative")
-                
-            if end_line is not None:
-                if end_line < start_line:
-                    raise ValueError("End line cannot be before start line")
-                if end_line >= len(lines):
-                    self.logger.warning(f"End line {end_line} exceeds file length {len(lines)}, capping at {len(lines)-1}")
-                    end_line = len(lines) - 1
-            else:
-                end_line = len(lines) - 1
-                
-            if start_line >= len(lines):
-                raise ValueError(f"Start line {start_line} is beyond file length {len(lines)}")
-                
-            selected_lines = lines[start_line:end_line+1]
-            
-            if start_column < 0:
-                raise ValueError("Start column cannot be negative")
-                
-            if start_column > 0 or end_column is not None:
-                self.logger.debug(f"Applying column range: {start_column} to {end_column}")
-                processed_lines = []
-                for line in selected_lines:
-                    if end_column is not None and end_column < start_column:
-                        raise ValueError("End column cannot be before start column")
-                    # Make sure we don't exceed line length
-                    effective_end = end_column
-                    if effective_end is not None and effective_end >= len(line):
-                        effective_end = len(line) - 1
-                    # Apply column range, handle if start_column is beyond line length
-                    if start_column >= len(line):
-                        processed_lines.append("")
-                    else:
-                        processed_lines.append(line[start_column:None if effective_end is None else effective_end+1])
-                return processed_lines
-            
-            return selected_lines
-            
+            index = self._find_line_index(file_path, start_line)
+            first, offset = index.seek_point(start_line) if index else (0, 0)
+            with self.open_file(file_path) as f:
+                if offset:
+                    # Offsets are line starts, where the decoder holds no state
+                    f.seek(offset)
+                selected = islice(f, start_line - first, None if end_line is None else end_line - first + 1)
+                if start_column > 0 or end_column is not None:
+                    selected = (self._slice_columns(line, start_column, end_column) for line in selected)
+                normalize = self.normalizer.normalize if self.normalizer else None
+                read = 0
+                for line in selected:
+                    read += 1
+                    if normalize is not None:
+                        line = normalize(line, read)
+                        if line is None:
+                            continue
+                    yield line
+            if read == 0:
+                if index and index.lines is not None:
+                    total = index.lines
+                else:
+                    with self.open_file(file_path) as f:
+                        total = sum(1 for _ in f)
+                raise ValueError(f"Start line {start_line} is beyond file length {total}")
+            if end_line is not None and read < end_line - start_line + 1:
+                total = start_line + read
+                self.logger.warning(f"End line {end_line} exceeds file length {total}, capping at {total-1}")
         except UnicodeDecodeError as e:
             raise ValueError(f"File encoding error for {file_path}. Try specifying a different encoding. Error: {str(e)}")
         except FileNotFoundError:
             raise ValueError(f"File not found: {file_path}")
-        except IOError as e:
+        except READ_ERRORS as e:
             raise ValueError(f"Error reading file {file_path}: {str(e)}")
-    
+
+    def _find_line_index(self, file_path, start_line):
+        """
+        @brief Get a line index to seek to a distant start line
+        @param file_path Path: Path to the text file
+        @param start_line int: Starting line number (0-based)
+        @return LineIndex: Index covering start_line, or None to read from the beginning
+        @details Only used when start_line is at least one index interval into the file,
+                 the file is not compressed and the encoding writes "\n" as the single
+                 byte b"\n", so byte offsets of newlines are line starts.
+        """
+        if not self.line_index or start_line < LINE_INDEX_INTERVAL:
+            return None
+        if self.compression(file_path):
+            return None
+        try:
+            if "\n".encode(self.encoding) != b"\n":
+                return None
+        except LookupError:
+            return None
+        if self.digest_cache is not None:
+            return self.digest_cache.line_index(file_path, start_line)
+        index = LineIndex()
+        return index if index.extend(file_path, start_line) else None
+
+    @staticmethod
+    def _slice_columns(line, start_column, end_column):
+        """
+        @brief Apply a column range to one line
+        @param line str: Line of text
+        @param start_column int: Starting column number (0-based)
+        @param end_column int: Ending column number (0-based, inclusive, None for end of line)
+        @return str: The selected part of the line ("" if it starts beyond the line)
+        """
+        if start_column >= len(line):
+            return ""
+        # Make sure we don't exceed line length
+        effective_end = end_column
+        if effective_end is not None and effective_end >= len(line):
+            effective_end = len(line) - 1
+        return line[start_column:None if effective_end is None else effective_end + 1]
+
+    def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Read text content with specified range
+        @param file_path Path: Path to the text file to read
+        @param start_line int: Starting line number (0-based)
+        @param end_line int: Ending line number (0-based, None for end of file)
+        @param start_column int: Starting column number (0-based)
+        @param end_column int: Ending column number (0-based, None for end of line)
+        @return list: List of text lines within the specified range, normalized if configured
+        @throws ValueError: If line or column ranges are invalid
+        @throws UnicodeDecodeError: If file encoding is incorrect
+        @throws FileNotFoundError: If file doesn't exist
+        @throws IOError: If there are other file reading errors
+        """
+        return list(self._iter_lines(file_path, start_line, end_line, start_column, end_column))
+
     def compare_content(self, content1, content2):
         """
         @brief Compare text content and return detailed differences
         @param content1 list: First list of text lines to compare
         @param content2 list: Second list of text lines to compare
         @return tuple: (bool, list) - (identical, differences)
-        @details Uses difflib to generate a detailed comparison of the text content.
+        @details Uses LineDiffer to generate a detailed comparison of the text content.
                  Returns a tuple containing a boolean indicating if the content is identical
                  and a list of Difference objects describing any differences found.
-                 Limits the number of differences reported to 10 to avoid overwhelming output.
+                 Limits the number of differences reported to max_differences to avoid
+                 overwhelming output.
         """
         self.logger.debug(f"Comparing text content")
-        
-        if content1 == content2:
-            return True, []
-            
-        differences = []
-        
-        # Use difflib for more detailed comparison
-        diff = list(difflib.unified_diff(content1, content2, n=0))
-        
-        # Process the diff output to create structured differences
-        line_diffs = []
-        for line in diff[2:]:  # Skip the first two header lines
-            if line.startswith('@@'):
-                # Parse hunk header for real line numbers: @@ -start1,c1 +start2,c2 @@
-                match = re.match(r'@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@', line)
-                if match:
-                    line_diffs.append(('hunk', (int(match.group(1)), int(match.group(3)))))
-                continue
-            elif line.startswith('-'):
-                line_diffs.append(('remove', line[1:]))
-            elif line.startswith('+'):
-                line_diffs.append(('add', line[1:]))
-            else:
-                line_diffs.append(('context', line[1:]))
-        
-        # Convert diff to our difference format
-        line_num1 = 0
-        line_num2 = 0
-        for i, (action, line) in enumerate(line_diffs):
-            if action == 'hunk':
-                # Reset to real line numbers from the hunk header (convert 1-based to 0-based)
-                line_num1 = line[0] - 1
-                line_num2 = line[1] - 1
-                continue
-            elif action == 'remove':
-                # Look ahead for a corresponding 'add'
-                add_match = None
-                for j in range(i+1, min(i+5, len(line_diffs))):
-                    if line_diffs[j][0] == 'add':
-                        add_match = line_diffs[j][1]
-                        del line_diffs[j]
-                        break
-                
-                if add_match is not None:
-                    # Content difference
-                    differences.append(Difference(
-                        position=f"line {line_num1+1}",
-                        expected=line,
-                        actual=add_match,
-                        diff_type="content"
-                    ))
-                else:
-                    # Missing line
-                    differences.append(Difference(
-                        position=f"line {line_num1+1}",
-                        expected=line,
-                        actual=None,
-                        diff_type="missing"
-                    ))
-                line_num1 += 1
-                
-            elif action == 'add':
-                # Extra line
-                differences.append(Difference(
-                    position=f"line {line_num2+1}",
-                    expected=None,
-                    actual=line,
-                    diff_type="extra"
-                ))
-                line_num2 += 1
-                
-            elif action == 'context':
-                line_num1 += 1
-                line_num2 += 1
-        
-        # Limit the number of differences reported
-        max_diffs = 10
-        if len(differences) > max_diffs:
-            differences = differences[:max_diffs]
-            differences.append(Difference(
-                position=None,
-                expected=None,
-                actual=None,
-                diff_type=f"more differences not shown (total: {len(differences)})"
-            ))
-            
-        return False, differences
\ No newline at end of file
+        return LineDiffer(self.max_differences).diff(content1, content2)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file text_normalizer.py
+@brief Compiled line normalization pipeline for text comparison
+@author Xiaotong Wang
+@date 2025
+"""
+
+import re
+
+# Keys accepted in a normalization specification
+_NORMALIZE_KEYS = {"ignore_lines", "substitutions", "collapse_whitespace", "rtol", "atol"}
+
+# Decimal or scientific number not embedded in a word or a dotted version string
+_NUMBER = re.compile(r'(?<![\w.])[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?(?![\w.])')
+
+
+class NormalizedLine(str):
+    """
+    @brief Normalized text of a line, remembering its line number
+    @details ``number`` is the 1-based position of the line within the compared
+             range before ignored lines were dropped; LineDiffer reports it.
+    """
+
+
+class NumericLine(NormalizedLine):
+    """
+    @brief Normalized line whose numbers compare with a tolerance
+    @details Two numeric lines are equal when their text with numbers masked out
+             is identical and every pair of numbers satisfies
+             ``|a - b| <= atol + rtol * |b|``. The hash covers only the masked
+             text, so lines equal within tolerance hash alike.
+    """
+
+    def __eq__(self, other):
+        if not isinstance(other, NumericLine):
+            return str.__eq__(self, other)
+        if self.template != other.template:
+            return False
+        rtol, atol = self.tolerance
+        for a, b in zip(self.values, other.values):
+            if a != b and not abs(a - b) <= atol + rtol * abs(b):
+                return False
+        return True
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.template)
+
+
+class TextNormalizer:
+    """
+    @brief Line normalization steps compiled from a declarative specification
+    @details Applied to each line in one pass while it is read, in this order:
+             - ``ignore_lines``: regexes; lines matching any of them are dropped,
+             - ``substitutions``: ``[pattern, replacement]`` pairs (or dicts with
+               ``pattern``/``replace``) applied in order with ``re.sub``,
+             - ``collapse_whitespace``: strip the line and collapse whitespace runs
+               to a single space,
+             - ``rtol``/``atol``: compare numeric tokens with a tolerance instead
+               of textually.
+    """
+
+    def __init__(self, ignore_lines=(), substitutions=(), collapse_whitespace=False, rtol=None, atol=None):
+        """
+        @brief Initialize a normalizer from compiled steps
+        @param ignore_lines list: Compiled patterns of lines to drop
+        @param substitutions list: (compiled pattern, replacement) pairs
+        @param collapse_whitespace bool: Collapse whitespace runs and strip lines
+        @param rtol float: Relative tolerance for numbers (None with atol None for exact text)
+        @param atol float: Absolute tolerance for numbers
+        """
+        self.ignore_lines = list(ignore_lines)
+        self.substitutions = list(substitutions)
+        self.collapse_whitespace = collapse_whitespace
+        self.numeric = rtol is not None or atol is not None
+        self.tolerance = (float(rtol or 0.0), float(atol or 0.0))
+
+    @classmethod
+    def load(cls, spec):
+        """
+        @brief Build a normalizer from a specification mapping
+        @param spec dict: Normalization specification (see class details)
+        @return TextNormalizer: The compiled normalizer
+        @throws ValueError: If the specification is malformed
+        """
+        if not isinstance(spec, dict):
+            raise ValueError(f"Normalization must be a mapping, got {type(spec).__name__}")
+        unknown = set(spec) - _NORMALIZE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown normalization keys: {sorted(unknown)}")
+
+        ignore_lines = spec.get("ignore_lines") or []
+        if isinstance(ignore_lines, str):
+            ignore_lines = [ignore_lines]
+        substitutions = []
+        for entry in spec.get("substitutions") or []:
+            if isinstance(entry, dict) and set(entry) <= {"pattern", "replace"} and "pattern" in entry:
+                pattern, replacement = entry["pattern"], entry.get("replace", "")
+            elif isinstance(entry, (list, tuple)) and len(entry) == 2:
+                pattern, replacement = entry
+            else:
+                raise ValueError(f"Invalid substitution: {entry!r}")
+            substitutions.append((_compile(pattern), replacement))
+
+        return cls(
+            ignore_lines=[_compile(pattern) for pattern in ignore_lines],
+            substitutions=substitutions,
+            collapse_whitespace=bool(spec.get("collapse_whitespace", False)),
+            rtol=spec.get("rtol"),
+            atol=spec.get("atol"),
+        )
+
+    def normalize(self, line, number):
+        """
+        @brief Normalize one line
+        @param line str: Line as read from the file
+        @param number int: 1-based position of the line within the compared range
+        @return NormalizedLine: The normalized line, or None if the line is ignored
+        """
+        for pattern in self.ignore_lines:
+            if pattern.search(line):
+                return None
+        for pattern, replacement in self.substitutions:
+            line = pattern.sub(replacement, line)
+        if self.collapse_whitespace:
+            line = " ".join(line.split())
+
+        if self.numeric:
+            values = []
+
+            def mask(match):
+                values.append(float(match.group()))
+                return "\0"
+
+            template = _NUMBER.sub(mask, line)
+            normalized = NumericLine(line)
+            normalized.template = template
+            normalized.values = values
+            normalized.tolerance = self.tolerance
+        else:
+            normalized = NormalizedLine(line)
+        normalized.number = number
+        return normalized
+
+
+def _compile(pattern):
+    """
+    @brief Compile a normalization regex
+    @param pattern str: Regular expression
+    @return re.Pattern: The compiled pattern
+    @throws ValueError: If the pattern is invalid
+    """
+    try:
+        return re.compile(pattern)
+    except (re.error, TypeError) as e:
+        raise ValueError(f"Invalid normalization pattern {pattern!r}: {e}")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file tolerance_profile.py
+@brief Per-path tolerance rules for numeric comparators
+@author Xiaotong Wang
+@date 2025
+"""
+
+import json
+import re
+from pathlib import Path
+from .numeric_kernel import ToleranceKernel
+
+# Keys accepted in a single profile rule
+_RULE_KEYS = {"pattern", "rtol", "atol", "max_ulp", "ignore"}
+
+
+class ToleranceRule:
+    """
+    @brief A single compiled profile entry
+    @details Holds the compiled path pattern, the ignore flag and a tolerance
+             kernel configured with the rule's rtol/atol/max_ulp.
+    """
+
+    def __init__(self, pattern, kernel, ignore=False):
+        """
+        @brief Initialize a rule
+        @param pattern re.Pattern: Compiled regular expression matched against full paths
+        @param kernel ToleranceKernel: Kernel used for paths matching this rule
+        @param ignore bool: Skip matching paths entirely
+        """
+        self.pattern = pattern
+        self.kernel = kernel
+        self.ignore = ignore
+
+
+class ToleranceProfile:
+    """
+    @brief Ordered mapping from path regex to tolerance settings
+    @details Rules are compiled once when the profile is created. A path uses the
+             first rule whose pattern fully matches it; rules without explicit
+             ``rtol``/``atol`` inherit the comparator-wide defaults. Lookups are
+             memoized per path. A profile can be given as:
+             - a dict ``{regex: {rtol, atol, max_ulp, ignore}}`` (in order),
+             - a list of dicts with a ``pattern`` key,
+             - or a path to a JSON/YAML sidecar file containing either form.
+    """
+
+    def __init__(self, rules, default_kernel):
+        """
+        @brief Initialize a profile from compiled rules
+        @param rules list: List of ToleranceRule objects, in priority order
+        @param default_kernel ToleranceKernel: Kernel for paths matching no rule
+        """
+        self.rules = rules
+        self.default_kernel = default_kernel
+        self._cache = {}
+
+    @classmethod
+    def load(cls, spec, rtol=1e-5, atol=1e-8, equal_nan=True):
+        """
+        @brief Build a profile from a mapping, a list or a sidecar file path
+        @param spec dict, list, str or Path: Profile specification (None for no rules)
+        @param rtol float: Default relative tolerance
+        @param atol float: Default absolute tolerance
+        @param equal_nan bool: Treat NaN values at the same position as equal
+        @return ToleranceProfile: The compiled profile
+        @throws ValueError: If the specification is malformed
+        """
+        default_kernel = ToleranceKernel(rtol=rtol, atol=atol, equal_nan=equal_nan)
+        if spec is None:
+            return cls([], default_kernel)
+        if isinstance(spec, (str, Path)):
+            spec = _load_sidecar(Path(spec))
+
+        if isinstance(spec, dict):
+            entries = [dict(settings or {}, pattern=pattern) for pattern, settings in spec.items()]
+        elif isinstance(spec, list):
+            entries = spec
+        else:
+            raise ValueError(f"Tolerance profile must be a mapping, a list or a file path, got {type(spec).__name__}")
+
+        rules = []
+        for entry in entries:
+            if not isinstance(entry, dict) or "pattern" not in entry:
+                raise ValueError(f"Invalid tolerance profile entry: {entry!r}")
+            unknown = set(entry) - _RULE_KEYS
+            if unknown:
+                raise ValueError(f"Unknown keys in tolerance profile entry {entry['pattern']!r}: {sorted(unknown)}")
+            try:
+                pattern = re.compile(entry["pattern"])
+            except re.error as e:
+                raise ValueError(f"Invalid tolerance profile pattern {entry['pattern']!r}: {e}")
+            kernel = ToleranceKernel(
+                rtol=entry.get("rtol", rtol),
+                atol=entry.get("atol", atol),
+                equal_nan=equal_nan,
+                max_ulp=entry.get("max_ulp"),
+            )
+            rules.append(ToleranceRule(pattern, kernel, ignore=bool(entry.get("ignore", False))))
+        return cls(rules, default_kernel)
+
+    def match(self, path):
+        """
+        @brief Find the rule applying to a path
+        @param path str: Full path of the item (e.g. an HDF5 dataset path)
+        @return ToleranceRule: The first fully matching rule, or None
+        """
+        try:
+            return self._cache[path]
+        except KeyError:
+            pass
+        rule = next((r for r in self.rules if r.pattern.fullmatch(path)), None)
+        self._cache[path] = rule
+        return rule
+
+    def is_ignored(self, path):
+        """
+        @brief Check whether a path is excluded from comparison
+        @param path str: Full path of the item
+        @return bool: True if the matching rule sets ``ignore``
+        """
+        rule = self.match(path)
+        return rule is not None and rule.ignore
+
+    def kernel_for(self, path):
+        """
+        @brief Get the tolerance kernel to use for a path
+        @param path str: Full path of the item
+        @return ToleranceKernel: The matching rule's kernel or the default kernel
+        """
+        rule = self.match(path)
+        return rule.kernel if rule is not None else self.default_kernel
+
+
+def _load_sidecar(path):
+    """
+    @brief Load a tolerance profile from a JSON or YAML file
+    @param path Path: Path to the sidecar file
+    @return dict or list: The raw profile specification
+    @throws ValueError: If the file cannot be read or has an unsupported format
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix.lower() in ('.yaml', '.yml'):
+                import yaml
+                return yaml.safe_load(f)
+            return json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Tolerance profile not found: {path}")
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Error reading tolerance profile {path}: {e}")
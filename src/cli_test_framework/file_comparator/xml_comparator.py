@@ -8,9 +8,16 @@
 @date 2025
 """
 
+import hashlib
 import xml.etree.ElementTree as ET
+from collections import deque
+from pathlib import Path
 from .text_comparator import TextComparator
 from .result import Difference
+from .xml_stream import XmlEventReader
+
+# Files from this size on are compared while streaming when streaming is not forced
+STREAM_THRESHOLD = 64 << 20
 
 class XmlComparator(TextComparator):
     """
@@ -21,8 +28,177 @@ class XmlComparator(TextComparator):
              - Attribute comparison
              - Text content comparison
              - Child element comparison
+             - Streaming comparison of large documents
+             - Order-insensitive matching of child elements
     """
-    
+
+    # Loaded documents are only read by compare_content; streamed comparisons never load them
+    cache_content = True
+
+    def __init__(self, encoding="utf-8", chunk_size=8192, verbose=False, streaming=None, ignore_order=False,
+                 **kwargs):
+        """
+        @brief Initialize the XML comparator
+        @param encoding str: File encoding
+        @param chunk_size int: Chunk size for reading files
+        @param verbose bool: Enable verbose logging
+        @param streaming bool: Compare elements while parsing both documents instead of
+                               loading them (None to stream files of STREAM_THRESHOLD
+                               bytes or more)
+        @param ignore_order bool: Match child elements regardless of their order
+                                  (see _match_children)
+        @param **kwargs: Additional parameters passed to TextComparator
+        """
+        super().__init__(encoding=encoding, chunk_size=chunk_size, verbose=verbose, **kwargs)
+        self.streaming = streaming
+        self.ignore_order = ignore_order
+
+    def _streams(self, file1, file2):
+        """
+        @brief Check whether compare_files may use the streaming path
+        @param file1 Path: Path to the first file
+        @param file2 Path: Path to the second file
+        @return bool: True when streaming is enabled, or left automatic and either
+                      file is at least STREAM_THRESHOLD bytes or compressed (its
+                      decompressed size is not known up front)
+        @details Order-insensitive matching needs whole child lists and always loads
+                 the documents.
+        """
+        if (type(self).read_content is not XmlComparator.read_content
+                or type(self).compare_content is not XmlComparator.compare_content):
+            return False
+        if self.ignore_order:
+            return False
+        if self.streaming is not None:
+            return bool(self.streaming)
+        try:
+            if self.compression(file1) or self.compression(file2):
+                return True
+            return max(Path(file1).stat().st_size, Path(file2).stat().st_size) >= STREAM_THRESHOLD
+        except OSError:
+            return False
+
+    def _iter_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
+        """
+        @brief Open an element event reader over an XML document for the streaming path
+        @param file_path Path: Path to the XML file
+        @param start_line int: Starting line number
+        @param end_line int: Ending line number
+        @param start_column int: Starting column number
+        @param end_column int: Ending column number
+        @return XmlEventReader: Reader over the selected text
+        """
+        return XmlEventReader(self._iter_text(file_path, start_line, end_line, start_column, end_column),
+                              name=str(file_path))
+
+    def _compare_iterables(self, reader1, reader2):
+        """
+        @brief Compare two XML documents while they are parsed
+        @param reader1 XmlEventReader: Reader over the first document
+        @param reader2 XmlEventReader: Reader over the second document
+        @return tuple: (bool, list) - (identical, differences)
+        @throws ValueError: If either document is not well-formed
+        """
+        self.logger.debug(f"Comparing XML content while streaming")
+        differences = []
+        root1 = reader1.next()[1]
+        root2 = reader2.next()[1]
+        self._compare_streamed(reader1, reader2, root1, root2, "", differences, self.max_differences)
+        if len(differences) < self.max_differences:
+            # Both documents were read to their end; parse errors after the root surface here
+            reader1.next()
+            reader2.next()
+        return not differences, differences
+
+    def _compare_streamed(self, reader1, reader2, elem1, elem2, path, differences, max_diffs=10):
+        """
+        @brief Compare two elements while reading their subtrees
+        @param reader1 XmlEventReader: Reader over the first document, after elem1's start
+        @param reader2 XmlEventReader: Reader over the second document, after elem2's start
+        @param elem1 ET.Element: Started element of the first document
+        @param elem2 ET.Element: Started element of the second document
+        @param path str: Current path in the XML structure
+        @param differences list: List to store found differences
+        @param max_diffs int: Maximum number of differences to report
+        @details Reports the same differences as _compare_elements. Children whose
+                 subtrees fit the readers' look-ahead on both sides are compared
+                 whole: equal serializations skip them, others go to
+                 _compare_elements. Larger children are compared recursively while
+                 they are read. Both elements are read to their end unless
+                 max_diffs is reached, in which case reading stops and a child
+                 count mismatch of the unfinished elements is not reported.
+        """
+        if elem1.tag != elem2.tag:
+            differences.append(Difference(
+                position=path or "/",
+                expected=elem1.tag,
+                actual=elem2.tag,
+                diff_type="tag_mismatch"
+            ))
+            reader1.skip()
+            reader2.skip()
+            return
+
+        self._compare_attributes(elem1, elem2, path, differences, max_diffs)
+        mark = len(differences)
+        count = 0
+        while len(differences) < max_diffs:
+            kind1, child1 = reader1.next()
+            kind2, child2 = reader2.next()
+            if kind1 != "start" or kind2 != "start":
+                break
+            new_path = f"{path}/{child1.tag}[{count}]" if path else f"/{child1.tag}[{count}]"
+            count += 1
+            events1 = reader1.look_ahead()
+            events2 = reader2.look_ahead() if events1 is not None else None
+            if events2 is None:
+                self._compare_streamed(reader1, reader2, child1, child2, new_path, differences, max_diffs)
+                continue
+            if not self._same_subtree(child1, child2):
+                self._compare_elements(child1, child2, new_path, differences, max_diffs)
+            reader1.consume(events1)
+            reader2.consume(events2)
+        else:
+            return
+
+        # One element ended; the rest of the other one holds its extra children
+        count1 = count2 = count
+        if kind1 == "start":
+            reader1.skip()
+            count1 += 1 + reader1.skip()
+        if kind2 == "start":
+            reader2.skip()
+            count2 += 1 + reader2.skip()
+        if count1 == 0 and count2 == 0:
+            self._compare_text(elem1, elem2, path, differences)
+        elif count1 != count2:
+            differences.insert(mark, Difference(
+                position=path or "/",
+                expected=f"{count1} child elements",
+                actual=f"{count2} child elements",
+                diff_type="children_count_mismatch"
+            ))
+            del differences[max_diffs:]
+
+    @staticmethod
+    def _same_subtree(elem1, elem2):
+        """
+        @brief Fast equality check of two complete subtrees
+        @param elem1 ET.Element: First element
+        @param elem2 ET.Element: Second element
+        @return bool: True if tags, attributes, texts and child counts are equal
+                      throughout both subtrees, which proves they have no
+                      structural differences
+        @details Walks both subtrees in document order without building paths or
+                 attribute sets; any mismatch leaves the detailed comparison to
+                 _compare_elements.
+        """
+        for node1, node2 in zip(elem1.iter(), elem2.iter()):
+            if (node1.tag != node2.tag or node1.text != node2.text
+                    or len(node1) != len(node2) or node1.attrib != node2.attrib):
+                return False
+        return True
+
     def read_content(self, file_path, start_line=0, end_line=None, start_column=0, end_column=None):
         """
         @brief Read and parse XML content from file
@@ -51,22 +227,28 @@ class XmlComparator(TextComparator):
         @param content2 ET.Element: Second XML element to compare
         @return tuple: (bool, list) - (identical, differences)
         @details Performs structural comparison of XML elements, including tags,
-                 attributes, text content, and child elements
+                 attributes, text content, and child elements. Documents without
+                 structural differences (e.g. differing only in attribute order or
+                 whitespace between elements) are identical. With ignore_order,
+                 children are matched by subtree fingerprint first.
         """
-        # Convert back to strings for comparison
-        xml_str1 = ET.tostring(content1, encoding='unicode')
-        xml_str2 = ET.tostring(content2, encoding='unicode')
-        
-        if xml_str1 == xml_str2:
+        if self._same_subtree(content1, content2):
             return True, []
+        fingerprints = None
+        if self.ignore_order:
+            fingerprints = self._fingerprint_tree(content1)
+            fingerprints.update(self._fingerprint_tree(content2))
+            if fingerprints[content1] == fingerprints[content2]:
+                return True, []
             
         # Use a recursive function to find differences in XML structures
         differences = []
-        self._compare_elements(content1, content2, "", differences)
+        self._compare_elements(content1, content2, "", differences, self.max_differences,
+                               fingerprints=fingerprints)
         
-        return False, differences
+        return not differences, differences
     
-    def _compare_elements(self, elem1, elem2, path, differences, max_diffs=10):
+    def _compare_elements(self, elem1, elem2, path, differences, max_diffs=10, fingerprints=None):
         """
         @brief Recursively compare XML elements and collect differences
         @param elem1 ET.Element: First XML element to compare
@@ -74,6 +256,9 @@ class XmlComparator(TextComparator):
         @param path str: Current path in the XML structure
         @param differences list: List to store found differences
         @param max_diffs int: Maximum number of differences to report
+        @param fingerprints dict: Subtree fingerprints of both documents (see
+                                  _fingerprint_tree) to match children regardless of
+                                  their order, None to pair them by index
         @details Compares XML elements recursively, checking for:
                  - Tag mismatches
                  - Missing or extra attributes
@@ -95,56 +280,166 @@ class XmlComparator(TextComparator):
             return  # If tags don't match, don't compare further
             
         # Compare attributes
+        self._compare_attributes(elem1, elem2, path, differences, max_diffs)
+        if len(differences) >= max_diffs:
+            return
+        
+        # Compare text content if leaf nodes
+        if len(elem1) == 0 and len(elem2) == 0:
+            self._compare_text(elem1, elem2, path, differences)
+            return
+                
+        # Compare children elements
+        children1 = list(elem1)
+        children2 = list(elem2)
+        
+        if len(children1) != len(children2):
+            differences.append(Difference(
+                position=path or "/",
+                expected=f"{len(children1)} child elements",
+                actual=f"{len(children2)} child elements",
+                diff_type="children_count_mismatch"
+            ))
+            
+        if fingerprints is not None:
+            self._match_children(children1, children2, path, differences, max_diffs, fingerprints)
+            return
+            
+        # Compare matching children
+        for i, (child1, child2) in enumerate(zip(children1, children2)):
+            new_path = f"{path}/{child1.tag}[{i}]" if path else f"/{child1.tag}[{i}]"
+            self._compare_elements(child1, child2, new_path, differences, max_diffs)
+
+    def _match_children(self, children1, children2, path, differences, max_diffs, fingerprints):
+        """
+        @brief Compare child elements regardless of their order
+        @param children1 list: Children of the first element
+        @param children2 list: Children of the second element
+        @param path str: Path of the parent elements
+        @param differences list: List to store found differences
+        @param max_diffs int: Maximum number of differences to report
+        @param fingerprints dict: Subtree fingerprints of both documents
+        @details Children with equal fingerprints are matched through a multiset of
+                 the second list's fingerprints and not compared further. Unmatched
+                 children are paired by tag in document order and compared in
+                 detail; the rest are reported as missing or extra elements. Paths
+                 use each child's index within its own document.
+        """
+        pool = {}
+        for index, child in enumerate(children2):
+            pool.setdefault(fingerprints[child], deque()).append(index)
+        matched = [False] * len(children2)
+        unmatched1 = []
+        for index, child in enumerate(children1):
+            indexes = pool.get(fingerprints[child])
+            if indexes:
+                matched[indexes.popleft()] = True
+            else:
+                unmatched1.append(index)
+
+        by_tag = {}
+        for index, child in enumerate(children2):
+            if not matched[index]:
+                by_tag.setdefault(child.tag, deque()).append(index)
+        for index in unmatched1:
+            if len(differences) >= max_diffs:
+                return
+            child1 = children1[index]
+            new_path = f"{path}/{child1.tag}[{index}]" if path else f"/{child1.tag}[{index}]"
+            candidates = by_tag.get(child1.tag)
+            if candidates:
+                self._compare_elements(child1, children2[candidates.popleft()], new_path, differences,
+                                       max_diffs, fingerprints)
+            else:
+                differences.append(Difference(
+                    position=new_path,
+                    expected=child1.tag,
+                    actual="missing element",
+                    diff_type="missing_element"
+                ))
+
+        for index in sorted(index for indexes in by_tag.values() for index in indexes):
+            if len(differences) >= max_diffs:
+                return
+            child2 = children2[index]
+            differences.append(Difference(
+                position=f"{path}/{child2.tag}[{index}]" if path else f"/{child2.tag}[{index}]",
+                expected="missing element",
+                actual=child2.tag,
+                diff_type="extra_element"
+            ))
+
+    @staticmethod
+    def _fingerprint_tree(root):
+        """
+        @brief Compute structural fingerprints of all elements of a tree in one pass
+        @param root ET.Element: Root of the tree
+        @return dict: Element -> 16-byte digest of its tag, sorted attributes, stripped
+                      text (leaves only) and the sorted digests of its children
+        @details Elements are visited in reverse document order, so children are
+                 hashed before their parent. Equal fingerprints mean the subtrees have
+                 no differences when child order is ignored.
+        """
+        fingerprints = {}
+        for elem in reversed(list(root.iter())):
+            children = sorted(fingerprints[child] for child in elem)
+            text = elem.text.strip() if elem.text and not children else ""
+            digest = hashlib.blake2b(repr((elem.tag, sorted(elem.attrib.items()), text)).encode(),
+                                     digest_size=16)
+            for child in children:
+                digest.update(child)
+            fingerprints[elem] = digest.digest()
+        return fingerprints
+
+    @staticmethod
+    def _compare_attributes(elem1, elem2, path, differences, max_diffs=10):
+        """
+        @brief Compare the attributes of two elements
+        @param elem1 ET.Element: First XML element
+        @param elem2 ET.Element: Second XML element
+        @param path str: Path of the elements
+        @param differences list: List to store found differences
+        @param max_diffs int: Maximum number of differences to report
+        """
         attrib1 = set(elem1.attrib.items())
         attrib2 = set(elem2.attrib.items())
         
         for attr, value in attrib1 - attrib2:
+            if len(differences) >= max_diffs:
+                return
             differences.append(Difference(
                 position=f"{path}/@{attr}" if path else f"/@{attr}",
                 expected=value,
                 actual="missing attribute",
                 diff_type="missing_attribute"
             ))
-            if len(differences) >= max_diffs:
-                return
                 
         for attr, value in attrib2 - attrib1:
+            if len(differences) >= max_diffs:
+                return
             differences.append(Difference(
                 position=f"{path}/@{attr}" if path else f"/@{attr}",
                 expected="missing attribute",
                 actual=value,
                 diff_type="extra_attribute"
             ))
-            if len(differences) >= max_diffs:
-                return
-        
-        # Compare text content if leaf nodes
-        if len(elem1) == 0 and len(elem2) == 0:
-            text1 = elem1.text.strip() if elem1.text else ""
-            text2 = elem2.text.strip() if elem2.text else ""
-            
-            if text1 != text2:
-                differences.append(Difference(
-                    position=path or "/",
-                    expected=text1,
-                    actual=text2,
-                    diff_type="text_mismatch"
-                ))
-                return
-                
-        # Compare children elements
-        children1 = list(elem1)
-        children2 = list(elem2)
+
+    @staticmethod
+    def _compare_text(elem1, elem2, path, differences):
+        """
+        @brief Compare the text of two leaf elements, ignoring surrounding whitespace
+        @param elem1 ET.Element: First XML element
+        @param elem2 ET.Element: Second XML element
+        @param path str: Path of the elements
+        @param differences list: List to store found differences
+        """
+        text1 = elem1.text.strip() if elem1.text else ""
+        text2 = elem2.text.strip() if elem2.text else ""
         
-        if len(children1) != len(children2):
+        if text1 != text2:
             differences.append(Difference(
                 position=path or "/",
-                expected=f"{len(children1)} child elements",
-                actual=f"{len(children2)} child elements",
-                diff_type="children_count_mismatch"
+                expected=text1,
+                actual=text2,
+                diff_type="text_mismatch"
             ))
-            
-        # Compare matching children
-        for i, (child1, child2) in enumerate(zip(children1, children2)):
-            new_path = f"{path}/{child1.tag}[{i}]" if path else f"/{child1.tag}[{i}]"
-            self._compare_elements(child1, child2, new_path, differences, max_diffs)
\ No newline at end of file
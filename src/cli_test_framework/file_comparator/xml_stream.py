@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file xml_stream.py
+@brief Incremental element event reader for XML documents read in chunks
+@author Xiaotong Wang
+@date 2025
+"""
+
+import xml.etree.ElementTree as ET
+
+# Events looked ahead at most to load one subtree whole
+SUBTREE_LIMIT = 1 << 12
+
+
+class XmlEventReader:
+    """
+    @brief Reads ``start``/``end`` element events from an iterable of text chunks
+    @details Chunks are fed to an XMLPullParser (the parser behind ET.iterparse),
+             which builds elements as usual. Events are ``(kind, element)`` pairs,
+             with kind ``"start"``, ``"end"`` or ``"eof"``. An element's tag and
+             attributes are complete at its start event, its text at its end event.
+             Once the end event of an element is read, the element is detached from
+             its parent, so a document is held only along the open elements and
+             the events looked ahead by look_ahead().
+    """
+
+    def __init__(self, chunks, name="<xml>", subtree_limit=None):
+        """
+        @brief Initialize the reader
+        @param chunks iterable: Text chunks of the document, in order
+        @param name str: Document name used in error messages
+        @param subtree_limit int: Events looked ahead at most to load one subtree
+                                  whole (None for SUBTREE_LIMIT)
+        """
+        self._chunks = iter(chunks)
+        self.name = name
+        self.subtree_limit = SUBTREE_LIMIT if subtree_limit is None else subtree_limit
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._events = []
+        self._pos = 0
+        self._open = []
+        self._eof = False
+
+    def close(self):
+        """
+        @brief Close the underlying chunk source if it supports it
+        """
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+
+    def error(self, message):
+        """
+        @brief Build the error raised for malformed input
+        @param message str: What was wrong
+        @return ValueError: Error naming the document
+        """
+        return ValueError(f"Invalid XML in {self.name}: {message}")
+
+    def _fill(self):
+        """
+        @brief Parse chunks until new events arrive
+        @return bool: False once the input is exhausted
+        @throws ValueError: If the document is not well-formed
+        """
+        if self._pos:
+            del self._events[:self._pos]
+            self._pos = 0
+        try:
+            while not self._eof:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    self._eof = True
+                    self._parser.close()
+                else:
+                    self._parser.feed(chunk)
+                count = len(self._events)
+                self._events.extend(self._parser.read_events())
+                if len(self._events) > count:
+                    return True
+        except ET.ParseError as e:
+            raise self.error(str(e))
+        return False
+
+    def next(self):
+        """
+        @brief Read the next event
+        @return tuple: (kind, element); ("eof", None) after the document
+        """
+        if self._pos == len(self._events) and not self._fill():
+            return "eof", None
+        event = self._events[self._pos]
+        self._pos += 1
+        if event[0] == "start":
+            self._open.append(event[1])
+        else:
+            self._release()
+        return event
+
+    def _release(self):
+        """
+        @brief Close the innermost open element and detach it from its parent
+        @details Later siblings already built by the parser are detached too; their
+                 events still refer to them.
+        """
+        self._open.pop()
+        if self._open:
+            del self._open[-1][:]
+
+    def look_ahead(self):
+        """
+        @brief Check whether the subtree of the element just started fits the limit
+        @return int: Number of events up to its end event (its subtree complete in
+                     the element), or None if it has more than subtree_limit events
+        @details The events stay unread; consume() skips them.
+        """
+        depth = 0
+        index = self._pos
+        while True:
+            if index - self._pos >= self.subtree_limit:
+                return None
+            if index == len(self._events):
+                start = self._pos
+                if not self._fill():
+                    return None
+                index -= start
+            if self._events[index][0] == "start":
+                depth += 1
+            elif depth:
+                depth -= 1
+            else:
+                return index + 1 - self._pos
+            index += 1
+
+    def consume(self, count):
+        """
+        @brief Skip the events of a subtree counted by look_ahead(), end event included
+        @param count int: Number of events
+        """
+        self._pos += count
+        self._release()
+
+    def skip(self):
+        """
+        @brief Read the rest of the innermost open element, end event included
+        @return int: Number of its children started while skipping
+        """
+        children = 0
+        depth = 0
+        while True:
+            kind = self.next()[0]
+            if kind == "start":
+                if not depth:
+                    children += 1
+                depth += 1
+            elif kind == "end":
+                if not depth:
+                    return children
+                depth -= 1
+            else:
+                raise self.error("Unexpected end of document")
@@ -1,9 +1,11 @@
 """
 Test configuration shared across suites.
 
-Adds the project src directory to sys.path so tests can import cli_test_framework.
+Adds the project src directory to sys.path so tests can import cli_test_framework,
+and keeps the persistent digest cache out of the user's cache directory.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -13,3 +15,4 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
+os.environ.setdefault("CLI_TEST_DIGEST_CACHE", "off")
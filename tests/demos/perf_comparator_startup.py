@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+比较器启动耗时验证脚本
+每次在新的解释器中创建一个比较器，测量导入与创建的耗时以及加载了哪些重量级依赖。
+“全部类型”一行依次创建所有内置比较器，相当于改为懒加载之前首次调用的开销。
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from cli_test_framework.file_comparator.factory import ComparatorFactory
+for file_type in sys.argv[1:]:
+    ComparatorFactory.create_comparator(file_type)
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "h5py": "h5py" in sys.modules, "numpy": "numpy" in sys.modules}))
+"""
+
+
+def measure(file_types, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE, *file_types],
+            check=True, capture_output=True, text=True,
+            env=dict(os.environ, PYTHONPATH=str(SRC), CLI_TEST_DIGEST_CACHE="off"),
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return statistics.median(sample["ms"] for sample in samples), samples[-1]
+
+
+def run_benchmark():
+    print("=" * 60)
+    print("比较器启动耗时验证（中位数，新解释器）")
+    print("=" * 60)
+
+    builtin = ["binary", "csv", "dir", "h5", "json", "jsonl", "npy", "text", "xml"]
+    cases = [(file_type, [file_type]) for file_type in ("text", "json", "csv", "binary", "h5")]
+    cases.append(("全部类型", builtin))
+    for label, file_types in cases:
+        elapsed, modules = measure(file_types)
+        print(f"{label:>8}: {elapsed:7.1f} ms  numpy={modules['numpy']!s:<5} h5py={modules['h5py']}")
+
+    print("\n文本/JSON 比较不应加载 numpy 和 h5py，耗时应明显低于“全部类型”。")
+
+
+if __name__ == "__main__":
+    run_benchmark()
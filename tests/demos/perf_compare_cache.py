@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+比较缓存性能验证脚本
+模拟一次运行中多个用例将不同的输出与同一个基线比较（按 key 匹配的 JSON），
+对比每次新建比较器、重复解析基线与启用运行级比较缓存时的耗时。
+"""
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from cli_test_framework.core.assertions import Assertions
+from cli_test_framework.core.compare_cache import comparison_cache
+
+
+def make_files(directory, records=30000, cases=10):
+    data = [{"id": i, "value": i * 0.5, "tags": ["a", "b"]} for i in range(records)]
+    baseline = Path(directory) / "baseline.json"
+    baseline.write_text(json.dumps(data), encoding="utf-8")
+    # 基线是旧文件，输出是刚生成的文件
+    past = time.time() - 3600
+    os.utime(baseline, (past, past))
+    outputs = []
+    for case in range(cases):
+        data[case]["value"] += 1e-9  # 在容差范围内
+        output = Path(directory) / f"out_{case}.json"
+        output.write_text(json.dumps(data), encoding="utf-8")
+        outputs.append(str(output))
+    return str(baseline), outputs
+
+
+def run_round(baseline, outputs):
+    start = time.perf_counter()
+    for output in outputs:
+        Assertions.compare_files(output, baseline, file_type="json",
+                                 compare_mode="key-based", key_field="id", atol=1e-6)
+    return time.perf_counter() - start
+
+
+def age(paths, seconds=60):
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def run_benchmark(cases=10):
+    print("=" * 60)
+    print("比较缓存性能验证")
+    print("=" * 60)
+    print(f"每轮 {cases} 次比较：不同的输出与同一基线")
+    for label, cached in (("无缓存", False), ("有缓存", True)):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline, outputs = make_files(directory, cases=cases)
+            with comparison_cache() if cached else contextlib.nullcontext():
+                fresh = run_round(baseline, outputs)
+                # 输出不再变化后重复比较（如多个用例检查同一批输出）
+                age(outputs)
+                repeated = run_round(baseline, outputs)
+                again = run_round(baseline, outputs)
+        print(f"  {label}: 新输出 {fresh:6.2f} s, 重复比较 {repeated:6.2f} s, 再次重复 {again:6.2f} s")
+
+    print("\n有缓存时基线只解析一次；刚生成的输出不缓存，未变化的输出在第二次比较后直接复用比较结果。")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多文件比较并发验证脚本
+一个用例通过 compare_files 比较多对 32 MB 的二进制文件，
+分别以 CLI_TEST_COMPARE_WORKERS=1（逐个比较）和默认并发度在新解释器中运行 validate_result。
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+
+PROBE = """
+import json, sys, time
+from cli_test_framework.core.execution import validate_result
+specs = json.loads(sys.argv[1])
+result = {"name": "t", "status": "failed", "message": "", "command": "", "output": "", "return_code": 0, "duration": 0.0}
+start = time.perf_counter()
+try:
+    validate_result({"compare_files": specs}, result)
+    failures = 0
+except AssertionError as exc:
+    failures = str(exc).count("File comparison failed")
+print(json.dumps({"s": time.perf_counter() - start, "failures": failures}))
+"""
+
+
+def make_specs(directory, files=8, size=32 << 20):
+    specs = []
+    for index in range(files):
+        content = bytearray(os.urandom(size))
+        baseline = Path(directory) / f"baseline_{index}.bin"
+        baseline.write_bytes(content)
+        if index % 4 == 3:
+            content[-1] ^= 0xFF  # 每 4 个文件中有 1 个不一致
+        actual = Path(directory) / f"out_{index}.bin"
+        actual.write_bytes(content)
+        specs.append({"actual": str(actual), "baseline": str(baseline), "digest_cache": False})
+    return specs
+
+
+def measure(specs, workers):
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    if workers:
+        env["CLI_TEST_COMPARE_WORKERS"] = str(workers)
+    output = subprocess.run([sys.executable, "-c", PROBE, json.dumps(specs)],
+                            check=True, capture_output=True, text=True, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmark():
+    print("=" * 60)
+    print("多文件比较并发验证")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as directory:
+        specs = make_specs(directory)
+        sequential = measure(specs, 1)
+        concurrent = measure(specs, None)
+    print(f"{len(specs)} 个比较规则")
+    print(f"  逐个比较: {sequential['s']:6.2f} s, 报告失败 {sequential['failures']} 个")
+    print(f"  并发比较: {concurrent['s']:6.2f} s, 报告失败 {concurrent['failures']} 个")
+    print(f"  加速比:   {sequential['s'] / concurrent['s']:6.2f}x (CPU 核数: {os.cpu_count()})")
+    print("\n两种方式都应报告全部失败的比较；加速取决于 CPU 核数与磁盘；纯 Python 解析（如 JSON）受 GIL 限制。")
+
+
+if __name__ == "__main__":
+    run_benchmark()
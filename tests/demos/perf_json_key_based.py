@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON key-based 比较性能验证脚本
+按倍数增加列表长度，验证按 key 匹配的耗时随记录数线性增长
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from cli_test_framework.file_comparator.json_comparator import JsonComparator
+
+
+def make_records(count, seed=0):
+    rng = random.Random(seed)
+    records = [
+        {"meta": {"id": i, "run": f"r{i % 7}"}, "value": i * 0.5, "tags": ["a", "b"]}
+        for i in range(count)
+    ]
+    shuffled = [dict(record) for record in records]
+    rng.shuffle(shuffled)
+    # A few changed records so the comparison walks matched items too
+    for record in shuffled[:5]:
+        record["value"] += 1
+    return records, shuffled
+
+
+def run_benchmark(sizes=(25000, 50000, 100000, 200000, 400000)):
+    print("=" * 60)
+    print("JSON key-based 比较性能验证")
+    print("=" * 60)
+
+    comparator = JsonComparator(compare_mode="key-based", key_field="meta.id", digest_cache=False)
+    previous = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for count in sizes:
+            expected, actual = make_records(count)
+            file1 = Path(temp_dir) / "a.json"
+            file2 = Path(temp_dir) / "b.json"
+            file1.write_text(json.dumps({"records": expected}), encoding="utf-8")
+            file2.write_text(json.dumps({"records": actual}), encoding="utf-8")
+            content1 = comparator.read_content(file1)
+            content2 = comparator.read_content(file2)
+
+            start_time = time.perf_counter()
+            identical, differences = comparator.compare_content(content1, content2)
+            elapsed = time.perf_counter() - start_time
+
+            per_record = elapsed / count * 1e6
+            ratio = "" if previous is None else f"  (x{elapsed / previous:.2f})"
+            print(f"{count:>8} 条记录: {elapsed:.3f}s, {per_record:.2f}us/条{ratio}, 差异 {len(differences)}")
+            previous = elapsed
+
+    print("\n记录数每翻倍耗时约翻倍（x2 左右）即为线性增长。")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,3 +1,5 @@
+import random
+
 from cli_test_framework.file_comparator.factory import ComparatorFactory
 from cli_test_framework.file_comparator.binary_comparator import BinaryComparator
 
@@ -88,7 +90,7 @@ def test_compute_similarity_same_size_different():
 
 
 # ---------------------------------------------------------------------------
-# _hash_chunk_similarity 回归测试（大文件分块哈希路径）
+# _hash_chunk_similarity 回归测试（大文件内容定义分块路径）
 # ---------------------------------------------------------------------------
 
 def test_hash_chunk_similarity_empty():
@@ -111,16 +113,22 @@ def test_hash_chunk_similarity_completely_different():
     assert comp._hash_chunk_similarity(a, b) == 0.0
 
 
-def test_hash_chunk_similarity_half_overlap():
-    """两个文件各 2 个分块，共享 1 个 → Jaccard = 1/3"""
+def test_hash_chunk_similarity_insertion_at_start():
+    """开头插入 1 字节 → 内容定义分块只改变插入点所在的块 → 相似度仍接近 1"""
+    comp = BinaryComparator()
+    data = random.Random(0).randbytes(1 << 20)
+    sim = comp._hash_chunk_similarity(data, b"X" + data)
+    assert 0.95 < sim < 1.0
+
+
+def test_hash_chunk_similarity_half_replaced():
+    """后一半替换为无关内容 → 共享字节约占一半"""
     comp = BinaryComparator()
-    chunk_a = b"\x00" * 4096
-    chunk_b = b"\x01" * 4096
-    chunk_c = b"\x02" * 4096
-    a = chunk_a + chunk_b  # 分块: {hash(chunk_a), hash(chunk_b)}
-    b = chunk_b + chunk_c  # 分块: {hash(chunk_b), hash(chunk_c)}
-    # 交集 1, 并集 3
-    assert comp._hash_chunk_similarity(a, b) == 1.0 / 3.0
+    rng = random.Random(1)
+    head = rng.randbytes(1 << 19)
+    a = head + rng.randbytes(1 << 19)
+    b = head + rng.randbytes(1 << 19)
+    assert 0.4 < comp._hash_chunk_similarity(a, b) < 0.55
 
 
 def test_hash_chunk_similarity_all_same():
@@ -0,0 +1,151 @@
+import bz2
+import gzip
+import json
+import lzma
+import random
+
+import pytest
+
+from cli_test_framework.core.assertions import Assertions
+from cli_test_framework.file_comparator.binary_comparator import BinaryComparator
+from cli_test_framework.file_comparator.factory import ComparatorFactory
+
+
+def compare(file_type, file1, file2, **kwargs):
+    comparator = ComparatorFactory.create_comparator(file_type, digest_cache=False, **kwargs)
+    return comparator.compare_files(file1, file2)
+
+
+def test_compressed_baselines_match_plain_output(tmp_path):
+    documents = {
+        "text": "alpha\nbeta\n",
+        "csv": "x,y\n1,2.5\n",
+        "json": json.dumps({"values": [1, 2, 3]}),
+        "jsonl": '{"id": 1}\n{"id": 2}\n',
+        "xml": "<root><item id='1'>a</item></root>",
+        "binary": "\x00\x01raw",
+    }
+    for file_type, content in documents.items():
+        actual = tmp_path / f"{file_type}.out"
+        actual.write_text(content, encoding="utf-8")
+        for suffix, compress in ((".gz", gzip.compress), (".bz2", bz2.compress), (".xz", lzma.compress)):
+            baseline = tmp_path / f"{file_type}.baseline{suffix}"
+            baseline.write_bytes(compress(content.encode("utf-8")))
+            result = compare(file_type, actual, baseline)
+            assert result.identical, (file_type, suffix, result.error)
+
+
+def test_compressed_differences_are_reported(tmp_path):
+    actual = tmp_path / "run.log"
+    baseline = tmp_path / "run.log.gz"
+    actual.write_text("step 1\nstep 2\n", encoding="utf-8")
+    baseline.write_bytes(gzip.compress(b"step 1\nstep 3\n"))
+
+    result = compare("text", actual, baseline)
+
+    assert [str(d) for d in result.differences] == ["At line 2: expected 'step 2\n', got 'step 3\n'"]
+
+
+def test_compressed_binary_reports_runs_and_size(tmp_path):
+    data = bytes(range(256)) * 100
+    changed = bytearray(data)
+    changed[1000] ^= 0xFF
+    actual = tmp_path / "a.bin"
+    baseline = tmp_path / "b.bin.gz"
+    actual.write_bytes(data)
+    baseline.write_bytes(gzip.compress(bytes(changed) + b"tail"))
+
+    result = compare("binary", actual, baseline)
+
+    assert [(d.position, d.diff_type) for d in result.differences] == [
+        ("byte 1000", "content"),
+        ("byte 25600", "size"),
+    ]
+    assert result.differences[1].actual == "25604 bytes"
+
+
+@pytest.mark.parametrize("length", [2 * BinaryComparator.WINDOW_SIZE + 100, BinaryComparator.WINDOW_SIZE + 3])
+def test_compressed_binary_context_matches_plain_across_windows(tmp_path, length):
+    window = BinaryComparator.WINDOW_SIZE
+    data = random.Random(7).randbytes(length)
+    changed = bytearray(data)
+    for pos in (window - 1, 2 * window - 4):
+        if pos < length:
+            changed[pos] ^= 0xFF
+    actual = tmp_path / "a.bin"
+    plain = tmp_path / "b.bin"
+    actual.write_bytes(data)
+    plain.write_bytes(changed)
+    (tmp_path / "b.bin.gz").write_bytes(gzip.compress(bytes(changed), compresslevel=1))
+
+    expected = compare("binary", actual, plain).differences
+    result = compare("binary", actual, tmp_path / "b.bin.gz")
+
+    assert [(d.position, d.expected, d.actual) for d in result.differences] == [
+        (d.position, d.expected, d.actual) for d in expected]
+    if length > window + BinaryComparator.CONTEXT_SIZE:
+        assert len(expected[0].expected.split()) == 2 * BinaryComparator.CONTEXT_SIZE
+
+
+def test_compressed_corrupt_file_is_an_error(tmp_path):
+    actual = tmp_path / "a.txt"
+    baseline = tmp_path / "b.txt.gz"
+    actual.write_text("x\n" * 1000, encoding="utf-8")
+    data = gzip.compress(b"x\n" * 1000)
+    baseline.write_bytes(data[:len(data) // 2])
+
+    result = compare("text", actual, baseline)
+
+    assert result.error.startswith("Error reading file")
+
+
+def test_compressed_type_is_detected_from_inner_suffix(tmp_path):
+    actual = tmp_path / "values.json"
+    baseline = tmp_path / "values.json.gz"
+    actual.write_text('{"v": 1.0}', encoding="utf-8")
+    baseline.write_bytes(gzip.compress(b'{"v": 1.0000001}'))
+
+    assert Assertions.compare_files(str(actual), str(baseline), rtol=1e-5, digest_cache=False) is True
+
+
+def test_zstd_files_support_similarity_and_ranges(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    compress = zstandard.ZstdCompressor().compress
+    # Random content: periodic data has no content-defined chunk boundaries
+    data = random.Random(0).randbytes(300000)
+    changed = bytearray(data)
+    changed[5000] ^= 0xFF
+    actual = tmp_path / "a.bin.zst"
+    baseline = tmp_path / "b.bin.zst"
+    actual.write_bytes(compress(data))
+    baseline.write_bytes(compress(bytes(changed)))
+
+    result = compare("binary", actual, baseline, similarity=True)
+    assert result.error is None
+    assert [d.position for d in result.differences] == ["byte 5000"]
+    assert 0.0 < result.similarity < 1.0
+    ranged = ComparatorFactory.create_comparator("binary", digest_cache=False).compare_files(
+        actual, baseline, start_line=6000)
+    assert ranged.error is None and ranged.identical
+
+    lines = "".join(f"line {i}\n" for i in range(100))
+    text_actual = tmp_path / "a.log.zst"
+    text_baseline = tmp_path / "b.log"
+    text_actual.write_bytes(compress(lines.encode("utf-8")))
+    text_baseline.write_text(lines.replace("line 10\n", "line X\n"), encoding="utf-8")
+    text = ComparatorFactory.create_comparator("text", digest_cache=False).compare_files(
+        text_actual, text_baseline, start_line=50)
+    assert text.error is None and text.identical
+
+
+def test_compressed_random_access_types_compare_as_binary(tmp_path):
+    np = pytest.importorskip("numpy")
+    buffer = tmp_path / "plain.npy"
+    np.save(buffer, np.arange(10.0))
+    data = gzip.compress(buffer.read_bytes())
+    actual = tmp_path / "out.npy.gz"
+    baseline = tmp_path / "baseline.npy.gz"
+    actual.write_bytes(data)
+    baseline.write_bytes(data)
+
+    assert Assertions.compare_files(str(actual), str(baseline), digest_cache=False) is True
@@ -109,3 +109,107 @@ def test_csv_numeric_tolerance_mixed_with_string(tmp_path):
     assert "cell_mismatch" in diff_types
     string_diffs = [d for d in result.differences if d.diff_type == "cell_mismatch"]
     assert any(d.expected == "Ada" and d.actual == "Grace" for d in string_diffs)
+
+
+def test_csv_columnar_blocks_report_in_row_order(tmp_path, monkeypatch):
+    """Mismatches found column by column are reported in row/column order across blocks"""
+    from cli_test_framework.file_comparator.csv_comparator import CsvComparator
+    monkeypatch.setattr(CsvComparator, "ROW_BLOCK", 4)
+    file1 = tmp_path / "a.csv"
+    file2 = tmp_path / "b.csv"
+    rows1 = [f"{i},{i * 0.5},label{i}" for i in range(20)]
+    rows2 = list(rows1)
+    rows2[5] = "5,9.0,other"
+    rows2[6] = "6,3.0000000001,label6"
+    rows2[13] = "13,6.5,label13,extra"
+    file1.write_text("\n".join(rows1) + "\n", encoding="utf-8")
+    file2.write_text("\n".join(rows2) + "\n", encoding="utf-8")
+
+    result = compare_csv(file1, file2)
+
+    assert [(d.position, d.diff_type) for d in result.differences] == [
+        ("row 6, column 2", "cell_mismatch"),
+        ("row 6, column 3", "cell_mismatch"),
+        ("row 14", "column_count_mismatch"),
+    ]
+
+
+def test_csv_numeric_column_with_missing_values(tmp_path):
+    """A numeric column containing non-numeric cells still uses tolerance where possible"""
+    file1 = tmp_path / "a.csv"
+    file2 = tmp_path / "b.csv"
+    file1.write_text("value\n1.0\nNA\n2.0\n", encoding="utf-8")
+    file2.write_text("value\n1.0000001\nNA\n3.0\n", encoding="utf-8")
+
+    result = compare_csv(file1, file2)
+
+    assert [(d.position, d.expected, d.actual) for d in result.differences] == [
+        ("row 4, column 1", "2.0", "3.0")
+    ]
+
+
+def test_csv_streams_rows_without_reading_whole_files(tmp_path, monkeypatch):
+    """compare_files parses rows lazily instead of building the full row lists"""
+    from cli_test_framework.file_comparator.csv_comparator import CsvComparator
+    file1 = tmp_path / "a.csv"
+    file2 = tmp_path / "b.csv"
+    file1.write_text("id,note\n1,\"multi\nline\"\n2,x\n", encoding="utf-8")
+    file2.write_text("id,note\n1,\"multi\nline\"\n2,y\n", encoding="utf-8")
+    monkeypatch.setattr(CsvComparator, "read_content", None)
+    monkeypatch.setattr(CsvComparator, "_streams", lambda self, file1, file2: True)
+
+    result = CsvComparator(digest_cache=False).compare_files(file1, file2)
+
+    assert [(d.position, d.expected, d.actual) for d in result.differences] == [
+        ("row 3, column 2", "x", "y")
+    ]
+
+
+def test_csv_key_columns_ignore_row_order(tmp_path):
+    file1 = tmp_path / "a.csv"
+    file2 = tmp_path / "b.csv"
+    file1.write_text("id,name,value\n1,Ada,1.0\n2,Grace,2.0\n3,Alan,3.0\n", encoding="utf-8")
+    file2.write_text("id,name,value\n3,Alan,3.0000001\n1,Ada,1.0\n2,Grace,2.0\n", encoding="utf-8")
+
+    result = compare_csv(file1, file2, key_columns="id")
+
+    assert result.identical, result.differences
+
+
+def test_csv_key_columns_report_missing_extra_changed(tmp_path):
+    file1 = tmp_path / "a.csv"
+    file2 = tmp_path / "b.csv"
+    file1.write_text("id,name\n1,Ada\n2,Grace\n3,Alan\n", encoding="utf-8")
+    file2.write_text("id,name\n4,Barbara\n2,Grace\n1,Ida\n2,Grace\n", encoding="utf-8")
+
+    result = compare_csv(file1, file2, key_columns=["id"])
+
+    assert [(d.position, d.diff_type) for d in result.differences] == [
+        ("row 2 (key: id=4)", "extra_row"),
+        ("row 4 (key: id=1), column 2", "cell_mismatch"),
+        ("row 5 (key: id=2)", "duplicate_key"),
+        ("row 4 (key: id=3)", "missing_row"),
+    ]
+
+
+def test_csv_key_columns_external_merge_matches_hash_join(tmp_path):
+    """Sort-merging through temporary files finds the same differences as the in-memory index"""
+    import random
+    rng = random.Random(11)
+    file1 = tmp_path / "a.csv"
+    file2 = tmp_path / "b.csv"
+    rows = [[f"k{i}", str(i % 7), f"{i * 0.25}"] for i in range(300)]
+    changed = [list(row) for row in rows]
+    for row in rng.sample(changed, 5):
+        row[2] = "9.5"
+    changed = [row for row in changed if row[0] not in ("k17", "k250")] + [["k999", "0", "1.0"]]
+    rng.shuffle(changed)
+    file1.write_text("".join(",".join(row) + "\n" for row in rows), encoding="utf-8")
+    file2.write_text("".join(",".join(row) + "\n" for row in changed), encoding="utf-8")
+
+    in_memory = compare_csv(file1, file2, key_columns=[0, 1], max_differences=100)
+    merged = compare_csv(file1, file2, key_columns=[0, 1], max_differences=100, max_rows_in_memory=16)
+
+    summary = lambda result: sorted((d.position, d.diff_type) for d in result.differences)
+    assert len(in_memory.differences) == 8
+    assert summary(merged) == summary(in_memory)
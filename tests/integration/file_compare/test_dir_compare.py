@@ -0,0 +1,81 @@
+import json
+
+from cli_test_framework.core.assertions import Assertions
+from cli_test_framework.file_comparator.factory import ComparatorFactory
+
+
+def compare_dirs(dir1, dir2, **kwargs):
+    comparator = ComparatorFactory.create_comparator("dir", digest_cache=False, **kwargs)
+    return comparator.compare_files(dir1, dir2)
+
+
+def write_tree(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return root
+
+
+def test_dir_identical_trees(tmp_path):
+    files = {"a.txt": "x\n", "sub/b.json": '{"v": 1}', "sub/deep/c.bin": "raw"}
+    dir1 = write_tree(tmp_path / "one", files)
+    dir2 = write_tree(tmp_path / "two", files)
+
+    result = compare_dirs(dir1, dir2)
+
+    assert result.identical
+    assert result.differences == []
+
+
+def test_dir_reports_missing_extra_and_dispatches_by_extension(tmp_path):
+    dir1 = write_tree(tmp_path / "one", {
+        "only1.txt": "x\n",
+        "data.json": json.dumps({"a": 1, "b": 2}),
+        "log.txt": "line1\nline2\n",
+        "same.txt": "same\n",
+    })
+    dir2 = write_tree(tmp_path / "two", {
+        "only2.txt": "x\n",
+        "data.json": json.dumps({"b": 2, "a": 3}),
+        "log.txt": "line1\nchanged\n",
+        "same.txt": "same\n",
+    })
+
+    result = compare_dirs(dir1, dir2)
+
+    assert not result.identical
+    assert [(d.position, d.diff_type) for d in result.differences] == [
+        ("data.json: a", "value_mismatch"),
+        ("log.txt: line 2", "content"),
+        ("only1.txt", "structure"),
+        ("only2.txt", "structure"),
+    ]
+    assert result.differences[2].actual == "File missing"
+
+
+def test_dir_include_exclude_and_file_options(tmp_path):
+    dir1 = write_tree(tmp_path / "one", {
+        "out/values.json": json.dumps({"v": 1.0}),
+        "out/run.log": "started at 10:00\n",
+        "tmp/scratch.txt": "a\n",
+    })
+    dir2 = write_tree(tmp_path / "two", {
+        "out/values.json": json.dumps({"v": 1.0001}),
+        "out/run.log": "started at 11:00\n",
+        "tmp/scratch.txt": "b\n",
+    })
+
+    assert not compare_dirs(dir1, dir2, include=["*.json"]).identical
+    assert compare_dirs(dir1, dir2, include=["*.json"], file_options={"*.json": {"rtol": 1e-3}}).identical
+    assert compare_dirs(dir1, dir2, exclude=["tmp", "*.log"],
+                        file_options={"out/*.json": {"rtol": 1e-3}}).identical
+    result = compare_dirs(dir1, dir2, include=["*.log"], file_options={"*.log": {"file_type": "binary"}})
+    assert [d.diff_type for d in result.differences] == ["content"]
+
+
+def test_dir_assertion_auto_detects_directories(tmp_path):
+    dir1 = write_tree(tmp_path / "one", {"a.txt": "x\n"})
+    dir2 = write_tree(tmp_path / "two", {"a.txt": "x\n"})
+
+    assert Assertions.compare_files(str(dir1), str(dir2), digest_cache=False) is True
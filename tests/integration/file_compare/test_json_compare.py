@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 from cli_test_framework.file_comparator.factory import ComparatorFactory
 
 
@@ -46,3 +50,134 @@ def test_json_key_missing_detected(tmp_path):
     result = compare_json(f1, f2, compare_mode="key-based", key_field="id")
     assert not result.identical
 
+
+
+def test_json_streaming_matches_loaded_comparison(tmp_path, monkeypatch):
+    """Streaming walks large containers token by token and reports the same differences"""
+    from cli_test_framework.file_comparator import json_stream
+    monkeypatch.setattr(json_stream, "SCAN_LIMIT", 16)
+    f1 = tmp_path / "a.json"
+    f2 = tmp_path / "b.json"
+    f1.write_text('{"meta": {"v": 1}, "rows": [{"id": 1, "x": 0.5}, {"id": 2, "x": 1.5}, 3], "z": "a"}',
+                  encoding="utf-8")
+    f2.write_text('{"meta": {"v": 2}, "rows": [{"id": 1, "x": 0.5}, {"id": 2, "x": 2.5}], "y": "a"}',
+                  encoding="utf-8")
+
+    loaded = compare_json(f1, f2, streaming=False)
+    streamed = compare_json(f1, f2, streaming=True)
+
+    def summary(result):
+        return sorted((d.position, d.diff_type, str(d.expected), str(d.actual)) for d in result.differences)
+
+    assert streamed.error is None
+    assert summary(streamed) == summary(loaded)
+    assert ("rows", "length_mismatch", "list with 3 items", "list with 2 items") in summary(streamed)
+
+
+def test_json_streaming_does_not_load_documents(tmp_path, monkeypatch):
+    from cli_test_framework.file_comparator.json_comparator import JsonComparator
+    f1 = tmp_path / "a.json"
+    f2 = tmp_path / "b.json"
+    f1.write_text('[' + ', '.join(str(i) for i in range(1000)) + ']', encoding="utf-8")
+    f2.write_text('[' + ', '.join(str(i if i % 50 else -i) for i in range(1000)) + ']', encoding="utf-8")
+    monkeypatch.setattr(JsonComparator, "read_content", None)
+    monkeypatch.setattr(JsonComparator, "compare_content", None)
+
+    result = JsonComparator(streaming=True, digest_cache=False).compare_files(f1, f2)
+
+    assert result.error is None
+    # The walk stops at the difference cap
+    assert [d.position for d in result.differences] == [f"[{i}]" for i in range(50, 550, 50)]
+
+
+def test_json_streaming_is_automatic_for_large_files(tmp_path, monkeypatch):
+    from cli_test_framework.file_comparator import json_comparator
+    f1 = tmp_path / "a.json"
+    f2 = tmp_path / "b.json"
+    f1.write_text('{"a": 1}', encoding="utf-8")
+    f2.write_text('{"a": 1} trailing', encoding="utf-8")
+    comparator = json_comparator.JsonComparator(digest_cache=False)
+
+    assert not comparator._streams(f1, f2)
+    monkeypatch.setattr(json_comparator, "STREAM_THRESHOLD", 8)
+    assert comparator._streams(f1, f2)
+    assert not json_comparator.JsonComparator(compare_mode="key-based", key_field="id")._streams(f1, f2)
+
+    result = comparator.compare_files(f1, f2)
+    assert not result.identical
+    assert f"Invalid JSON in {f2}" in result.error
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_json_tolerance_and_ignore_paths(tmp_path, streaming):
+    f1 = tmp_path / "a.json"
+    f2 = tmp_path / "b.json"
+    f1.write_text('{"meta": {"timestamp": "2025-01-01", "solver": "cg"}, '
+                  '"results": [{"x": 1.0, "elapsed": 0.5}, {"x": 2, "elapsed": 0.7}]}', encoding="utf-8")
+    f2.write_text('{"meta": {"timestamp": "2025-06-30", "solver": "cg"}, '
+                  '"results": [{"x": 1.0000000001, "elapsed": 0.9}, {"x": 2.0, "elapsed": 0.1, "extra": 1}]}',
+                  encoding="utf-8")
+    ignore_paths = ["$.meta.timestamp", "$.results[*].elapsed"]
+
+    exact = compare_json(f1, f2, streaming=streaming, ignore_paths=ignore_paths)
+    tolerant = compare_json(f1, f2, streaming=streaming, ignore_paths=ignore_paths, rtol=1e-6)
+
+    assert sorted(d.position for d in exact.differences) == ["results[0].x", "results[1].extra", "results[1].x"]
+    assert [d.position for d in tolerant.differences] == ["results[1].extra"]
+
+
+def test_json_tolerance_reports_values_outside_tolerance(tmp_path):
+    f1 = tmp_path / "a.json"
+    f2 = tmp_path / "b.json"
+    f1.write_text('{"energy": -1.5, "count": 3}', encoding="utf-8")
+    f2.write_text('{"energy": -1.6, "count": 3}', encoding="utf-8")
+
+    result = compare_json(f1, f2, atol=0.01)
+
+    assert [(d.position, d.expected, d.actual, d.diff_type) for d in result.differences] == [
+        ("energy", -1.5, -1.6, "value_mismatch")
+    ]
+
+
+def test_json_key_based_reports_duplicate_keys(tmp_path):
+    f1 = tmp_path / "a.json"
+    f2 = tmp_path / "b.json"
+    f1.write_text('[{"id": 1, "v": "a"}, {"id": 2, "v": "b"}]', encoding="utf-8")
+    f2.write_text('[{"id": 2, "v": "b"}, {"id": 1, "v": "a"}, {"id": 1, "v": "c"}]', encoding="utf-8")
+
+    result = compare_json(f1, f2, compare_mode="key-based", key_field="id")
+
+    assert [(d.position, d.diff_type, d.actual) for d in result.differences] == [
+        ("[2] (key: id=1)", "duplicate_key", {"id": 1, "v": "c"})
+    ]
+
+
+def test_json_key_based_nested_and_typed_keys(tmp_path):
+    f1 = tmp_path / "a.json"
+    f2 = tmp_path / "b.json"
+    f1.write_text('{"runs": [{"meta": {"id": 1}, "x": 1}, {"meta": {"id": "2"}, "x": 2}, {"x": 3}]}',
+                  encoding="utf-8")
+    f2.write_text('{"runs": [{"meta": {"id": 2}, "x": 2}, {"x": 4}, {"meta": {"id": 1}, "x": 1}]}',
+                  encoding="utf-8")
+
+    result = compare_json(f1, f2, compare_mode="key-based", key_field="meta.id")
+
+    # "2" and 2 are different keys; items without the key are compared by position
+    assert [(d.position, d.diff_type) for d in result.differences] == [
+        ("runs[1] (key: meta.id=2)", "missing_item"),
+        ("runs[0] (key: meta.id=2)", "extra_item"),
+        ("runs[2].x", "value_mismatch"),
+    ]
+
+
+@pytest.mark.parametrize("options", [{"streaming": False}, {"streaming": True},
+                                     {"compare_mode": "key-based", "key_field": "id"}])
+@pytest.mark.parametrize("max_differences", [3, 25])
+def test_json_max_differences(tmp_path, options, max_differences):
+    f1 = tmp_path / "a.json"
+    f2 = tmp_path / "b.json"
+    f1.write_text(json.dumps([{"id": i, "v": i} for i in range(40)]), encoding="utf-8")
+    f2.write_text(json.dumps([{"id": i, "v": -i - 1} for i in range(40)]), encoding="utf-8")
+
+    result = compare_json(f1, f2, max_differences=max_differences, **options)
+    assert len(result.differences) == max_differences
@@ -0,0 +1,106 @@
+import pytest
+
+from cli_test_framework.file_comparator.factory import ComparatorFactory
+from cli_test_framework.file_comparator import jsonl_comparator
+from cli_test_framework.file_comparator.jsonl_comparator import JsonlComparator
+
+
+def compare_jsonl(file1, file2, **kwargs):
+    comparator = ComparatorFactory.create_comparator("jsonl", digest_cache=False, **kwargs)
+    return comparator.compare_files(file1, file2)
+
+
+def write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_jsonl_differences_are_reported_with_line_numbers(tmp_path):
+    f1 = tmp_path / "a.jsonl"
+    f2 = tmp_path / "b.jsonl"
+    write_lines(f1, ['{"id": 1, "v": "a"}', '{"id": 2, "v": "b"}', '{"id": 3, "v": "c"}'])
+    write_lines(f2, ['{"id": 1, "v": "a"}', '', '{"v": "x", "id": 2}'])
+
+    result = compare_jsonl(f1, f2)
+    assert not result.identical
+    assert [(d.position, d.diff_type) for d in result.differences] == [
+        ("line 2.v", "value_mismatch"),
+        ("line 3", "missing_item"),
+    ]
+
+
+def test_jsonl_key_field_matches_records_in_any_order(tmp_path):
+    f1 = tmp_path / "a.jsonl"
+    f2 = tmp_path / "b.jsonl"
+    write_lines(f1, ['{"id": 1, "v": 1.0}', '{"id": 2, "v": 2.0}', '{"id": 3, "v": 3.0}'])
+    write_lines(f2, ['{"id": 3, "v": 3.0}', '{"id": 1, "v": 1.0000001}', '{"id": 2, "v": 2.0}'])
+
+    assert compare_jsonl(f1, f2, key_field="id", rtol=1e-6).identical
+    result = compare_jsonl(f1, f2, key_field="id")
+    assert [d.position for d in result.differences] == ["[key:id=1].v"]
+
+    write_lines(f2, ['{"id": 1, "v": 1.0}', '{"id": 1, "v": 2.0}', '{"id": 3, "v": 3.0}'])
+    result = compare_jsonl(f1, f2, key_field="id")
+    assert {d.diff_type for d in result.differences} >= {"duplicate_key", "missing_item"}
+
+
+def test_jsonl_ignore_paths_apply_to_each_record(tmp_path):
+    f1 = tmp_path / "a.jsonl"
+    f2 = tmp_path / "b.jsonl"
+    write_lines(f1, ['{"id": 1, "ts": "10:00"}', '{"id": 2, "ts": "10:01"}'])
+    write_lines(f2, ['{"id": 1, "ts": "11:00"}', '{"id": 2, "ts": "11:01"}'])
+
+    assert compare_jsonl(f1, f2, ignore_paths=["$.ts"]).identical
+    assert not compare_jsonl(f1, f2).identical
+
+
+def test_jsonl_invalid_line_is_reported(tmp_path):
+    f1 = tmp_path / "a.jsonl"
+    f2 = tmp_path / "b.jsonl"
+    write_lines(f1, ['{"id": 1}', '{"id": 2}'])
+    write_lines(f2, ['{"id": 1}', '{"id": 2'])
+
+    result = compare_jsonl(f1, f2)
+    assert not result.identical
+    assert "at line 2" in result.error
+
+
+@pytest.mark.parametrize("execution_mode", ["thread", "process"])
+@pytest.mark.parametrize("key_field", [None, "id"])
+def test_jsonl_worker_pool_matches_serial_comparison(tmp_path, monkeypatch, execution_mode, key_field):
+    monkeypatch.setattr(JsonlComparator, "PARALLEL_THRESHOLD", 0)
+    f1 = tmp_path / "a.jsonl"
+    f2 = tmp_path / "b.jsonl"
+    records = [f'{{"id": {i}, "x": {i * 0.5}}}' for i in range(500)]
+    write_lines(f1, records)
+    records[123] = '{"id": 123, "x": -1.0}'
+    records[456] = '{"id": 456, "x": "text"}'
+    write_lines(f2, records)
+
+    serial = compare_jsonl(f1, f2, key_field=key_field, num_threads=1)
+    pooled = compare_jsonl(f1, f2, key_field=key_field, num_threads=2, execution_mode=execution_mode,
+                           batch_size=50)
+    assert [(d.position, d.diff_type) for d in pooled.differences] == \
+        [(d.position, d.diff_type) for d in serial.differences]
+    assert len(pooled.differences) == 2
+
+
+@pytest.mark.parametrize("key_field", [None, "id"])
+def test_jsonl_unmatched_records_stop_at_max_differences(monkeypatch, key_field):
+    created = []
+    original = jsonl_comparator.Difference
+
+    def counting_difference(*args, **kwargs):
+        created.append(kwargs.get("diff_type"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(jsonl_comparator, "Difference", counting_difference)
+    comparator = JsonlComparator(key_field=key_field, max_differences=5)
+    # Arrays have no key, so the trailing records are compared by position
+    content1 = [(1, [0])]
+    content2 = [(1, [0])] + [(i, [i]) for i in range(2, 10002)]
+
+    identical, differences = comparator.compare_content(content1, content2)
+
+    assert not identical
+    assert [d.diff_type for d in differences] == ["extra_item"] * 5 + ["more differences not shown"]
+    assert len(created) == 6
@@ -0,0 +1,90 @@
+import numpy as np
+
+from cli_test_framework.file_comparator.factory import ComparatorFactory
+
+
+def compare_npy(file1, file2, **kwargs):
+    comparator = ComparatorFactory.create_comparator("npy", **kwargs)
+    return comparator.compare_files(file1, file2)
+
+
+def test_npy_values_within_tolerance_are_identical(tmp_path):
+    file1 = tmp_path / "a.npy"
+    file2 = tmp_path / "b.npy"
+    data = np.linspace(0.0, 1.0, 1000).reshape(10, 100)
+    np.save(file1, data)
+    np.save(file2, data + 1e-9)
+
+    result = compare_npy(file1, file2)
+
+    assert result.identical
+    assert result.differences == []
+
+
+def test_npy_reports_mismatch_statistics(tmp_path):
+    file1 = tmp_path / "a.npy"
+    file2 = tmp_path / "b.npy"
+    data = np.linspace(0.0, 1.0, 1000).reshape(10, 100)
+    changed = data.copy()
+    changed[3, 7] += 1e-3
+    np.save(file1, data)
+    np.save(file2, changed)
+
+    summary = compare_npy(file1, file2)
+    detailed = compare_npy(file1, file2, show_content_diff=True)
+
+    assert [(d.position, d.diff_type) for d in summary.differences] == [("array", "content")]
+    assert detailed.differences[0].actual.startswith("1/1000 values differ")
+    assert detailed.differences[1].position == "array[3,7]"
+    assert compare_npy(file1, file2, atol=1e-2).identical
+
+
+def test_npz_members_are_matched_by_name(tmp_path):
+    file1 = tmp_path / "a.npz"
+    file2 = tmp_path / "b.npz"
+    np.savez(file1, x=np.arange(5), labels=np.array(["a", "b"]), shape=np.zeros((2, 2)), only1=np.zeros(1))
+    np.savez(file2, labels=np.array(["a", "c"]), x=np.arange(5.0), shape=np.zeros((2, 3)), only2=np.zeros(1))
+
+    result = compare_npy(file1, file2, show_content_diff=True)
+
+    assert [(d.position, d.diff_type) for d in result.differences] == [
+        ("x/dtype", "structure"),
+        ("labels[1]", "content"),
+        ("shape/shape", "structure"),
+        ("only1", "structure"),
+        ("only2", "structure"),
+    ]
+
+
+def test_npz_tolerance_profile_applies_per_member(tmp_path):
+    file1 = tmp_path / "a.npz"
+    file2 = tmp_path / "b.npz"
+    np.savez(file1, energy=np.array([1.0, 2.0]), timings=np.array([0.5]))
+    np.savez(file2, energy=np.array([1.001, 2.0]), timings=np.array([0.9]))
+
+    profile = {"energy": {"rtol": 1e-2}, "timings": {"ignore": True}}
+
+    assert compare_npy(file1, file2, tolerance_profile=profile).identical
+    assert not compare_npy(file1, file2).identical
+
+
+def test_npy_rejects_pickled_and_invalid_files(tmp_path):
+    file1 = tmp_path / "a.npy"
+    file2 = tmp_path / "b.npy"
+    np.save(file1, np.array([{"a": 1}], dtype=object), allow_pickle=True)
+    file2.write_text("not an array", encoding="utf-8")
+
+    result = compare_npy(file1, file2)
+
+    assert not result.identical
+    assert f"Invalid NumPy file {file1}" in result.error
+    assert "Invalid NumPy file" in compare_npy(file2, file2).error
+
+
+def test_npy_files_are_memory_mapped(tmp_path):
+    file1 = tmp_path / "a.npy"
+    np.save(file1, np.arange(10))
+
+    content = ComparatorFactory.create_comparator("npy").read_content(file1)
+
+    assert isinstance(content["array"], np.memmap)
@@ -38,3 +38,17 @@ def test_text_range_limits_scope(tmp_path):
     result = compare_text(f1, f2, start_line=0, end_line=1)
     assert result.identical
 
+
+
+def test_text_inserted_line_reported_once(tmp_path):
+    f1 = tmp_path / "a.txt"
+    f2 = tmp_path / "b.txt"
+    f1.write_text("".join(f"line{i}\n" for i in range(1000)), encoding="utf-8")
+    f2.write_text("".join(f"line{i}\n" for i in range(500)) + "inserted\n"
+                  + "".join(f"line{i}\n" for i in range(500, 1000)), encoding="utf-8")
+
+    result = compare_text(f1, f2)
+    assert not result.identical
+    assert [(d.position, d.diff_type, d.actual) for d in result.differences] == [
+        ("line 501", "extra", "inserted\n")
+    ]
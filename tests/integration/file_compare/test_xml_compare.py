@@ -70,3 +70,80 @@ def test_xml_invalid_file_sets_error(tmp_path):
     assert not result.identical
     assert "Invalid XML" in result.error
 
+
+
+def test_xml_streaming_matches_loaded_comparison(tmp_path, monkeypatch):
+    """Streaming compares small subtrees whole and larger ones while reading them"""
+    from cli_test_framework.file_comparator import text_comparator, xml_stream
+    monkeypatch.setattr(xml_stream, "SUBTREE_LIMIT", 4)
+    monkeypatch.setattr(text_comparator, "STREAM_CHUNK", 7)
+    file1 = tmp_path / "a.xml"
+    file2 = tmp_path / "b.xml"
+    file1.write_text("<root v='1'><suite><case id='1'>ok</case><case id='2'><out>a</out></case></suite>"
+                     "<big><x/><y>1</y><y>2</y><y>3</y></big><tail/></root>", encoding="utf-8")
+    file2.write_text("<root v='1'><suite><case id='1'>ok</case><case id='3'><out>b</out></case></suite>"
+                     "<big><x/><y>1</y><y>4</y></big><tail/><extra/></root>", encoding="utf-8")
+
+    loaded = ComparatorFactory.create_comparator("xml", streaming=False).compare_files(file1, file2)
+    streamed = ComparatorFactory.create_comparator("xml", streaming=True).compare_files(file1, file2)
+
+    assert [(d.position, d.diff_type) for d in streamed.differences] == [
+        (d.position, d.diff_type) for d in loaded.differences
+    ]
+    assert ("/big[1]", "children_count_mismatch") in [(d.position, d.diff_type) for d in streamed.differences]
+    assert not streamed.identical
+
+
+def test_xml_streaming_is_automatic_for_large_files(tmp_path, monkeypatch):
+    from cli_test_framework.file_comparator import xml_comparator
+    file1 = tmp_path / "a.xml"
+    file2 = tmp_path / "b.xml"
+    file1.write_text("<root><a b='1' c='2'/></root>", encoding="utf-8")
+    file2.write_text("<root>\n  <a c='2' b='1'/>\n</root>\n<junk/>", encoding="utf-8")
+    comparator = xml_comparator.XmlComparator(digest_cache=False)
+
+    assert not comparator._streams(file1, file2)
+    monkeypatch.setattr(xml_comparator, "STREAM_THRESHOLD", 8)
+    assert comparator._streams(file1, file2)
+
+    result = comparator.compare_files(file1, file2)
+    assert not result.identical
+    assert f"Invalid XML in {file2}" in result.error
+
+    file2.write_text("<root>\n  <a c='2' b='1'/>\n</root>\n", encoding="utf-8")
+    assert comparator.compare_files(file1, file2).identical
+
+
+def test_xml_ignore_order_matches_reordered_children(tmp_path):
+    file1 = tmp_path / "a.xml"
+    file2 = tmp_path / "b.xml"
+    file1.write_text("<suite><case name='a'><out>1</out><err/></case><case name='b'>2</case>"
+                     "<case name='c'>3</case><skipped/></suite>", encoding="utf-8")
+    file2.write_text("<suite><case name='c'>30</case><case name='b'>2</case>"
+                     "<case name='a'><err/><out>1</out></case><extra/></suite>", encoding="utf-8")
+
+    ordered = ComparatorFactory.create_comparator("xml").compare_files(file1, file2)
+    unordered = ComparatorFactory.create_comparator("xml", ignore_order=True).compare_files(file1, file2)
+
+    assert len(ordered.differences) > 3
+    assert [(d.position, d.diff_type) for d in unordered.differences] == [
+        ("/case[2]", "text_mismatch"),
+        ("/skipped[3]", "missing_element"),
+        ("/extra[3]", "extra_element"),
+    ]
+
+    file2.write_text("<suite><skipped/><case name='c'>3</case><case name='b'>2</case>"
+                     "<case name='a'><err/><out>1</out></case></suite>", encoding="utf-8")
+    assert ComparatorFactory.create_comparator("xml", ignore_order=True).compare_files(file1, file2).identical
+
+
+def test_xml_max_differences(tmp_path):
+    f1 = tmp_path / "a.xml"
+    f2 = tmp_path / "b.xml"
+    f1.write_text("<r>" + "".join(f"<i>{n}</i>" for n in range(40)) + "</r>", encoding="utf-8")
+    f2.write_text("<r>" + "".join(f"<i>{-n - 1}</i>" for n in range(40)) + "</r>", encoding="utf-8")
+
+    for streaming in (False, True):
+        for limit in (3, 25):
+            comparator = ComparatorFactory.create_comparator("xml", streaming=streaming, max_differences=limit)
+            assert len(comparator.compare_files(f1, f2).differences) == limit
@@ -7,11 +7,18 @@ from cli_test_framework.commands import compare
 
 def test_detect_file_type_uses_specific_comparators():
     assert compare.detect_file_type("data.json") == "json"
+    assert compare.detect_file_type("data.jsonl") == "jsonl"
+    assert compare.detect_file_type("data.ndjson") == "jsonl"
     assert compare.detect_file_type("data.xml") == "xml"
     assert compare.detect_file_type("data.csv") == "csv"
     assert compare.detect_file_type("data.h5") == "h5"
+    assert compare.detect_file_type("data.npy") == "npy"
+    assert compare.detect_file_type("data.npz") == "npy"
     assert compare.detect_file_type("data.txt") == "text"
     assert compare.detect_file_type("data.bin") == "binary"
+    assert compare.detect_file_type("data.xml.gz") == "xml"
+    assert compare.detect_file_type("data.npz.gz") == "binary"
+    assert compare.detect_file_type("data.h5.bz2") == "binary"
 
 
 def run_compare(monkeypatch, args):
@@ -71,3 +78,44 @@ def test_compare_main_missing_file_exits_nonzero(tmp_path, monkeypatch):
 
     assert exit_code == 1
 
+
+
+def test_compare_main_passes_json_tolerance_and_ignore_paths(tmp_path, monkeypatch, capsys):
+    file1 = tmp_path / "a.json"
+    file2 = tmp_path / "b.json"
+    file1.write_text('{"value": 1.0, "meta": {"host": "a", "pid": 1}}', encoding="utf-8")
+    file2.write_text('{"value": 1.001, "meta": {"host": "b", "pid": 2}}', encoding="utf-8")
+
+    exit_code = run_compare(
+        monkeypatch,
+        [str(file1), str(file2), "--json-atol", "0.01", "--json-ignore-paths", "$.meta.host, $.meta.pid"],
+    )
+
+    assert exit_code == 0
+    assert "Files are identical" in capsys.readouterr().out
+
+
+def test_compare_main_passes_xml_ignore_order(tmp_path, monkeypatch, capsys):
+    file1 = tmp_path / "a.xml"
+    file2 = tmp_path / "b.xml"
+    file1.write_text("<root><item id='1'/><item id='2'/></root>", encoding="utf-8")
+    file2.write_text("<root><item id='2'/><item id='1'/></root>", encoding="utf-8")
+
+    assert run_compare(monkeypatch, [str(file1), str(file2)]) == 1
+    capsys.readouterr()
+    assert run_compare(monkeypatch, [str(file1), str(file2), "--xml-ignore-order"]) == 0
+    assert "Files are identical" in capsys.readouterr().out
+
+
+def test_compare_main_compares_directories(tmp_path, monkeypatch, capsys):
+    dir1 = tmp_path / "one"
+    dir2 = tmp_path / "two"
+    for root, value in ((dir1, "1"), (dir2, "2")):
+        (root / "logs").mkdir(parents=True)
+        (root / "result.txt").write_text("same\n", encoding="utf-8")
+        (root / "logs" / "run.log").write_text(value, encoding="utf-8")
+
+    assert run_compare(monkeypatch, [str(dir1), str(dir2)]) == 1
+    capsys.readouterr()
+    assert run_compare(monkeypatch, [str(dir1), str(dir2), "--dir-exclude", "logs"]) == 0
+    assert "Files are identical" in capsys.readouterr().out
@@ -2,10 +2,12 @@
 
 import os
 import tempfile
+import threading
 
 import pytest
 
 from cli_test_framework.core.assertions import Assertions, _detect_file_type
+from cli_test_framework.core import execution
 from cli_test_framework.core.execution import validate_result, _dispatch_file_compare
 from cli_test_framework.core.assertions import Assertions as AS  # alias for dispatch tests
 
@@ -20,7 +22,11 @@ from cli_test_framework.core.assertions import Assertions as AS  # alias for dis
         ("out.h5", "h5"),
         ("output.hdf5", "h5"),
         ("data.hdf", "h5"),
+        ("arrays.npy", "npy"),
+        ("arrays.npz", "npy"),
         ("report.json", "json"),
+        ("events.jsonl", "jsonl"),
+        ("events.ndjson", "jsonl"),
         ("table.csv", "csv"),
         ("data.tsv", "csv"),
         ("config.xml", "xml"),
@@ -30,6 +36,12 @@ from cli_test_framework.core.assertions import Assertions as AS  # alias for dis
         ("server.log", "text"),
         ("run.out", "text"),
         ("script.py", "text"),
+        ("report.json.gz", "json"),
+        ("table.csv.bz2", "csv"),
+        ("run.log.xz", "text"),
+        ("archive.gz", "binary"),
+        ("arrays.npy.gz", "binary"),
+        ("result.h5.xz", "binary"),
     ],
 )
 def test_detect_file_type_known_extensions(path, expected):
@@ -47,6 +59,10 @@ def test_detect_file_type_unknown_extension():
     assert _detect_file_type("nofile") == "binary"
 
 
+def test_detect_file_type_directory(tmp_path):
+    assert _detect_file_type(str(tmp_path)) == "dir"
+
+
 # ---------------------------------------------------------------------------
 # Assertions.compare_files – identical files
 # ---------------------------------------------------------------------------
@@ -215,6 +231,56 @@ def test_validate_result_compare_files_fails_on_second():
             )
 
 
+def test_validate_result_reports_all_failing_specs():
+    with tempfile.TemporaryDirectory() as d:
+        _write_two(d, "a1.txt", "b1.txt", "x\n", "y\n")
+        _write_two(d, "a2.txt", "b2.txt", "same\n")
+        _write_two(d, "a3.txt", "b3.txt", "X\n", "Y\n")
+        specs = [{"actual": f"a{i}.txt", "baseline": f"b{i}.txt", "type": "text"} for i in (1, 2, 3)]
+        with pytest.raises(AssertionError) as info:
+            validate_result({"compare_files": specs}, _mini_result(), workspace=d)
+        message = str(info.value)
+        assert message.startswith("2 of 3 file comparisons failed")
+        assert message.index("a1.txt") < message.index("a3.txt")
+        assert "a2.txt" not in message
+
+
+def _fake_dispatch(monkeypatch, compare, workers):
+    """Replace the per-spec comparison and use a fresh pool of *workers* threads."""
+    monkeypatch.setenv("CLI_TEST_COMPARE_WORKERS", str(workers))
+    monkeypatch.setattr(execution, "_compare_pool", None)
+    monkeypatch.setattr(execution, "_dispatch_file_compare",
+                        lambda spec, workspace, assertions: compare(spec["actual"]))
+
+
+def test_validate_result_compares_specs_concurrently(monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+    _fake_dispatch(monkeypatch, lambda name: barrier.wait(), workers=2)
+    # Both comparisons must be running at the same time to pass the barrier
+    validate_result({"compare_files": [{"actual": "a"}, {"actual": "b"}]}, _mini_result())
+
+
+def test_validate_result_fail_fast_cancels_pending_specs(monkeypatch):
+    release = threading.Event()
+    started = []
+
+    def compare(name):
+        started.append(name)
+        if name == "a1":
+            raise AssertionError("a1 differs")
+        release.wait(5)
+
+    _fake_dispatch(monkeypatch, compare, workers=2)
+    specs = [{"actual": f"a{i}"} for i in range(1, 6)]
+    try:
+        with pytest.raises(AssertionError, match="^a1 differs$"):
+            validate_result({"compare_files": specs, "compare_fail_fast": True}, _mini_result())
+    finally:
+        release.set()
+    # Both workers were busy when a1 failed, so the last specs never started
+    assert "a4" not in started and "a5" not in started
+
+
 # ---------------------------------------------------------------------------
 # validate_result – backward compatibility
 # ---------------------------------------------------------------------------
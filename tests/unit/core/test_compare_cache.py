@@ -0,0 +1,131 @@
+"""Unit tests for the run-scoped comparison cache."""
+
+import json
+import os
+import time
+
+import pytest
+
+from cli_test_framework.core.assertions import Assertions
+from cli_test_framework.core.compare_cache import ComparisonCache, active_cache, comparison_cache
+from cli_test_framework.file_comparator.lru_cache import LruCache
+
+
+def _write_json(path, data, age=60):
+    """Write a JSON file and backdate it so it counts as stable."""
+    path.write_text(json.dumps(data), encoding="utf-8")
+    past = time.time() - age
+    os.utime(path, (past, past))
+    return str(path)
+
+
+def test_lru_cache_evicts_by_entries_and_weight():
+    cache = LruCache(max_entries=2, max_weight=10)
+    cache.put("a", 1, weight=4)
+    cache.put("b", 2, weight=4)
+    assert cache.get("a") == 1          # "b" becomes least recently used
+    cache.put("c", 3, weight=4)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.put("huge", 4, weight=11) is False
+    cache.put("d", 5, weight=9)
+    assert len(cache) == 1 and cache.weight == 9
+
+
+def test_comparator_shared_per_type_and_options():
+    cache = ComparisonCache()
+    first = cache.comparator("json", rtol=0.1, verbose=True)
+    assert cache.comparator("JSON", verbose=True, rtol=0.1) is first
+    assert cache.comparator("json", rtol=0.2, verbose=True) is not first
+    assert first.content_cache is cache.contents
+
+
+def test_result_memoized_for_unchanged_stable_files(tmp_path):
+    actual = _write_json(tmp_path / "out.json", {"a": 1})
+    baseline = _write_json(tmp_path / "base.json", {"a": 2})
+    cache = ComparisonCache()
+
+    result = cache.compare("json", actual, baseline)
+    assert not result.identical
+    assert cache.compare("json", actual, baseline) is result
+
+    # Rewriting the output changes its identity and forces a new comparison
+    _write_json(tmp_path / "out.json", {"a": 2}, age=30)
+    assert cache.compare("json", actual, baseline).identical
+
+
+def test_fresh_files_not_memoized(tmp_path):
+    actual = tmp_path / "out.json"
+    actual.write_text('{"a": 1}', encoding="utf-8")
+    baseline = _write_json(tmp_path / "base.json", {"a": 1})
+    cache = ComparisonCache()
+
+    first = cache.compare("json", str(actual), baseline)
+    assert first.identical
+    assert cache.compare("json", str(actual), baseline) is not first
+    assert len(cache.results) == 0
+
+
+def test_stable_baseline_parsed_once(tmp_path, monkeypatch):
+    baseline = _write_json(tmp_path / "base.json", {"a": [1, 2, 3]})
+    cache = ComparisonCache()
+    comparator = cache.comparator("json", streaming=False)
+    reads = []
+    original = comparator.read_content
+
+    def counting_read(file_path, *args):
+        reads.append(os.path.basename(str(file_path)))
+        return original(file_path, *args)
+
+    monkeypatch.setattr(comparator, "read_content", counting_read)
+    for index in range(3):
+        actual = tmp_path / f"out{index}.json"
+        actual.write_text(json.dumps({"a": [1, 2, index]}), encoding="utf-8")
+        cache.compare("json", str(actual), baseline, streaming=False)
+
+    assert reads.count("base.json") == 1
+    assert len(cache.contents) == 1
+
+
+def test_only_loaded_documents_cached(tmp_path):
+    cache = ComparisonCache()
+    for name in ("base.txt", "out.txt"):
+        _write_json(tmp_path / name, {"a": 1})
+    cache.compare("text", str(tmp_path / "out.txt"), str(tmp_path / "base.txt"))
+    assert len(cache.contents) == 0    # text always streams
+
+    baseline = tmp_path / "base.xml"
+    baseline.write_text("<r><a>1</a><b>2</b></r>", encoding="utf-8")
+    past = time.time() - 60
+    os.utime(baseline, (past, past))
+    actual = tmp_path / "out.xml"
+    actual.write_text("<r><b>2</b><a>1</a></r>", encoding="utf-8")
+    assert cache.compare("xml", str(actual), str(baseline), ignore_order=True).identical
+    assert len(cache.contents) == 1
+
+
+def test_comparison_cache_scopes_assertions(tmp_path, monkeypatch):
+    actual = _write_json(tmp_path / "out.json", {"a": 1})
+    baseline = _write_json(tmp_path / "base.json", {"a": 1})
+
+    with comparison_cache() as cache:
+        assert active_cache() is cache
+        assert Assertions.compare_files(actual, baseline)
+        with comparison_cache() as nested:
+            assert nested is cache
+        assert len(cache.results) == 1
+    assert active_cache() is None
+    assert len(cache.results) == 0
+
+    monkeypatch.setenv("CLI_TEST_COMPARE_CACHE", "off")
+    with comparison_cache() as disabled:
+        assert disabled is None and active_cache() is None
+
+
+def test_failures_still_raise_from_memoized_results(tmp_path):
+    actual = _write_json(tmp_path / "out.json", {"a": 1})
+    baseline = _write_json(tmp_path / "base.json", {"a": 2})
+    with comparison_cache():
+        for _ in range(2):
+            with pytest.raises(AssertionError, match="File comparison failed"):
+                Assertions.compare_files(actual, baseline)
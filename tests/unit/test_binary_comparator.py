@@ -3,6 +3,7 @@
 """Unit tests for BinaryComparator — covering read_content, compare_content,
 compare_files, streaming, similarity, and get_file_hash."""
 
+import numpy as np
 import pytest
 from pathlib import Path
 from unittest.mock import patch
@@ -106,11 +107,11 @@ class TestCompareContent:
         assert len(diffs) >= 1
 
     def test_max_differences_limit(self):
-        """When many chunks differ, max_differences=10 should cap output."""
+        """When many byte runs differ, max_differences=10 should cap output."""
         comp = BinaryComparator(chunk_size=2, verbose=True)
-        # Create two 40-byte sequences that differ in every chunk
-        data1 = bytes([i % 256 for i in range(40)])
-        data2 = bytes([(i + 1) % 256 for i in range(40)])
+        # Create two 40-byte sequences with a separate differing run every other byte
+        data1 = bytes(40)
+        data2 = bytes([i % 2 for i in range(40)])
         identical, diffs = comp.compare_content(data1, data2)
         assert identical is False
         # Should have at most 10 + 1("more differences") ≤ 11 diffs
@@ -267,17 +268,61 @@ class TestCompareFilesStreaming:
         assert identical is False
 
     def test_streaming_max_differences(self, tmp_path):
-        """When two files differ in every chunk, max_differences caps output."""
+        """When two files differ in many separate runs, max_differences caps output."""
         f1 = tmp_path / "a.bin"
         f2 = tmp_path / "b.bin"
         f1.write_bytes(bytes(100))
-        f2.write_bytes(bytes([255] * 100))
+        f2.write_bytes(bytes([255, 255, 0, 0] * 25))
 
         comp = BinaryComparator(chunk_size=4)
         identical, diffs = comp._compare_files_streaming(f1, f2)
         assert identical is False
         assert any(d.diff_type == "more differences not shown" for d in diffs)
 
+    def test_streaming_reports_runs_across_windows(self, tmp_path, monkeypatch):
+        """A run spanning a window boundary is reported once, with context from both windows."""
+        monkeypatch.setattr(BinaryComparator, "WINDOW_SIZE", 16)
+        data1 = bytearray(range(64))
+        data2 = bytearray(data1)
+        data2[14:18] = b"\xff" * 4   # crosses the boundary at 16
+        data2[40] = 0xff
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(bytes(data1))
+        f2.write_bytes(bytes(data2))
+
+        identical, diffs = BinaryComparator(chunk_size=4)._compare_files_streaming(f1, f2)
+        assert identical is False
+        assert [d.position for d in diffs] == ["byte 14", "byte 40"]
+        assert diffs[0].expected == " ".join(f"{b:02x}" for b in range(6, 22))
+        assert diffs[0].actual.split()[8:12] == ["ff"] * 4
+
+    def test_streaming_offsets_are_absolute(self, tmp_path):
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(b"0123456789")
+        f2.write_bytes(b"0123456X89")
+        identical, diffs = BinaryComparator()._compare_files_streaming(f1, f2, start_offset=4, end_offset=9)
+        assert identical is False
+        assert diffs[0].position == "byte 7"
+
+    def test_streaming_max_differences_option(self, tmp_path):
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(bytes(20))
+        f2.write_bytes(bytes([1, 0] * 10))
+        identical, diffs = BinaryComparator(max_differences=3)._compare_files_streaming(f1, f2)
+        assert [d.position for d in diffs[:3]] == ["byte 0", "byte 2", "byte 4"]
+        assert diffs[3].diff_type == "more differences not shown"
+        assert len(diffs) == 4
+
+    def test_streaming_empty_files(self, tmp_path):
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(b"")
+        f2.write_bytes(b"")
+        assert BinaryComparator()._compare_files_streaming(f1, f2) == (True, [])
+
     def test_streaming_file_not_found(self, tmp_path):
         comp = BinaryComparator()
         with pytest.raises(ValueError, match="File not found"):
@@ -297,6 +342,55 @@ class TestCompareFilesStreaming:
             comp._compare_files_streaming(f1, f2, start_offset=10, end_offset=5)
 
 
+# =============================================================================
+# Parallel range comparison
+# =============================================================================
+
+
+class TestParallelRanges:
+    """Test num_threads range splitting in BinaryComparator._find_runs()."""
+
+    @pytest.fixture
+    def small_ranges(self, monkeypatch):
+        monkeypatch.setattr(BinaryComparator, "WINDOW_SIZE", 64)
+        monkeypatch.setattr(BinaryComparator, "PARALLEL_THRESHOLD", 256)
+
+    def _arrays(self, positions, size=4096):
+        data1 = np.zeros(size, dtype=np.uint8)
+        data2 = data1.copy()
+        data2[positions] = 1
+        return data1, data2
+
+    def test_parallel_matches_sequential(self, small_ranges):
+        rng = np.random.default_rng(1)
+        positions = np.sort(rng.choice(4096, size=300, replace=False))
+        data1, data2 = self._arrays(positions)
+        sequential = BinaryComparator(num_threads=1)._find_runs(data1, data2, 10_000)
+        parallel = BinaryComparator(num_threads=4)._find_runs(data1, data2, 10_000)
+        assert parallel == sequential
+        assert parallel == sorted(parallel)
+
+    def test_run_across_range_boundary_reported_once(self, small_ranges):
+        # 4096 bytes / 16 ranges -> 256-byte ranges; run 250..260 crosses one
+        data1, data2 = self._arrays(np.arange(250, 261))
+        assert BinaryComparator(num_threads=4)._find_runs(data1, data2, 10) == [250]
+
+    def test_limit_keeps_earliest_runs(self, small_ranges):
+        data1, data2 = self._arrays(np.arange(0, 4096, 3))
+        runs = BinaryComparator(num_threads=4)._find_runs(data1, data2, 11)
+        assert runs == list(range(0, 33, 3))
+
+    def test_streaming_uses_parallel_ranges(self, small_ranges, tmp_path):
+        data1, data2 = self._arrays([5, 3000])
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(data1.tobytes())
+        f2.write_bytes(data2.tobytes())
+        identical, diffs = BinaryComparator(num_threads=3)._compare_files_streaming(f1, f2)
+        assert identical is False
+        assert [d.position for d in diffs] == ["byte 5", "byte 3000"]
+
+
 # =============================================================================
 # _compute_similarity
 # =============================================================================
@@ -377,6 +471,50 @@ class TestHashChunkSimilarity:
         sim = comp._hash_chunk_similarity(b"", b"")
         assert sim == 1.0
 
+    def test_chunks_independent_of_read_blocks(self):
+        """Chunk boundaries depend on content only, not on how the stream is read."""
+        comp = BinaryComparator()
+        data = np.random.default_rng(2).integers(0, 256, 300_000, dtype=np.uint8).tobytes()
+        whole = comp._chunk_fingerprints([data])
+        pieces = comp._chunk_fingerprints(data[i:i + 7001] for i in range(0, len(data), 7001))
+        assert whole == pieces
+        assert sum(whole.values()) == len(data)
+        assert len(whole) > 10
+
+    def test_chunk_size_bounds(self):
+        comp = BinaryComparator()
+        # Constant data selects every position or none
+        for data in (bytes(200_000), b"\x01" * 200_000):
+            sizes = list(comp._chunk_fingerprints([data]).values())
+            assert sum(sizes) == len(data)
+        # Random data: every chunk is distinct, so the counter holds chunk sizes
+        data = np.random.default_rng(3).integers(0, 256, 500_000, dtype=np.uint8).tobytes()
+        sizes = list(comp._chunk_fingerprints([data]).values())
+        assert all(2048 <= size <= 65536 for size in sizes[:-1])
+
+    def test_stream_matches_in_memory(self, tmp_path):
+        data1 = np.random.default_rng(4).integers(0, 256, 600_000, dtype=np.uint8).tobytes()
+        data2 = data1[:1000] + b"inserted" + data1[1000:]
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(data1)
+        f2.write_bytes(data2)
+        comp = BinaryComparator()
+        assert comp._stream_chunk_similarity(f1, f2) == comp._hash_chunk_similarity(data1, data2)
+
+    def test_compare_files_large_uses_streaming_similarity(self, tmp_path):
+        data1 = np.random.default_rng(5).integers(0, 256, 700_000, dtype=np.uint8).tobytes()
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(data1)
+        f2.write_bytes(b"\x00" + data1)
+        comp = BinaryComparator(similarity=True)
+        with patch.object(comp, "read_content", side_effect=AssertionError("must stream")):
+            result = comp.compare_files(f1, f2)
+        assert result.identical is False
+        assert result.differences[0].diff_type == "size"
+        assert 0.9 < result.similarity < 1.0
+
 
 # =============================================================================
 # get_file_hash
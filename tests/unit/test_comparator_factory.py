@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the lazy comparator registry of ComparatorFactory."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cli_test_framework.file_comparator import factory
+from cli_test_framework.file_comparator.binary_comparator import BinaryComparator
+from cli_test_framework.file_comparator.factory import ComparatorFactory
+from cli_test_framework.file_comparator.text_comparator import TextComparator
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+
+class FakeEntryPoint:
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.target
+
+
+class PluginComparator(TextComparator):
+    pass
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Isolate the factory's registry and entry points for one test."""
+    monkeypatch.setattr(ComparatorFactory, "_comparators", {})
+    monkeypatch.setattr(ComparatorFactory, "_entry_points", None)
+    points = []
+    monkeypatch.setattr(factory, "_entry_points", lambda group: points)
+    return points
+
+
+def test_text_comparison_does_not_import_heavy_modules():
+    probe = (
+        "import sys\n"
+        "from cli_test_framework.file_comparator.factory import ComparatorFactory\n"
+        "ComparatorFactory.create_comparator('text')\n"
+        "ComparatorFactory.create_comparator('json')\n"
+        "print(sorted(m for m in ('h5py', 'numpy', 'cli_test_framework.file_comparator.h5_comparator')"
+        " if m in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=str(SRC))).stdout
+    assert output.strip() == "[]"
+
+
+def test_builtin_types_are_loaded_on_first_use(registry):
+    assert "h5" in ComparatorFactory.get_available_comparators()
+    assert "h5" not in ComparatorFactory._comparators
+
+    assert isinstance(ComparatorFactory.create_comparator("TEXT"), TextComparator)
+    assert ComparatorFactory._comparators == {"text": TextComparator}
+
+
+def test_entry_point_plugins_are_loaded_lazily(registry):
+    plugin = FakeEntryPoint("fits", PluginComparator)
+    shadowing = FakeEntryPoint("json", PluginComparator)
+    registry.extend([plugin, shadowing])
+
+    assert ComparatorFactory.get_available_comparators().count("json") == 1
+    assert "fits" in ComparatorFactory.get_available_comparators()
+    assert plugin.loads == 0
+
+    assert isinstance(ComparatorFactory.create_comparator("fits"), PluginComparator)
+    assert isinstance(ComparatorFactory.create_comparator("fits"), PluginComparator)
+    assert plugin.loads == 1
+    assert not isinstance(ComparatorFactory.create_comparator("json"), PluginComparator)
+    assert shadowing.loads == 0
+
+
+def test_string_registration_and_failed_imports(registry, caplog):
+    ComparatorFactory.register_comparator("log", f"{__name__}:PluginComparator")
+    ComparatorFactory.register_comparator("broken", "no_such_module_for_tests:Comparator")
+
+    assert isinstance(ComparatorFactory.create_comparator("log"), PluginComparator)
+    assert isinstance(ComparatorFactory.create_comparator("broken"), BinaryComparator)
+    assert "Failed to load comparator for file type broken" in caplog.text
+    assert "broken" not in ComparatorFactory.get_available_comparators()
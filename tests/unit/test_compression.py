@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for compressed file detection and on-the-fly decompression."""
+
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+from cli_test_framework.file_comparator.compression import (
+    detect_compression,
+    open_decompressed,
+    strip_compression_suffix,
+)
+from cli_test_framework.file_comparator.text_comparator import TextComparator
+
+
+@pytest.mark.parametrize("compress, name", [
+    (gzip.compress, "gzip"),
+    (bz2.compress, "bz2"),
+    (lzma.compress, "xz"),
+])
+def test_detect_and_open_by_magic_bytes(tmp_path, compress, name):
+    path = tmp_path / "data.bin"  # no telltale suffix
+    path.write_bytes(compress("héllo\nwörld\n".encode("utf-8")))
+
+    assert detect_compression(path) == name
+    with open_decompressed(path, name, 'r', encoding="utf-8") as f:
+        assert f.readlines() == ["héllo\n", "wörld\n"]
+
+
+def test_plain_files_are_not_compressed(tmp_path):
+    path = tmp_path / "data.gz"
+    path.write_bytes(b"plain text despite the suffix")
+    assert detect_compression(path) is None
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    assert detect_compression(empty) is None
+
+
+def test_strip_compression_suffix():
+    assert strip_compression_suffix("out/result.JSON.gz") == "out/result.JSON"
+    assert strip_compression_suffix("table.csv.zst") == "table.csv"
+    assert strip_compression_suffix("model.h5") == "model.h5"
+
+
+def test_open_file_can_be_disabled(tmp_path):
+    path = tmp_path / "log.txt.gz"
+    data = gzip.compress(b"line\n")
+    path.write_bytes(data)
+
+    with TextComparator().open_file(path, 'rb') as f:
+        assert f.read() == b"line\n"
+    with TextComparator(decompress=False).open_file(path, 'rb') as f:
+        assert f.read() == data
+
+
+def test_zstd_stream_seeks_forward(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "data.bin"
+    path.write_bytes(zstandard.ZstdCompressor().compress(bytes(range(256)) * 10))
+
+    assert detect_compression(path) == "zstd"
+    with open_decompressed(path, "zstd") as f:
+        assert f.seekable()
+        assert f.seek(0) == 0
+        assert f.seek(300) == 300
+        assert f.read(2) == bytes([44, 45])
+        assert f.seek(10, 1) == 312
+        with pytest.raises(OSError):
+            f.seek(0)
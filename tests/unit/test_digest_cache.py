@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the persistent digest cache and its use by Binary/TextComparator."""
+
+import os
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cli_test_framework.file_comparator.binary_comparator import BinaryComparator
+from cli_test_framework.file_comparator.digest_cache import (
+    DigestCache,
+    default_cache_path,
+    resolve_digest_cache,
+)
+from cli_test_framework.file_comparator.text_comparator import TextComparator
+
+
+def write_baseline(path, data):
+    """Write a file and age it so the cache treats it as a stable baseline."""
+    path.write_bytes(data)
+    old = time.time() - 3600
+    os.utime(path, (old, old))
+    return path
+
+
+class TestFileDigest:
+
+    def test_blocks_and_differing_spans(self, tmp_path):
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(b"A" * 16 + b"B" * 16 + b"C" * 16 + b"D" * 5)
+        f2.write_bytes(b"A" * 16 + b"x" * 16 + b"y" * 16 + b"D" * 5)
+        d1 = DigestCache.compute(f1, block_size=16)
+        d2 = DigestCache.compute(f2, block_size=16)
+        assert d1.size == 53
+        assert len(d1.blocks) == 4
+        assert d1.digest != d2.digest
+        assert d1.differing_blocks(d2) == [(16, 48)]
+
+    def test_equal_content_equal_digest(self, tmp_path):
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(b"same")
+        f2.write_bytes(b"same")
+        assert DigestCache.compute(f1).digest == DigestCache.compute(f2).digest
+
+
+class TestDigestCache:
+
+    def test_stable_file_hashed_once(self, tmp_path):
+        f = write_baseline(tmp_path / "base.bin", b"baseline")
+        cache = DigestCache()
+        first = cache.get(f)
+        with patch.object(DigestCache, "compute", side_effect=AssertionError("rehashed")):
+            assert cache.get(f) is first
+
+    def test_fresh_file_not_cached(self, tmp_path):
+        f = tmp_path / "out.bin"
+        f.write_bytes(b"output")
+        cache = DigestCache()
+        cache.get(f)
+        assert len(cache._memory) == 0
+        assert not cache.is_cheap(f)
+
+    def test_memory_bounded_by_max_entries(self, tmp_path):
+        cache = DigestCache(max_entries=2)
+        files = [write_baseline(tmp_path / f"base{i}.bin", b"x" * i) for i in range(4)]
+        for f in files:
+            cache.get(f)
+            cache.line_index(f, 0)
+        assert len(cache._memory) == 2
+        assert len(cache._line_indexes) <= 2
+        assert cache.is_cheap(files[-1])
+
+    def test_persisted_across_instances(self, tmp_path):
+        f = write_baseline(tmp_path / "base.bin", b"baseline" * 100)
+        db = tmp_path / "cache" / "digests.sqlite3"
+        digest = DigestCache(db).get(f)
+        with patch.object(DigestCache, "compute", side_effect=AssertionError("rehashed")):
+            assert DigestCache(db).get(f).digest == digest.digest
+
+    def test_modified_file_rehashed(self, tmp_path):
+        f = write_baseline(tmp_path / "base.bin", b"version 1")
+        db = tmp_path / "digests.sqlite3"
+        first = DigestCache(db).get(f)
+        write_baseline(f, b"version 22")
+        assert DigestCache(db).get(f).digest != first.digest
+
+    def test_oldest_entries_evicted(self, tmp_path):
+        db = tmp_path / "digests.sqlite3"
+        cache = DigestCache(db, max_entries=2)
+        files = [write_baseline(tmp_path / f"{i}.bin", bytes([i])) for i in range(3)]
+        for f in files:
+            cache.get(f)
+        with sqlite3.connect(db) as conn:
+            paths = {row[0] for row in conn.execute("SELECT path FROM digests")}
+        assert paths == {os.path.realpath(f) for f in files[1:]}
+
+    def test_unusable_database_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("x")
+        cache = DigestCache(blocker / "digests.sqlite3")
+        assert cache.db_path is None
+        f = write_baseline(tmp_path / "base.bin", b"data")
+        assert cache.get(f).size == 4
+
+    @pytest.mark.parametrize("value", ["off", "0", ""])
+    def test_env_disables_persistence(self, monkeypatch, value):
+        monkeypatch.setenv("CLI_TEST_DIGEST_CACHE", value)
+        assert default_cache_path() is None
+
+    def test_env_sets_location(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("CLI_TEST_DIGEST_CACHE", str(tmp_path / "d.sqlite3"))
+        assert default_cache_path() == tmp_path / "d.sqlite3"
+
+    def test_resolve_option(self, tmp_path):
+        assert resolve_digest_cache(False) is None
+        assert resolve_digest_cache(True) is DigestCache.shared()
+        assert resolve_digest_cache(str(tmp_path / "x.sqlite3")).db_path == tmp_path / "x.sqlite3"
+
+
+class TestComparatorsUseDigests:
+
+    def test_binary_identical_skips_byte_comparison(self, tmp_path):
+        data = bytes(range(256)) * 10
+        base = write_baseline(tmp_path / "base.bin", data)
+        out = tmp_path / "out.bin"
+        out.write_bytes(data)
+        comp = BinaryComparator()
+        with patch.object(comp, "_collect_differences", side_effect=AssertionError("compared bytes")):
+            result = comp.compare_files(base, out)
+        assert result.identical is True
+
+    def test_binary_compares_only_differing_blocks(self, tmp_path):
+        data = bytearray(64 * 8)
+        base = write_baseline(tmp_path / "base.bin", bytes(data))
+        data[200] = 1
+        out = tmp_path / "out.bin"
+        out.write_bytes(bytes(data))
+        comp = BinaryComparator()
+        comp.digest_cache = DigestCache(block_size=64)
+        scanned = []
+        original = comp._iter_difference_runs
+
+        def spy(data1, data2, start=0, stop=None, cancelled=None):
+            scanned.append((start, stop))
+            return original(data1, data2, start, stop, cancelled)
+
+        with patch.object(comp, "_iter_difference_runs", side_effect=spy):
+            result = comp.compare_files(base, out)
+        assert [d.position for d in result.differences] == ["byte 200"]
+        assert scanned == [(192, 256)]
+
+    def test_binary_fresh_files_compare_directly(self, tmp_path):
+        f1 = tmp_path / "a.bin"
+        f2 = tmp_path / "b.bin"
+        f1.write_bytes(b"abc")
+        f2.write_bytes(b"abd")
+        comp = BinaryComparator()
+        with patch.object(DigestCache, "compute", side_effect=AssertionError("hashed")):
+            result = comp.compare_files(f1, f2)
+        assert result.identical is False
+
+    def test_text_identical_skips_reading_lines(self, tmp_path):
+        base = write_baseline(tmp_path / "base.txt", b"line 1\nline 2\n")
+        out = tmp_path / "out.txt"
+        out.write_bytes(b"line 1\nline 2\n")
+        comp = TextComparator()
+        with patch.object(comp, "read_content", side_effect=AssertionError("read lines")):
+            result = comp.compare_files(base, out)
+        assert result.identical is True
+        assert result.file1_size == 14
+
+    def test_text_different_or_ranged_falls_back(self, tmp_path):
+        base = write_baseline(tmp_path / "base.txt", b"line 1\nline 2\n")
+        out = tmp_path / "out.txt"
+        out.write_bytes(b"line 1\nline X\n")
+        assert TextComparator().compare_files(base, out).identical is False
+        assert TextComparator().compare_files(base, out, end_line=0).identical is True
+
+    def test_disabled_cache(self, tmp_path):
+        base = write_baseline(tmp_path / "base.txt", b"same\n")
+        out = tmp_path / "out.txt"
+        out.write_bytes(b"same\n")
+        comp = TextComparator(digest_cache=False)
+        assert comp.digest_cache is None
+        assert comp.compare_files(base, out).identical is True
@@ -4,12 +4,15 @@
 Unit tests for H5Comparator - focuses on logic not covered by integration tests.
 """
 
+import os
+import time
+
 import numpy as np
 import h5py
 import pytest
 from pathlib import Path
 
-from cli_test_framework.file_comparator.h5_comparator import H5Comparator
+from cli_test_framework.file_comparator.h5_comparator import H5Comparator, _PathSelector
 from cli_test_framework.file_comparator.result import Difference
 
 
@@ -243,6 +246,99 @@ class TestReadContentTableSelection:
         assert "parent/child" not in content
 
 
+class TestSinglePassSelection:
+    """Test the pruned single traversal and the object index cache."""
+
+    @pytest.mark.parametrize("pattern, prefix", [
+        ("results/step_.*", "results/step_"),
+        ("results/step_1\\.0", "results/step_1.0"),
+        ("results/steps?", "results/step"),
+        ("(?i)results", ""),
+        ("a/b|c/d", ""),
+        ("run\\d+/x", "run"),
+    ])
+    def test_literal_prefix(self, pattern, prefix):
+        assert _PathSelector._literal_prefix(pattern) == prefix
+
+    def test_may_contain_prunes_unrelated_groups(self):
+        selector = _PathSelector(tables=["config/solver"], table_regex="results/step_.*")
+        assert selector.may_contain("results")
+        assert selector.may_contain("config")
+        assert not selector.may_contain("mesh")
+        assert not selector.may_contain("results_old")
+
+    def test_unrelated_subtrees_are_not_visited(self, tmp_path, monkeypatch):
+        f1 = tmp_path / "a.h5"
+        create_h5(f1, {"results/step_1": [1.0], "results/other": [2.0], "mesh/nodes/x": [3.0]})
+        visited = []
+        original = H5Comparator._describe
+
+        def describe(obj):
+            visited.append(obj.name)
+            return original(obj)
+
+        monkeypatch.setattr(H5Comparator, "_describe", staticmethod(describe))
+        content = H5Comparator(table_regex="results/step_.*").read_content(f1)
+        assert "results/step_1" in content
+        assert "results/other" not in content
+        assert visited == ["/results/step_1"]
+
+    def test_regex_selected_group_is_expanded(self, tmp_path):
+        f1 = tmp_path / "a.h5"
+        create_h5(f1, {"run1/a/x": [1], "run1/b": [2], "run2/a/x": [3]})
+        content = H5Comparator(table_regex="run1/a").read_content(f1)
+        assert {"run1/a", "run1/a/x"} <= set(content)
+        assert "run1/b" not in content
+        assert "run2/a/x" not in content
+
+    def test_object_index_is_cached_until_file_changes(self, tmp_path, monkeypatch):
+        f1 = tmp_path / "a.h5"
+        create_h5(f1, {"ds": [1.0, 2.0]})
+        past = time.time() - 60
+        os.utime(f1, (past, past))
+        walks = []
+        original = H5Comparator._walk
+
+        def walk(self, f):
+            walks.append(f.filename)
+            return original(self, f)
+
+        monkeypatch.setattr(H5Comparator, "_walk", walk)
+        H5Comparator(tables=["ds"]).read_content(f1)
+        content = H5Comparator(tables=["ds"]).read_content(f1)
+        assert len(walks) == 1
+        np.testing.assert_array_equal(content["ds"]["data"], [1.0, 2.0])
+
+        # A different selection or a rewritten file walks again
+        H5Comparator().read_content(f1)
+        assert len(walks) == 2
+        create_h5(f1, {"ds": [1.0, 2.0, 3.0]})
+        content = H5Comparator(tables=["ds"]).read_content(f1)
+        assert len(walks) == 3
+        assert content["ds"]["shape"] == (3,)
+
+        # A freshly written file is not cached
+        H5Comparator(tables=["ds"]).read_content(f1)
+        assert len(walks) == 4
+
+    def test_links_followed_like_visititems(self, tmp_path):
+        files = []
+        for name in ("a.h5", "b.h5"):
+            path = tmp_path / name
+            with h5py.File(path, "w") as f:
+                g = f.create_group("g")
+                g["x"] = np.arange(3)
+                g["loop"] = h5py.SoftLink("/g")
+                f["alias"] = h5py.SoftLink("/g/x")
+                f["hard"] = g["x"]
+            files.append(str(path))
+
+        content = H5Comparator().read_content(files[0])
+        assert set(content) - {k for k in content if k.startswith("_")} == {"g", "g/x"}
+        result = H5Comparator().compare_files(*files)
+        assert result.identical and not result.error
+
+
 # ===========================================================================
 # compare_content - type mismatch
 # ===========================================================================
@@ -421,6 +517,18 @@ class TestCompareContentNumericData:
         identical, diffs = comp.compare_content(c1, c2)
         assert not identical
 
+    def test_show_content_diff_reports_statistics_and_indices(self):
+        comp = H5Comparator(show_content_diff=True)
+        data2 = np.zeros((3, 4))
+        data2[2, 1] = 0.5
+        c1 = {"ds": {"type": "dataset", "shape": (3, 4), "dtype": "float64", "attrs": {}, "data": np.zeros((3, 4))}}
+        c2 = {"ds": {"type": "dataset", "shape": (3, 4), "dtype": "float64", "attrs": {}, "data": data2}}
+        identical, diffs = comp.compare_content(c1, c2)
+        assert not identical
+        assert "1/12 values differ" in diffs[0].actual
+        assert diffs[1].position == "ds[2,1]"
+        assert diffs[1].actual == "0.5"
+
 
 # ===========================================================================
 # compare_content - string / non-numeric data
@@ -503,6 +611,41 @@ class TestCompareContentWithFilter:
         assert identical
 
 
+# ===========================================================================
+# tolerance_profile
+# ===========================================================================
+
+class TestToleranceProfile:
+    """Per-dataset tolerances selected by path regex."""
+
+    def test_profile_overrides_global_tolerance_per_dataset(self, tmp_path):
+        f1 = tmp_path / "a.h5"
+        f2 = tmp_path / "b.h5"
+        create_h5(f1, {"loose/x": np.array([1.0]), "tight/x": np.array([1.0])})
+        create_h5(f2, {"loose/x": np.array([1.01]), "tight/x": np.array([1.0])})
+        assert not compare(f1, f2).identical
+        assert compare(f1, f2, tolerance_profile={"loose/.*": {"rtol": 0.1}}).identical
+
+    def test_ignore_skips_dataset(self, tmp_path):
+        f1 = tmp_path / "a.h5"
+        f2 = tmp_path / "b.h5"
+        create_h5(f1, {"run/elapsed": np.array([1.0]), "run/value": np.array([2.0])})
+        create_h5(f2, {"run/elapsed": np.array([9.0]), "run/value": np.array([2.0])})
+        comp = H5Comparator(tolerance_profile=[{"pattern": "run/elapsed", "ignore": True}])
+        assert "run/elapsed" not in comp.read_content(f1)
+        assert comp.compare_files(f1, f2).identical
+
+    def test_float32_max_ulp(self, tmp_path):
+        f1 = tmp_path / "a.h5"
+        f2 = tmp_path / "b.h5"
+        data = np.linspace(1, 2, 10, dtype=np.float32)
+        create_h5(f1, {"field": data})
+        create_h5(f2, {"field": np.nextafter(data, np.float32(3))})
+        profile = {"field": {"rtol": 0, "atol": 0, "max_ulp": 1}}
+        assert compare(f1, f2, tolerance_profile=profile).identical
+        assert not compare(f1, f2, rtol=0, atol=0).identical
+
+
 # ===========================================================================
 # compare_content - structure_only mode
 # ===========================================================================
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the JSONPath-like ignore pattern trie."""
+
+import pytest
+
+from cli_test_framework.file_comparator.json_path import JsonPathTrie
+
+
+def matches(trie, *steps):
+    states = trie.root
+    for step in steps:
+        states = trie.step(states, step)
+        if states is None:
+            return True
+    return False
+
+
+@pytest.mark.parametrize("pattern, path, expected", [
+    ("$.meta.timestamp", ("meta", "timestamp"), True),
+    ("$.meta.timestamp", ("meta", "version"), False),
+    ("$.meta.timestamp", ("meta", "timestamp", "nested"), True),
+    ("$.results[*].elapsed", ("results", 3, "elapsed"), True),
+    ("$.results[*].elapsed", ("results", "x", "elapsed"), True),
+    ("$.results[1].elapsed", ("results", 0, "elapsed"), False),
+    ("$.results[1].elapsed", ("results", 1, "elapsed"), True),
+    ("$.*.id", ("anything", "id"), True),
+    ("$.time_*", ("time_total",), True),
+    ("$.time_*", ("total_time",), False),
+    ("$['a.b']", ("a.b",), True),
+    ("$..elapsed", ("elapsed",), True),
+    ("$..elapsed", ("a", 0, "b", "elapsed"), True),
+    ("$..elapsed", ("a", 0, "b"), False),
+    ("$.runs..[0]", ("runs", "x", 0), True),
+    ("$.runs..[0]", ("other", 0), False),
+])
+def test_patterns_match_paths(pattern, path, expected):
+    assert matches(JsonPathTrie([pattern]), *path) is expected
+
+
+def test_patterns_share_prefixes_and_stop_when_nothing_can_match():
+    trie = JsonPathTrie(["$.meta.timestamp", "$.meta.host", "$.results[*].elapsed"])
+
+    assert matches(trie, "meta", "host")
+    assert matches(trie, "meta", "timestamp")
+    assert trie.step(trie.root, "other") == ()
+    assert not trie.matches_root()
+    assert JsonPathTrie("$").matches_root()
+
+
+@pytest.mark.parametrize("pattern", ["meta.timestamp", "$.a[", "$.a[x]", "$..", "$....a", "$name"])
+def test_malformed_patterns_are_rejected(pattern):
+    with pytest.raises(ValueError, match="Invalid JSON path"):
+        JsonPathTrie([pattern])
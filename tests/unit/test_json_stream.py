@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the incremental JSON tokenizer."""
+
+import json
+
+import pytest
+
+from cli_test_framework.file_comparator.json_stream import JsonTokenReader
+
+DOCUMENT = {
+    "text": 'quote " backslash \\ unicode é 😀',
+    "numbers": [0, -1, 12345678901234567890, 1.5, -2.5e-07, 1e+300],
+    "literals": [True, False, None],
+    "nested": {"empty_list": [], "empty_object": {}, "deep": [[{"a": [1]}]]},
+}
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+@pytest.mark.parametrize("scan_limit", [0, 8, 1 << 20])
+def test_reader_parses_like_json_module_across_chunk_boundaries(size, scan_limit):
+    text = json.dumps(DOCUMENT, indent=1, ensure_ascii=False) + "\n"
+    reader = JsonTokenReader(chunked(text, size), scan_limit=scan_limit)
+
+    loaded, value = reader.read_value()
+    if not loaded:
+        value = reader.value(value)
+
+    assert json.dumps(value) == json.dumps(DOCUMENT)
+    assert reader.token() == ("eof", None)
+
+
+def test_reader_walks_containers_without_loading_them():
+    reader = JsonTokenReader(chunked('{"a": [1, {"b": 2}, [3]], "c": 4}', 3), scan_limit=0)
+
+    assert reader.token() == ("{", None)
+    assert reader.object_key(True) == "a"
+    assert reader.token() == ("[", None)
+    items = []
+    while reader.array_item(not items):
+        token = reader.token()
+        items.append(token[0])
+        reader.skip(token)
+    assert items == ["value", "{", "["]
+    assert reader.object_key(False) == "c"
+    assert reader.rest_of_object("c") == {"c": 4}
+
+
+@pytest.mark.parametrize("text, message", [
+    ('{"a" 1}', "Expecting ':'"),
+    ('[1,]', "Expecting value"),
+    ('{"a": 1,}', "Expecting property name"),
+    ('[1 2]', "Expecting ',' or ']'"),
+    ('"abc', "Unterminated string"),
+    ('["a\\x"]', "Invalid \\escape"),
+    ('[-]', "Unexpected input"),
+    ('tru', "Unexpected input"),
+])
+def test_reader_rejects_malformed_documents(text, message):
+    for size in (1, len(text)):
+        reader = JsonTokenReader(chunked(text, size), name="doc.json", scan_limit=0)
+        with pytest.raises(ValueError, match="Invalid JSON in doc.json") as error:
+            reader.value(reader.token())
+        assert message in str(error.value)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the streaming LineDiffer and TextComparator's streaming path."""
+
+import random
+
+from cli_test_framework.file_comparator.line_diff import LineDiffer
+from cli_test_framework.file_comparator.text_comparator import TextComparator
+
+
+def apply_differences(lines1, differences):
+    """Rebuild the actual lines from the expected lines and reported differences."""
+    changes = {}
+    extras = []
+    for diff in differences:
+        number = int(diff.position.split()[1])
+        if diff.diff_type == "extra":
+            extras.append((number, diff.actual))
+        else:
+            changes[number] = diff.actual
+    rebuilt = [changes.get(i + 1, line) for i, line in enumerate(lines1)]
+    rebuilt = [line for line in rebuilt if line is not None]
+    return rebuilt, extras
+
+
+class TestLineDiffer:
+
+    def test_identical(self):
+        assert LineDiffer().diff(["a\n", "b\n"], ["a\n", "b\n"]) == (True, [])
+
+    def test_changed_inserted_and_removed_lines(self):
+        lines1 = ["a\n", "b\n", "c\n", "d\n", "e\n"]
+        lines2 = ["a\n", "B\n", "c\n", "new\n", "d\n"]
+        identical, diffs = LineDiffer().diff(lines1, lines2)
+        assert not identical
+        assert [(d.position, d.diff_type) for d in diffs] == [
+            ("line 2", "content"),
+            ("line 4", "extra"),
+            ("line 5", "missing"),
+        ]
+        assert (diffs[0].expected, diffs[0].actual) == ("b\n", "B\n")
+
+    def test_cap_adds_marker(self):
+        lines1 = [f"{i}\n" for i in range(100)]
+        lines2 = [f"{i}\n" if i % 3 else "x\n" for i in range(100)]
+        identical, diffs = LineDiffer(max_differences=5).diff(lines1, lines2)
+        assert not identical
+        assert len(diffs) == 6
+        assert diffs[-1].diff_type == "more differences not shown"
+
+    def test_exactly_max_differences_has_no_marker(self):
+        _, diffs = LineDiffer(max_differences=2).diff(["a\n", "b\n", "c\n"], ["x\n", "b\n", "y\n"])
+        assert [d.position for d in diffs] == ["line 1", "line 3"]
+
+    def test_stops_reading_after_cap(self):
+        consumed = []
+
+        def lines(tag):
+            for i in range(10 ** 6):
+                consumed.append(tag)
+                yield f"{tag}{i}\n"
+
+        LineDiffer(max_differences=3).diff(lines("a"), lines("b"))
+        assert len(consumed) < 4 * LineDiffer.WINDOW
+
+    def test_differences_rebuild_actual_lines(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            lines1 = [rng.choice("abcde") for _ in range(rng.randrange(0, 30))]
+            lines2 = list(lines1)
+            for _ in range(rng.randrange(1, 6)):
+                op = rng.randrange(3)
+                pos = rng.randrange(len(lines2) + 1)
+                if op == 0:
+                    lines2.insert(pos, rng.choice("abcxy"))
+                elif lines2 and pos < len(lines2):
+                    if op == 1:
+                        del lines2[pos]
+                    else:
+                        lines2[pos] = rng.choice("xyz")
+            identical, diffs = LineDiffer(max_differences=10 ** 6).diff(lines1, lines2)
+            assert identical == (lines1 == lines2)
+            rebuilt, extras = apply_differences(lines1, diffs)
+            for number, line in extras:
+                rebuilt.insert(number - 1, line)
+            assert rebuilt == lines2
+
+
+class TestTextStreaming:
+
+    def test_large_files_diffed_without_reading_content(self, tmp_path, monkeypatch):
+        f1 = tmp_path / "a.txt"
+        f2 = tmp_path / "b.txt"
+        lines = [f"row {i}\n" for i in range(200000)]
+        f1.write_text("".join(lines), encoding="utf-8")
+        lines[150000] = "changed\n"
+        f2.write_text("".join(lines), encoding="utf-8")
+        comp = TextComparator(digest_cache=False)
+        monkeypatch.setattr(comp, "read_content", None)
+        result = comp.compare_files(f1, f2)
+        assert [d.position for d in result.differences] == ["line 150001"]
+
+    def test_range_and_errors_match_read_content(self, tmp_path):
+        f1 = tmp_path / "a.txt"
+        f2 = tmp_path / "b.txt"
+        f1.write_text("abcdef\n123456\n", encoding="utf-8")
+        f2.write_text("abcXef\n123456\n", encoding="utf-8")
+        comp = TextComparator(digest_cache=False)
+        assert list(comp._iter_lines(f1, 0, 5, 1, 3)) == comp.read_content(f1, 0, 5, 1, 3)
+        assert comp.compare_files(f1, f2, start_column=4).identical
+        assert comp.compare_files(f1, f2, start_line=5).error == "Start line 5 is beyond file length 2"
+        assert comp.compare_files(f1, f2, start_column=-1).error == "Start column cannot be negative"
+        assert comp.compare_files(f1, tmp_path / "missing.txt").error
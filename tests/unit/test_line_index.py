@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the sparse line-offset index and TextComparator range reads."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cli_test_framework.file_comparator import line_index
+from cli_test_framework.file_comparator.digest_cache import DigestCache
+from cli_test_framework.file_comparator.line_index import LINE_INDEX_INTERVAL, LineIndex
+from cli_test_framework.file_comparator.text_comparator import TextComparator
+
+
+def line_starts(path):
+    starts = []
+    pos = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            starts.append(pos)
+            pos += len(line)
+    return starts
+
+
+def write_log(path, count, newline="\n"):
+    path.write_bytes("".join(f"entry {i}{newline}" for i in range(count)).encode())
+    old = time.time() - 3600
+    os.utime(path, (old, old))
+    return path
+
+
+class TestLineIndex:
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    def test_offsets_are_line_starts(self, tmp_path, monkeypatch, newline):
+        monkeypatch.setattr(line_index, "SCAN_BLOCK_SIZE", 37)
+        path = write_log(tmp_path / "log.txt", 100, newline)
+        index = LineIndex(interval=7)
+        assert index.extend(path, 10 ** 6)
+        starts = line_starts(path)
+        assert index.offsets == [starts[j] for j in range(0, 100, 7)] + ([] if 100 % 7 else [path.stat().st_size])
+        assert index.lines == 100
+
+    def test_scans_only_up_to_requested_line(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(line_index, "SCAN_BLOCK_SIZE", 64)
+        path = write_log(tmp_path / "log.txt", 1000)
+        index = LineIndex(interval=10)
+        index.extend(path, 25)
+        assert index.lines is None
+        assert index.seek_point(25) == (20, line_starts(path)[20])
+        scanned = len(index.offsets)
+        assert scanned < 20
+        index.extend(path, 500)
+        assert index.seek_point(505) == (500, line_starts(path)[500])
+
+    def test_lone_carriage_return_unusable(self, tmp_path):
+        path = tmp_path / "mac.txt"
+        path.write_bytes(b"a\rb\nc\n")
+        assert not LineIndex(interval=1).extend(path, 5)
+
+    def test_persisted_in_digest_cache(self, tmp_path):
+        path = write_log(tmp_path / "log.txt", 50)
+        db = tmp_path / "digests.sqlite3"
+        first = DigestCache(db).line_index(path, 40, interval=8)
+        with patch.object(LineIndex, "extend", side_effect=AssertionError("rescanned")):
+            index = DigestCache(db).line_index(path, 40, interval=8)
+        assert index.offsets == first.offsets
+
+
+class TestTextRangeReads:
+
+    def test_distant_range_seeks(self, tmp_path):
+        count = 3 * LINE_INDEX_INTERVAL
+        path = write_log(tmp_path / "log.txt", count)
+        start = 2 * LINE_INDEX_INTERVAL + 5
+        comp = TextComparator(digest_cache=False)
+        lines = comp.read_content(path, start, start + 2, 6)
+        assert lines == [f"{i}\n" for i in range(start, start + 3)]
+        assert comp.read_content(path, start, start + 2) == TextComparator(
+            digest_cache=False, line_index=False).read_content(path, start, start + 2)
+        with pytest.raises(ValueError, match=f"Start line {count} is beyond file length {count}"):
+            comp.read_content(path, count)
+
+    def test_stops_after_end_line(self, tmp_path):
+        path = tmp_path / "log.txt"
+        path.write_bytes(b"ok\n" * 100000 + b"\xff\xfe not utf-8\n")
+        assert TextComparator(digest_cache=False).read_content(path, 1, 3) == ["ok\n"] * 3
+
+    def test_utf16_reads_without_index(self, tmp_path):
+        path = tmp_path / "wide.txt"
+        path.write_text("".join(f"{i}\n" for i in range(LINE_INDEX_INTERVAL + 2)), encoding="utf-16")
+        comp = TextComparator(encoding="utf-16", digest_cache=False)
+        assert comp.read_content(path, LINE_INDEX_INTERVAL) == [f"{LINE_INDEX_INTERVAL}\n", f"{LINE_INDEX_INTERVAL + 1}\n"]
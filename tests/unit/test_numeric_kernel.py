@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the blockwise ToleranceKernel shared by numeric comparators."""
+
+import numpy as np
+import pytest
+
+from cli_test_framework.file_comparator.numeric_kernel import KernelStats, ToleranceKernel
+
+
+class TestToleranceSemantics:
+    """The kernel must agree with np.isclose / math.isclose."""
+
+    @pytest.mark.parametrize("symmetric", [False, True])
+    def test_matches_reference(self, symmetric):
+        rng = np.random.default_rng(0)
+        a = rng.normal(size=5000)
+        b = a + rng.normal(scale=1e-5, size=5000)
+        b[::97] = np.nan
+        a[::194] = np.nan
+        a[5] = b[5] = np.inf
+        a[6], b[6] = np.inf, -np.inf
+        a[7], b[7] = 1.0, np.inf
+        kernel = ToleranceKernel(rtol=1e-5, atol=1e-8, symmetric=symmetric, block_size=512)
+
+        got = kernel.within(a, b)
+
+        if symmetric:
+            tol = np.maximum(1e-5 * np.maximum(np.abs(a), np.abs(b)), 1e-8)
+            with np.errstate(invalid="ignore"):
+                ref = (np.abs(a - b) <= tol) & np.isfinite(a - b) | (a == b) | (np.isnan(a) & np.isnan(b))
+        else:
+            ref = np.isclose(a, b, rtol=1e-5, atol=1e-8, equal_nan=True)
+        np.testing.assert_array_equal(got, ref)
+
+    def test_integer_input_does_not_wrap(self):
+        kernel = ToleranceKernel(rtol=0, atol=0)
+        a = np.array([0, 5], dtype=np.uint8)
+        b = np.array([1, 5], dtype=np.uint8)
+        np.testing.assert_array_equal(kernel.within(a, b), [False, True])
+
+    def test_shape_mismatch_raises(self):
+        with pytest.raises(ValueError, match="Shape mismatch"):
+            ToleranceKernel().compare(np.zeros(3), np.zeros(4))
+
+
+class TestCompare:
+    """Blockwise compare() with statistics, filters and early exit."""
+
+    def test_identical(self):
+        stats = ToleranceKernel(block_size=16).compare(np.arange(100.0), np.arange(100.0))
+        assert stats.identical
+        assert stats.checked == 100
+
+    def test_short_circuit_without_detail(self):
+        a = np.zeros(1000)
+        b = a.copy()
+        b[[10, 900]] = 1.0
+        stats = ToleranceKernel(block_size=100).compare(a, b)
+        assert not stats.complete
+        assert stats.mismatches == 1
+        assert stats.checked == 100
+        assert stats.samples == [(10, 0.0, 1.0)]
+
+    def test_detailed_statistics(self):
+        a = np.zeros(1000)
+        b = a.copy()
+        b[[10, 900]] = [1.0, -3.0]
+        stats = ToleranceKernel(block_size=100).compare(a, b, detailed=True)
+        assert stats.complete
+        assert stats.mismatches == 2
+        assert stats.max_abs_diff == 3.0
+        assert [s[0] for s in stats.samples] == [10, 900]
+
+    def test_complex_statistics(self):
+        a = np.array([1 + 1j, 2 + 0j])
+        b = np.array([1 + 2j, 2 + 0j])
+        stats = ToleranceKernel().compare(a, b, detailed=True)
+        assert stats.mismatches == 1
+        assert stats.max_abs_diff == 1.0
+        assert stats.max_rel_diff == pytest.approx(1 / abs(1 + 2j))
+
+    def test_non_contiguous_nd_blocks_report_flat_index(self):
+        base1 = np.zeros((20, 30))
+        base2 = np.zeros((20, 30))
+        base2[7, 4] = 2.0
+        a, b = base1[:, :10], base2[:, :10]  # non-contiguous views
+        stats = ToleranceKernel(block_size=25).compare(a, b, detailed=True)
+        assert stats.mismatches == 1
+        assert np.unravel_index(stats.samples[0][0], a.shape) == (7, 4)
+
+    def test_filter_restricts_compared_positions(self):
+        a = np.array([1.0, 10.0, 20.0])
+        b = np.array([2.0, 10.0, 20.0])
+        stats = ToleranceKernel().compare(a, b, filter_func=lambda d: d > 5)
+        assert stats.identical
+        assert stats.checked == 2
+
+    def test_stats_accumulate_across_calls_with_offset(self):
+        kernel = ToleranceKernel()
+        stats = KernelStats()
+        kernel.compare(np.zeros(5), np.zeros(5), stats=stats, detailed=True)
+        kernel.compare(np.zeros(5), np.ones(5), stats=stats, detailed=True, offset=5)
+        assert stats.checked == 10
+        assert stats.mismatches == 5
+        assert stats.samples[0][0] == 5
+
+
+class TestMaxUlp:
+    """ULP tolerance for floats and unit tolerance for integers."""
+
+    def test_float32_ulp_distance(self):
+        one = np.float32(1.0)
+        a = np.array([1.0, 1.0, -0.0, 5.0], dtype=np.float32)
+        b = np.array([np.nextafter(np.nextafter(one, 2), 2), 1.0000005, 0.0, -5.0], dtype=np.float32)
+        kernel = ToleranceKernel(rtol=0, atol=0, max_ulp=2)
+        np.testing.assert_array_equal(kernel.within(a, b), [True, False, True, False])
+
+    def test_infinity_is_not_one_ulp_from_max(self):
+        a = np.array([np.inf])
+        b = np.array([np.finfo(np.float64).max])
+        assert not ToleranceKernel(rtol=0, atol=0, max_ulp=4).within(a, b)[0]
+
+    def test_integer_ulp_is_one_unit(self):
+        kernel = ToleranceKernel(rtol=0, atol=0, max_ulp=1)
+        np.testing.assert_array_equal(kernel.within(np.array([10, 10]), np.array([11, 12])), [True, False])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the text normalization pipeline."""
+
+import pytest
+
+from cli_test_framework.file_comparator.text_comparator import TextComparator
+from cli_test_framework.file_comparator.text_normalizer import TextNormalizer
+
+
+def compare(tmp_path, text1, text2, **normalize):
+    f1 = tmp_path / "expected.txt"
+    f2 = tmp_path / "actual.txt"
+    f1.write_text(text1, encoding="utf-8")
+    f2.write_text(text2, encoding="utf-8")
+    return TextComparator(digest_cache=False, normalize=normalize).compare_files(f1, f2)
+
+
+class TestTextNormalizer:
+
+    def test_steps_applied_in_order(self):
+        normalizer = TextNormalizer.load({
+            "ignore_lines": ["^DEBUG"],
+            "substitutions": [[r"pid=\d+", "pid=<PID>"], {"pattern": r"/tmp/\w+", "replace": "<TMP>"}],
+            "collapse_whitespace": True,
+        })
+        assert normalizer.normalize("DEBUG pid=1\n", 1) is None
+        line = normalizer.normalize("  run  pid=42   in /tmp/abc12\n", 3)
+        assert line == "run pid=<PID> in <TMP>"
+        assert line.number == 3
+
+    def test_numeric_tolerance(self):
+        normalizer = TextNormalizer.load({"rtol": 1e-3})
+        a = normalizer.normalize("t=1.0000 err 2e-3 v1.2.3\n", 1)
+        assert a == normalizer.normalize("t=1.0004 err 2.001e-3 v1.2.3\n", 1)
+        assert hash(a) == hash(normalizer.normalize("t=1.0004 err 2.001e-3 v1.2.3\n", 1))
+        assert a != normalizer.normalize("t=1.01 err 2e-3 v1.2.3\n", 1)
+        assert a != normalizer.normalize("t=1.0000 err 2e-3 v1.2.4\n", 1)
+
+    @pytest.mark.parametrize("spec", [
+        {"unknown": 1},
+        {"ignore_lines": ["("]},
+        {"substitutions": [["only pattern"]]},
+        ["not", "a", "mapping"],
+    ])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            TextNormalizer.load(spec)
+
+
+class TestNormalizedComparison:
+
+    def test_noise_normalized_away(self, tmp_path):
+        expected = "start 2025-01-01T10:00:00\nDEBUG cache warm\nresult  = 3.14159\n"
+        actual = "start 2025-06-30T23:59:59\nresult = 3.14160\n"
+        result = compare(tmp_path, expected, actual,
+                         substitutions=[[r"\d{4}-\d\d-\d\dT[\d:]+", "<TIME>"]],
+                         ignore_lines=["^DEBUG"], collapse_whitespace=True, atol=1e-4)
+        assert result.identical, result.differences
+
+    def test_differences_keep_file_line_numbers(self, tmp_path):
+        expected = "DEBUG a\nDEBUG b\nvalue 1\nvalue 2\n"
+        actual = "value 1\nvalue 3\n"
+        result = compare(tmp_path, expected, actual, ignore_lines=["^DEBUG"], atol=0.5)
+        assert [(d.position, d.expected, d.actual) for d in result.differences] == [
+            ("line 4", "value 2\n", "value 3\n")
+        ]
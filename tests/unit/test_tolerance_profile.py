@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for ToleranceProfile loading and path matching."""
+
+import json
+
+import pytest
+
+from cli_test_framework.file_comparator.tolerance_profile import ToleranceProfile
+
+
+class TestLoad:
+    def test_none_gives_default_kernel_only(self):
+        profile = ToleranceProfile.load(None, rtol=1e-3, atol=1e-4)
+        assert profile.rules == []
+        kernel = profile.kernel_for("any/path")
+        assert (kernel.rtol, kernel.atol) == (1e-3, 1e-4)
+
+    def test_mapping_form_inherits_defaults(self):
+        profile = ToleranceProfile.load({"mesh/.*": {"max_ulp": 4}}, rtol=1e-3, atol=1e-4)
+        kernel = profile.kernel_for("mesh/coords")
+        assert (kernel.rtol, kernel.atol, kernel.max_ulp) == (1e-3, 1e-4, 4)
+
+    def test_list_form_and_first_match_wins(self):
+        profile = ToleranceProfile.load([
+            {"pattern": "results/timing.*", "ignore": True},
+            {"pattern": "results/.*", "rtol": 1e-2},
+        ])
+        assert profile.is_ignored("results/timing_total")
+        assert not profile.is_ignored("results/pressure")
+        assert profile.kernel_for("results/pressure").rtol == 1e-2
+
+    def test_pattern_must_match_full_path(self):
+        profile = ToleranceProfile.load({"temp": {"rtol": 0.5}})
+        assert profile.match("temperature") is None
+        assert profile.match("temp") is not None
+
+    def test_json_sidecar(self, tmp_path):
+        sidecar = tmp_path / "tol.json"
+        sidecar.write_text(json.dumps({"a": {"atol": 0.1}}), encoding="utf-8")
+        assert ToleranceProfile.load(str(sidecar)).kernel_for("a").atol == 0.1
+
+    def test_yaml_sidecar(self, tmp_path):
+        sidecar = tmp_path / "tol.yaml"
+        sidecar.write_text("- pattern: a\n  ignore: true\n", encoding="utf-8")
+        assert ToleranceProfile.load(sidecar).is_ignored("a")
+
+    @pytest.mark.parametrize("spec,match", [
+        ({"x": {"rtl": 1}}, "Unknown keys"),
+        ([{"rtol": 1}], "Invalid tolerance profile entry"),
+        ({"(": {}}, "Invalid tolerance profile pattern"),
+        (42, "must be a mapping"),
+    ])
+    def test_invalid_specs(self, spec, match):
+        with pytest.raises(ValueError, match=match):
+            ToleranceProfile.load(spec)
+
+    def test_missing_sidecar(self, tmp_path):
+        with pytest.raises(ValueError, match="not found"):
+            ToleranceProfile.load(tmp_path / "missing.json")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for the incremental XML event reader."""
+
+import pytest
+
+from cli_test_framework.file_comparator.xml_stream import XmlEventReader
+
+DOCUMENT = '<root a="1"><item id="1"><name>Ada</name></item><item id="2"/>tail<last>text</last></root>'
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 5, 1000])
+def test_reader_yields_start_and_end_events_across_chunks(size):
+    reader = XmlEventReader(chunked(DOCUMENT, size))
+    events = []
+    while True:
+        kind, elem = reader.next()
+        if kind == "eof":
+            break
+        events.append((kind, elem.tag))
+
+    assert events[:4] == [("start", "root"), ("start", "item"), ("start", "name"), ("end", "name")]
+    assert events[-1] == ("end", "root")
+    assert len(events) == 10
+
+
+def test_reader_looks_ahead_within_limit_and_detaches_read_children():
+    reader = XmlEventReader(chunked(DOCUMENT, 4), subtree_limit=4)
+    kind, root = reader.next()
+    assert reader.next()[1].get("id") == "1"
+
+    count = reader.look_ahead()
+    assert count == 3
+    reader.consume(count)
+    assert len(root) == 0
+
+    kind, item = reader.next()
+    assert item.get("id") == "2" and reader.look_ahead() == 1
+    reader.consume(1)
+
+    kind, last = reader.next()
+    assert reader.skip() == 0
+    assert last.text == "text"
+    assert reader.next() == ("end", root)
+    assert reader.next() == ("eof", None)
+
+
+def test_reader_reports_subtrees_over_the_limit_and_skips_them():
+    reader = XmlEventReader([DOCUMENT], subtree_limit=2)
+    reader.next()
+    reader.next()
+
+    assert reader.look_ahead() is None
+    assert reader.skip() == 1
+    assert reader.next()[1].get("id") == "2"
+
+
+def test_reader_raises_for_malformed_documents():
+    reader = XmlEventReader(chunked("<root><a></root>", 3), name="bad.xml")
+
+    with pytest.raises(ValueError, match="Invalid XML in bad.xml"):
+        while reader.next()[0] != "eof":
+            pass